@@ -8,7 +8,7 @@ import streamlit as st
 import pandas as pd
 import sys
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 # 添加项目路径到sys.path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,6 +17,8 @@ sys.path.insert(0, current_dir)
 # 导入自定义模块
 from config import *
 from utils import DataUtils, SessionStateManager, FileUtils
+from utils.cube_cache import CubeCache
+from utils.excel_loader import ExcelStreamLoader
 from components.ui_components import UIComponents
 from components.config_manager import render_sidebar_config_panel
 from core.analysis_engine import AnalysisEngine, DimensionConfigManager
@@ -352,6 +354,104 @@ def handle_analysis_configuration():
                     dimension_configs[dimension] = config
                 else:
                     all_configs_valid = False
+            elif dimension == "时段峰值分析":
+                config_valid = UIComponents.render_intraday_analysis_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "需求预测":
+                config_valid = UIComponents.render_demand_forecast_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "季节性分析":
+                config_valid = UIComponents.render_seasonality_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "出入库对账分析":
+                config_valid = UIComponents.render_reconciliation_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "库龄分析":
+                config_valid = UIComponents.render_inventory_aging_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "库存周转分析":
+                config_valid = UIComponents.render_turnover_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "安全库存分析":
+                config_valid = UIComponents.render_safety_stock_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "吞吐仿真分析":
+                config_valid = UIComponents.render_throughput_simulation_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "储位优化分析":
+                config_valid = UIComponents.render_slotting_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "拣选路径分析":
+                config_valid = UIComponents.render_pick_path_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "分区拆单分析":
+                config_valid = UIComponents.render_zone_split_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "补货频次分析":
+                config_valid = UIComponents.render_replenishment_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "存储需求分析":
+                config_valid = UIComponents.render_storage_requirement_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
+            elif dimension == "订单聚类分析":
+                config_valid = UIComponents.render_order_cluster_config(columns)
+                if config_valid:
+                    config = SessionStateManager.get_analysis_config(dimension)
+                    dimension_configs[dimension] = config
+                else:
+                    all_configs_valid = False
             else:
                 # 其他维度的配置界面
                 st.info(f"💡 {dimension} 配置界面待完善...")
@@ -417,8 +517,8 @@ def execute_analysis():
         st.error("❌ 数据加载失败")
         return
     
-    # 创建分析引擎
-    analysis_engine = AnalysisEngine(df)
+    # 创建分析引擎（传入源工作表指纹，出入库分析据此复用日聚合缓存）
+    analysis_engine = AnalysisEngine(df, get_source_fingerprint(uploaded_file, sheet_name))
     
     # 分离前置处理和分析步骤（添加安全检查，确保维度存在）
     preprocessing_steps = [dim for dim in selected_dimensions if dim in PREPROCESSING_DIMENSIONS]
@@ -641,32 +741,37 @@ def reset_analysis():
     st.success("✅ 已重置，请重新开始分析")
     st.rerun()
 
+def get_source_fingerprint(uploaded_file, sheet_name: str) -> Optional[str]:
+    """获取源工作表内容指纹（同一次上传的同一工作表只计算一次）"""
+    if uploaded_file is None:
+        return None
+    
+    # 按上传ID记忆：重新上传同名同大小但内容不同的文件会得到新的file_id，不会复用旧指纹
+    file_id = getattr(uploaded_file, 'file_id', None)
+    cache_key = (file_id, sheet_name)
+    cached = st.session_state.get('source_fingerprint_cache')
+    if file_id and cached and cached[0] == cache_key:
+        return cached[1]
+    
+    try:
+        fingerprint = CubeCache.source_fingerprint(uploaded_file.getvalue(), sheet_name)
+    except Exception:
+        return None
+    
+    st.session_state['source_fingerprint_cache'] = (cache_key, fingerprint)
+    return fingerprint
+
 @st.cache_data
 def load_data_cached(uploaded_file, sheet_name: str) -> pd.DataFrame:
     """高性能缓存数据加载函数（无UI元素，纯数据处理）"""
     try:
-        # 使用优化的读取参数，无UI提示
+        # 单次流式读取（只解析一次工作簿），无UI提示
         try:
-            # 先读取少量数据检查格式
-            sample_df = pd.read_excel(
-                uploaded_file, 
-                sheet_name=sheet_name, 
-                nrows=5,
-                engine='openpyxl'
-            )
+            df = ExcelStreamLoader.load(uploaded_file, sheet_name)
             
-            if sample_df.empty:
+            if df.empty:
                 return pd.DataFrame()
             
-            # 使用优化参数读取完整数据
-            df = pd.read_excel(
-                uploaded_file,
-                sheet_name=sheet_name,
-                engine='openpyxl',  # 使用更快的引擎
-                na_values=['', 'NULL', 'null', 'N/A', 'n/a', '#N/A', 'nan'],
-                keep_default_na=True
-            )
-            
             # 安全的数据类型优化，避免PyArrow转换问题
             for col in df.select_dtypes(include=['object']).columns:
                 try:
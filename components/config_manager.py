@@ -198,7 +198,10 @@ def restore_dimension_configs_to_session(dimension_configs: Dict[str, Any]):
         "出库分析_date_column", "出库分析_order_data_type", "出库分析_order_id_column",
         "出库分析_order_count_column", "出库分析_sku_data_type", "出库分析_sku_column",
         "出库分析_sku_count_column", "出库分析_item_data_type", "出库分析_item_column",
-        "出库分析_item_count_column", "出库分析_start_date", "出库分析_end_date"
+        "出库分析_item_count_column", "出库分析_start_date", "出库分析_end_date",
+        "出库分析_distinct_mode", "出库分析_hll_precision", "出库分析_customer_column",
+        "出库分析_customer_mode", "出库分析_customer_top_n", "出库分析_customer_a_percentage",
+        "出库分析_customer_b_percentage"
     ]
     for key in outbound_keys:
         if key in st.session_state:
@@ -208,12 +211,162 @@ def restore_dimension_configs_to_session(dimension_configs: Dict[str, Any]):
     inbound_keys = [
         "入库分析_date_column", "入库分析_sku_data_type", "入库分析_sku_column",
         "入库分析_sku_count_column", "入库分析_quantity_data_type", "入库分析_quantity_column",
-        "入库分析_quantity_count_column", "入库分析_start_date", "入库分析_end_date"
+        "入库分析_quantity_count_column", "入库分析_start_date", "入库分析_end_date",
+        "入库分析_distinct_mode", "入库分析_hll_precision", "入库分析_supplier_column",
+        "入库分析_reference_date_column", "入库分析_delivery_column", "入库分析_box_column",
+        "入库分析_on_time_days"
     ]
     for key in inbound_keys:
         if key in st.session_state:
             del st.session_state[key]
     
+    # 清除时段峰值分析相关的配置键
+    intraday_keys = [
+        "时段峰值分析_datetime_column", "时段峰值分析_order_column",
+        "时段峰值分析_quantity_column", "时段峰值分析_slot_minutes"
+    ]
+    for key in intraday_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除需求预测相关的配置键
+    forecast_keys = [
+        "需求预测_date_column", "需求预测_sku_column",
+        "需求预测_quantity_column", "需求预测_horizon"
+    ]
+    for key in forecast_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除季节性分析相关的配置键
+    seasonality_keys = [
+        "季节性分析_date_column", "季节性分析_series_column", "季节性分析_quantity_column"
+    ]
+    for key in seasonality_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除出入库对账分析相关的配置键
+    reconciliation_keys = [
+        "出入库对账分析_current_role", "出入库对账分析_date_column", "出入库对账分析_sku_column",
+        "出入库对账分析_quantity_column", "出入库对账分析_sheet", "出入库对账分析_sheet_date_column",
+        "出入库对账分析_sheet_sku_column", "出入库对账分析_sheet_quantity_column", "出入库对账分析_use_opening",
+        "出入库对账分析_opening_sheet", "出入库对账分析_opening_sku_column", "出入库对账分析_opening_quantity_column"
+    ]
+    for key in reconciliation_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除库龄分析相关的配置键
+    aging_keys = [
+        "库龄分析_current_role", "库龄分析_date_column", "库龄分析_sku_column",
+        "库龄分析_quantity_column", "库龄分析_sheet", "库龄分析_sheet_date_column",
+        "库龄分析_sheet_sku_column", "库龄分析_sheet_quantity_column"
+    ]
+    for key in aging_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除库存周转分析相关的配置键
+    turnover_keys = [
+        "库存周转分析_sku_column", "库存周转分析_stock_column", "库存周转分析_category_column",
+        "库存周转分析_sheet", "库存周转分析_sheet_date_column", "库存周转分析_sheet_sku_column",
+        "库存周转分析_sheet_quantity_column"
+    ]
+    for key in turnover_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除安全库存分析相关的配置键
+    safety_stock_keys = [
+        "安全库存分析_date_column", "安全库存分析_sku_column", "安全库存分析_quantity_column",
+        "安全库存分析_cost_column", "安全库存分析_period", "安全库存分析_lead_time",
+        "安全库存分析_lead_time_std", "安全库存分析_service_levels"
+    ]
+    for key in safety_stock_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除吞吐仿真分析相关的配置键
+    simulation_keys = [
+        "吞吐仿真分析_datetime_column", "吞吐仿真分析_quantity_column", "吞吐仿真分析_workload",
+        "吞吐仿真分析_picks_per_hour", "吞吐仿真分析_hit_rate", "吞吐仿真分析_backlog_hours",
+        "吞吐仿真分析_service_level", "吞吐仿真分析_replications"
+    ]
+    for key in simulation_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除储位优化分析相关的配置键
+    slotting_keys = [
+        "储位优化分析_sku_column", "储位优化分析_length_column", "储位优化分析_width_column",
+        "储位优化分析_height_column", "储位优化分析_inventory_column", "储位优化分析_data_unit",
+        "储位优化分析_location_column", "储位优化分析_sheet", "储位优化分析_sheet_sku_column",
+        "储位优化分析_aisles", "储位优化分析_bays", "储位优化分析_levels",
+        "储位优化分析_bay_width", "储位优化分析_aisle_pitch", "储位优化分析_level_penalty",
+        "储位优化分析_location_length", "储位优化分析_location_width", "储位优化分析_location_height"
+    ]
+    for key in slotting_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除拣选路径分析相关的配置键
+    pick_path_keys = [
+        "拣选路径分析_order_column", "拣选路径分析_sku_column", "拣选路径分析_sheet",
+        "拣选路径分析_sheet_sku_column", "拣选路径分析_sheet_location_column", "拣选路径分析_aisles",
+        "拣选路径分析_bays", "拣选路径分析_levels", "拣选路径分析_bay_width",
+        "拣选路径分析_aisle_pitch", "拣选路径分析_batch_sizes"
+    ]
+    for key in pick_path_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除分区拆单分析相关的配置键
+    zone_split_keys = [
+        "分区拆单分析_order_column", "分区拆单分析_sku_column", "分区拆单分析_zone_columns",
+        "分区拆单分析_use_abc", "分区拆单分析_a_percentage", "分区拆单分析_b_percentage",
+        "分区拆单分析_zone_counts"
+    ]
+    for key in zone_split_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除补货频次分析相关的配置键
+    replenishment_keys = [
+        "补货频次分析_sku_column", "补货频次分析_length_column", "补货频次分析_width_column",
+        "补货频次分析_height_column", "补货频次分析_weight_column", "补货频次分析_capacity_column",
+        "补货频次分析_data_unit", "补货频次分析_weight_unit", "补货频次分析_sheet",
+        "补货频次分析_sheet_date_column", "补货频次分析_sheet_sku_column", "补货频次分析_sheet_quantity_column",
+        "补货频次分析_refills_per_face", "补货频次分析_peak_percentile"
+    ]
+    for key in replenishment_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除存储需求分析相关的配置键
+    storage_requirement_keys = [
+        "存储需求分析_sku_column", "存储需求分析_quantity_column", "存储需求分析_length_column",
+        "存储需求分析_width_column", "存储需求分析_height_column", "存储需求分析_inventory_column",
+        "存储需求分析_weight_column", "存储需求分析_data_unit", "存储需求分析_weight_unit",
+        "存储需求分析_a_percentage", "存储需求分析_b_percentage", "存储需求分析_divider_counts",
+        "存储需求分析_location_length", "存储需求分析_location_width", "存储需求分析_location_height"
+    ]
+    for key in storage_requirement_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
+    # 清除订单聚类分析相关的配置键
+    order_cluster_keys = [
+        "订单聚类分析_order_column", "订单聚类分析_sku_column", "订单聚类分析_quantity_column",
+        "订单聚类分析_date_column", "订单聚类分析_length_column", "订单聚类分析_width_column",
+        "订单聚类分析_height_column", "订单聚类分析_weight_column", "订单聚类分析_data_unit",
+        "订单聚类分析_weight_unit", "订单聚类分析_n_clusters", "订单聚类分析_a_percentage",
+        "订单聚类分析_b_percentage"
+    ]
+    for key in order_cluster_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+    
     # 清除ABC分析相关的配置键
     abc_keys = [
         "ABC分析_sku_column", "ABC分析_quantity_column", 
@@ -252,7 +405,10 @@ def restore_dimension_configs_to_session(dimension_configs: Dict[str, Any]):
                        '出库分析_order_id_column', '出库分析_order_count_column',
                        '出库分析_sku_data_type', '出库分析_sku_column', 
                        '出库分析_sku_count_column', '出库分析_item_data_type',
-                       '出库分析_item_column', '出库分析_item_count_column']:
+                       '出库分析_item_column', '出库分析_item_count_column',
+                       '出库分析_distinct_mode', '出库分析_hll_precision',
+                       '出库分析_customer_column', '出库分析_customer_mode', '出库分析_customer_top_n',
+                       '出库分析_customer_a_percentage', '出库分析_customer_b_percentage']:
                 if key in config:  # 只要配置中存在这个键，就恢复（包括"无数据"值）
                     st.session_state[key] = config[key]
             
@@ -269,7 +425,10 @@ def restore_dimension_configs_to_session(dimension_configs: Dict[str, Any]):
             for key in ['入库分析_date_column', '入库分析_sku_data_type', 
                        '入库分析_sku_column', '入库分析_sku_count_column',
                        '入库分析_quantity_data_type', '入库分析_quantity_column', 
-                       '入库分析_quantity_count_column']:
+                       '入库分析_quantity_count_column',
+                       '入库分析_distinct_mode', '入库分析_hll_precision',
+                       '入库分析_supplier_column', '入库分析_reference_date_column',
+                       '入库分析_delivery_column', '入库分析_box_column', '入库分析_on_time_days']:
                 if key in config:  # 只要配置中存在这个键，就恢复（包括"无数据"值）
                     st.session_state[key] = config[key]
             
@@ -281,6 +440,111 @@ def restore_dimension_configs_to_session(dimension_configs: Dict[str, Any]):
                         from datetime import datetime
                         date_value = datetime.strptime(date_value, '%Y-%m-%d').date()
                     st.session_state[date_key] = date_value
+        elif dimension == '时段峰值分析':
+            # 恢复时段峰值分析的配置（包括"无数据"值）
+            for key in ['时段峰值分析_datetime_column', '时段峰值分析_order_column',
+                       '时段峰值分析_quantity_column', '时段峰值分析_slot_minutes']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '需求预测':
+            # 恢复需求预测的配置（包括"无数据"值）
+            for key in ['需求预测_date_column', '需求预测_sku_column',
+                       '需求预测_quantity_column', '需求预测_horizon']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '季节性分析':
+            # 恢复季节性分析的配置（包括"无数据"值）
+            for key in ['季节性分析_date_column', '季节性分析_series_column', '季节性分析_quantity_column']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '出入库对账分析':
+            # 恢复出入库对账分析的配置（包括"无数据"值）
+            for key in ['出入库对账分析_current_role', '出入库对账分析_date_column', '出入库对账分析_sku_column',
+                       '出入库对账分析_quantity_column', '出入库对账分析_sheet', '出入库对账分析_sheet_date_column',
+                       '出入库对账分析_sheet_sku_column', '出入库对账分析_sheet_quantity_column', '出入库对账分析_use_opening',
+                       '出入库对账分析_opening_sheet', '出入库对账分析_opening_sku_column', '出入库对账分析_opening_quantity_column']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '库龄分析':
+            # 恢复库龄分析的配置（包括"无数据"值）
+            for key in ['库龄分析_current_role', '库龄分析_date_column', '库龄分析_sku_column',
+                       '库龄分析_quantity_column', '库龄分析_sheet', '库龄分析_sheet_date_column',
+                       '库龄分析_sheet_sku_column', '库龄分析_sheet_quantity_column']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '库存周转分析':
+            # 恢复库存周转分析的配置（包括"无数据"值）
+            for key in ['库存周转分析_sku_column', '库存周转分析_stock_column', '库存周转分析_category_column',
+                       '库存周转分析_sheet', '库存周转分析_sheet_date_column', '库存周转分析_sheet_sku_column',
+                       '库存周转分析_sheet_quantity_column']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '安全库存分析':
+            # 恢复安全库存分析的配置（包括"无数据"值）
+            for key in ['安全库存分析_date_column', '安全库存分析_sku_column', '安全库存分析_quantity_column',
+                       '安全库存分析_cost_column', '安全库存分析_period', '安全库存分析_lead_time',
+                       '安全库存分析_lead_time_std', '安全库存分析_service_levels']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '吞吐仿真分析':
+            # 恢复吞吐仿真分析的配置（包括"无数据"值）
+            for key in ['吞吐仿真分析_datetime_column', '吞吐仿真分析_quantity_column', '吞吐仿真分析_workload',
+                       '吞吐仿真分析_picks_per_hour', '吞吐仿真分析_hit_rate', '吞吐仿真分析_backlog_hours',
+                       '吞吐仿真分析_service_level', '吞吐仿真分析_replications']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '储位优化分析':
+            # 恢复储位优化分析的配置（包括"无数据"值）
+            for key in ['储位优化分析_sku_column', '储位优化分析_length_column', '储位优化分析_width_column',
+                       '储位优化分析_height_column', '储位优化分析_inventory_column', '储位优化分析_data_unit',
+                       '储位优化分析_location_column', '储位优化分析_sheet', '储位优化分析_sheet_sku_column',
+                       '储位优化分析_aisles', '储位优化分析_bays', '储位优化分析_levels',
+                       '储位优化分析_bay_width', '储位优化分析_aisle_pitch', '储位优化分析_level_penalty',
+                       '储位优化分析_location_length', '储位优化分析_location_width', '储位优化分析_location_height']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '拣选路径分析':
+            # 恢复拣选路径分析的配置
+            for key in ['拣选路径分析_order_column', '拣选路径分析_sku_column', '拣选路径分析_sheet',
+                       '拣选路径分析_sheet_sku_column', '拣选路径分析_sheet_location_column', '拣选路径分析_aisles',
+                       '拣选路径分析_bays', '拣选路径分析_levels', '拣选路径分析_bay_width',
+                       '拣选路径分析_aisle_pitch', '拣选路径分析_batch_sizes']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '分区拆单分析':
+            # 恢复分区拆单分析的配置
+            for key in ['分区拆单分析_order_column', '分区拆单分析_sku_column', '分区拆单分析_zone_columns',
+                       '分区拆单分析_use_abc', '分区拆单分析_a_percentage', '分区拆单分析_b_percentage',
+                       '分区拆单分析_zone_counts']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '补货频次分析':
+            # 恢复补货频次分析的配置
+            for key in ['补货频次分析_sku_column', '补货频次分析_length_column', '补货频次分析_width_column',
+                       '补货频次分析_height_column', '补货频次分析_weight_column', '补货频次分析_capacity_column',
+                       '补货频次分析_data_unit', '补货频次分析_weight_unit', '补货频次分析_sheet',
+                       '补货频次分析_sheet_date_column', '补货频次分析_sheet_sku_column', '补货频次分析_sheet_quantity_column',
+                       '补货频次分析_refills_per_face', '补货频次分析_peak_percentile']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '存储需求分析':
+            # 恢复存储需求分析的配置
+            for key in ['存储需求分析_sku_column', '存储需求分析_quantity_column', '存储需求分析_length_column',
+                       '存储需求分析_width_column', '存储需求分析_height_column', '存储需求分析_inventory_column',
+                       '存储需求分析_weight_column', '存储需求分析_data_unit', '存储需求分析_weight_unit',
+                       '存储需求分析_a_percentage', '存储需求分析_b_percentage', '存储需求分析_divider_counts',
+                       '存储需求分析_location_length', '存储需求分析_location_width', '存储需求分析_location_height']:
+                if key in config:
+                    st.session_state[key] = config[key]
+        elif dimension == '订单聚类分析':
+            # 恢复订单聚类分析的配置
+            for key in ['订单聚类分析_order_column', '订单聚类分析_sku_column', '订单聚类分析_quantity_column',
+                       '订单聚类分析_date_column', '订单聚类分析_length_column', '订单聚类分析_width_column',
+                       '订单聚类分析_height_column', '订单聚类分析_weight_column', '订单聚类分析_data_unit',
+                       '订单聚类分析_weight_unit', '订单聚类分析_n_clusters', '订单聚类分析_a_percentage',
+                       '订单聚类分析_b_percentage']:
+                if key in config:
+                    st.session_state[key] = config[key]
         elif dimension == 'ABC分析':
             # 恢复ABC分析的配置
             for key in ['sku_column', 'quantity_column', 'a_percentage', 'b_percentage']:
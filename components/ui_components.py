@@ -8,6 +8,7 @@ import pandas as pd
 from datetime import datetime
 from config import *
 from core.packing_analysis import PackingAnalyzer
+from core.date_index import SortedDateIndex
 from utils import DataUtils
 
 class UIComponents:
@@ -583,13 +584,13 @@ class UIComponents:
         if analysis_type == "outbound":
             # 出库分析：显示出库分析的核心维度
             st.write(f"📊 请勾选要执行的 **{analysis_name}** 维度：")
-            analysis_dimensions = ["ABC分析", "订单结构分析"]  # 出库分析默认执行，不在选择列表中
             default_dimensions = ["出库分析"]  # 默认包含的维度
+            analysis_dimensions = [dim for dim in available_dimensions if dim not in default_dimensions]  # 出库分析默认执行，不在选择列表中
         elif analysis_type == "inbound":
             # 入库分析：显示入库分析的核心维度  
             st.write(f"📊 请勾选要执行的 **{analysis_name}** 维度：")
-            analysis_dimensions = ["ABC分析", "订单结构分析"]  # 入库分析默认执行，不在选择列表中
             default_dimensions = ["入库分析"]  # 默认包含的维度
+            analysis_dimensions = [dim for dim in available_dimensions if dim not in default_dimensions]  # 入库分析默认执行，不在选择列表中
         elif analysis_type == "inventory":
             # 库存分析：只显示装箱分析和ABC分析
             st.write(f"📊 请勾选要执行的 **{analysis_name}** 维度：")
@@ -1138,12 +1139,15 @@ class UIComponents:
         try:
             df = st.session_state.get('loaded_data')
             if df is not None and date_column in df.columns:
-                date_series = pd.to_datetime(df[date_column], errors='coerce')
-                min_date = date_series.min().date() if not date_series.isna().all() else None
-                max_date = date_series.max().date() if not date_series.isna().all() else None
+                # 使用有序日期索引（同一数据集只解析排序一次）
+                date_index = SortedDateIndex.for_frame(df, date_column)
+                min_date = date_index.min_date
+                max_date = date_index.max_date
             else:
+                date_index = None
                 min_date = max_date = None
         except:
+            date_index = None
             min_date = max_date = None
         
         with col1:
@@ -1239,6 +1243,15 @@ class UIComponents:
             st.error("❌ 开始日期不能晚于结束日期")
             return False
         
+        if date_index is not None and start_date and end_date:
+            st.caption(f"📊 所选范围内共 {date_index.count_in_range(start_date, end_date):,} 条记录")
+        
+        # 去重计数模式
+        UIComponents._render_distinct_count_config("出库分析")
+        
+        # 客户需求（可选）
+        UIComponents._render_customer_config("出库分析", columns)
+        
         # 分析说明
         st.write("**🔬 分析说明**")
         
@@ -1282,6 +1295,121 @@ class UIComponents:
         
         return True
     
+    @staticmethod
+    def _render_distinct_count_config(prefix):
+        """渲染订单数/SKU数的去重计数模式配置（精确或HyperLogLog近似）"""
+        st.write("**🧮 去重计数模式**")
+        modes = DISTINCT_COUNT_CONFIG['modes']
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            distinct_mode = st.radio(
+                "订单数/SKU数去重方式",
+                options=list(modes.keys()),
+                format_func=lambda mode: modes[mode],
+                key=f"{prefix}_distinct_mode",
+                horizontal=True,
+                help="数据量很大或需要跨文件、跨周期合并时使用近似去重，内存占用固定"
+            )
+        
+        with col2:
+            if distinct_mode == "approximate":
+                # 检查session_state中是否已有值，避免widget冲突
+                precision_key = f"{prefix}_hll_precision"
+                if precision_key not in st.session_state:
+                    st.session_state[precision_key] = DISTINCT_COUNT_CONFIG['default_precision']
+                precision = st.slider(
+                    "近似精度p",
+                    min_value=DISTINCT_COUNT_CONFIG['min_precision'],
+                    max_value=DISTINCT_COUNT_CONFIG['max_precision'],
+                    key=precision_key,
+                    help="每天使用2^p个寄存器，p越大越精确、内存越高"
+                )
+                error = 1.04 / (2 ** precision) ** 0.5
+                st.caption(f"≈ 相对标准误差 ±{error:.2%}，每天每指标 {2 ** precision / 1024:.0f} KB")
+    
+    @staticmethod
+    def _render_customer_config(prefix, columns):
+        """渲染客户需求配置（客户列、精确/近似Top-N模式和客户ABC分类阈值）"""
+        st.markdown("### 👥 客户需求（可选）")
+        defaults = {
+            f"{prefix}_customer_top_n": CUSTOMER_DEMAND_CONFIG['default_top_n'],
+            f"{prefix}_customer_a_percentage": CUSTOMER_DEMAND_CONFIG['default_a_percentage'],
+            f"{prefix}_customer_b_percentage": CUSTOMER_DEMAND_CONFIG['default_b_percentage']
+        }
+        for key, value in defaults.items():
+            if key not in st.session_state:
+                st.session_state[key] = value
+        
+        modes = CUSTOMER_DEMAND_CONFIG['modes']
+        col1, col2 = st.columns(2)
+        with col1:
+            customer_column = st.selectbox(
+                "选择客户列",
+                options=["无数据"] + list(columns),
+                key=f"{prefix}_customer_column",
+                help="选择后按客户统计下单频次、行数、件数、客户ABC分类和集中度；订单数和件数沿用上方的原始订单号列和件数列"
+            )
+        with col2:
+            if customer_column != "无数据":
+                customer_mode = st.radio(
+                    "统计方式",
+                    options=list(modes.keys()),
+                    format_func=lambda mode: modes[mode],
+                    key=f"{prefix}_customer_mode",
+                    horizontal=True,
+                    help="客户达到百万级时使用近似Top-N，只输出件数最大的N个客户及其误差上限"
+                )
+        
+        if customer_column != "无数据":
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.number_input("A类累计占比(%)", min_value=1, max_value=99, step=1,
+                                key=f"{prefix}_customer_a_percentage")
+            with col2:
+                st.number_input("B类累计占比(%)", min_value=1, max_value=99, step=1,
+                                key=f"{prefix}_customer_b_percentage")
+            with col3:
+                if customer_mode == "approximate":
+                    st.number_input("Top-N客户数", min_value=10, max_value=10000, step=10,
+                                    key=f"{prefix}_customer_top_n")
+    
+    @staticmethod
+    def _render_supplier_config(prefix, columns):
+        """渲染供应商表现配置（供应商列、下单/ASN日期列、入库单号列、箱数列和准时阈值）"""
+        st.markdown("### 🏭 供应商表现（可选）")
+        if f"{prefix}_on_time_days" not in st.session_state:
+            st.session_state[f"{prefix}_on_time_days"] = SUPPLIER_CONFIG['default_on_time_days']
+        
+        optional_options = ["无数据"] + list(columns)
+        col1, col2 = st.columns(2)
+        with col1:
+            supplier_column = st.selectbox(
+                "选择供应商列",
+                options=optional_options,
+                key=f"{prefix}_supplier_column",
+                help="选择后按供应商统计交期、准时交货率和每次交货的行数/件数/箱数"
+            )
+        with col2:
+            if supplier_column != "无数据":
+                st.selectbox(
+                    "下单/ASN日期列",
+                    options=optional_options,
+                    key=f"{prefix}_reference_date_column",
+                    help="交期 = 入库日期 - 该日期；不选择时只统计交货频次和批量"
+                )
+        
+        if supplier_column != "无数据":
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.selectbox("入库单号/ASN单号列", options=optional_options, key=f"{prefix}_delivery_column",
+                             help="不选择时同一供应商同一天的入库视为一次交货")
+            with col2:
+                st.selectbox("箱数列", options=optional_options, key=f"{prefix}_box_column")
+            with col3:
+                st.number_input("准时阈值(天)", min_value=0, max_value=365, step=1, key=f"{prefix}_on_time_days",
+                                help="交期不超过该天数为准时；参考日期为ASN预计到货日时填允许延迟的天数")
+    
     @staticmethod
     def render_inbound_analysis_config(columns):
         """渲染入库分析配置界面"""
@@ -1374,12 +1502,15 @@ class UIComponents:
         try:
             df = st.session_state.get('loaded_data')
             if df is not None and date_column in df.columns:
-                date_series = pd.to_datetime(df[date_column], errors='coerce')
-                min_date = date_series.min().date() if not date_series.isna().all() else None
-                max_date = date_series.max().date() if not date_series.isna().all() else None
+                # 使用有序日期索引（同一数据集只解析排序一次）
+                date_index = SortedDateIndex.for_frame(df, date_column)
+                min_date = date_index.min_date
+                max_date = date_index.max_date
             else:
+                date_index = None
                 min_date = max_date = None
         except:
+            date_index = None
             min_date = max_date = None
         
         with col1:
@@ -1475,6 +1606,15 @@ class UIComponents:
             st.error("❌ 开始日期不能晚于结束日期")
             return False
         
+        if date_index is not None and start_date and end_date:
+            st.caption(f"📊 所选范围内共 {date_index.count_in_range(start_date, end_date):,} 条记录")
+        
+        # 去重计数模式
+        UIComponents._render_distinct_count_config("入库分析")
+        
+        # 供应商表现（可选）
+        UIComponents._render_supplier_config("入库分析", columns)
+        
         # 配置摘要和验证
         st.markdown("### ✅ 分析说明")
         
@@ -1867,6 +2007,1277 @@ class UIComponents:
             st.error(f"❌ 订单结构分析配置错误: {str(e)}")
             return False
 
+    @staticmethod
+    def render_intraday_analysis_config(columns):
+        """渲染时段峰值分析配置界面"""
+        try:
+            st.markdown("#### ⏰ 时段峰值分析配置")
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📋 选择分析列:**")
+                
+                # 日期时间列：默认沿用出入库分析已选择的日期列
+                datetime_key = "时段峰值分析_datetime_column"
+                if datetime_key in st.session_state:
+                    datetime_column = st.selectbox(
+                        "📅 日期时间列",
+                        options=columns,
+                        key=datetime_key,
+                        help="选择包含时分信息的出入库时间列"
+                    )
+                else:
+                    inout_date_column = (st.session_state.get("出库分析_date_column")
+                                         or st.session_state.get("入库分析_date_column"))
+                    datetime_column = st.selectbox(
+                        "📅 日期时间列",
+                        options=columns,
+                        index=columns.index(inout_date_column) if inout_date_column in columns else 0,
+                        key=datetime_key,
+                        help="选择包含时分信息的出入库时间列"
+                    )
+                
+                optional_columns = ["无数据"] + columns
+                order_column = st.selectbox(
+                    "📦 订单号列（可选）",
+                    options=optional_columns,
+                    key="时段峰值分析_order_column",
+                    help="选择订单号列以统计峰值小时订单数，行数按明细行计"
+                )
+                
+                quantity_column = st.selectbox(
+                    "🔢 件数列（可选）",
+                    options=optional_columns,
+                    key="时段峰值分析_quantity_column",
+                    help="选择件数列以统计峰值小时件数"
+                )
+                
+                slot_options = INTRADAY_CONFIG['slot_options']
+                slot_minutes = st.selectbox(
+                    "⏱️ 时段粒度",
+                    options=list(slot_options.keys()),
+                    format_func=lambda minutes: slot_options[minutes],
+                    key="时段峰值分析_slot_minutes",
+                    help="热力图和峰值小时始终按小时统计，时段粒度影响时段分布曲线和分钟级峰值"
+                )
+            
+            with col2:
+                config_valid = bool(datetime_column)
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择日期时间列")
+                else:
+                    st.success("✅ **时段峰值分析配置完成**")
+                    st.info(f"📅 **时间列**: {datetime_column}")
+                    if order_column != "无数据":
+                        st.info(f"📦 **订单列**: {order_column}")
+                    if quantity_column != "无数据":
+                        st.info(f"🔢 **件数列**: {quantity_column}")
+                    st.caption(f"• 时段粒度: {slot_options[slot_minutes]}")
+                    st.caption(f"• 峰值设计分位数: P{INTRADAY_CONFIG['peak_percentile']}")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 时段峰值分析配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_demand_forecast_config(columns):
+        """渲染需求预测配置界面"""
+        try:
+            st.markdown("#### 🔮 需求预测配置")
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📋 选择分析列:**")
+                
+                # 日期列和SKU列：默认沿用出库分析已选择的列
+                date_key = "需求预测_date_column"
+                if date_key in st.session_state:
+                    date_column = st.selectbox(
+                        "📅 日期列",
+                        options=columns,
+                        key=date_key,
+                        help="选择出库日期列"
+                    )
+                else:
+                    outbound_date_column = st.session_state.get("出库分析_date_column")
+                    date_column = st.selectbox(
+                        "📅 日期列",
+                        options=columns,
+                        index=columns.index(outbound_date_column) if outbound_date_column in columns else 0,
+                        key=date_key,
+                        help="选择出库日期列"
+                    )
+                
+                sku_key = "需求预测_sku_column"
+                if sku_key in st.session_state:
+                    sku_column = st.selectbox(
+                        "🏷️ SKU列",
+                        options=columns,
+                        key=sku_key,
+                        help="按该列拆分需求序列，每个SKU单独拟合"
+                    )
+                else:
+                    outbound_sku_column = st.session_state.get("出库分析_sku_column")
+                    sku_column = st.selectbox(
+                        "🏷️ SKU列",
+                        options=columns,
+                        index=columns.index(outbound_sku_column) if outbound_sku_column in columns else 0,
+                        key=sku_key,
+                        help="按该列拆分需求序列，每个SKU单独拟合"
+                    )
+                
+                quantity_column = st.selectbox(
+                    "🔢 件数列（可选）",
+                    options=["无数据"] + columns,
+                    key="需求预测_quantity_column",
+                    help="选择件数列按件数预测，不选择时按出库行数预测"
+                )
+                
+                horizon_key = "需求预测_horizon"
+                if horizon_key in st.session_state:
+                    horizon = st.selectbox(
+                        "📆 预测天数",
+                        options=DEMAND_FORECAST_CONFIG['horizon_options'],
+                        key=horizon_key
+                    )
+                else:
+                    horizon = st.selectbox(
+                        "📆 预测天数",
+                        options=DEMAND_FORECAST_CONFIG['horizon_options'],
+                        index=DEMAND_FORECAST_CONFIG['horizon_options'].index(DEMAND_FORECAST_CONFIG['default_horizon']),
+                        key=horizon_key
+                    )
+            
+            with col2:
+                config_valid = bool(date_column and sku_column) and date_column != sku_column
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择不同的日期列和SKU列")
+                else:
+                    st.success("✅ **需求预测配置完成**")
+                    st.info(f"📅 **日期列**: {date_column}")
+                    st.info(f"🏷️ **SKU列**: {sku_column}")
+                    if quantity_column != "无数据":
+                        st.info(f"🔢 **件数列**: {quantity_column}")
+                    st.caption(f"• 预测天数: {horizon} 天")
+                    st.caption(f"• 模型: {'、'.join(DEMAND_FORECAST_CONFIG['models'].values())}")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 需求预测配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_seasonality_config(columns):
+        """渲染季节性分析配置界面"""
+        try:
+            st.markdown("#### 🌊 季节性分析配置")
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📋 选择分析列:**")
+                
+                # 日期列：默认沿用出入库分析已选择的日期列
+                date_key = "季节性分析_date_column"
+                if date_key in st.session_state:
+                    date_column = st.selectbox(
+                        "📅 日期列",
+                        options=columns,
+                        key=date_key,
+                        help="选择出入库日期列"
+                    )
+                else:
+                    inout_date_column = (st.session_state.get("出库分析_date_column")
+                                         or st.session_state.get("入库分析_date_column"))
+                    date_column = st.selectbox(
+                        "📅 日期列",
+                        options=columns,
+                        index=columns.index(inout_date_column) if inout_date_column in columns else 0,
+                        key=date_key,
+                        help="选择出入库日期列"
+                    )
+                
+                optional_columns = ["无数据"] + columns
+                series_column = st.selectbox(
+                    "🏷️ 序列列（可选）",
+                    options=optional_columns,
+                    key="季节性分析_series_column",
+                    help="选择SKU或品类列，按该列拆分为多个序列批量分解；不选择时只分解汇总序列"
+                )
+                
+                quantity_column = st.selectbox(
+                    "🔢 件数列（可选）",
+                    options=optional_columns,
+                    key="季节性分析_quantity_column",
+                    help="选择件数列按件数分解，不选择时按明细行数分解"
+                )
+            
+            with col2:
+                config_valid = bool(date_column) and series_column != date_column
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择日期列，且序列列不能与日期列相同")
+                else:
+                    st.success("✅ **季节性分析配置完成**")
+                    st.info(f"📅 **日期列**: {date_column}")
+                    if series_column != "无数据":
+                        st.info(f"🏷️ **序列列**: {series_column}")
+                    if quantity_column != "无数据":
+                        st.info(f"🔢 **件数列**: {quantity_column}")
+                    st.caption("• 周季节性: 7日居中移动平均")
+                    st.caption(f"• 年季节性: 需至少 {SEASONALITY_CONFIG['min_yearly_months']} 个完整月份")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 季节性分析配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_sheet_picker(dimension, label, help_text=None, key=None):
+        """
+        渲染第二数据源工作表选择（对账、库龄等需要同一文件中另一张表的分析）
+        
+        Args:
+            dimension: 分析维度名称（用作控件键前缀）
+            label: 工作表含义（如"入库"、"库存快照"）
+            help_text: 帮助提示
+            key: 控件键，为空时为"{dimension}_sheet"
+            
+        Returns:
+            Tuple[Optional[str], List[str]]: (工作表名称, 该表列名)，无可选工作表时为(None, [])
+        """
+        uploaded_file = st.session_state.get('uploaded_file')
+        if uploaded_file is None:
+            st.warning("⚠️ 未找到上传的文件")
+            return None, []
+        
+        current_sheet = st.session_state.get('selected_sheet')
+        sheet_names = [name for name in DataUtils.get_excel_sheets_names_only(uploaded_file)['sheet_names']
+                       if str(name) != str(current_sheet)]
+        if not sheet_names:
+            st.warning(f"⚠️ 文件中没有其他工作表，请将{label}数据放在同一文件的另一个工作表中")
+            return None, []
+        
+        sheet_name = st.selectbox(
+            f"📑 {label}工作表",
+            options=sheet_names,
+            key=key or f"{dimension}_sheet",
+            help=help_text or f"选择同一文件中的{label}工作表"
+        )
+        return sheet_name, DataUtils.get_sheet_columns(uploaded_file, sheet_name)
+
+    @staticmethod
+    def render_flow_sheets_config(dimension, columns):
+        """
+        渲染入库+出库两张工作表的列选择（当前工作表为一侧，同一文件中的另一张表为另一侧）
+        
+        Args:
+            dimension: 分析维度名称（用作控件键前缀）
+            columns: 当前工作表列名
+            
+        Returns:
+            dict: valid、current_role、other_role、sheet_name
+        """
+        # 当前工作表的角色：默认按所选分析类型判断
+        role_options = ["出库", "入库"]
+        role_key = f"{dimension}_current_role"
+        if role_key in st.session_state:
+            current_role = st.radio("📋 当前工作表为", options=role_options, key=role_key, horizontal=True)
+        else:
+            current_role = st.radio(
+                "📋 当前工作表为",
+                options=role_options,
+                index=0 if st.session_state.get('analysis_type') == 'outbound' else 1,
+                key=role_key,
+                horizontal=True
+            )
+        other_role = "入库" if current_role == "出库" else "出库"
+        
+        st.markdown(f"**📤 {current_role}数据（当前工作表）:**")
+        date_key = f"{dimension}_date_column"
+        if date_key in st.session_state:
+            date_column = st.selectbox("📅 日期列", options=columns, key=date_key)
+        else:
+            inout_date_column = st.session_state.get(f"{current_role}分析_date_column")
+            date_column = st.selectbox(
+                "📅 日期列",
+                options=columns,
+                index=columns.index(inout_date_column) if inout_date_column in columns else 0,
+                key=date_key
+            )
+        sku_key = f"{dimension}_sku_column"
+        if sku_key in st.session_state:
+            sku_column = st.selectbox("🏷️ SKU列", options=columns, key=sku_key)
+        else:
+            inout_sku_column = st.session_state.get(f"{current_role}分析_sku_column")
+            sku_column = st.selectbox(
+                "🏷️ SKU列",
+                options=columns,
+                index=columns.index(inout_sku_column) if inout_sku_column in columns else 0,
+                key=sku_key
+            )
+        st.selectbox(
+            "🔢 件数列（可选）",
+            options=["无数据"] + columns,
+            key=f"{dimension}_quantity_column",
+            help="不选择时每行按1件计"
+        )
+        
+        st.markdown(f"**📥 {other_role}数据:**")
+        sheet_name, sheet_columns = UIComponents.render_sheet_picker(dimension, other_role)
+        if sheet_columns:
+            sheet_date_column = st.selectbox("📅 日期列", options=sheet_columns,
+                                             key=f"{dimension}_sheet_date_column")
+            sheet_sku_column = st.selectbox("🏷️ SKU列", options=sheet_columns,
+                                            key=f"{dimension}_sheet_sku_column",
+                                            help="SKU编码需与当前工作表一致")
+            st.selectbox("🔢 件数列（可选）", options=["无数据"] + sheet_columns,
+                         key=f"{dimension}_sheet_quantity_column")
+        else:
+            sheet_date_column = sheet_sku_column = None
+        
+        valid = (bool(date_column and sku_column and sheet_date_column and sheet_sku_column)
+                 and date_column != sku_column and sheet_date_column != sheet_sku_column)
+        return {'valid': valid, 'current_role': current_role, 'other_role': other_role, 'sheet_name': sheet_name}
+
+    @staticmethod
+    def render_reconciliation_config(columns):
+        """渲染出入库对账分析配置界面"""
+        try:
+            st.markdown("#### 🔄 出入库对账配置")
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                sheets = UIComponents.render_flow_sheets_config("出入库对账分析", columns)
+                
+                use_opening = st.checkbox(
+                    "📦 使用期初库存快照",
+                    key="出入库对账分析_use_opening",
+                    help="不使用时按每个SKU首次入库前的出库缺口推定期初库存，在库量为相对净流水的推算值"
+                )
+                opening_valid = True
+                if use_opening:
+                    opening_sheet, opening_columns = UIComponents.render_sheet_picker(
+                        "出入库对账分析", "期初库存快照", key="出入库对账分析_opening_sheet")
+                    if opening_columns:
+                        opening_sku = st.selectbox("🏷️ 快照SKU列", options=opening_columns,
+                                                   key="出入库对账分析_opening_sku_column",
+                                                   help="SKU编码需与出入库流水一致")
+                        opening_quantity = st.selectbox("🔢 快照库存数量列", options=opening_columns,
+                                                        key="出入库对账分析_opening_quantity_column")
+                        opening_valid = opening_sku != opening_quantity
+                    else:
+                        opening_valid = False
+            
+            with col2:
+                config_valid = sheets['valid'] and opening_valid
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请为两张表分别选择不同的日期列和SKU列，"
+                               "使用期初库存快照时需选择不同的SKU列和数量列")
+                else:
+                    st.success("✅ **出入库对账配置完成**")
+                    st.info(f"📤 **{sheets['current_role']}**: 当前工作表")
+                    st.info(f"📥 **{sheets['other_role']}**: {sheets['sheet_name']}")
+                    if use_opening:
+                        st.info(f"📦 **期初库存**: {opening_sheet}")
+                    else:
+                        st.caption("• 期初库存按首次入库前的缺口推定")
+                    st.caption("• 在库量<0 记为缺货")
+                    st.caption(f"• 超过 {RECONCILIATION_CONFIG['excess_cover_days']} 天日均出库量记为积压")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 出入库对账配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_inventory_aging_config(columns):
+        """渲染库龄分析配置界面"""
+        try:
+            st.markdown("#### ⏳ 库龄分析配置")
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                sheets = UIComponents.render_flow_sheets_config("库龄分析", columns)
+            
+            with col2:
+                config_valid = sheets['valid']
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请为两张表分别选择不同的日期列和SKU列")
+                else:
+                    st.success("✅ **库龄分析配置完成**")
+                    st.info(f"📤 **{sheets['current_role']}**: 当前工作表")
+                    st.info(f"📥 **{sheets['other_role']}**: {sheets['sheet_name']}")
+                    st.caption("• 出库按先进先出匹配入库批次")
+                    buckets = INVENTORY_AGING_CONFIG['age_buckets']
+                    st.caption(f"• 库龄分段: 0-{buckets[0]} / {buckets[0] + 1}-{buckets[1]} / {buckets[1]}天以上")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 库龄分析配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_turnover_config(columns):
+        """渲染库存周转分析配置界面"""
+        try:
+            st.markdown("#### 🔁 库存周转分析配置")
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📦 库存快照（当前工作表）:**")
+                sku_column = st.selectbox("🏷️ SKU列", options=columns, key="库存周转分析_sku_column")
+                stock_column = st.selectbox("🔢 库存数量列", options=columns, key="库存周转分析_stock_column",
+                                            help="同一SKU有多行（多库位）时库存相加")
+                st.selectbox("🗂️ 品类列（可选）", options=["无数据"] + columns, key="库存周转分析_category_column",
+                             help="选择后按品类汇总周转率和可供天数")
+                
+                st.markdown("**📤 出库历史:**")
+                sheet_name, sheet_columns = UIComponents.render_sheet_picker("库存周转分析", "出库")
+                if sheet_columns:
+                    sheet_date_column = st.selectbox("📅 日期列", options=sheet_columns,
+                                                     key="库存周转分析_sheet_date_column")
+                    sheet_sku_column = st.selectbox("🏷️ SKU列", options=sheet_columns,
+                                                    key="库存周转分析_sheet_sku_column",
+                                                    help="SKU编码需与库存快照一致")
+                    st.selectbox("🔢 件数列（可选）", options=["无数据"] + sheet_columns,
+                                 key="库存周转分析_sheet_quantity_column", help="不选择时每行按1件计")
+                else:
+                    sheet_date_column = sheet_sku_column = None
+            
+            with col2:
+                config_valid = (bool(sku_column and stock_column and sheet_date_column and sheet_sku_column)
+                                and sku_column != stock_column and sheet_date_column != sheet_sku_column)
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择快照的SKU列、库存列，以及出库表的日期列和SKU列")
+                else:
+                    st.success("✅ **库存周转配置完成**")
+                    st.info(f"📦 **库存列**: {stock_column}")
+                    st.info(f"📤 **出库表**: {sheet_name}")
+                    st.caption(f"• 滚动窗口: {'/'.join(str(w) for w in TURNOVER_CONFIG['windows'])} 天")
+                    st.caption(f"• 可供天数按近 {TURNOVER_CONFIG['primary_window']} 天日均出库计算")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 库存周转配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_safety_stock_config(columns):
+        """渲染安全库存分析配置界面"""
+        try:
+            st.markdown("#### 🛡️ 安全库存分析配置")
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📋 选择出库历史列:**")
+                
+                # 日期列和SKU列：默认沿用出库分析已选择的列
+                date_key = "安全库存分析_date_column"
+                if date_key in st.session_state:
+                    date_column = st.selectbox("📅 日期列", options=columns, key=date_key, help="选择出库日期列")
+                else:
+                    outbound_date_column = st.session_state.get("出库分析_date_column")
+                    date_column = st.selectbox(
+                        "📅 日期列",
+                        options=columns,
+                        index=columns.index(outbound_date_column) if outbound_date_column in columns else 0,
+                        key=date_key,
+                        help="选择出库日期列"
+                    )
+                
+                sku_key = "安全库存分析_sku_column"
+                if sku_key in st.session_state:
+                    sku_column = st.selectbox("🏷️ SKU列", options=columns, key=sku_key)
+                else:
+                    outbound_sku_column = st.session_state.get("出库分析_sku_column")
+                    sku_column = st.selectbox(
+                        "🏷️ SKU列",
+                        options=columns,
+                        index=columns.index(outbound_sku_column) if outbound_sku_column in columns else 0,
+                        key=sku_key
+                    )
+                
+                st.selectbox("🔢 件数列（可选）", options=["无数据"] + columns, key="安全库存分析_quantity_column",
+                             help="不选择时每行按1件计")
+                cost_column = st.selectbox("💰 单价列（可选）", options=["无数据"] + columns,
+                                           key="安全库存分析_cost_column",
+                                           help="选择后按金额汇总安全库存投入（同一SKU取第一条单价）")
+                
+                st.markdown("**⚙️ 补货参数:**")
+                period_options = list(SAFETY_STOCK_CONFIG['period_options'].keys())
+                period = st.selectbox("📆 需求统计周期", options=period_options, key="安全库存分析_period",
+                                      help="按日或按周统计需求的均值和波动")
+                
+                lead_time_key = "安全库存分析_lead_time"
+                if lead_time_key in st.session_state:
+                    lead_time = st.number_input("🚚 补货提前期(天)", min_value=1, step=1, key=lead_time_key)
+                else:
+                    lead_time = st.number_input("🚚 补货提前期(天)", min_value=1, step=1,
+                                                value=SAFETY_STOCK_CONFIG['default_lead_time_days'], key=lead_time_key)
+                
+                lead_time_std_key = "安全库存分析_lead_time_std"
+                if lead_time_std_key in st.session_state:
+                    st.number_input("📏 提前期标准差(天)", min_value=0.0, step=0.5, key=lead_time_std_key,
+                                    help="为0时只考虑需求波动")
+                else:
+                    st.number_input("📏 提前期标准差(天)", min_value=0.0, step=0.5, value=0.0, key=lead_time_std_key,
+                                    help="为0时只考虑需求波动")
+                
+                levels_key = "安全库存分析_service_levels"
+                if levels_key in st.session_state:
+                    service_levels = st.multiselect("🎯 服务水平", options=SAFETY_STOCK_CONFIG['service_levels'],
+                                                    format_func=lambda level: f"{level * 100:g}%", key=levels_key)
+                else:
+                    service_levels = st.multiselect("🎯 服务水平", options=SAFETY_STOCK_CONFIG['service_levels'],
+                                                    default=SAFETY_STOCK_CONFIG['default_service_levels'],
+                                                    format_func=lambda level: f"{level * 100:g}%", key=levels_key)
+            
+            with col2:
+                config_valid = bool(date_column and sku_column and service_levels) and date_column != sku_column
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择不同的日期列和SKU列，并至少选择一个服务水平")
+                else:
+                    st.success("✅ **安全库存配置完成**")
+                    st.info(f"🚚 **提前期**: {lead_time} 天")
+                    st.info(f"📆 **统计周期**: {period}")
+                    if cost_column != "无数据":
+                        st.info(f"💰 **单价列**: {cost_column}")
+                    st.caption(f"• 服务水平: {'/'.join(f'{level * 100:g}%' for level in sorted(service_levels))}")
+                    st.caption("• 安全库存 = z × √(L·σd² + μd²·σL²)")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 安全库存配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_throughput_simulation_config(columns):
+        """渲染吞吐仿真分析配置界面"""
+        try:
+            st.markdown("#### 🎲 吞吐仿真分析配置")
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📋 选择分析列:**")
+                
+                # 日期时间列：默认沿用时段峰值分析或出库分析已选择的列
+                datetime_key = "吞吐仿真分析_datetime_column"
+                if datetime_key in st.session_state:
+                    datetime_column = st.selectbox("📅 日期时间列", options=columns, key=datetime_key,
+                                                   help="选择包含时分信息的出库时间列")
+                else:
+                    outbound_date_column = (st.session_state.get("时段峰值分析_datetime_column")
+                                            or st.session_state.get("出库分析_date_column"))
+                    datetime_column = st.selectbox(
+                        "📅 日期时间列",
+                        options=columns,
+                        index=columns.index(outbound_date_column) if outbound_date_column in columns else 0,
+                        key=datetime_key,
+                        help="选择包含时分信息的出库时间列"
+                    )
+                
+                quantity_column = st.selectbox("🔢 件数列（可选）", options=["无数据"] + columns,
+                                               key="吞吐仿真分析_quantity_column", help="按件数测算时必选")
+                workload = st.radio("📦 作业量口径", options=["行数", "件数"], key="吞吐仿真分析_workload",
+                                    horizontal=True, help="行数按明细行计，件数按件数列求和")
+                
+                st.markdown("**⚙️ 工作站参数:**")
+                picks_key = "吞吐仿真分析_picks_per_hour"
+                if picks_key in st.session_state:
+                    picks_per_hour = st.number_input("🤲 单站每小时拣选次数", min_value=1, step=10, key=picks_key)
+                else:
+                    picks_per_hour = st.number_input("🤲 单站每小时拣选次数", min_value=1, step=10, key=picks_key,
+                                                     value=THROUGHPUT_SIMULATION_CONFIG['default_picks_per_hour'])
+                
+                hit_rate_key = "吞吐仿真分析_hit_rate"
+                if hit_rate_key in st.session_state:
+                    hit_rate = st.number_input("🎯 命中率", min_value=0.1, step=0.1, key=hit_rate_key,
+                                               help="每次拣选完成的行数/件数")
+                else:
+                    hit_rate = st.number_input("🎯 命中率", min_value=0.1, step=0.1, key=hit_rate_key,
+                                               value=THROUGHPUT_SIMULATION_CONFIG['default_hit_rate'],
+                                               help="每次拣选完成的行数/件数")
+                
+                backlog_key = "吞吐仿真分析_backlog_hours"
+                if backlog_key in st.session_state:
+                    st.number_input("⏳ 允许积压(小时)", min_value=0.0, step=0.5, key=backlog_key,
+                                    help="为0时按峰值小时配置；大于0时未完成作业可顺延，积压不超过该小时数的产能")
+                else:
+                    st.number_input("⏳ 允许积压(小时)", min_value=0.0, step=0.5, value=0.0, key=backlog_key,
+                                    help="为0时按峰值小时配置；大于0时未完成作业可顺延，积压不超过该小时数的产能")
+                
+                level_options = THROUGHPUT_SIMULATION_CONFIG['service_levels']
+                level_key = "吞吐仿真分析_service_level"
+                if level_key in st.session_state:
+                    service_level = st.selectbox("📈 目标服务水平", options=level_options, key=level_key,
+                                                 format_func=lambda level: f"{level * 100:g}%")
+                else:
+                    service_level = st.selectbox(
+                        "📈 目标服务水平",
+                        options=level_options,
+                        index=level_options.index(THROUGHPUT_SIMULATION_CONFIG['default_service_level']),
+                        key=level_key,
+                        format_func=lambda level: f"{level * 100:g}%"
+                    )
+                
+                replication_options = THROUGHPUT_SIMULATION_CONFIG['replication_options']
+                replications_key = "吞吐仿真分析_replications"
+                if replications_key in st.session_state:
+                    replications = st.selectbox("🔁 重复次数", options=replication_options, key=replications_key)
+                else:
+                    replications = st.selectbox(
+                        "🔁 重复次数",
+                        options=replication_options,
+                        index=replication_options.index(THROUGHPUT_SIMULATION_CONFIG['default_replications']),
+                        key=replications_key
+                    )
+            
+            with col2:
+                config_valid = bool(datetime_column) and (workload == "行数" or quantity_column != "无数据")
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择日期时间列；按件数测算时需选择件数列")
+                else:
+                    st.success("✅ **吞吐仿真配置完成**")
+                    st.info(f"📦 **单站能力**: {picks_per_hour * hit_rate:,.0f} {workload}/小时")
+                    st.info(f"📈 **服务水平**: {service_level * 100:g}%")
+                    st.caption(f"• {replications:,} 次重复 × {THROUGHPUT_SIMULATION_CONFIG['days_per_replication']} 个作业日")
+                    st.caption("• 日量与小时分布自助抽样 + 泊松波动")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 吞吐仿真配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_slotting_config(columns):
+        """渲染储位优化分析配置界面"""
+        try:
+            st.markdown("#### 🗺️ 储位优化分析配置")
+            
+            # 初始化储位网格默认值（如果不存在）
+            for name, value in SLOTTING_CONFIG['grid'].items():
+                if f"储位优化分析_{name}" not in st.session_state:
+                    st.session_state[f"储位优化分析_{name}"] = value
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📦 SKU尺寸与库存（当前工作表）:**")
+                
+                # 列选择默认沿用ABC分析、装箱分析已选择的列
+                selected = {}
+                for name, label, source_key in [
+                    ("sku_column", "🏷️ SKU列", "ABC分析_sku_column"),
+                    ("length_column", "📏 长度列", "装箱分析_length_column"),
+                    ("width_column", "📏 宽度列", "装箱分析_width_column"),
+                    ("height_column", "📏 高度列", "装箱分析_height_column")
+                ]:
+                    key = f"储位优化分析_{name}"
+                    if key in st.session_state:
+                        selected[name] = st.selectbox(label, options=columns, key=key)
+                    else:
+                        source_column = st.session_state.get(source_key)
+                        selected[name] = st.selectbox(
+                            label,
+                            options=columns,
+                            index=columns.index(source_column) if source_column in columns else 0,
+                            key=key
+                        )
+                
+                inventory_key = "储位优化分析_inventory_column"
+                inventory_options = ["无数据"] + columns
+                if inventory_key in st.session_state:
+                    st.selectbox("🔢 库存件数列（可选）", options=inventory_options, key=inventory_key,
+                                 help="不选择时按单件体积计算所需储位")
+                else:
+                    source_column = st.session_state.get("装箱分析_inventory_column")
+                    st.selectbox(
+                        "🔢 库存件数列（可选）",
+                        options=inventory_options,
+                        index=inventory_options.index(source_column) if source_column in columns else 0,
+                        key=inventory_key,
+                        help="不选择时按单件体积计算所需储位"
+                    )
+                
+                unit_key = "储位优化分析_data_unit"
+                unit_options = list(PACKING_CONFIG['unit_conversion'].keys())
+                if unit_key in st.session_state:
+                    st.selectbox("📐 尺寸单位", options=unit_options, key=unit_key)
+                else:
+                    source_unit = st.session_state.get("装箱分析_data_unit", "cm")
+                    st.selectbox("📐 尺寸单位", options=unit_options, key=unit_key,
+                                 index=unit_options.index(source_unit) if source_unit in unit_options else 0)
+                
+                st.selectbox("📍 当前储位列（可选）", options=["无数据"] + columns, key="储位优化分析_location_column",
+                             help="储位编码依次包含巷道、列、层编号（如 03-012-2），用于评估相对当前储位的节省")
+                
+                st.markdown("**📤 出库历史（拣选频次）:**")
+                sheet_name, sheet_columns = UIComponents.render_sheet_picker("储位优化分析", "出库")
+                if sheet_columns:
+                    sheet_sku_column = st.selectbox("🏷️ SKU列", options=sheet_columns, key="储位优化分析_sheet_sku_column",
+                                                    help="每个出库行计一次拣选")
+                else:
+                    sheet_sku_column = None
+                
+                st.markdown("**🏗️ 储位网格:**")
+                grid_col1, grid_col2, grid_col3 = st.columns(3)
+                with grid_col1:
+                    aisles = st.number_input("巷道数", min_value=1, step=1, key="储位优化分析_aisles")
+                    bay_width = st.number_input("列宽(m)", min_value=0.1, step=0.1, key="储位优化分析_bay_width")
+                    st.number_input("储位长(mm)", min_value=1, step=50, key="储位优化分析_location_length")
+                with grid_col2:
+                    bays = st.number_input("每侧列数", min_value=1, step=1, key="储位优化分析_bays")
+                    st.number_input("巷道中心距(m)", min_value=0.1, step=0.5, key="储位优化分析_aisle_pitch")
+                    st.number_input("储位宽(mm)", min_value=1, step=50, key="储位优化分析_location_width")
+                with grid_col3:
+                    levels = st.number_input("层数", min_value=1, step=1, key="储位优化分析_levels")
+                    st.number_input("每层折算距离(m)", min_value=0.0, step=0.1, key="储位优化分析_level_penalty")
+                    st.number_input("储位高(mm)", min_value=1, step=50, key="储位优化分析_location_height")
+            
+            with col2:
+                dimension_columns = [selected['length_column'], selected['width_column'], selected['height_column']]
+                config_valid = (all(selected.values()) and bool(sheet_sku_column)
+                                and selected['sku_column'] not in dimension_columns)
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择SKU列、长宽高列，以及出库表的SKU列")
+                else:
+                    location_count = aisles * SLOTTING_CONFIG['sides'] * bays * levels
+                    st.success("✅ **储位优化配置完成**")
+                    st.info(f"🏗️ **储位数**: {location_count:,}")
+                    st.info(f"📤 **出库表**: {sheet_name}")
+                    st.caption(f"• 列宽 {bay_width}m，巷道两侧均为储位")
+                    st.caption(f"• 储位可用容积 {SLOTTING_CONFIG['fill_rate']:.0%}")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 储位优化配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_pick_path_config(columns):
+        """渲染拣选路径分析配置界面"""
+        try:
+            st.markdown("#### 🚶 拣选路径分析配置")
+            
+            # 初始化储位网格默认值：优先沿用储位优化分析的网格
+            for name in ['aisles', 'bays', 'levels', 'bay_width', 'aisle_pitch']:
+                if f"拣选路径分析_{name}" not in st.session_state:
+                    st.session_state[f"拣选路径分析_{name}"] = st.session_state.get(
+                        f"储位优化分析_{name}", SLOTTING_CONFIG['grid'][name])
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📋 订单明细（当前工作表）:**")
+                
+                # 订单列和SKU列：默认沿用订单结构分析已选择的列
+                selected = {}
+                for name, label, source_key in [
+                    ("order_column", "📦 订单号列", "订单结构分析_order_column"),
+                    ("sku_column", "🏷️ SKU列", "订单结构分析_item_column")
+                ]:
+                    key = f"拣选路径分析_{name}"
+                    if key in st.session_state:
+                        selected[name] = st.selectbox(label, options=columns, key=key)
+                    else:
+                        source_column = st.session_state.get(source_key)
+                        selected[name] = st.selectbox(
+                            label,
+                            options=columns,
+                            index=columns.index(source_column) if source_column in columns else 0,
+                            key=key
+                        )
+                
+                st.markdown("**📍 SKU储位表:**")
+                sheet_name, sheet_columns = UIComponents.render_sheet_picker(
+                    "拣选路径分析", "储位", help_text="选择包含SKU和储位编码的工作表")
+                if sheet_columns:
+                    sheet_sku_column = st.selectbox("🏷️ SKU列", options=sheet_columns,
+                                                    key="拣选路径分析_sheet_sku_column")
+                    sheet_location_column = st.selectbox(
+                        "📍 储位编码列", options=sheet_columns, key="拣选路径分析_sheet_location_column",
+                        help="储位编码依次包含巷道、列、层编号（如 03-012-2）")
+                else:
+                    sheet_sku_column = sheet_location_column = None
+                
+                st.markdown("**🏗️ 巷道布局:**")
+                grid_col1, grid_col2, grid_col3 = st.columns(3)
+                with grid_col1:
+                    aisles = st.number_input("巷道数", min_value=1, step=1, key="拣选路径分析_aisles")
+                    st.number_input("列宽(m)", min_value=0.1, step=0.1, key="拣选路径分析_bay_width")
+                with grid_col2:
+                    bays = st.number_input("每侧列数", min_value=1, step=1, key="拣选路径分析_bays")
+                    st.number_input("巷道中心距(m)", min_value=0.1, step=0.5, key="拣选路径分析_aisle_pitch")
+                with grid_col3:
+                    st.number_input("层数", min_value=1, step=1, key="拣选路径分析_levels")
+                
+                batch_key = "拣选路径分析_batch_sizes"
+                if batch_key in st.session_state:
+                    batch_sizes = st.multiselect("🧺 每批订单数", options=PICK_PATH_CONFIG['batch_size_options'],
+                                                 key=batch_key, help="1为按单拣选；订单按出现顺序分批")
+                else:
+                    batch_sizes = st.multiselect("🧺 每批订单数", options=PICK_PATH_CONFIG['batch_size_options'],
+                                                 default=PICK_PATH_CONFIG['default_batch_sizes'],
+                                                 key=batch_key, help="1为按单拣选；订单按出现顺序分批")
+            
+            with col2:
+                config_valid = (bool(selected['order_column'] and selected['sku_column'] and sheet_sku_column
+                                     and sheet_location_column and batch_sizes)
+                                and selected['order_column'] != selected['sku_column']
+                                and sheet_sku_column != sheet_location_column)
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择订单列、SKU列、储位表的SKU列和储位编码列，并至少选择一个批次大小")
+                else:
+                    st.success("✅ **拣选路径配置完成**")
+                    st.info(f"📍 **储位表**: {sheet_name}")
+                    st.info(f"🏗️ **巷道**: {aisles} 条 × {bays} 列")
+                    st.caption(f"• 路线策略: {'、'.join(PICK_PATH_CONFIG['methods'].values())}")
+                    st.caption("• 对比当前储位与按频次重排")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 拣选路径配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_zone_split_config(columns):
+        """渲染分区拆单分析配置界面"""
+        try:
+            st.markdown("#### 🧩 分区拆单分析配置")
+            
+            # 初始化默认值：ABC阈值优先沿用ABC分析的设置
+            defaults = {
+                "use_abc": True,
+                "a_percentage": st.session_state.get("ABC分析_a_percentage", ABC_CONFIG['default_a_percentage']),
+                "b_percentage": st.session_state.get("ABC分析_b_percentage", ABC_CONFIG['default_b_percentage']),
+                "zone_columns": [],
+                "zone_counts": ZONE_SPLIT_CONFIG['default_zone_counts']
+            }
+            for name, value in defaults.items():
+                if f"分区拆单分析_{name}" not in st.session_state:
+                    st.session_state[f"分区拆单分析_{name}"] = value
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                # 订单列和SKU列：默认沿用订单结构分析已选择的列
+                selected = {}
+                for name, label, source_key in [
+                    ("order_column", "📦 订单号列", "订单结构分析_order_column"),
+                    ("sku_column", "🏷️ SKU列", "订单结构分析_item_column")
+                ]:
+                    key = f"分区拆单分析_{name}"
+                    if key in st.session_state:
+                        selected[name] = st.selectbox(label, options=columns, key=key)
+                    else:
+                        source_column = st.session_state.get(source_key)
+                        selected[name] = st.selectbox(
+                            label,
+                            options=columns,
+                            index=columns.index(source_column) if source_column in columns else 0,
+                            key=key
+                        )
+                
+                st.markdown("**🗂️ 分区方案:**")
+                use_abc = st.checkbox("按拣选行数ABC分区", key="分区拆单分析_use_abc",
+                                      help="按拣选行数累计占比把SKU分为A/B/C三区")
+                if use_abc:
+                    abc_col1, abc_col2 = st.columns(2)
+                    with abc_col1:
+                        st.number_input("A类累计百分比(%)", min_value=1, max_value=99, step=1,
+                                        key="分区拆单分析_a_percentage")
+                    with abc_col2:
+                        st.number_input("B类累计百分比(%)", min_value=1, max_value=99, step=1,
+                                        key="分区拆单分析_b_percentage")
+                
+                zone_options = [col for col in columns if col not in selected.values()]
+                zone_columns = st.multiselect(
+                    "🌡️ 分区字段", options=zone_options, key="分区拆单分析_zone_columns",
+                    help="如温区、品类、楼层等；同一SKU取第一个非空值，为空的SKU归入未分区")
+                zone_counts = st.multiselect(
+                    "⚖️ 按拣选行数均分的分区数", options=ZONE_SPLIT_CONFIG['zone_count_options'],
+                    key="分区拆单分析_zone_counts", help="按SKU编码顺序连续切分，各区拣选行数大致相等")
+            
+            with col2:
+                config_valid = (bool(selected['order_column'] and selected['sku_column'])
+                                and selected['order_column'] != selected['sku_column']
+                                and bool(use_abc or zone_columns or zone_counts))
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择不同的订单列和SKU列，并至少选择一种分区方案")
+                else:
+                    scheme_count = int(bool(use_abc)) + len(zone_columns) + len(zone_counts)
+                    st.success("✅ **分区拆单配置完成**")
+                    st.info(f"🗂️ **分区方案**: {scheme_count} 个")
+                    st.caption("• 统计订单涉及1、2、…个分区的占比")
+                    st.caption("• 估算需合流的子订单数")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 分区拆单配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_replenishment_config(columns):
+        """渲染补货频次分析配置界面"""
+        try:
+            st.markdown("#### 🚚 补货频次分析配置")
+            
+            # 初始化默认值（如果不存在）
+            defaults = {
+                "refills_per_face": REPLENISHMENT_CONFIG['default_refills_per_face'],
+                "peak_percentile": REPLENISHMENT_CONFIG['default_peak_percentile']
+            }
+            for name, value in defaults.items():
+                if f"补货频次分析_{name}" not in st.session_state:
+                    st.session_state[f"补货频次分析_{name}"] = value
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📦 SKU尺寸与拣选位容量（当前工作表）:**")
+                
+                # 列选择默认沿用储位优化分析、装箱分析已选择的列
+                selected = {}
+                for name, label, source_key in [
+                    ("sku_column", "🏷️ SKU列", "储位优化分析_sku_column"),
+                    ("length_column", "📏 长度列", "装箱分析_length_column"),
+                    ("width_column", "📏 宽度列", "装箱分析_width_column"),
+                    ("height_column", "📏 高度列", "装箱分析_height_column")
+                ]:
+                    key = f"补货频次分析_{name}"
+                    if key in st.session_state:
+                        selected[name] = st.selectbox(label, options=columns, key=key)
+                    else:
+                        source_column = st.session_state.get(source_key)
+                        selected[name] = st.selectbox(
+                            label,
+                            options=columns,
+                            index=columns.index(source_column) if source_column in columns else 0,
+                            key=key
+                        )
+                
+                optional_options = ["无数据"] + columns
+                unit_options = list(PACKING_CONFIG['unit_conversion'].keys())
+                weight_unit_options = list(PACKING_CONFIG['weight_conversion'].keys())
+                option_col1, option_col2 = st.columns(2)
+                with option_col1:
+                    weight_key = "补货频次分析_weight_column"
+                    if weight_key in st.session_state:
+                        st.selectbox("⚖️ 单件重量列（可选）", options=optional_options, key=weight_key)
+                    else:
+                        source_column = st.session_state.get("装箱分析_weight_column")
+                        st.selectbox("⚖️ 单件重量列（可选）", options=optional_options, key=weight_key,
+                                     index=optional_options.index(source_column) if source_column in columns else 0)
+                    st.selectbox("🔢 储位容量列（可选）", options=optional_options, key="补货频次分析_capacity_column",
+                                 help="每个拣选位可存放的件数；有值时优先于按容器计算的最大装箱数")
+                with option_col2:
+                    unit_key = "补货频次分析_data_unit"
+                    if unit_key in st.session_state:
+                        st.selectbox("📐 尺寸单位", options=unit_options, key=unit_key)
+                    else:
+                        source_unit = st.session_state.get("装箱分析_data_unit", "cm")
+                        st.selectbox("📐 尺寸单位", options=unit_options, key=unit_key,
+                                     index=unit_options.index(source_unit) if source_unit in unit_options else 0)
+                    weight_unit_key = "补货频次分析_weight_unit"
+                    if weight_unit_key in st.session_state:
+                        st.selectbox("⚖️ 重量单位", options=weight_unit_options, key=weight_unit_key)
+                    else:
+                        source_unit = st.session_state.get("装箱分析_weight_unit", "kg")
+                        st.selectbox("⚖️ 重量单位", options=weight_unit_options, key=weight_unit_key,
+                                     index=weight_unit_options.index(source_unit) if source_unit in weight_unit_options else 0)
+                
+                st.markdown("**📤 出库历史:**")
+                sheet_name, sheet_columns = UIComponents.render_sheet_picker("补货频次分析", "出库")
+                if sheet_columns:
+                    sheet_date_column = st.selectbox("📅 出库日期列", options=sheet_columns,
+                                                     key="补货频次分析_sheet_date_column")
+                    sheet_sku_column = st.selectbox("🏷️ SKU列", options=sheet_columns,
+                                                    key="补货频次分析_sheet_sku_column")
+                    st.selectbox("🔢 出库件数列（可选）", options=["无数据"] + sheet_columns,
+                                 key="补货频次分析_sheet_quantity_column", help="不选择时每个出库行计1件")
+                else:
+                    sheet_date_column = sheet_sku_column = None
+                
+                st.markdown("**⚙️ 补货参数:**")
+                param_col1, param_col2 = st.columns(2)
+                with param_col1:
+                    refills_per_face = st.number_input(
+                        "每个拣选位每日最多补货次数", min_value=1, max_value=20, step=1,
+                        key="补货频次分析_refills_per_face", help="单日出库超过 容量×次数 的SKU需要多个拣选位")
+                with param_col2:
+                    peak_percentile = st.number_input(
+                        "峰值日分位数(%)", min_value=50, max_value=100, step=1,
+                        key="补货频次分析_peak_percentile", help="日出库件数不低于该分位数的日期视为峰值日")
+            
+            with col2:
+                dimension_columns = [selected['length_column'], selected['width_column'], selected['height_column']]
+                config_valid = (all(selected.values()) and bool(sheet_date_column and sheet_sku_column)
+                                and selected['sku_column'] not in dimension_columns
+                                and sheet_date_column != sheet_sku_column)
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择SKU列、长宽高列，以及出库表的日期列和SKU列")
+                else:
+                    st.success("✅ **补货频次配置完成**")
+                    st.info(f"📦 **拣选容器**: {st.session_state.get('container_length', 600)}×"
+                            f"{st.session_state.get('container_width', 400)}×"
+                            f"{st.session_state.get('container_height', 300)} mm")
+                    st.info(f"📤 **出库表**: {sheet_name}")
+                    st.caption(f"• 每个拣选位每日最多补货 {refills_per_face} 次")
+                    st.caption(f"• 峰值日: 日出库件数 ≥ P{peak_percentile}")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 补货频次配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_storage_requirement_config(columns):
+        """渲染存储需求分析配置界面"""
+        try:
+            st.markdown("#### 🏬 存储需求分析配置")
+            
+            # 初始化默认值：ABC阈值沿用ABC分析，隔口沿用容器选择，储位尺寸沿用储位优化分析
+            selected_dividers = st.session_state.get("selected_dividers", []) if st.session_state.get("use_dividers") == "是" else []
+            defaults = {
+                "a_percentage": st.session_state.get("ABC分析_a_percentage", ABC_CONFIG['default_a_percentage']),
+                "b_percentage": st.session_state.get("ABC分析_b_percentage", ABC_CONFIG['default_b_percentage']),
+                "divider_counts": [int(count) for count in selected_dividers
+                                   if int(count) in STORAGE_REQUIREMENT_CONFIG['divider_options']]
+            }
+            for name in ['location_length', 'location_width', 'location_height']:
+                defaults[name] = st.session_state.get(f"储位优化分析_{name}", SLOTTING_CONFIG['grid'][name])
+            for name, value in defaults.items():
+                if f"存储需求分析_{name}" not in st.session_state:
+                    st.session_state[f"存储需求分析_{name}"] = value
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**📦 SKU数据（当前工作表）:**")
+                
+                # 列选择默认沿用ABC分析、装箱分析已选择的列
+                selected = {}
+                for name, label, source_key in [
+                    ("sku_column", "🏷️ SKU列", "ABC分析_sku_column"),
+                    ("quantity_column", "🔢 ABC分类数量列", "ABC分析_quantity_column"),
+                    ("length_column", "📏 长度列", "装箱分析_length_column"),
+                    ("width_column", "📏 宽度列", "装箱分析_width_column"),
+                    ("height_column", "📏 高度列", "装箱分析_height_column"),
+                    ("inventory_column", "📦 库存件数列", "装箱分析_inventory_column")
+                ]:
+                    key = f"存储需求分析_{name}"
+                    if key in st.session_state:
+                        selected[name] = st.selectbox(label, options=columns, key=key)
+                    else:
+                        source_column = st.session_state.get(source_key)
+                        selected[name] = st.selectbox(
+                            label,
+                            options=columns,
+                            index=columns.index(source_column) if source_column in columns else 0,
+                            key=key
+                        )
+                
+                weight_options = ["无数据"] + columns
+                unit_options = list(PACKING_CONFIG['unit_conversion'].keys())
+                weight_unit_options = list(PACKING_CONFIG['weight_conversion'].keys())
+                option_col1, option_col2, option_col3 = st.columns(3)
+                with option_col1:
+                    weight_key = "存储需求分析_weight_column"
+                    if weight_key in st.session_state:
+                        st.selectbox("⚖️ 单件重量列（可选）", options=weight_options, key=weight_key)
+                    else:
+                        source_column = st.session_state.get("装箱分析_weight_column")
+                        st.selectbox("⚖️ 单件重量列（可选）", options=weight_options, key=weight_key,
+                                     index=weight_options.index(source_column) if source_column in columns else 0)
+                with option_col2:
+                    unit_key = "存储需求分析_data_unit"
+                    if unit_key in st.session_state:
+                        st.selectbox("📐 尺寸单位", options=unit_options, key=unit_key)
+                    else:
+                        source_unit = st.session_state.get("装箱分析_data_unit", "cm")
+                        st.selectbox("📐 尺寸单位", options=unit_options, key=unit_key,
+                                     index=unit_options.index(source_unit) if source_unit in unit_options else 0)
+                with option_col3:
+                    weight_unit_key = "存储需求分析_weight_unit"
+                    if weight_unit_key in st.session_state:
+                        st.selectbox("⚖️ 重量单位", options=weight_unit_options, key=weight_unit_key)
+                    else:
+                        source_unit = st.session_state.get("装箱分析_weight_unit", "kg")
+                        st.selectbox("⚖️ 重量单位", options=weight_unit_options, key=weight_unit_key,
+                                     index=weight_unit_options.index(source_unit) if source_unit in weight_unit_options else 0)
+                
+                st.markdown("**🎯 ABC分类阈值:**")
+                abc_col1, abc_col2 = st.columns(2)
+                with abc_col1:
+                    a_percentage = st.number_input("A类累计百分比(%)", min_value=1, max_value=99, step=1,
+                                                   key="存储需求分析_a_percentage")
+                with abc_col2:
+                    b_percentage = st.number_input("B类累计百分比(%)", min_value=1, max_value=99, step=1,
+                                                   key="存储需求分析_b_percentage")
+                
+                st.markdown("**🗄️ 存储策略与储位:**")
+                divider_counts = st.multiselect(
+                    "隔口专用策略（每个SKU独占隔口）", options=STORAGE_REQUIREMENT_CONFIG['divider_options'],
+                    format_func=lambda count: CONTAINER_DIVIDERS[str(count)]["description"],
+                    key="存储需求分析_divider_counts", help="专用容器和共享容器策略始终参与对比")
+                location_col1, location_col2, location_col3 = st.columns(3)
+                with location_col1:
+                    st.number_input("储位长(mm)", min_value=1, step=50, key="存储需求分析_location_length")
+                with location_col2:
+                    st.number_input("储位宽(mm)", min_value=1, step=50, key="存储需求分析_location_width")
+                with location_col3:
+                    st.number_input("储位高(mm)", min_value=1, step=50, key="存储需求分析_location_height")
+            
+            with col2:
+                dimension_columns = [selected['length_column'], selected['width_column'], selected['height_column']]
+                other_columns = [value for name, value in selected.items() if name != 'sku_column']
+                config_valid = (all(selected.values()) and selected['sku_column'] not in other_columns
+                                and len(set(dimension_columns)) == 3 and a_percentage + b_percentage < 100)
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择SKU列、数量列、互不相同的长宽高列和库存列，且A、B类百分比之和小于100%")
+                else:
+                    st.success("✅ **存储需求配置完成**")
+                    st.info(f"📦 **容器**: {st.session_state.get('container_length', 600)}×"
+                            f"{st.session_state.get('container_width', 400)}×"
+                            f"{st.session_state.get('container_height', 300)} mm")
+                    st.info(f"🗄️ **存储策略**: {2 + len(divider_counts)} 种")
+                    st.caption(f"• ABC阈值 A {a_percentage}% / B {b_percentage}%")
+                    st.caption(f"• 共享容器容积利用率 {STORAGE_REQUIREMENT_CONFIG['shared_fill_rate']:.0%}")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 存储需求配置错误: {str(e)}")
+            return False
+
+    @staticmethod
+    def render_order_cluster_config(columns):
+        """渲染订单聚类分析配置界面"""
+        try:
+            st.markdown("#### 🧬 订单聚类分析配置")
+            
+            # 初始化默认值：ABC阈值优先沿用ABC分析的设置
+            defaults = {
+                "n_clusters": ORDER_CLUSTER_CONFIG['default_clusters'],
+                "a_percentage": st.session_state.get("ABC分析_a_percentage", ABC_CONFIG['default_a_percentage']),
+                "b_percentage": st.session_state.get("ABC分析_b_percentage", ABC_CONFIG['default_b_percentage'])
+            }
+            for name, value in defaults.items():
+                if f"订单聚类分析_{name}" not in st.session_state:
+                    st.session_state[f"订单聚类分析_{name}"] = value
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                # 订单列和SKU列：默认沿用订单结构分析已选择的列
+                selected = {}
+                for name, label, source_key in [
+                    ("order_column", "📦 订单号列", "订单结构分析_order_column"),
+                    ("sku_column", "🏷️ SKU列", "订单结构分析_item_column")
+                ]:
+                    key = f"订单聚类分析_{name}"
+                    if key in st.session_state:
+                        selected[name] = st.selectbox(label, options=columns, key=key)
+                    else:
+                        source_column = st.session_state.get(source_key)
+                        selected[name] = st.selectbox(
+                            label,
+                            options=columns,
+                            index=columns.index(source_column) if source_column in columns else 0,
+                            key=key
+                        )
+                
+                optional_options = ["无数据"] + columns
+                option_col1, option_col2 = st.columns(2)
+                with option_col1:
+                    st.selectbox("🔢 件数列（可选）", options=optional_options, key="订单聚类分析_quantity_column",
+                                 help="不选择时每个拣选行计1件")
+                with option_col2:
+                    st.selectbox("📅 日期列（可选）", options=optional_options, key="订单聚类分析_date_column",
+                                 help="订单日期取订单首行，用于统计每日聚类构成")
+                
+                st.markdown("**📐 单件尺寸与重量（可选，用于订单体积和重量特征）:**")
+                unit_options = list(PACKING_CONFIG['unit_conversion'].keys())
+                weight_unit_options = list(PACKING_CONFIG['weight_conversion'].keys())
+                size_col1, size_col2, size_col3 = st.columns(3)
+                with size_col1:
+                    st.selectbox("📏 长度列", options=optional_options, key="订单聚类分析_length_column")
+                    st.selectbox("⚖️ 单件重量列", options=optional_options, key="订单聚类分析_weight_column")
+                with size_col2:
+                    st.selectbox("📏 宽度列", options=optional_options, key="订单聚类分析_width_column")
+                    st.selectbox("📐 尺寸单位", options=unit_options, key="订单聚类分析_data_unit")
+                with size_col3:
+                    st.selectbox("📏 高度列", options=optional_options, key="订单聚类分析_height_column")
+                    st.selectbox("⚖️ 重量单位", options=weight_unit_options, key="订单聚类分析_weight_unit")
+                
+                st.markdown("**⚙️ 聚类参数:**")
+                param_col1, param_col2, param_col3 = st.columns(3)
+                with param_col1:
+                    n_clusters = st.number_input("聚类数", min_value=2, max_value=ORDER_CLUSTER_CONFIG['max_clusters'],
+                                                 step=1, key="订单聚类分析_n_clusters")
+                with param_col2:
+                    a_percentage = st.number_input("A类累计百分比(%)", min_value=1, max_value=99, step=1,
+                                                   key="订单聚类分析_a_percentage", help="SKU按出库件数分类")
+                with param_col3:
+                    b_percentage = st.number_input("B类累计百分比(%)", min_value=1, max_value=99, step=1,
+                                                   key="订单聚类分析_b_percentage")
+            
+            with col2:
+                dimension_columns = [st.session_state.get(f"订单聚类分析_{name}_column")
+                                     for name in ['length', 'width', 'height']]
+                use_volume = "无数据" not in dimension_columns
+                config_valid = (bool(selected['order_column'] and selected['sku_column'])
+                                and selected['order_column'] != selected['sku_column']
+                                and a_percentage + b_percentage < 100)
+                
+                if not config_valid:
+                    st.warning("⚠️ **配置不完整**\n\n请选择不同的订单列和SKU列，且A类与B类百分比之和小于100")
+                else:
+                    st.success("✅ **订单聚类配置完成**")
+                    st.info(f"🧬 **聚类数**: {n_clusters}")
+                    st.caption("• 特征: 行数、件数、ABC构成" + ("、体积" if use_volume else "")
+                               + ("、重量" if st.session_state.get("订单聚类分析_weight_column") != "无数据" else ""))
+                    st.caption("• 小批量k-means，适用于百万级订单")
+            
+            return config_valid
+            
+        except Exception as e:
+            st.error(f"❌ 订单聚类配置错误: {str(e)}")
+            return False
+
     @staticmethod
     def render_data_cleaning_config(columns):
         """渲染高级异常数据清理配置界面"""
@@ -101,14 +101,98 @@ ANALYSIS_DIMENSIONS = {
         "icon": "📥",
         "method": "inbound_analysis", 
         "config_type": "inbound_analysis"
+    },
+    "时段峰值分析": {
+        "description": "分析小时/15分钟级时段分布、星期×小时热力图和峰值小时订单数、行数、件数",
+        "icon": "⏰",
+        "method": "intraday_peak_analysis",
+        "config_type": "intraday_analysis"
+    },
+    "需求预测": {
+        "description": "按SKU批量拟合指数平滑、季节性指数平滑和季节性朴素模型，输出未来需求预测与误差指标",
+        "icon": "🔮",
+        "method": "demand_forecast",
+        "config_type": "demand_forecast"
+    },
+    "季节性分析": {
+        "description": "分解日量序列的趋势、周季节性、年季节性和残差，支持按SKU或品类批量分解",
+        "icon": "🌊",
+        "method": "seasonality_analysis",
+        "config_type": "seasonality_analysis"
+    },
+    "出入库对账分析": {
+        "description": "合并入库表和出库表，按SKU推算每日在库量，识别缺货天和积压天",
+        "icon": "🔄",
+        "method": "stock_reconciliation",
+        "config_type": "stock_reconciliation"
+    },
+    "库龄分析": {
+        "description": "按先进先出将出库匹配到入库批次，统计在库时长分布和剩余库存库龄结构",
+        "icon": "⏳",
+        "method": "inventory_aging",
+        "config_type": "inventory_aging"
+    },
+    "库存周转分析": {
+        "description": "库存快照关联出库历史，计算30/90/365天周转次数、可供天数和覆盖分类",
+        "icon": "🔁",
+        "method": "inventory_turnover",
+        "config_type": "inventory_turnover"
+    },
+    "安全库存分析": {
+        "description": "按出库历史的需求波动批量计算多个服务水平下的安全库存、再订货点和投入曲线",
+        "icon": "🛡️",
+        "method": "safety_stock",
+        "config_type": "safety_stock"
+    },
+    "吞吐仿真分析": {
+        "description": "自助抽样出库日量和小时分布进行蒙特卡洛仿真，估算达到目标服务水平所需的工作站数",
+        "icon": "🎲",
+        "method": "throughput_simulation",
+        "config_type": "throughput_simulation"
+    },
+    "储位优化分析": {
+        "description": "按COI（体积/拣选频次）排序，依行走距离为SKU分配储位网格，评估相对随机或当前储位的行走节省",
+        "icon": "🗺️",
+        "method": "slotting",
+        "config_type": "slotting"
+    },
+    "拣选路径分析": {
+        "description": "按S型和最大间隙策略估算订单/批次的拣选行走距离，对比储位方案与批次大小",
+        "icon": "🚶",
+        "method": "pick_path",
+        "config_type": "pick_path"
+    },
+    "分区拆单分析": {
+        "description": "评估ABC、温区等分区方案下订单涉及的分区数分布和合流工作量",
+        "icon": "🧩",
+        "method": "zone_split",
+        "config_type": "zone_split"
+    },
+    "补货频次分析": {
+        "description": "结合拣选位容量和每日出库件数，估算SKU补货次数、峰值日分布和所需拣选位数",
+        "icon": "🚚",
+        "method": "replenishment",
+        "config_type": "replenishment"
+    },
+    "存储需求分析": {
+        "description": "结合ABC分类和装箱结果，按ABC类别对比专用、共享、隔口容器策略所需的容器数、容积和储位数",
+        "icon": "🏬",
+        "method": "storage_requirement",
+        "config_type": "storage_requirement"
+    },
+    "订单聚类分析": {
+        "description": "按订单行数、件数、体积、重量和ABC构成对订单聚类，输出各类订单画像和每日构成，指导履约流程设计",
+        "icon": "🧬",
+        "method": "order_cluster",
+        "config_type": "order_cluster"
     }
 }
 
 # 分析类型对应的维度
 ANALYSIS_TYPE_DIMENSIONS = {
-    "inventory": ["ABC分析", "装箱分析"],
-    "inbound": ["入库分析", "ABC分析", "订单结构分析"],
-    "outbound": ["出库分析", "ABC分析", "订单结构分析"]
+    "inventory": ["ABC分析", "装箱分析", "库龄分析", "库存周转分析", "安全库存分析", "储位优化分析", "补货频次分析", "存储需求分析"],
+    "inbound": ["入库分析", "ABC分析", "订单结构分析", "时段峰值分析", "季节性分析", "出入库对账分析"],
+    "outbound": ["出库分析", "ABC分析", "订单结构分析", "时段峰值分析", "需求预测", "季节性分析", "出入库对账分析", "安全库存分析", "吞吐仿真分析", "拣选路径分析", "分区拆单分析", "订单聚类分析"]
 }
 
 # 前置处理维度
@@ -222,4 +306,230 @@ EIQ_CONFIG = {
     "frequency_bins": [0, 1, 5, 20, float('inf')],  # 频率分箱
     "frequency_labels": ["低频", "中低频", "中高频", "高频"],
     "preview_rows": 20  # 结果预览行数
-} 
\ No newline at end of file
+}
+
+# 去重计数配置（订单数/天、SKU数/天）
+DISTINCT_COUNT_CONFIG = {
+    "modes": {
+        "exact": "精确去重",
+        "approximate": "近似去重(HyperLogLog)"
+    },
+    "default_mode": "exact",
+    "default_precision": 14,  # 寄存器位数p，相对误差约1.04/sqrt(2^p)
+    "min_precision": 10,
+    "max_precision": 16
+}
+
+# 日聚合缓存配置
+CUBE_CACHE_CONFIG = {
+    "enabled": True,
+    "cache_dir": "data/cube_cache",  # 磁盘缓存目录（npz格式）
+    "memory_entries": 8,  # 内存中保留的缓存条目数
+    "disk_entries": 64  # 磁盘上保留的缓存文件数，超过时删除最久未使用的文件
+}
+
+# Excel流式加载配置
+EXCEL_LOADER_CONFIG = {
+    "chunk_rows": 20000,  # 每块读取的行数（每块回报一次进度）
+    "na_values": ['', 'NULL', 'null', 'N/A', 'n/a', '#N/A', 'nan'],  # 视为缺失值的字符串（另外合并pandas默认缺失值集合）
+    "read_progress_share": 0.9  # 进度条中读取单元格所占的比例，其余为构建数据列
+}
+
+# 时段峰值分析配置
+INTRADAY_CONFIG = {
+    "slot_options": {
+        60: "按小时",
+        30: "30分钟",
+        15: "15分钟"
+    },
+    "default_slot_minutes": 60,
+    "peak_percentile": 95,  # 峰值小时设计分位数
+    "weekday_labels": ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
+}
+
+# 容量规划配置（基于出入库日聚合表）
+CAPACITY_PLANNING_CONFIG = {
+    "metrics": {  # 日聚合列 -> 显示名称
+        "订单数/天": "订单数",
+        "SKU数/天": "行数",
+        "件数/天": "件数"
+    },
+    "percentiles": [50, 80, 95, 99],  # 设计日分位数
+    "joint_percentile": 95,  # 联合设计日分位数（取真实日期，保留当日比例关系）
+    "growth_rates": [0, 5, 10, 15, 20, 30, 40, 50, 75, 100],  # 业务增长率(%)
+    "peak_factors": [1.0, 1.1, 1.2, 1.3, 1.5]  # 峰值系数（大促等）
+}
+
+# 需求预测配置
+DEMAND_FORECAST_CONFIG = {
+    "horizon_options": [7, 14, 28],  # 预测天数选项
+    "default_horizon": 14,
+    "holdout_days": 14,  # 留出评估天数（不超过历史天数的1/3）
+    "season_length": 7,  # 季节周期（按周）
+    "ses_alphas": [0.05, 0.1, 0.2, 0.3, 0.5, 0.8],  # 简单指数平滑α候选
+    "seasonal_alphas": [0.1, 0.3, 0.5],  # 季节性指数平滑α候选
+    "seasonal_gammas": [0.05, 0.2],  # 季节性指数平滑γ候选
+    "models": {
+        "ses": "简单指数平滑",
+        "seasonal_es": "季节性指数平滑",
+        "seasonal_naive": "季节性朴素"
+    },
+    "sku_block_size": 8192,  # 按SKU分块递推，块内状态可放入CPU缓存
+    "preview_skus": 100  # 页面展示的SKU数
+}
+
+# 季节性分解配置
+SEASONALITY_CONFIG = {
+    "weekday_labels": ["周一", "周二", "周三", "周四", "周五", "周六", "周日"],
+    "month_labels": ["1月", "2月", "3月", "4月", "5月", "6月", "7月", "8月", "9月", "10月", "11月", "12月"],
+    "min_weekly_days": 21,  # 周季节性分解所需最少天数（3个完整周期）
+    "min_yearly_months": 24,  # 年季节性分解所需最少月数
+    "strength_threshold": 0.4,  # 季节强度达到该值视为显著
+    "trend_threshold_pct": 5.0,  # 趋势变化（%/30天）达到该值视为明显趋势
+    "preview_series": 100  # 页面展示的序列数
+}
+
+# 图表渲染配置
+CHART_CONFIG = {
+    "max_points": 2000,  # 每条曲线最多绘制的点数，超过时降采样
+    "webgl_threshold": 1000,  # 超过该点数时使用WebGL(Scattergl)渲染
+    "downsample_method": "lttb"  # 降采样方法：lttb（最大三角形三桶）或 minmax（每桶保留最大最小值）
+}
+
+# 出入库对账配置
+RECONCILIATION_CONFIG = {
+    "excess_cover_days": 60,  # 在库量超过该天数的日均出库量视为积压
+    "preview_skus": 100  # 页面展示的SKU数
+}
+
+# 库龄分析配置
+INVENTORY_AGING_CONFIG = {
+    "age_buckets": [30, 90],  # 库龄分段上限（天）：0-30、31-90、90天以上
+    "dwell_percentiles": [50, 90, 95],  # 在库时长分位数
+    "quantity_tolerance": 1e-9,  # 相对SKU数量级的容差，小于该长度的匹配片段视为累计和舍入误差
+    "preview_skus": 100  # 页面展示的SKU数
+}
+
+# 库存周转分析配置
+TURNOVER_CONFIG = {
+    "windows": [30, 90, 365],  # 滚动窗口（天），截至出库历史最后一天
+    "primary_window": 90,  # 可供天数和覆盖分类使用的窗口
+    "coverage_days": [7, 30, 90],  # 可供天数分界
+    "coverage_labels": ["不足(≤7天)", "合理(8-30天)", "偏高(31-90天)", "积压(>90天)"],
+    "preview_skus": 100  # 页面展示的SKU数
+}
+
+# 安全库存配置
+SAFETY_STOCK_CONFIG = {
+    "service_levels": [0.80, 0.85, 0.90, 0.95, 0.97, 0.98, 0.99, 0.995, 0.999],  # 可选服务水平
+    "default_service_levels": [0.90, 0.95, 0.98, 0.99, 0.995],
+    "period_options": {"日": 1, "周": 7},  # 需求统计周期
+    "default_lead_time_days": 7,
+    "curve_range": [0.80, 0.999],  # 投入曲线的服务水平范围
+    "curve_points": 60,
+    "cell_block_size": 1 << 24,  # 按SKU分块计算(SKU, 周期)合计时每块的单元格数
+    "preview_skus": 100  # 页面展示的SKU数
+}
+
+# 吞吐仿真配置（工作站数量测算）
+THROUGHPUT_SIMULATION_CONFIG = {
+    "default_picks_per_hour": 300,  # 单站每小时拣选次数
+    "default_hit_rate": 1.0,  # 每次拣选完成的行数/件数
+    "service_levels": [0.90, 0.95, 0.98, 0.99],  # 目标服务水平（满足当日需求的天数占比）
+    "default_service_level": 0.95,
+    "replication_options": [1000, 5000, 10000],
+    "default_replications": 10000,
+    "days_per_replication": 250,  # 每次重复仿真的作业天数（约一年）
+    "chunk_replications": 250,  # 每个进程任务的重复次数（结果与进程数无关）
+    "max_workers": None,  # 进程数，None为CPU核数
+    "confidence": 90,  # 跨重复的工作站数分位数
+    "seed": 20240601
+}
+
+# 储位优化配置（COI储位分配）
+SLOTTING_CONFIG = {
+    "grid": {  # 储位网格默认参数
+        "aisles": 20,  # 巷道数
+        "bays": 50,  # 每侧列数
+        "levels": 5,  # 层数
+        "bay_width": 1.2,  # 列宽(m)
+        "aisle_pitch": 3.0,  # 相邻巷道中心距(m)
+        "level_penalty": 0.5,  # 每升高一层折算的行走距离(m)
+        "location_length": 1000,  # 储位长(mm)
+        "location_width": 600,  # 储位宽(mm)
+        "location_height": 400  # 储位高(mm)
+    },
+    "sides": 2,  # 每条巷道两侧均为储位
+    "fill_rate": 0.85,  # 储位可用容积比例
+    "distance_bands": 5,  # 按行走距离分段汇总
+    "preview_skus": 100
+}
+
+# 拣选路径配置（矩形巷道布局，S型与最大间隙策略）
+PICK_PATH_CONFIG = {
+    "batch_size_options": [1, 5, 10, 20, 50, 100],  # 每批订单数
+    "default_batch_sizes": [1, 10, 20],
+    "methods": {
+        "s_shape": "S型",
+        "largest_gap": "最大间隙"
+    },
+    "preview_batches": 100
+}
+
+# 分区拆单配置（多分区拣选的拆单率与合流工作量）
+ZONE_SPLIT_CONFIG = {
+    "zone_count_options": [2, 3, 4, 5, 6, 8, 10, 12],  # 按拣选行数均分的分区数
+    "default_zone_counts": [2, 3, 4, 6],
+    "unassigned_label": "未分区",  # 分区字段为空的SKU
+    "max_chart_zones": 5  # 图中涉及分区数达到该值的订单合并显示
+}
+
+# 补货频次配置（拣选位容量 × 每日出库件数）
+REPLENISHMENT_CONFIG = {
+    "default_refills_per_face": 2,  # 每个拣选位每日最多补货次数
+    "default_peak_percentile": 95,  # 峰值日的日出库件数分位数(%)
+    "max_trip_bucket": 10,  # 峰值日分布中补货次数达到该值的合并显示
+    "preview_skus": 100
+}
+
+# 存储需求配置（ABC × 装箱，按存储策略汇总）
+STORAGE_REQUIREMENT_CONFIG = {
+    "shared_fill_rate": 0.85,  # 共享容器混放时可达到的容积利用率
+    "divider_options": [2, 4, 8],  # 隔口专用策略可选的隔口数
+    "preview_skus": 100
+}
+
+# 订单聚类配置（订单画像 + 小批量k-means）
+ORDER_CLUSTER_CONFIG = {
+    "default_clusters": 5,
+    "max_clusters": 12,
+    "batch_size": 4096,  # 每次迭代的小批量订单数
+    "max_iterations": 300,
+    "tolerance": 1e-5,  # 中心平均移动距离平方低于该值时停止迭代
+    "init_sample": 20000,  # k-means++ 初始化的抽样订单数
+    "assign_chunk": 200000,  # 最终分配时每块的订单数
+    "seed": 20240601,
+    "preview_orders": 100
+}
+
+# 供应商表现配置（入库分析）
+SUPPLIER_CONFIG = {
+    "default_on_time_days": 7,  # 交期不超过该天数视为准时（参考日期为ASN预计到货日时填允许延迟天数）
+    "min_deliveries": 3,  # 参与综合排名的最少交货次数
+    "score_weights": {"准时交货率": 0.5, "平均交期": 0.3, "交期稳定性": 0.2},
+    "lead_percentiles": [50, 90],
+    "max_chart_suppliers": 300,
+    "preview_suppliers": 200
+}
+
+# 客户需求配置（出库分析）
+CUSTOMER_DEMAND_CONFIG = {
+    "modes": {"exact": "精确（全部客户）", "approximate": "近似Top-N（每天前K合并）"},
+    "default_top_n": 100,
+    "counter_factor": 10,  # 近似模式每天保留件数前 Top-N × 该倍数 个客户
+    "default_a_percentage": 70,
+    "default_b_percentage": 20,
+    "top_shares": [1, 5, 10, 20],  # 头部客户占比(%)
+    "curve_points": 500,  # 集中度曲线抽稀后的点数
+    "preview_customers": 200
+}
@@ -9,4 +9,28 @@ from .abc_analysis import ABCAnalyzer
 from .eiq_analysis import EIQAnalyzer
 from .data_cleaning import DataCleaning
 from .outbound_analysis import OutboundAnalyzer
-from .inbound_analysis import InboundAnalyzer
\ No newline at end of file
+from .inbound_analysis import InboundAnalyzer
+from .time_series_kernel import TimeSeriesKernel
+from .daily_cube import DailyCube
+from .intraday_analysis import IntradayAnalyzer
+from .hyperloglog import HyperLogLog
+from .frame_cache import FrameCache
+from .date_index import SortedDateIndex
+from .robust_statistics import RobustStatistics
+from .capacity_planning import CapacityPlanner
+from .demand_forecast import DemandForecaster
+from .seasonality import SeasonalDecomposer
+from .stock_reconciliation import StockReconciler
+from .inventory_aging import InventoryAgingAnalyzer
+from .inventory_turnover import TurnoverAnalyzer
+from .safety_stock import SafetyStockCalculator
+from .throughput_simulation import ThroughputSimulator
+from .slotting import SlottingOptimizer
+from .pick_path import PickPathEstimator
+from .zone_split import ZoneSplitAnalyzer
+from .replenishment import ReplenishmentAnalyzer
+from .key_index import KeyIndex
+from .storage_requirement import StorageRequirementAnalyzer
+from .order_clustering import OrderClusterAnalyzer
+from .supplier_performance import SupplierPerformanceAnalyzer
+from .customer_demand import CustomerDemandAnalyzer, CustomerDemandCube
@@ -128,9 +128,30 @@ class ABCAnalyzer:
         
         # 重新排列列顺序，便于展示
         result_df = result_df[['排名', 'SKU', '出库数量', '数量占比(%)', '累计占比(%)', 'ABC分类']]
-        
+
         return result_df
-    
+
+    @staticmethod
+    def classify(values: np.ndarray, a_percentage: float, b_percentage: float) -> np.ndarray:
+        """
+        按累计占比对已按SKU对齐的数组分类（与calculate_abc_classification的划分规则一致）
+
+        Args:
+            values: 每个SKU的数量（不大于0的SKU排在最后，归为C类）
+            a_percentage: A类累计百分比
+            b_percentage: B类累计百分比
+
+        Returns:
+            np.ndarray: 每个SKU的类别编码（0=A, 1=B, 2=C），与输入对齐
+        """
+        values = np.maximum(np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0), 0)
+        rank = np.argsort(-values, kind='stable')
+        cumulative = np.cumsum(values[rank]) / max(values.sum(), 1e-12) * 100
+        classes = np.full(values.size, 2, dtype=np.int64)
+        classes[rank] = np.where(cumulative <= a_percentage, 0, np.where(cumulative <= a_percentage + b_percentage, 1, 2))
+        classes[values <= 0] = 2
+        return classes
+
     def generate_summary_statistics(self, abc_results: pd.DataFrame) -> Dict[str, Any]:
         """
         生成ABC分析统计摘要
@@ -13,21 +13,41 @@ from core.abc_analysis import ABCAnalyzer
 from core.eiq_analysis import EIQAnalyzer
 from core.outbound_analysis import OutboundAnalyzer
 from core.inbound_analysis import InboundAnalyzer
+from core.intraday_analysis import IntradayAnalyzer
+from core.capacity_planning import CapacityPlanner
+from core.demand_forecast import DemandForecaster
+from core.seasonality import SeasonalDecomposer
+from core.stock_reconciliation import StockReconciler
+from core.inventory_aging import InventoryAgingAnalyzer
+from core.inventory_turnover import TurnoverAnalyzer
+from core.safety_stock import SafetyStockCalculator
+from core.throughput_simulation import ThroughputSimulator
+from core.slotting import SlottingOptimizer
+from core.pick_path import PickPathEstimator
+from core.zone_split import ZoneSplitAnalyzer
+from core.replenishment import ReplenishmentAnalyzer
+from core.storage_requirement import StorageRequirementAnalyzer
+from core.order_clustering import OrderClusterAnalyzer
+from core.supplier_performance import SupplierPerformanceAnalyzer
+from core.customer_demand import CustomerDemandAnalyzer
+from core.time_series_kernel import TimeSeriesKernel
 from utils import DataUtils, SessionStateManager, ValidationUtils, ProgressUtils
-from config import ANALYSIS_DIMENSIONS, PREPROCESSING_DIMENSIONS, ABC_CONFIG, EIQ_CONFIG
+from config import ANALYSIS_DIMENSIONS, PREPROCESSING_DIMENSIONS, ABC_CONFIG, EIQ_CONFIG, INTRADAY_CONFIG, CAPACITY_PLANNING_CONFIG, DEMAND_FORECAST_CONFIG, SEASONALITY_CONFIG, RECONCILIATION_CONFIG, INVENTORY_AGING_CONFIG, TURNOVER_CONFIG, SAFETY_STOCK_CONFIG, THROUGHPUT_SIMULATION_CONFIG, SLOTTING_CONFIG, PICK_PATH_CONFIG, ZONE_SPLIT_CONFIG, REPLENISHMENT_CONFIG, STORAGE_REQUIREMENT_CONFIG, ORDER_CLUSTER_CONFIG, SUPPLIER_CONFIG, CUSTOMER_DEMAND_CONFIG
 
 class AnalysisEngine:
     """分析引擎核心类"""
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, source_fingerprint: Optional[str] = None):
         """
         初始化分析引擎
         
         Args:
             df: 要分析的数据框
+            source_fingerprint: 源工作表内容指纹（用于日聚合缓存，数据被清洗后失效）
         """
         self.df = df.copy()
         self.original_df = df.copy()
+        self.source_fingerprint = source_fingerprint
         self.analysis_results = {}
         self.data_cleaning = DataCleaning(df)
         
@@ -74,6 +94,34 @@ class AnalysisEngine:
                 return self._execute_outbound_analysis(config)
             elif dimension == "入库分析":
                 return self._execute_inbound_analysis(config)
+            elif dimension == "时段峰值分析":
+                return self._execute_intraday_peak_analysis(config)
+            elif dimension == "需求预测":
+                return self._execute_demand_forecast(config)
+            elif dimension == "季节性分析":
+                return self._execute_seasonality_analysis(config)
+            elif dimension == "出入库对账分析":
+                return self._execute_stock_reconciliation(config)
+            elif dimension == "库龄分析":
+                return self._execute_inventory_aging(config)
+            elif dimension == "库存周转分析":
+                return self._execute_inventory_turnover(config)
+            elif dimension == "安全库存分析":
+                return self._execute_safety_stock(config)
+            elif dimension == "吞吐仿真分析":
+                return self._execute_throughput_simulation(config)
+            elif dimension == "储位优化分析":
+                return self._execute_slotting(config)
+            elif dimension == "拣选路径分析":
+                return self._execute_pick_path(config)
+            elif dimension == "分区拆单分析":
+                return self._execute_zone_split(config)
+            elif dimension == "补货频次分析":
+                return self._execute_replenishment(config)
+            elif dimension == "存储需求分析":
+                return self._execute_storage_requirement(config)
+            elif dimension == "订单聚类分析":
+                return self._execute_order_cluster(config)
             elif dimension == "容器对比分析":
                 return self._execute_container_comparison(config)
             elif dimension == "SKU件数分析":
@@ -216,6 +264,8 @@ class AnalysisEngine:
                 # 直接删除异常数据
                 result_df = self.df[~final_mask].copy()
                 self.df = result_df
+                # 数据已变化，源文件指纹不再代表当前数据
+                self.source_fingerprint = None
                 action_text = "删除"
                 
                 # 保存清洗结果
@@ -744,7 +794,7 @@ class AnalysisEngine:
                 return False
                 
             # 创建分析器
-            analyzer = OutboundAnalyzer(config)
+            analyzer = OutboundAnalyzer({**config, 'source_fingerprint': self.source_fingerprint})
             
             # 执行分析 - 使用新的参数格式
             daily_data, summary = analyzer.analyze_batch_enhanced(
@@ -773,6 +823,12 @@ class AnalysisEngine:
                 date_info = summary.get('date_range', {})
                 st.info(f"📅 分析时间范围：{date_info.get('start_date')} 至 {date_info.get('end_date')}，共 {date_info.get('total_days', 0)} 天")
                 
+                # 近似去重模式提示误差范围
+                distinct_info = summary.get('distinct_count')
+                if distinct_info:
+                    st.caption(f"≈ {'、'.join(distinct_info['metrics'])} 使用HyperLogLog近似去重"
+                               f"（精度p={distinct_info['precision']}，相对标准误差约 ±{distinct_info['relative_error']:.2%}）")
+                
                 # 显示各维度统计
                 for col, stats in summary.items():
                     if isinstance(stats, dict) and 'total' in stats:
@@ -799,34 +855,1732 @@ class AnalysisEngine:
                             )
                 
                 # 添加EIQ分析比值（如果有足够的维度数据）
-                self._add_eiq_ratios_to_summary(summary)
+                eiq_ratios = self._add_eiq_ratios_to_summary(summary)
+            else:
+                eiq_ratios = {}
+            
+            # 多粒度上卷（基于日聚合立方体，切换粒度无需重新扫描明细）
+            period_rollups = self._render_period_rollups(analyzer.daily_cube, date_column, "出库")
+            
+            # 设计日与增长场景容量规划
+            capacity_plan = self._render_capacity_planning(daily_data, date_column, "出库", eiq_ratios)
+            
+            # 季节性与趋势分解，结论并入优化建议
+            seasonality = self._render_seasonality(daily_data, date_column, "出库")
+            suggestions = analyzer.generate_optimization_suggestions(
+                daily_data, summary, seasonality.get('summary') if seasonality else None
+            )
+            
+            # 客户需求（选择了客户列时）
+            customer_demand = self._render_customer_demand(config, date_column, order_id_column, item_column,
+                                                           start_date, end_date)
+            
+            # 提供数据下载
+            st.subheader("📥 数据导出")
+            csv_data = daily_data.to_csv(index=False, encoding='utf-8-sig')
+            st.download_button(
+                label="📄 导出出库趋势数据(CSV)",
+                data=csv_data,
+                file_name=f"出库趋势分析_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                help="下载完整的出库趋势分析数据"
+            )
+            
+            # 保存分析结果供其他分析使用
+            self.analysis_results["出库分析"] = {
+                "daily_data": daily_data,
+                "summary": summary,
+                "daily_cube": analyzer.daily_cube,
+                "period_rollups": period_rollups,
+                "eiq_ratios": eiq_ratios,
+                "capacity_plan": capacity_plan,
+                "seasonality": seasonality,
+                "suggestions": suggestions,
+                "customer_demand": customer_demand
+            }
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 出库分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_intraday_peak_analysis(self, config: Dict[str, Any]) -> bool:
+        """执行时段峰值分析"""
+        try:
+            st.subheader("⏰ 时段峰值分析")
+            
+            # 获取配置参数
+            datetime_column = config.get("时段峰值分析_datetime_column")
+            order_column = config.get("时段峰值分析_order_column")
+            quantity_column = config.get("时段峰值分析_quantity_column")
+            slot_minutes = int(config.get("时段峰值分析_slot_minutes") or INTRADAY_CONFIG['default_slot_minutes'])
+            
+            # 处理"无数据"选项
+            if order_column == "无数据":
+                order_column = None
+            if quantity_column == "无数据":
+                quantity_column = None
+            
+            # 验证必需配置
+            if not datetime_column:
+                st.error("❌ 请选择日期时间列")
+                return False
+            
+            analyzer = IntradayAnalyzer(config)
+            with st.spinner("按时段聚合中..."):
+                results = analyzer.analyze(
+                    self.df, datetime_column, order_column, quantity_column, slot_minutes
+                )
+            
+            if not results:
+                return False
+            
+            matrices = results['matrices']
+            metric_names = matrices['metric_names']
+            peak_summary = results['peak_summary']
+            percentile = INTRADAY_CONFIG['peak_percentile']
+            daily_peaks = results['daily_peaks']
+            
+            st.info(f"📅 共 {len(daily_peaks)} 个有数据的日期，时段粒度 {INTRADAY_CONFIG['slot_options'].get(slot_minutes, f'{slot_minutes}分钟')}，"
+                    f"最常见峰值小时 {peak_summary['common_peak_hour']}")
+            
+            # 峰值小时设计值
+            st.write(f"**📌 峰值小时设计值（P{percentile}，设备能力按峰值小时设计）**")
+            metric_cols = st.columns(len(metric_names))
+            for i, name in enumerate(metric_names):
+                stats = peak_summary[name]
+                max_date = stats['max_date']
+                max_date_str = max_date.strftime('%Y-%m-%d') if hasattr(max_date, 'strftime') else str(max_date)
+                with metric_cols[i]:
+                    st.metric(
+                        f"P{percentile}峰值小时{name}",
+                        f"{stats['design_value']:,.0f}",
+                        help=f"日均峰值小时: {stats['mean']:,.1f}\n最高: {stats['max']:,.0f} ({max_date_str})\n"
+                             f"峰值小时占全天比例: {stats['peak_hour_share']:.1f}%"
+                    )
+            
+            # 星期×小时热力图
+            st.write("**🗓️ 星期×小时热力图**")
+            heatmap_tabs = st.tabs(metric_names)
+            for tab, name in zip(heatmap_tabs, metric_names):
+                with tab:
+                    analyzer.render_weekday_hour_heatmap(results['weekday_hour'][name], name)
+            
+            # 时段分布
+            analyzer.render_slot_profile(results['slot_profile'], metric_names, percentile)
+            
+            # 每日峰值表
+            st.write("**📋 每日峰值小时明细**")
+            st.dataframe(daily_peaks, use_container_width=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button(
+                    label="📄 导出每日峰值数据(CSV)",
+                    data=daily_peaks.to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"时段峰值分析_每日峰值_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+            with col2:
+                st.download_button(
+                    label="📊 导出时段分布数据(CSV)",
+                    data=results['slot_profile'].to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"时段峰值分析_时段分布_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+            
+            # 保存分析结果
+            self.analysis_results["时段峰值分析"] = {
+                "daily_peaks": daily_peaks,
+                "slot_profile": results['slot_profile'],
+                "weekday_hour": results['weekday_hour'],
+                "peak_summary": peak_summary,
+                "suggestions": []
+            }
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 时段峰值分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_demand_forecast(self, config: Dict[str, Any]) -> bool:
+        """执行SKU需求预测"""
+        try:
+            st.subheader("🔮 SKU需求预测")
+            
+            # 获取配置参数
+            date_column = config.get("需求预测_date_column")
+            sku_column = config.get("需求预测_sku_column")
+            quantity_column = config.get("需求预测_quantity_column")
+            horizon = int(config.get("需求预测_horizon") or DEMAND_FORECAST_CONFIG['default_horizon'])
+            
+            # 处理"无数据"选项
+            if quantity_column == "无数据":
+                quantity_column = None
+            
+            # 验证必需配置
+            if not date_column or not sku_column:
+                st.error("❌ 请选择日期列和SKU列")
+                return False
+            
+            forecaster = DemandForecaster(config)
+            with st.spinner("批量拟合预测模型中..."):
+                results = forecaster.analyze(self.df, date_column, sku_column, quantity_column, horizon)
+            
+            if not results:
+                return False
+            
+            matrices = results['matrices']
+            forecast_result = results['result']
+            n_days, n_skus = matrices['demand'].shape
+            demand_label = "件数" if quantity_column else "出库行数"
+            
+            st.info(f"📅 共 {n_skus:,} 个SKU、{n_days} 天历史（{demand_label}），"
+                    f"留出最后 {forecast_result['holdout_days']} 天评估模型，预测未来 {horizon} 天")
+            
+            # 模型对比
+            model_comparison = results['model_comparison']
+            if not model_comparison.empty:
+                st.write("**📊 模型留出期误差对比**")
+                st.dataframe(model_comparison, use_container_width=True, hide_index=True)
+                st.caption("每个SKU按留出期MAE选用误差最小的模型；WAPE = 绝对误差合计 ÷ 实际需求合计")
+            
+            # 全部SKU合计的历史与预测
+            forecaster.render_forecast_chart(
+                matrices,
+                matrices['demand'].sum(axis=1, dtype=np.float64),
+                forecast_result['final_forecast'].sum(axis=1),
+                f"全部SKU{demand_label}：历史与预测"
+            )
+            
+            # 单个SKU明细（按历史需求排名靠前的SKU）
+            sku_table = results['sku_table']
+            preview_skus = sku_table['SKU'].head(DEMAND_FORECAST_CONFIG['preview_skus']).tolist()
+            selected_sku = st.selectbox("🏷️ 查看SKU预测", options=preview_skus, key="需求预测_preview_sku")
+            sku_position = matrices['skus'].get_loc(selected_sku)
+            forecaster.render_forecast_chart(
+                matrices,
+                matrices['demand'][:, sku_position],
+                forecast_result['final_forecast'][:, sku_position],
+                f"SKU {selected_sku}：历史与预测"
+            )
+            
+            st.write(f"**📋 SKU预测汇总（历史需求前 {len(preview_skus)} 个）**")
+            st.dataframe(sku_table.head(len(preview_skus)), use_container_width=True, hide_index=True)
+            
+            # SKU日需求统计（中位数、分位数、剔除离群值均值等）
+            sku_statistics = results['sku_statistics']
+            st.write(f"**📈 SKU日{demand_label}统计（总量前 {len(preview_skus)} 个）**")
+            st.dataframe(sku_statistics.head(len(preview_skus)), use_container_width=True, hide_index=True)
+            st.caption("只统计有出库记录的日期；最高/最低已过滤异常低值，趋势按末日与首日需求比较")
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.download_button(
+                    label="📄 导出SKU预测汇总(CSV)",
+                    data=sku_table.to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"需求预测_SKU汇总_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+            with col2:
+                st.download_button(
+                    label="📊 导出逐日预测(CSV)",
+                    data=results['forecast'].to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"需求预测_逐日预测_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+            with col3:
+                st.download_button(
+                    label="📈 导出SKU日需求统计(CSV)",
+                    data=sku_statistics.to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"需求预测_SKU日需求统计_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+            
+            # 保存分析结果
+            self.analysis_results["需求预测"] = {
+                "sku_table": sku_table,
+                "sku_statistics": sku_statistics,
+                "forecast": results['forecast'],
+                "model_comparison": model_comparison,
+                "suggestions": []
+            }
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 需求预测执行失败: {str(e)}")
+            return False
+    
+    def _execute_seasonality_analysis(self, config: Dict[str, Any]) -> bool:
+        """执行季节性分解分析（汇总序列 + 按SKU/品类批量分解）"""
+        try:
+            st.subheader("🌊 季节性与趋势分解")
+            
+            # 获取配置参数
+            date_column = config.get("季节性分析_date_column")
+            series_column = config.get("季节性分析_series_column")
+            quantity_column = config.get("季节性分析_quantity_column")
+            
+            # 处理"无数据"选项
+            if series_column == "无数据":
+                series_column = None
+            if quantity_column == "无数据":
+                quantity_column = None
+            
+            # 验证必需配置
+            if not date_column:
+                st.error("❌ 请选择日期列")
+                return False
+            
+            value_label = quantity_column if quantity_column else "行数"
+            with st.spinner("批量分解序列中..."):
+                # 无序列列时只分解汇总序列
+                matrix = TimeSeriesKernel.day_key_matrix(self.df, date_column, series_column, quantity_column)
+                if not matrix:
+                    st.error(f"❌ 日期列 '{date_column}' 没有有效数据")
+                    return False
+                
+                values = matrix['values']
+                if series_column:
+                    # 第一列为全部序列的合计
+                    values = np.column_stack([values.sum(axis=1, dtype=np.float64), values])
+                    labels = ["全部"] + list(matrix['keys'])
+                else:
+                    labels = ["全部"]
+                series_name = series_column or "序列"
+                results = SeasonalDecomposer.analyze(values, matrix['dates'], labels, series_name)
+            
+            if not results:
+                st.warning(f"⚠️ 历史数据不足 {SEASONALITY_CONFIG['min_weekly_days']} 天，无法进行季节性分解")
+                return False
+            
+            summary = results['summary']
+            n_series = len(labels) - 1
+            threshold = SEASONALITY_CONFIG['strength_threshold']
+            has_yearly = results['monthly_index'] is not None
+            
+            st.info(f"📅 共 {results['n_days']} 天、{value_label}，"
+                    + (f"{n_series:,} 个{series_column}序列" if series_column else "汇总序列")
+                    + ("" if has_yearly else f"；完整月份不足 {SEASONALITY_CONFIG['min_yearly_months']} 个，未做年季节性分解"))
+            
+            # 汇总序列结论
+            for message in SeasonalDecomposer.insights(summary.head(1), series_name):
+                st.write(message)
+            
+            if series_column:
+                series_summary = summary.iloc[1:]
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("周季节性显著", f"{int((series_summary['周季节强度'] >= threshold).sum()):,}")
+                with col2:
+                    if has_yearly:
+                        st.metric("年季节性显著", f"{int((series_summary['年季节强度'] >= threshold).sum()):,}")
+                with col3:
+                    trending = series_summary['趋势变化(%/30天)'].abs() >= SEASONALITY_CONFIG['trend_threshold_pct']
+                    st.metric("趋势明显", f"{int(trending.sum()):,}")
+            
+            # 汇总表（按日均降序，汇总序列在首行）
+            preview = SEASONALITY_CONFIG['preview_series']
+            display_summary = pd.concat([
+                summary.head(1),
+                summary.iloc[1:].sort_values('日均', ascending=False, kind='stable').head(preview)
+            ])
+            st.write(f"**📋 季节性汇总（日均前 {min(preview, n_series)} 个序列）**" if series_column else "**📋 季节性汇总**")
+            st.dataframe(display_summary, use_container_width=True, hide_index=True)
+            
+            # 单个序列分解图
+            selected = st.selectbox("📈 查看序列分解", options=display_summary[series_name].tolist(),
+                                    key="季节性分析_preview_series")
+            position = labels.index(selected)
+            SeasonalDecomposer.render_decomposition_chart(values[:, position], matrix['dates'], f"{selected}：趋势与周季节分解")
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            st.download_button(
+                label="📄 导出季节性汇总(CSV)",
+                data=summary.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"季节性分析_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # 保存分析结果
+            self.analysis_results["季节性分析"] = {
+                "summary": summary,
+                "weekly_index": results['weekly_index'],
+                "monthly_index": results['monthly_index'],
+                "suggestions": SeasonalDecomposer.insights(summary.head(1), series_name)
+            }
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 季节性分析执行失败: {str(e)}")
+            return False
+    
+    def _load_sheet(self, sheet_name: Optional[str]) -> pd.DataFrame:
+        """
+        加载同一文件中的另一张工作表（对账、库龄等分析的第二数据源）
+        
+        Args:
+            sheet_name: 工作表名称
+            
+        Returns:
+            pd.DataFrame: 工作表数据，选择的是当前工作表时直接返回当前（可能已清洗的）数据
+        """
+        if not sheet_name:
+            return pd.DataFrame()
+        if str(sheet_name) == str(st.session_state.get('selected_sheet')):
+            return self.df
+        
+        uploaded_file = st.session_state.get('uploaded_file')
+        if uploaded_file is None:
+            st.error("❌ 未找到上传的文件")
+            return pd.DataFrame()
+        return DataUtils.load_excel_data(uploaded_file, str(sheet_name))
+    
+    def _resolve_flow_sheets(self, dimension: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        按配置组装入库、出库两侧数据（当前工作表为一侧，同一文件中的另一张工作表为另一侧）
+        
+        Args:
+            dimension: 分析维度名称（配置键前缀）
+            config: 配置参数
+            
+        Returns:
+            dict: inbound_df、inbound_columns、outbound_df、outbound_columns，配置或数据无效时为None
+        """
+        current_role = config.get(f"{dimension}_current_role") or "出库"
+        sheet_name = config.get(f"{dimension}_sheet")
+        current_columns = {
+            'date': config.get(f"{dimension}_date_column"),
+            'sku': config.get(f"{dimension}_sku_column"),
+            'quantity': config.get(f"{dimension}_quantity_column")
+        }
+        sheet_columns = {
+            'date': config.get(f"{dimension}_sheet_date_column"),
+            'sku': config.get(f"{dimension}_sheet_sku_column"),
+            'quantity': config.get(f"{dimension}_sheet_quantity_column")
+        }
+        
+        # 处理"无数据"选项
+        for columns in (current_columns, sheet_columns):
+            if columns['quantity'] == "无数据":
+                columns['quantity'] = None
+        
+        # 验证必需配置
+        if not all([current_columns['date'], current_columns['sku'], sheet_columns['date'], sheet_columns['sku']]):
+            st.error("❌ 请为两张表分别选择日期列和SKU列")
+            return None
+        
+        sheet_df = self._load_sheet(sheet_name)
+        if sheet_df.empty:
+            st.error(f"❌ 工作表 '{sheet_name}' 没有数据")
+            return None
+        missing = [col for col in sheet_columns.values() if col and col not in sheet_df.columns]
+        if missing:
+            st.error(f"❌ 工作表 '{sheet_name}' 中缺少列: {', '.join(missing)}")
+            return None
+        
+        if current_role == "入库":
+            return {'inbound_df': self.df, 'inbound_columns': current_columns,
+                    'outbound_df': sheet_df, 'outbound_columns': sheet_columns}
+        return {'inbound_df': sheet_df, 'inbound_columns': sheet_columns,
+                'outbound_df': self.df, 'outbound_columns': current_columns}
+    
+    def _execute_stock_reconciliation(self, config: Dict[str, Any]) -> bool:
+        """执行出入库对账分析（当前工作表 + 同一文件中的另一张工作表）"""
+        try:
+            st.subheader("🔄 出入库对账与在库量推算")
+            
+            sheets = self._resolve_flow_sheets("出入库对账分析", config)
+            if sheets is None:
+                return False
+            
+            if config.get("出入库对账分析_use_opening"):
+                opening_sheet = config.get("出入库对账分析_opening_sheet")
+                opening_columns = {
+                    'sku': config.get("出入库对账分析_opening_sku_column"),
+                    'quantity': config.get("出入库对账分析_opening_quantity_column")
+                }
+                if not all(opening_columns.values()):
+                    st.error("❌ 请为期初库存快照选择SKU列和数量列")
+                    return False
+                opening_df = self._load_sheet(opening_sheet)
+                if opening_df.empty:
+                    st.error(f"❌ 工作表 '{opening_sheet}' 没有数据")
+                    return False
+                missing = [col for col in opening_columns.values() if col not in opening_df.columns]
+                if missing:
+                    st.error(f"❌ 工作表 '{opening_sheet}' 中缺少列: {', '.join(missing)}")
+                    return False
+                sheets.update(opening_df=opening_df, opening_columns=opening_columns)
+            
+            with st.spinner("合并出入库流水并推算在库量..."):
+                reconciler = StockReconciler(config)
+                results = reconciler.analyze(**sheets)
+            
+            if not results:
+                st.error("❌ 两张表都没有有效的日期和SKU数据")
+                return False
+            
+            summary = results['summary']
+            sku_table = results['sku_table']
+            st.info(f"📅 共 {summary['day_count']} 天、{summary['sku_count']:,} 个SKU；"
+                    f"入库 {summary['inbound_total']:,.0f}，出库 {summary['outbound_total']:,.0f}")
+            if summary['opening_source'] == 'snapshot':
+                st.caption(f"📦 期初库存取自快照，合计 {summary['opening_total']:,.0f}")
+            else:
+                st.caption(f"📦 未提供期初库存快照：按各SKU首次入库前的出库缺口推定期初库存（合计 {summary['opening_total']:,.0f}），"
+                           f"在库量为相对净流水的推算值，首次入库前的负库存不计为缺货")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("出现缺货的SKU", f"{summary['stockout_skus']:,}")
+            with col2:
+                st.metric("出现积压的SKU", f"{summary['excess_skus']:,}")
+            with col3:
+                st.metric("仅入库SKU", f"{summary['inbound_only_skus']:,}")
+            with col4:
+                st.metric("仅出库SKU", f"{summary['outbound_only_skus']:,}")
+            
+            if summary['outbound_only_skus'] > 0:
+                st.warning(f"⚠️ {summary['outbound_only_skus']:,} 个SKU只有出库没有入库，可能缺少期初库存或两张表SKU编码不一致")
+            
+            StockReconciler.render_stock_chart(results['daily_table'])
+            
+            preview = RECONCILIATION_CONFIG['preview_skus']
+            st.write(f"**📋 SKU对账明细（缺货/积压天数前 {min(preview, len(sku_table))} 个）**")
+            st.dataframe(sku_table.head(preview), use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button(
+                    label="📄 导出SKU对账明细(CSV)",
+                    data=sku_table.to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"出入库对账_SKU_{timestamp}.csv",
+                    mime="text/csv"
+                )
+            with col2:
+                st.download_button(
+                    label="📄 导出逐日库存(CSV)",
+                    data=results['daily_table'].to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"出入库对账_逐日_{timestamp}.csv",
+                    mime="text/csv"
+                )
+            
+            # 保存分析结果
+            self.analysis_results["出入库对账分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 出入库对账分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_inventory_aging(self, config: Dict[str, Any]) -> bool:
+        """执行FIFO库龄分析（当前工作表 + 同一文件中的另一张工作表）"""
+        try:
+            st.subheader("⏳ FIFO库龄与在库时长")
+            
+            sheets = self._resolve_flow_sheets("库龄分析", config)
+            if sheets is None:
+                return False
+            
+            with st.spinner("按先进先出匹配出库与入库批次..."):
+                results = InventoryAgingAnalyzer(config).analyze(**sheets)
+            
+            if not results:
+                st.error("❌ 两张表都没有有效的日期和SKU数据")
+                return False
+            
+            summary = results['summary']
+            percentiles = summary['dwell_percentiles']
+            st.info(f"📅 截至 {summary['as_of_date'].strftime('%Y-%m-%d')}，{summary['sku_count']:,} 个SKU；"
+                    f"已匹配出库 {summary['matched_quantity']:,.0f}，剩余库存 {summary['remaining_quantity']:,.0f}")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("平均在库天数", f"{summary['average_dwell']:.1f}" if not np.isnan(summary['average_dwell']) else "-")
+            for column, percentile in zip([col2, col3, col4], percentiles):
+                with column:
+                    value = percentiles[percentile]
+                    st.metric(f"P{percentile}在库天数", f"{value:.0f}" if not np.isnan(value) else "-")
+            
+            if summary['unmatched_outbound'] > 0 or summary['early_outbound'] > 0:
+                st.warning(f"⚠️ {summary['unmatched_outbound']:,.0f} 件出库找不到可匹配的入库，"
+                           f"{summary['early_outbound']:,.0f} 件出库早于所匹配的入库日期，可能缺少期初库存")
+            
+            InventoryAgingAnalyzer.render_dwell_chart(results['dwell_distribution'], percentiles)
+            
+            st.write("**📦 剩余库存库龄结构**")
+            st.dataframe(results['aging_buckets'], use_container_width=True, hide_index=True)
+            
+            sku_table = results['sku_table']
+            preview = INVENTORY_AGING_CONFIG['preview_skus']
+            st.write(f"**📋 SKU库龄明细（最老库龄前 {min(preview, len(sku_table))} 个）**")
+            st.dataframe(sku_table.head(preview), use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            st.download_button(
+                label="📄 导出SKU库龄明细(CSV)",
+                data=sku_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"库龄分析_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # 保存分析结果
+            self.analysis_results["库龄分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 库龄分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_inventory_turnover(self, config: Dict[str, Any]) -> bool:
+        """执行库存周转分析（当前工作表为库存快照 + 同一文件中的出库工作表）"""
+        try:
+            st.subheader("🔁 库存周转与可供天数")
+            
+            # 获取配置参数
+            snapshot_columns = {
+                'sku': config.get("库存周转分析_sku_column"),
+                'stock': config.get("库存周转分析_stock_column"),
+                'category': config.get("库存周转分析_category_column")
+            }
+            outbound_columns = {
+                'date': config.get("库存周转分析_sheet_date_column"),
+                'sku': config.get("库存周转分析_sheet_sku_column"),
+                'quantity': config.get("库存周转分析_sheet_quantity_column")
+            }
+            sheet_name = config.get("库存周转分析_sheet")
+            
+            # 处理"无数据"选项
+            if snapshot_columns['category'] == "无数据":
+                snapshot_columns['category'] = None
+            if outbound_columns['quantity'] == "无数据":
+                outbound_columns['quantity'] = None
+            
+            # 验证必需配置
+            if not all([snapshot_columns['sku'], snapshot_columns['stock'], outbound_columns['date'], outbound_columns['sku']]):
+                st.error("❌ 请选择快照的SKU列、库存列，以及出库表的日期列和SKU列")
+                return False
+            
+            outbound_df = self._load_sheet(sheet_name)
+            if outbound_df.empty:
+                st.error(f"❌ 工作表 '{sheet_name}' 没有数据")
+                return False
+            missing = [col for col in outbound_columns.values() if col and col not in outbound_df.columns]
+            if missing:
+                st.error(f"❌ 工作表 '{sheet_name}' 中缺少列: {', '.join(missing)}")
+                return False
+            
+            with st.spinner("关联库存快照与出库历史..."):
+                results = TurnoverAnalyzer(config).analyze(self.df, snapshot_columns, outbound_df, outbound_columns)
+            
+            if not results:
+                st.error("❌ 库存快照或出库历史没有有效数据")
+                return False
+            
+            summary = results['summary']
+            windows = summary['windows']
+            st.info(f"📅 出库截至 {summary['end_date'].strftime('%Y-%m-%d')}，快照 {summary['sku_count']:,} 个SKU，"
+                    f"总库存 {summary['total_stock']:,.0f}")
+            if summary['history_days'] < windows[-1]:
+                st.caption(f"📏 出库历史仅 {summary['history_days']} 天，超过该长度的窗口按 {summary['history_days']} 天折算日均出库")
+            
+            metric_columns = st.columns(len(windows) + 1)
+            for column, window in zip(metric_columns, windows):
+                with column:
+                    st.metric(f"周转次数(近{window}天年化)", f"{summary['turnover'][window]:.2f}")
+            with metric_columns[-1]:
+                st.metric("可供天数", f"{summary['days_of_supply']:,.1f}")
+            
+            if summary['unknown_outbound_skus'] > 0:
+                st.warning(f"⚠️ 出库表中有 {summary['unknown_outbound_skus']:,} 个SKU不在库存快照中，未计入周转")
+            
+            TurnoverAnalyzer.render_class_chart(results['class_table'])
+            st.dataframe(results['class_table'], use_container_width=True, hide_index=True)
+            
+            if not results['category_table'].empty:
+                st.write("**🗂️ 品类周转**")
+                st.dataframe(results['category_table'], use_container_width=True, hide_index=True)
+            
+            sku_table = results['sku_table']
+            preview = TURNOVER_CONFIG['preview_skus']
+            st.write(f"**📋 SKU周转明细（可供天数前 {min(preview, len(sku_table))} 个）**")
+            st.dataframe(sku_table.head(preview), use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            st.download_button(
+                label="📄 导出SKU周转明细(CSV)",
+                data=sku_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"库存周转_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # 保存分析结果
+            self.analysis_results["库存周转分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 库存周转分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_safety_stock(self, config: Dict[str, Any]) -> bool:
+        """执行安全库存与再订货点计算"""
+        try:
+            st.subheader("🛡️ 安全库存与再订货点")
+            
+            # 获取配置参数
+            date_column = config.get("安全库存分析_date_column")
+            sku_column = config.get("安全库存分析_sku_column")
+            quantity_column = config.get("安全库存分析_quantity_column")
+            cost_column = config.get("安全库存分析_cost_column")
+            period_days = SAFETY_STOCK_CONFIG['period_options'].get(config.get("安全库存分析_period"), 1)
+            lead_time_days = float(config.get("安全库存分析_lead_time") or SAFETY_STOCK_CONFIG['default_lead_time_days'])
+            lead_time_std_days = float(config.get("安全库存分析_lead_time_std") or 0.0)
+            service_levels = config.get("安全库存分析_service_levels") or SAFETY_STOCK_CONFIG['default_service_levels']
+            
+            # 处理"无数据"选项
+            if quantity_column == "无数据":
+                quantity_column = None
+            if cost_column == "无数据":
+                cost_column = None
+            
+            # 验证必需配置
+            if not date_column or not sku_column:
+                st.error("❌ 请选择日期列和SKU列")
+                return False
+            
+            with st.spinner("统计需求波动并计算安全库存..."):
+                results = SafetyStockCalculator(config).analyze(
+                    self.df, date_column, sku_column, quantity_column, cost_column,
+                    service_levels, lead_time_days, lead_time_std_days, period_days
+                )
+            
+            if not results:
+                st.error("❌ 有效出库历史不足两个统计周期，无法计算需求波动")
+                return False
+            
+            summary = results['summary']
+            level_table = results['level_table']
+            st.info(f"📊 {summary['sku_count']:,} 个SKU，{summary['n_periods']} 个统计周期（每{summary['period_label']}），"
+                    f"提前期 {summary['lead_time_days']:g} 天")
+            
+            metric_columns = st.columns(len(level_table))
+            for column, (_, row) in zip(metric_columns, level_table.iterrows()):
+                with column:
+                    st.metric(f"安全库存@{row['服务水平(%)']:g}%", f"{row['安全库存总量']:,.0f}")
+            
+            if summary['zero_demand_skus'] > 0:
+                st.warning(f"⚠️ {summary['zero_demand_skus']:,} 个SKU在统计周期内没有出库，安全库存为0")
+            
+            SafetyStockCalculator.render_investment_curve(results['curve'], level_table)
+            st.dataframe(level_table, use_container_width=True, hide_index=True)
+            
+            sku_table = results['sku_table']
+            preview = SAFETY_STOCK_CONFIG['preview_skus']
+            st.write(f"**📋 SKU安全库存明细（安全库存前 {min(preview, len(sku_table))} 个）**")
+            st.dataframe(sku_table.head(preview), use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            st.download_button(
+                label="📄 导出SKU安全库存明细(CSV)",
+                data=sku_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"安全库存_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # 保存分析结果
+            self.analysis_results["安全库存分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 安全库存分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_throughput_simulation(self, config: Dict[str, Any]) -> bool:
+        """执行工作站吞吐蒙特卡洛仿真"""
+        try:
+            st.subheader("🎲 工作站吞吐仿真")
+            
+            # 获取配置参数
+            datetime_column = config.get("吞吐仿真分析_datetime_column")
+            quantity_column = config.get("吞吐仿真分析_quantity_column")
+            workload = config.get("吞吐仿真分析_workload") or "行数"
+            picks_per_hour = float(config.get("吞吐仿真分析_picks_per_hour")
+                                   or THROUGHPUT_SIMULATION_CONFIG['default_picks_per_hour'])
+            hit_rate = float(config.get("吞吐仿真分析_hit_rate") or THROUGHPUT_SIMULATION_CONFIG['default_hit_rate'])
+            backlog_hours = float(config.get("吞吐仿真分析_backlog_hours") or 0.0)
+            service_level = config.get("吞吐仿真分析_service_level") or THROUGHPUT_SIMULATION_CONFIG['default_service_level']
+            replications = int(config.get("吞吐仿真分析_replications")
+                               or THROUGHPUT_SIMULATION_CONFIG['default_replications'])
+            
+            # 处理"无数据"选项
+            if quantity_column == "无数据":
+                quantity_column = None
+            
+            # 验证必需配置
+            if not datetime_column:
+                st.error("❌ 请选择日期时间列")
+                return False
+            if workload == "件数" and not quantity_column:
+                st.error("❌ 按件数测算时请选择件数列")
+                return False
+            
+            with st.spinner(f"仿真 {replications:,} 次重复..."):
+                results = ThroughputSimulator(config).analyze(
+                    self.df, datetime_column, quantity_column, workload, picks_per_hour, hit_rate,
+                    service_level, replications, backlog_hours
+                )
+            
+            if not results:
+                st.error(f"❌ 日期列 '{datetime_column}' 没有有效的出库作业数据")
+                return False
+            
+            summary = results['summary']
+            if not summary['has_time']:
+                st.warning("⚠️ 日期列不包含时分信息，所有作业将落在00:00时段，仿真结果按整天集中到一小时计算")
+            st.info(f"📊 基于 {summary['operating_days']:,} 个历史作业日，仿真 {summary['replications']:,} 次 × "
+                    f"{summary['simulated_days'] // summary['replications']} 天，单站 {summary['capacity']:,.0f} "
+                    f"{summary['workload']}/小时")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("按均值测算", f"{summary['average_stations']} 站", help="日均作业量 ÷ 日均作业小时 ÷ 单站能力")
+            with col2:
+                st.metric("按历史日测算", f"{summary['historical_stations']} 站",
+                          help=f"历史作业日中 {summary['service_level'] * 100:g}% 的天数能满足")
+            with col3:
+                st.metric("仿真中位数", f"{summary['median_stations']} 站")
+            with col4:
+                st.metric(f"推荐(P{summary['confidence']})", f"{summary['recommended_stations']} 站",
+                          delta=f"{summary['recommended_stations'] - summary['average_stations']:+d} vs 均值",
+                          delta_color="off")
+            
+            ThroughputSimulator.render_service_curve(results['service_curve'], summary['service_level'],
+                                                     summary['recommended_stations'])
+            
+            st.write("**📋 各次重复所需工作站数分布**")
+            st.dataframe(results['station_table'], use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            st.download_button(
+                label="📄 导出工作站数-服务水平曲线(CSV)",
+                data=results['service_curve'].to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"吞吐仿真_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # 保存分析结果
+            self.analysis_results["吞吐仿真分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 吞吐仿真分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_slotting(self, config: Dict[str, Any]) -> bool:
+        """执行COI储位优化（当前工作表为SKU尺寸与库存 + 同一文件中的出库工作表）"""
+        try:
+            st.subheader("🗺️ COI储位优化")
+            
+            # 获取配置参数
+            sku_columns = {
+                'sku': config.get("储位优化分析_sku_column"),
+                'length': config.get("储位优化分析_length_column"),
+                'width': config.get("储位优化分析_width_column"),
+                'height': config.get("储位优化分析_height_column"),
+                'inventory': config.get("储位优化分析_inventory_column"),
+                'location': config.get("储位优化分析_location_column")
+            }
+            data_unit = config.get("储位优化分析_data_unit") or "cm"
+            sheet_name = config.get("储位优化分析_sheet")
+            outbound_sku_column = config.get("储位优化分析_sheet_sku_column")
+            grid = {name: config[f"储位优化分析_{name}"] for name in SLOTTING_CONFIG['grid']
+                    if config.get(f"储位优化分析_{name}") is not None}
+            
+            # 处理"无数据"选项
+            for name in ['inventory', 'location']:
+                if sku_columns[name] == "无数据":
+                    sku_columns[name] = None
+            
+            # 验证必需配置
+            if not all([sku_columns['sku'], sku_columns['length'], sku_columns['width'], sku_columns['height'],
+                        outbound_sku_column]):
+                st.error("❌ 请选择SKU列、长宽高列，以及出库表的SKU列")
+                return False
+            
+            outbound_df = self._load_sheet(sheet_name)
+            if outbound_df.empty:
+                st.error(f"❌ 工作表 '{sheet_name}' 没有数据")
+                return False
+            if outbound_sku_column not in outbound_df.columns:
+                st.error(f"❌ 工作表 '{sheet_name}' 中缺少列: {outbound_sku_column}")
+                return False
+            
+            with st.spinner("计算COI并分配储位..."):
+                results = SlottingOptimizer(config).analyze(self.df, sku_columns, data_unit, outbound_df,
+                                                            outbound_sku_column, grid)
+            
+            if not results:
+                st.error("❌ 没有可分配的SKU或储位")
+                return False
+            
+            summary = results['summary']
+            st.info(f"🏗️ {summary['location_count']:,} 个储位，已用 {summary['used_locations']:,} 个；"
+                    f"{summary['assigned_skus']:,}/{summary['sku_count']:,} 个SKU完成分配")
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("COI分配行走距离", f"{summary['coi_travel'] / 1000:,.1f} km")
+            with col2:
+                st.metric("随机分配行走距离", f"{summary['random_travel'] / 1000:,.1f} km",
+                          delta=f"节省 {summary['random_saving']:.1%}", delta_color="off")
+            with col3:
+                if 'current_travel' in summary:
+                    st.metric("当前储位行走距离", f"{summary['current_travel'] / 1000:,.1f} km",
+                              delta=f"节省 {summary['current_saving']:.1%}", delta_color="off",
+                              help=f"仅比较 {summary['current_compared_skus']:,} 个当前储位有效且完成分配的SKU")
+                else:
+                    st.metric("当前储位行走距离", "-", help="未选择当前储位列")
+            
+            if summary['unassigned_skus'] > 0:
+                st.warning(f"⚠️ 储位不足，{summary['unassigned_skus']:,} 个COI靠后的SKU未分配储位")
+            if summary['invalid_dimension_skus'] > 0:
+                st.warning(f"⚠️ {summary['invalid_dimension_skus']:,} 个SKU尺寸缺失或无效，未参与分配")
+            if summary['unknown_outbound_lines'] > 0:
+                st.caption(f"• 出库表中有 {summary['unknown_outbound_lines']:,} 行的SKU不在当前工作表中，未计入拣选频次")
+            
+            SlottingOptimizer.render_pick_curve(results['curve'])
+            st.dataframe(results['band_table'], use_container_width=True, hide_index=True)
+            
+            sku_table = results['sku_table']
+            preview = SLOTTING_CONFIG['preview_skus']
+            st.write(f"**📋 SKU储位分配（COI前 {min(preview, len(sku_table))} 个）**")
+            st.dataframe(sku_table.head(preview), use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button(
+                    label="📄 导出SKU储位分配(CSV)",
+                    data=sku_table.to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"储位优化_SKU_{timestamp}.csv",
+                    mime="text/csv"
+                )
+            with col2:
+                st.download_button(
+                    label="📄 导出储位表(CSV)",
+                    data=results['location_table'].to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"储位优化_储位_{timestamp}.csv",
+                    mime="text/csv"
+                )
+            
+            # 保存分析结果
+            self.analysis_results["储位优化分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 储位优化分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_pick_path(self, config: Dict[str, Any]) -> bool:
+        """执行拣选路径估算（当前工作表为订单明细 + 同一文件中的SKU储位表）"""
+        try:
+            st.subheader("🚶 拣选路径行走距离")
             
-            # 提供数据下载
+            # 获取配置参数
+            order_column = config.get("拣选路径分析_order_column")
+            sku_column = config.get("拣选路径分析_sku_column")
+            sheet_name = config.get("拣选路径分析_sheet")
+            location_sku_column = config.get("拣选路径分析_sheet_sku_column")
+            location_column = config.get("拣选路径分析_sheet_location_column")
+            batch_sizes = config.get("拣选路径分析_batch_sizes") or PICK_PATH_CONFIG['default_batch_sizes']
+            grid = {name: config[f"拣选路径分析_{name}"] for name in ['aisles', 'bays', 'levels', 'bay_width', 'aisle_pitch']
+                    if config.get(f"拣选路径分析_{name}") is not None}
+            
+            # 验证必需配置
+            if not all([order_column, sku_column, location_sku_column, location_column]):
+                st.error("❌ 请选择订单列、SKU列，以及储位表的SKU列和储位编码列")
+                return False
+            
+            location_df = self._load_sheet(sheet_name)
+            if location_df.empty:
+                st.error(f"❌ 工作表 '{sheet_name}' 没有数据")
+                return False
+            missing = [col for col in [location_sku_column, location_column] if col not in location_df.columns]
+            if missing:
+                st.error(f"❌ 工作表 '{sheet_name}' 中缺少列: {', '.join(missing)}")
+                return False
+            
+            with st.spinner("估算拣选路径..."):
+                results = PickPathEstimator(config).analyze(self.df, order_column, sku_column, location_df,
+                                                            location_sku_column, location_column, batch_sizes, grid)
+            
+            if not results:
+                st.error("❌ 没有能匹配到有效储位的拣选行")
+                return False
+            
+            summary = results['summary']
+            scenario_table = results['scenario_table']
+            st.info(f"📦 {summary['order_count']:,} 个订单、{summary['line_count']:,} 个拣选行")
+            if summary['unlocated_lines'] > 0:
+                st.warning(f"⚠️ {summary['unlocated_skus']:,} 个SKU没有有效储位，"
+                           f"{summary['unlocated_lines']:,} 个拣选行未计入")
+            if not summary['reslotted']:
+                st.warning(f"⚠️ 储位数 {summary['location_count']:,} 少于SKU数，未生成按频次重排方案")
+            
+            # 当前储位按单拣选 vs 最优方案
+            baseline = scenario_table.iloc[0]
+            for label in PICK_PATH_CONFIG['methods'].values():
+                best = scenario_table.loc[scenario_table[f'{label}每单距离(m)'].idxmin()]
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric(f"{label}·{baseline['储位方案']}·每批{baseline['每批订单数']}单",
+                              f"{baseline[f'{label}每单距离(m)']:,.1f} m/单")
+                with col2:
+                    saving = 1 - best[f'{label}每单距离(m)'] / baseline[f'{label}每单距离(m)']
+                    st.metric(f"{label}·{best['储位方案']}·每批{best['每批订单数']}单",
+                              f"{best[f'{label}每单距离(m)']:,.1f} m/单",
+                              delta=f"节省 {saving:.1%}", delta_color="off")
+            
+            PickPathEstimator.render_scenario_chart(scenario_table)
+            st.dataframe(scenario_table.round(2), use_container_width=True, hide_index=True)
+            
+            batch_table = results['batch_table']
+            preview = PICK_PATH_CONFIG['preview_batches']
+            st.write(f"**📋 批次路线明细（{baseline['储位方案']}、每批{baseline['每批订单数']}单，前 {min(preview, len(batch_table))} 批）**")
+            st.dataframe(batch_table.head(preview), use_container_width=True, hide_index=True)
+            
+            # 数据导出
             st.subheader("📥 数据导出")
-            csv_data = daily_data.to_csv(index=False, encoding='utf-8-sig')
             st.download_button(
-                label="📄 导出出库趋势数据(CSV)",
-                data=csv_data,
-                file_name=f"出库趋势分析_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-                help="下载完整的出库趋势分析数据"
+                label="📄 导出方案对比(CSV)",
+                data=scenario_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"拣选路径_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
             )
             
-            # 保存分析结果供其他分析使用
-            self.analysis_results["出库分析"] = {
-                "daily_data": daily_data,
-                "summary": summary,
-                "suggestions": []  # 不再生成建议
+            # 保存分析结果
+            self.analysis_results["拣选路径分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 拣选路径分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_zone_split(self, config: Dict[str, Any]) -> bool:
+        """执行分区拆单分析（评估多个分区方案下订单涉及的分区数和合流工作量）"""
+        try:
+            st.subheader("🧩 分区拆单分析")
+            
+            # 获取配置参数
+            order_column = config.get("分区拆单分析_order_column")
+            sku_column = config.get("分区拆单分析_sku_column")
+            zone_columns = config.get("分区拆单分析_zone_columns") or []
+            zone_counts = config.get("分区拆单分析_zone_counts")
+            if zone_counts is None:
+                zone_counts = ZONE_SPLIT_CONFIG['default_zone_counts']
+            abc_percentages = None
+            if config.get("分区拆单分析_use_abc", True):
+                abc_percentages = (config.get("分区拆单分析_a_percentage") or ABC_CONFIG['default_a_percentage'],
+                                   config.get("分区拆单分析_b_percentage") or ABC_CONFIG['default_b_percentage'])
+            
+            # 验证必需配置
+            if not order_column or not sku_column:
+                st.error("❌ 请选择订单列和SKU列")
+                return False
+            missing = [col for col in [order_column, sku_column, *zone_columns] if col not in self.df.columns]
+            if missing:
+                st.error(f"❌ 数据中缺少列: {', '.join(missing)}")
+                return False
+            
+            with st.spinner("评估分区方案..."):
+                results = ZoneSplitAnalyzer(config).analyze(self.df, order_column, sku_column, zone_columns,
+                                                            zone_counts, abc_percentages)
+            
+            if not results:
+                st.error("❌ 没有可评估的分区方案或有效订单明细")
+                return False
+            
+            summary = results['summary']
+            zoning_table = results['zoning_table']
+            st.info(f"📦 {summary['order_count']:,} 个订单、{summary['line_count']:,} 个拣选行、"
+                    f"{summary['sku_count']:,} 个SKU，共评估 {summary['zoning_count']} 个分区方案")
+            
+            # 拆单率最低的多分区方案
+            multi_zone = zoning_table[zoning_table['分区数'] > 1]
+            if not multi_zone.empty:
+                best = multi_zone.loc[multi_zone['拆单率(%)'].idxmin()]
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("拆单率最低方案", best['分区方案'], delta=f"{best['分区数']} 个分区", delta_color="off")
+                with col2:
+                    st.metric("拆单率", f"{best['拆单率(%)']:.1f}%")
+                with col3:
+                    st.metric("需合流子订单", f"{best['需合流子订单数']:,}")
+            
+            ZoneSplitAnalyzer.render_distribution_chart(results['distribution_table'])
+            st.write("**📋 分区方案对比**")
+            st.dataframe(zoning_table.round(2), use_container_width=True, hide_index=True)
+            
+            st.write("**📋 各分区作业量**")
+            st.dataframe(results['zone_table'].round(2), use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            st.download_button(
+                label="📄 导出方案对比(CSV)",
+                data=zoning_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"分区拆单_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # 保存分析结果
+            self.analysis_results["分区拆单分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 分区拆单分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_replenishment(self, config: Dict[str, Any]) -> bool:
+        """执行补货频次分析（当前工作表为SKU主数据 + 同一文件中的出库明细）"""
+        try:
+            st.subheader("🚚 补货频次分析")
+            
+            # 获取配置参数
+            sku_columns = {
+                'sku': config.get("补货频次分析_sku_column"),
+                'length': config.get("补货频次分析_length_column"),
+                'width': config.get("补货频次分析_width_column"),
+                'height': config.get("补货频次分析_height_column"),
+                'weight': config.get("补货频次分析_weight_column"),
+                'capacity': config.get("补货频次分析_capacity_column")
             }
+            sheet_name = config.get("补货频次分析_sheet")
+            date_column = config.get("补货频次分析_sheet_date_column")
+            outbound_sku_column = config.get("补货频次分析_sheet_sku_column")
+            quantity_column = config.get("补货频次分析_sheet_quantity_column")
+            refills_per_face = config.get("补货频次分析_refills_per_face") or REPLENISHMENT_CONFIG['default_refills_per_face']
+            peak_percentile = config.get("补货频次分析_peak_percentile") or REPLENISHMENT_CONFIG['default_peak_percentile']
+            container_info = {
+                'length': config.get("补货频次分析_container_length") or 600,
+                'width': config.get("补货频次分析_container_width") or 400,
+                'height': config.get("补货频次分析_container_height") or 300,
+                'weight_limit': config.get("补货频次分析_container_weight_limit") or 30
+            }
+            
+            # 处理"无数据"选项
+            for name in ['weight', 'capacity']:
+                if sku_columns[name] == "无数据":
+                    sku_columns[name] = None
+            if quantity_column == "无数据":
+                quantity_column = None
+            
+            # 验证必需配置
+            if not all([sku_columns['sku'], sku_columns['length'], sku_columns['width'], sku_columns['height'],
+                        date_column, outbound_sku_column]):
+                st.error("❌ 请选择SKU列、长宽高列，以及出库表的日期列和SKU列")
+                return False
+            exists, missing = DataUtils.validate_columns_existence(
+                self.df, [column for column in sku_columns.values() if column])
+            if not exists:
+                st.error(f"❌ 当前工作表缺少列: {missing}")
+                return False
+            
+            outbound_df = self._load_sheet(sheet_name)
+            if outbound_df.empty:
+                st.error(f"❌ 工作表 '{sheet_name}' 没有数据")
+                return False
+            missing = [col for col in [date_column, outbound_sku_column, quantity_column]
+                       if col and col not in outbound_df.columns]
+            if missing:
+                st.error(f"❌ 工作表 '{sheet_name}' 中缺少列: {', '.join(missing)}")
+                return False
+            
+            with st.spinner("估算补货频次..."):
+                results = ReplenishmentAnalyzer(config).analyze(
+                    self.df, sku_columns, config.get("补货频次分析_data_unit") or "cm", container_info,
+                    outbound_df, date_column, outbound_sku_column, quantity_column, refills_per_face,
+                    peak_percentile, config.get("补货频次分析_weight_unit") or "kg")
+            
+            if not results:
+                st.error("❌ 没有能匹配到有效拣选位容量的出库记录")
+                return False
+            
+            summary = results['summary']
+            st.info(f"📦 拣选容器 {container_info['length']}×{container_info['width']}×{container_info['height']} mm，"
+                    f"{summary['matched_skus']:,} 个SKU、{summary['operating_days']} 个作业日")
+            if summary['unknown_skus'] > 0 or summary['unfit_skus'] > 0:
+                st.warning(f"⚠️ {summary['unknown_skus']:,} 个出库SKU不在SKU主数据中，{summary['unfit_skus']:,} 个SKU"
+                           f"尺寸无效或装不进拣选容器，共 {summary['excluded_lines']:,} 个出库行未计入")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("日均补货次数", f"{summary['avg_daily_trips']:,.0f}")
+            with col2:
+                st.metric("P95日补货次数", f"{summary['p95_daily_trips']:,.0f}")
+            with col3:
+                st.metric("最高日补货次数", f"{summary['max_daily_trips']:,}", delta=str(summary['peak_day']),
+                          delta_color="off")
+            with col4:
+                st.metric("需多个拣选位的SKU", f"{summary['multi_face_skus']:,}")
+            
+            ReplenishmentAnalyzer.render_daily_trips(results['daily_table'])
+            
+            st.write(f"**📋 峰值日（{summary['peak_days']} 天，日出库件数 ≥ {summary['peak_threshold_units']:,.0f}）"
+                     f"每SKU补货次数分布**")
+            st.dataframe(results['peak_distribution'].round(2), use_container_width=True, hide_index=True)
+            
+            sku_table = results['sku_table']
+            preview = REPLENISHMENT_CONFIG['preview_skus']
+            st.write(f"**📋 SKU补货频次（按日均补货次数降序，前 {min(preview, len(sku_table))} 个）**")
+            st.dataframe(sku_table.head(preview).round(2), use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            st.download_button(
+                label="📄 导出SKU补货频次(CSV)",
+                data=sku_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"补货频次_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # 保存分析结果
+            self.analysis_results["补货频次分析"] = results
             
             return True
             
         except Exception as e:
-            st.error(f"❌ 出库分析执行失败: {str(e)}")
+            st.error(f"❌ 补货频次分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_storage_requirement(self, config: Dict[str, Any]) -> bool:
+        """执行ABC × 装箱存储需求分析"""
+        try:
+            st.subheader("🏬 存储需求分析")
+            
+            # 获取配置参数
+            sku_column = config.get("存储需求分析_sku_column")
+            quantity_column = config.get("存储需求分析_quantity_column")
+            columns = {
+                'length': config.get("存储需求分析_length_column"),
+                'width': config.get("存储需求分析_width_column"),
+                'height': config.get("存储需求分析_height_column"),
+                'inventory': config.get("存储需求分析_inventory_column"),
+                'weight': config.get("存储需求分析_weight_column")
+            }
+            container_info = {
+                'length': config.get("存储需求分析_container_length") or 600,
+                'width': config.get("存储需求分析_container_width") or 400,
+                'height': config.get("存储需求分析_container_height") or 300,
+                'weight_limit': config.get("存储需求分析_container_weight_limit") or 30
+            }
+            location_info = {name: config.get(f"存储需求分析_location_{name}") or SLOTTING_CONFIG['grid'][f"location_{name}"]
+                             for name in ['length', 'width', 'height']}
+            
+            # 处理"无数据"选项
+            if columns['weight'] == "无数据":
+                columns['weight'] = None
+            
+            # 验证必需配置
+            if not all([sku_column, quantity_column, columns['length'], columns['width'], columns['height'],
+                        columns['inventory']]):
+                st.error("❌ 请选择SKU列、ABC分类数量列、长宽高列和库存件数列")
+                return False
+            exists, missing = DataUtils.validate_columns_existence(
+                self.df, [sku_column, quantity_column] + [column for column in columns.values() if column])
+            if not exists:
+                st.error(f"❌ 缺少必需的列: {missing}")
+                return False
+            
+            with st.spinner("计算存储需求..."):
+                results = StorageRequirementAnalyzer(config).analyze(
+                    self.df, sku_column, quantity_column, columns, config.get("存储需求分析_data_unit") or "cm",
+                    container_info, location_info,
+                    config.get("存储需求分析_a_percentage") or ABC_CONFIG['default_a_percentage'],
+                    config.get("存储需求分析_b_percentage") or ABC_CONFIG['default_b_percentage'],
+                    config.get("存储需求分析_divider_counts") or [], config.get("存储需求分析_weight_unit") or "kg")
+            
+            if not results:
+                st.error("❌ 没有有库存且能装入容器的SKU")
+                return False
+            
+            summary = results['summary']
+            class_table = results['class_table']
+            st.info(f"📦 容器 {container_info['length']}×{container_info['width']}×{container_info['height']} mm，"
+                    f"{summary['stored_skus']:,} / {summary['sku_count']:,} 个SKU参与计算，"
+                    f"每个储位可放 {summary['containers_per_location']} 个容器")
+            if summary['unfit_skus'] > 0:
+                st.warning(f"⚠️ {summary['unfit_skus']:,} 个有库存的SKU尺寸无效或装不进容器，未计入")
+            if summary['containers_per_location'] == 0:
+                st.warning("⚠️ 容器放不进储位，未计算储位数")
+            
+            totals = class_table[class_table['ABC分类'] == '合计'].reset_index(drop=True)
+            metric_columns = st.columns(len(totals))
+            for column, (_, row) in zip(metric_columns, totals.iterrows()):
+                with column:
+                    st.metric(f"{row['存储策略']}容器数", f"{row['容器数']:,}",
+                              delta=f"容积利用率 {row['容积利用率(%)']:.1f}%", delta_color="off")
+            
+            StorageRequirementAnalyzer.render_policy_chart(class_table)
+            st.write("**📋 各存储策略 × ABC分类存储需求**")
+            st.dataframe(class_table.round(2), use_container_width=True, hide_index=True)
+            
+            sku_table = results['sku_table']
+            preview = STORAGE_REQUIREMENT_CONFIG['preview_skus']
+            st.write(f"**📋 SKU明细（前 {min(preview, len(sku_table))} 个）**")
+            st.dataframe(sku_table.head(preview).round(4), use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            st.download_button(
+                label="📄 导出存储需求(CSV)",
+                data=class_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"存储需求_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # 保存分析结果
+            self.analysis_results["存储需求分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 存储需求分析执行失败: {str(e)}")
+            return False
+    
+    def _execute_order_cluster(self, config: Dict[str, Any]) -> bool:
+        """执行订单聚类分析（订单画像特征 + 小批量k-means）"""
+        try:
+            st.subheader("🧬 订单聚类分析")
+            
+            # 获取配置参数
+            order_column = config.get("订单聚类分析_order_column")
+            sku_column = config.get("订单聚类分析_sku_column")
+            optional_columns = {name: config.get(f"订单聚类分析_{name}_column")
+                                for name in ['quantity', 'date', 'length', 'width', 'height', 'weight']}
+            
+            # 处理"无数据"选项
+            for name in optional_columns:
+                if optional_columns[name] == "无数据":
+                    optional_columns[name] = None
+            dimension_columns = [optional_columns[name] for name in ['length', 'width', 'height']]
+            if not all(dimension_columns):
+                dimension_columns = None
+            
+            # 验证必需配置
+            if not order_column or not sku_column:
+                st.error("❌ 请选择订单列和SKU列")
+                return False
+            exists, missing = DataUtils.validate_columns_existence(
+                self.df, [order_column, sku_column] + [column for column in optional_columns.values() if column])
+            if not exists:
+                st.error(f"❌ 缺少必需的列: {missing}")
+                return False
+            
+            with st.spinner("提取订单特征并聚类..."):
+                results = OrderClusterAnalyzer(config).analyze(
+                    self.df, order_column, sku_column, optional_columns['quantity'], optional_columns['date'],
+                    dimension_columns, optional_columns['weight'], config.get("订单聚类分析_data_unit") or "cm",
+                    config.get("订单聚类分析_weight_unit") or "kg",
+                    config.get("订单聚类分析_n_clusters") or ORDER_CLUSTER_CONFIG['default_clusters'],
+                    config.get("订单聚类分析_a_percentage") or ABC_CONFIG['default_a_percentage'],
+                    config.get("订单聚类分析_b_percentage") or ABC_CONFIG['default_b_percentage'])
+            
+            if not results:
+                st.error("❌ 没有有效的订单明细")
+                return False
+            
+            summary = results['summary']
+            profile_table = results['profile_table']
+            st.info(f"📦 {summary['order_count']:,} 个订单、{summary['line_count']:,} 个拣选行，"
+                    f"按 {'、'.join(summary['features'])} 聚为 {summary['cluster_count']} 类"
+                    f"（{summary['iterations']} 次小批量迭代）")
+            
+            metric_columns = st.columns(min(len(profile_table), 4))
+            for column, (_, row) in zip(metric_columns, profile_table.iterrows()):
+                with column:
+                    st.metric(f"{row['聚类']}订单占比", f"{row['订单占比(%)']:.1f}%",
+                              delta=f"每单 {row['每单行数']:.1f} 行 / {row['每单件数']:.1f} 件", delta_color="off")
+            
+            st.write("**📋 聚类画像**")
+            st.dataframe(profile_table.round(2), use_container_width=True, hide_index=True)
+            
+            daily_table = results['daily_table']
+            if not daily_table.empty:
+                OrderClusterAnalyzer.render_daily_mix(daily_table)
+                st.write("**📋 每日聚类构成**")
+                st.dataframe(daily_table.round(dict.fromkeys(daily_table.columns[2:], 2)), use_container_width=True,
+                             hide_index=True)
+            
+            order_table = results['order_table']
+            preview = ORDER_CLUSTER_CONFIG['preview_orders']
+            st.write(f"**📋 订单聚类明细（前 {min(preview, len(order_table))} 个）**")
+            st.dataframe(order_table.head(preview).round(dict.fromkeys(summary['features'], 3)),
+                         use_container_width=True, hide_index=True)
+            
+            # 数据导出
+            st.subheader("📥 数据导出")
+            st.download_button(
+                label="📄 导出聚类画像(CSV)",
+                data=profile_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"订单聚类_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # 保存分析结果
+            self.analysis_results["订单聚类分析"] = results
+            
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ 订单聚类分析执行失败: {str(e)}")
             return False
     
-    def _add_eiq_ratios_to_summary(self, summary: Dict[str, Any]) -> None:
-        """将EIQ分析比值添加到出库分析统计摘要中"""
+    def _render_supplier_performance(self, config: Dict[str, Any], date_column: str, quantity_column: Optional[str],
+                                     start_date=None, end_date=None) -> Dict[str, Any]:
+        """
+        渲染入库供应商表现：交期、准时交货率、每次交货批量与综合排名
+        
+        Args:
+            config: 入库分析配置
+            date_column: 入库日期列名
+            quantity_column: 原始件数列名
+            start_date: 开始日期
+            end_date: 结束日期
+            
+        Returns:
+            Dict[str, Any]: SupplierPerformanceAnalyzer.analyze的结果，未选择供应商列时为空字典
+        """
+        try:
+            columns = {name: config.get(f"入库分析_{name}_column")
+                       for name in ['supplier', 'reference_date', 'delivery', 'box']}
+            
+            # 处理"无数据"选项
+            for name in columns:
+                if columns[name] == "无数据":
+                    columns[name] = None
+            if not columns['supplier']:
+                return {}
+            
+            st.subheader("🏭 供应商表现")
+            on_time_days = config.get("入库分析_on_time_days")
+            if on_time_days is None:
+                on_time_days = SUPPLIER_CONFIG['default_on_time_days']
+            with st.spinner("统计供应商表现..."):
+                results = SupplierPerformanceAnalyzer(config).analyze(
+                    self.df, columns['supplier'], date_column, columns['reference_date'], quantity_column,
+                    columns['box'], columns['delivery'], on_time_days, start_date, end_date)
+            if not results:
+                st.warning("⚠️ 没有有效的供应商入库记录")
+                return {}
+            
+            summary = results['summary']
+            supplier_table = results['supplier_table']
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("供应商数", f"{summary['supplier_count']:,}")
+            with col2:
+                st.metric("交货次数", f"{summary['delivery_count']:,}")
+            with col3:
+                st.metric("平均交期", f"{summary['mean_lead_days']:.1f} 天" if summary['lead_lines'] else "-")
+            with col4:
+                st.metric("准时交货率", f"{summary['on_time_rate']:.1f}%" if summary['lead_lines'] else "-",
+                          help=f"交期不超过 {on_time_days} 天的交货占比")
+            
+            if summary['lead_lines']:
+                if summary['lead_lines'] < summary['line_count']:
+                    st.caption(f"• {summary['line_count'] - summary['lead_lines']:,} 个入库行缺少下单/ASN日期，不计入交期")
+                SupplierPerformanceAnalyzer.render_supplier_chart(supplier_table)
+                st.caption(f"• 综合排名只包含交货次数不少于 {SUPPLIER_CONFIG['min_deliveries']} 次的 "
+                           f"{summary['ranked_suppliers']:,} 个供应商")
+            
+            preview = SUPPLIER_CONFIG['preview_suppliers']
+            st.write(f"**📋 供应商表现（前 {min(preview, len(supplier_table))} 个）**")
+            numeric_columns = supplier_table.select_dtypes('number').columns
+            st.dataframe(supplier_table.head(preview).round(dict.fromkeys(numeric_columns, 2)),
+                         use_container_width=True, hide_index=True)
+            st.download_button(
+                label="📄 导出供应商表现(CSV)",
+                data=supplier_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"供应商表现_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            return results
+            
+        except Exception as e:
+            st.warning(f"⚠️ 供应商表现分析失败: {str(e)}")
+            return {}
+    
+    def _render_customer_demand(self, config: Dict[str, Any], date_column: str, order_id_column: Optional[str],
+                                item_column: Optional[str], start_date=None, end_date=None) -> Dict[str, Any]:
+        """
+        渲染出库客户需求：客户下单频次、行数、件数、客户ABC分类和集中度曲线
+        
+        Args:
+            config: 出库分析配置
+            date_column: 出库日期列名
+            order_id_column: 原始订单号列名
+            item_column: 原始件数列名
+            start_date: 开始日期
+            end_date: 结束日期
+            
+        Returns:
+            Dict[str, Any]: CustomerDemandAnalyzer.analyze的结果，未选择客户列时为空字典
+        """
+        try:
+            customer_column = config.get("出库分析_customer_column")
+            if not customer_column or customer_column == "无数据":
+                return {}
+            
+            st.subheader("👥 客户需求")
+            mode = config.get("出库分析_customer_mode") or "exact"
+            top_n = int(config.get("出库分析_customer_top_n") or CUSTOMER_DEMAND_CONFIG['default_top_n'])
+            a_percentage = config.get("出库分析_customer_a_percentage") or CUSTOMER_DEMAND_CONFIG['default_a_percentage']
+            b_percentage = config.get("出库分析_customer_b_percentage") or CUSTOMER_DEMAND_CONFIG['default_b_percentage']
+            with st.spinner("统计客户需求..."):
+                results = CustomerDemandAnalyzer(config).analyze(
+                    self.df, date_column, customer_column, order_id_column, item_column, start_date, end_date,
+                    mode, top_n, a_percentage, b_percentage)
+            if not results:
+                st.warning("⚠️ 没有有效的客户出库记录")
+                return {}
+            
+            summary = results['summary']
+            concentration = results['concentration']
+            approximate = summary['mode'] == "approximate"
+            unit_label = "件数" if item_column else "行数"
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                if approximate:
+                    st.metric("跟踪客户数", f"{summary['tracked_customers']:,}",
+                              help=f"每天保留件数前 {summary['counters']:,} 的客户，范围内至少保留过一天的客户数")
+                else:
+                    st.metric("客户数", f"{summary['customer_count']:,}")
+            with col2:
+                st.metric(f"总{unit_label}", f"{summary['total_units']:,.0f}")
+            with col3:
+                if approximate:
+                    st.metric(f"Top-{top_n}客户{unit_label}占比", f"{results['customer_table']['件数占比(%)'].sum():.1f}%",
+                              help="按估计值（下限）计算")
+                else:
+                    top_share = CUSTOMER_DEMAND_CONFIG['top_shares'][-1]
+                    st.metric(f"前{top_share}%客户{unit_label}占比", f"{concentration['top_shares'][top_share]:.1f}%")
+            with col4:
+                if approximate:
+                    st.metric("误差上限", f"{summary['error_bound']:,.0f}",
+                              help="范围内各天阈值（当天第K+1大的件数）之和；每个客户只累加其未被保留的日期，见明细中的件数上限")
+                else:
+                    st.metric("基尼系数", f"{concentration['gini']:.3f}", help="越接近1需求越集中在少数客户")
+            
+            if not approximate:
+                st.caption("• " + "，".join(f"前{share}%客户占{unit_label} {value:.1f}%"
+                                            for share, value in concentration['top_shares'].items()))
+            CustomerDemandAnalyzer.render_concentration_chart(concentration['curve'], approximate)
+            
+            st.write("**📊 客户ABC分类**")
+            st.dataframe(results['class_table'].round(2), use_container_width=True, hide_index=True)
+            
+            customer_table = results['customer_table']
+            preview = CUSTOMER_DEMAND_CONFIG['preview_customers']
+            st.write(f"**📋 客户需求明细（前 {min(preview, len(customer_table))} 个）**")
+            numeric_columns = customer_table.select_dtypes('number').columns
+            st.dataframe(customer_table.head(preview).round(dict.fromkeys(numeric_columns, 2)),
+                         use_container_width=True, hide_index=True)
+            st.download_button(
+                label="📄 导出客户需求(CSV)",
+                data=customer_table.to_csv(index=False, encoding='utf-8-sig'),
+                file_name=f"客户需求_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            return results
+            
+        except Exception as e:
+            st.warning(f"⚠️ 客户需求分析失败: {str(e)}")
+            return {}
+    
+    def _render_seasonality(self, daily_data: pd.DataFrame, date_column: str, label: str) -> Dict[str, Any]:
+        """
+        渲染出入库日聚合指标的季节性与趋势分解
+        
+        Args:
+            daily_data: 日聚合数据
+            date_column: 日期列名
+            label: 分析类型标签（出库/入库）
+            
+        Returns:
+            Dict[str, Any]: SeasonalDecomposer.analyze的结果，天数不足时为空字典
+        """
+        try:
+            metrics = [col for col in daily_data.columns
+                       if col != date_column and pd.api.types.is_numeric_dtype(daily_data[col])]
+            matrix = SeasonalDecomposer.frame_to_matrix(daily_data, date_column, metrics) if metrics else {}
+            if not matrix:
+                return {}
+            
+            results = SeasonalDecomposer.analyze(matrix['values'], matrix['dates'], metrics, '指标')
+            if not results:
+                return {}
+            
+            st.subheader(f"🌊 {label}季节性与趋势")
+            st.dataframe(results['summary'], use_container_width=True, hide_index=True)
+            for message in SeasonalDecomposer.insights(results['summary'], '指标'):
+                st.write(message)
+            
+            with st.expander("📈 查看分解图"):
+                selected = st.selectbox("选择指标", options=metrics, key=f"seasonality_metric_{label}")
+                position = metrics.index(selected)
+                SeasonalDecomposer.render_decomposition_chart(
+                    matrix['values'][:, position], matrix['dates'], f"{selected}：趋势与周季节分解"
+                )
+            
+            return results
+            
+        except Exception as e:
+            st.warning(f"⚠️ 季节性分解失败: {str(e)}")
+            return {}
+    
+    def _render_period_rollups(self, daily_cube, date_column: str, label: str) -> Dict[str, pd.DataFrame]:
+        """
+        渲染日/周/月/季度多粒度汇总（所有粒度一次性由日聚合立方体上卷得到）
+        
+        Args:
+            daily_cube: 日聚合立方体（原始明细数据时由分析器构建，聚合数据时为None）
+            date_column: 日期列名
+            label: 分析类型标签（出库/入库）
+            
+        Returns:
+            Dict[str, pd.DataFrame]: {粒度键: 周期汇总表}
+        """
+        if daily_cube is None:
+            return {}
+        
+        try:
+            period_rollups = daily_cube.rollup_all(date_column)
+            
+            st.subheader(f"🗓️ {label}多粒度汇总")
+            periods = EIQ_CONFIG['analysis_periods']
+            tabs = st.tabs(list(periods.values()))
+            for tab, granularity in zip(tabs, periods.keys()):
+                with tab:
+                    rollup = period_rollups[granularity]
+                    display_df = rollup.drop(columns=[date_column])
+                    st.dataframe(display_df, use_container_width=True)
+            
+            return period_rollups
+            
+        except Exception as e:
+            st.warning(f"⚠️ 多粒度汇总计算失败: {str(e)}")
+            return {}
+    
+    def _render_capacity_planning(self, daily_data: pd.DataFrame, date_column: str, label: str,
+                                  eiq_ratios: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        渲染容量规划：分位数设计日、联合设计日及增长/峰值场景对比
+        
+        Args:
+            daily_data: 日聚合数据
+            date_column: 日期列名
+            label: 分析类型标签（出库/入库）
+            eiq_ratios: 统计摘要中的EIQ比值（用于与设计日比例对比）
+            
+        Returns:
+            Dict[str, Any]: 容量规划结果，无可用指标时为空字典
+        """
+        try:
+            if not CapacityPlanner.metric_columns(daily_data):
+                return {}
+            
+            st.subheader(f"🏗️ {label}容量规划")
+            metric_names = CAPACITY_PLANNING_CONFIG['metrics']
+            
+            # 场景表可编辑，修改后所有场景一次性重新计算
+            st.write("**🎯 增长/峰值场景**")
+            scenarios = st.data_editor(
+                CapacityPlanner.build_scenarios(),
+                num_rows="dynamic",
+                use_container_width=True,
+                key=f"capacity_scenarios_{label}"
+            )
+            plan = CapacityPlanner.plan(daily_data, date_column, scenarios.dropna(how='all'), eiq_ratios)
+            if not plan:
+                return {}
+            
+            # 分位数设计日及其隐含比值
+            st.write("**📐 设计日**")
+            design_display = plan['base_table'].round(0).join(plan['ratios'])
+            st.dataframe(design_display.rename(columns=metric_names), use_container_width=True)
+            
+            joint = plan['joint_design_day']
+            if joint:
+                joint_date = joint['date']
+                joint_date_str = joint_date.strftime('%Y-%m-%d') if hasattr(joint_date, 'strftime') else str(joint_date)
+                st.info(f"📌 联合P{joint['percentile']:g}设计日取真实日期 {joint_date_str}（负荷指数 {joint['load_index']:.2f}），"
+                        f"保留当天{'/'.join(metric_names[m] for m in plan['metrics'])}的比例关系")
+            if eiq_ratios:
+                st.caption("EIQ平均比值：" + "，".join(f"{name} {data['ratio']:.2f}" for name, data in eiq_ratios.items()))
+            
+            # 场景结果对比
+            scenario_results = plan['scenario_results']
+            if not scenario_results.empty:
+                levels = plan['base_table'].index.tolist()
+                default_level = f"P{CAPACITY_PLANNING_CONFIG['joint_percentile']:g}"
+                level = st.selectbox(
+                    "选择设计日",
+                    levels,
+                    index=levels.index(default_level) if default_level in levels else 0,
+                    key=f"capacity_level_{label}"
+                )
+                level_results = scenario_results[scenario_results['设计日'] == level]
+                st.dataframe(
+                    level_results.drop(columns=['设计日']).rename(columns=metric_names),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                st.download_button(
+                    label=f"📄 导出{label}容量规划场景(CSV)",
+                    data=scenario_results.rename(columns=metric_names).to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"{label}容量规划_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+            
+            return plan
+            
+        except Exception as e:
+            st.warning(f"⚠️ 容量规划计算失败: {str(e)}")
+            return {}
+    
+    def _add_eiq_ratios_to_summary(self, summary: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """将EIQ分析比值添加到出库分析统计摘要中，返回计算出的比值（含分子、分母列）供容量规划复用"""
+        eiq_ratios = {}
         try:
             # 分析可用的数据维度
             available_dimensions = []
@@ -848,10 +2602,9 @@ class AnalysisEngine:
                 dimension_data["件数"] = summary["件数/天"]
             
             if len(available_dimensions) < 2:
-                return
+                return eiq_ratios
             
             # 计算EIQ比值
-            eiq_ratios = {}
             
             # 行单比 = SKU数/天 ÷ 订单数/天
             if "订单" in available_dimensions and "SKU" in available_dimensions:
@@ -862,6 +2615,7 @@ class AnalysisEngine:
                     ratio = sku_avg / order_avg
                     eiq_ratios["行单比"] = {
                         "ratio": ratio,
+                        "columns": ("SKU数/天", "订单数/天"),
                         "description": "平均每个订单包含的SKU数量",
                         "interpretation": self._interpret_ratio("行单比", ratio)
                     }
@@ -875,6 +2629,7 @@ class AnalysisEngine:
                     ratio = item_avg / sku_avg
                     eiq_ratios["件行比"] = {
                         "ratio": ratio,
+                        "columns": ("件数/天", "SKU数/天"),
                         "description": "平均每个SKU的出库件数",
                         "interpretation": self._interpret_ratio("件行比", ratio)
                     }
@@ -888,6 +2643,7 @@ class AnalysisEngine:
                     ratio = item_avg / order_avg
                     eiq_ratios["件单比"] = {
                         "ratio": ratio,
+                        "columns": ("件数/天", "订单数/天"),
                         "description": "平均每个订单的件数",
                         "interpretation": self._interpret_ratio("件单比", ratio)
                     }
@@ -909,6 +2665,8 @@ class AnalysisEngine:
                         
         except Exception as e:
             st.warning(f"⚠️ EIQ比值计算失败: {str(e)}")
+        
+        return eiq_ratios
     
     def _interpret_ratio(self, ratio_type: str, ratio_value: float) -> str:
         """解释比值结果"""
@@ -1010,7 +2768,7 @@ class AnalysisEngine:
                 return False
                 
             # 创建分析器
-            analyzer = InboundAnalyzer(config)
+            analyzer = InboundAnalyzer({**config, 'source_fingerprint': self.source_fingerprint})
             
             # 执行增强分析（支持原始和聚合数据）
             daily_data, summary = analyzer.analyze_batch_enhanced(
@@ -1037,6 +2795,12 @@ class AnalysisEngine:
                 date_info = summary.get('date_range', {})
                 st.info(f"📅 分析时间范围：{date_info.get('start_date')} 至 {date_info.get('end_date')}，共 {date_info.get('total_days', 0)} 天")
                 
+                # 近似去重模式提示误差范围
+                distinct_info = summary.get('distinct_count')
+                if distinct_info:
+                    st.caption(f"≈ {'、'.join(distinct_info['metrics'])} 使用HyperLogLog近似去重"
+                               f"（精度p={distinct_info['precision']}，相对标准误差约 ±{distinct_info['relative_error']:.2%}）")
+                
                 # 显示各维度统计
                 for col, stats in summary.items():
                     if isinstance(stats, dict) and 'total' in stats:
@@ -1062,6 +2826,22 @@ class AnalysisEngine:
                                 help=f"最高值: {max_val:.0f} ({max_date_str})\n最低值: {min_val:.0f} ({min_date_str})"
                             )
             
+            # 多粒度上卷（基于日聚合立方体，切换粒度无需重新扫描明细）
+            period_rollups = self._render_period_rollups(analyzer.daily_cube, date_column, "入库")
+            
+            # 设计日与增长场景容量规划
+            capacity_plan = self._render_capacity_planning(daily_data, date_column, "入库")
+            
+            # 季节性与趋势分解，结论并入优化建议
+            seasonality = self._render_seasonality(daily_data, date_column, "入库")
+            suggestions = analyzer.generate_optimization_suggestions(
+                daily_data, summary, seasonality.get('summary') if seasonality else None
+            )
+            
+            # 供应商表现（选择了供应商列时）
+            supplier_performance = self._render_supplier_performance(config, date_column, quantity_column,
+                                                                     start_date, end_date)
+            
             # 提供数据下载
             st.subheader("📥 数据导出")
             csv_data = daily_data.to_csv(index=False, encoding='utf-8-sig')
@@ -1077,7 +2857,12 @@ class AnalysisEngine:
             self.analysis_results["入库分析"] = {
                 "daily_data": daily_data,
                 "summary": summary,
-                "suggestions": []
+                "daily_cube": analyzer.daily_cube,
+                "period_rollups": period_rollups,
+                "capacity_plan": capacity_plan,
+                "seasonality": seasonality,
+                "suggestions": suggestions,
+                "supplier_performance": supplier_performance
             }
             
             return True
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+容量规划模块 - 基于出入库日聚合表计算设计日与增长场景
+各指标分位数设计日一次计算；联合设计日取真实日期，保留当天订单/行/件之间的比例关系；
+所有增长/峰值场景以乘数向量广播，一次得到全部场景结果
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Any, Optional
+from config import CAPACITY_PLANNING_CONFIG
+
+class CapacityPlanner:
+    """容量规划计算工具"""
+
+    @staticmethod
+    def metric_columns(daily_data: pd.DataFrame) -> List[str]:
+        """
+        获取日聚合表中可用于容量规划的指标列
+
+        Args:
+            daily_data: 日聚合数据
+
+        Returns:
+            List[str]: 指标列名（按配置顺序）
+        """
+        return [col for col in CAPACITY_PLANNING_CONFIG['metrics'] if col in daily_data.columns]
+
+    @staticmethod
+    def design_days(daily_data: pd.DataFrame, metrics: List[str],
+                    percentiles: Optional[List[float]] = None) -> pd.DataFrame:
+        """
+        计算各指标的分位数设计日（各指标独立取分位数）
+
+        Args:
+            daily_data: 日聚合数据
+            metrics: 指标列名
+            percentiles: 分位数列表
+
+        Returns:
+            pd.DataFrame: 行为设计日（P50、P80...），列为指标
+        """
+        if percentiles is None:
+            percentiles = CAPACITY_PLANNING_CONFIG['percentiles']
+        values = daily_data[metrics].to_numpy(dtype=np.float64)
+        table = np.nanpercentile(values, percentiles, axis=0)
+        return pd.DataFrame(table, index=[f"P{p:g}" for p in percentiles], columns=metrics)
+
+    @staticmethod
+    def joint_design_day(daily_data: pd.DataFrame, date_column: str, metrics: List[str],
+                         percentile: Optional[float] = None) -> Dict[str, Any]:
+        """
+        计算联合设计日：以各指标相对其分位数设计值的平均负荷排序，取该分位的真实日期
+
+        Args:
+            daily_data: 日聚合数据
+            date_column: 日期列名
+            metrics: 指标列名
+            percentile: 分位数
+
+        Returns:
+            Dict[str, Any]: 日期、各指标取值、负荷指数
+        """
+        if percentile is None:
+            percentile = CAPACITY_PLANNING_CONFIG['joint_percentile']
+        values = daily_data[metrics].to_numpy(dtype=np.float64)
+        targets = np.nanpercentile(values, percentile, axis=0)
+
+        # 负荷指数 = 各指标取值 / 分位数设计值 的平均（设计值为0的指标不参与）
+        usable = targets > 0
+        if not usable.any():
+            return {}
+        load = np.nanmean(values[:, usable] / targets[usable], axis=1)
+        valid_days = np.flatnonzero(~np.isnan(load))
+        if valid_days.size == 0:
+            return {}
+
+        # 最近秩法：取负荷排序后第ceil(p%×n)个真实日期
+        order = valid_days[np.argsort(load[valid_days], kind='stable')]
+        rank = min(max(int(np.ceil(percentile / 100 * order.size)) - 1, 0), order.size - 1)
+        day = order[rank]
+        return {
+            'date': daily_data[date_column].iloc[day],
+            'percentile': percentile,
+            'values': pd.Series(values[day], index=metrics),
+            'load_index': float(load[day])
+        }
+
+    @staticmethod
+    def build_scenarios(growth_rates: Optional[List[float]] = None,
+                        peak_factors: Optional[List[float]] = None) -> pd.DataFrame:
+        """
+        生成增长率 × 峰值系数的全组合场景
+
+        Args:
+            growth_rates: 业务增长率(%)列表
+            peak_factors: 峰值系数列表
+
+        Returns:
+            pd.DataFrame: 场景表（场景、业务增长(%)、峰值系数）
+        """
+        if growth_rates is None:
+            growth_rates = CAPACITY_PLANNING_CONFIG['growth_rates']
+        if peak_factors is None:
+            peak_factors = CAPACITY_PLANNING_CONFIG['peak_factors']
+        growth, peak = np.meshgrid(np.asarray(growth_rates, dtype=np.float64),
+                                   np.asarray(peak_factors, dtype=np.float64), indexing='ij')
+        growth, peak = growth.ravel(), peak.ravel()
+        return pd.DataFrame({
+            '场景': [f"增长{g:g}%×峰值{p:g}" for g, p in zip(growth, peak)],
+            '业务增长(%)': growth,
+            '峰值系数': peak
+        })
+
+    @staticmethod
+    def evaluate_scenarios(base_table: pd.DataFrame, scenarios: pd.DataFrame) -> pd.DataFrame:
+        """
+        一次性计算所有场景下的设计值（场景乘数 × 基准设计值，广播计算）
+
+        Args:
+            base_table: 基准设计值表（行为设计日，列为指标）
+            scenarios: 场景表（业务增长(%)、峰值系数）
+
+        Returns:
+            pd.DataFrame: 长表，每个场景 × 设计日一行
+        """
+        if base_table.empty or scenarios.empty:
+            return pd.DataFrame()
+
+        growth = pd.to_numeric(scenarios['业务增长(%)'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        peak = pd.to_numeric(scenarios['峰值系数'], errors='coerce').fillna(1).to_numpy(dtype=np.float64)
+        multipliers = (1 + growth / 100) * peak
+
+        base = base_table.to_numpy(dtype=np.float64)
+        n_scenarios, n_levels = len(multipliers), base.shape[0]
+        # (场景, 设计日, 指标)
+        projected = multipliers[:, None, None] * base[None, :, :]
+
+        result = pd.DataFrame({
+            '场景': np.repeat(scenarios['场景'].astype(str).to_numpy(), n_levels),
+            '业务增长(%)': np.repeat(growth, n_levels),
+            '峰值系数': np.repeat(peak, n_levels),
+            '综合乘数': np.repeat(multipliers.round(4), n_levels),
+            '设计日': np.tile(base_table.index.astype(str).to_numpy(), n_scenarios)
+        })
+        flat = projected.reshape(n_scenarios * n_levels, -1)
+        for i, col in enumerate(base_table.columns):
+            result[col] = np.ceil(flat[:, i])
+        return result
+
+    @staticmethod
+    def implied_ratios(table: pd.DataFrame, eiq_ratios: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        """
+        计算设计值表每一行隐含的EIQ比值（用于对比各指标独立取分位数时比例关系的偏离）
+
+        Args:
+            table: 行为设计日、列为指标的表
+            eiq_ratios: 统计摘要中的EIQ比值（AnalysisEngine._add_eiq_ratios_to_summary的结果，含分子、分母列）
+
+        Returns:
+            pd.DataFrame: 行与输入一致，列为可计算的EIQ比值
+        """
+        ratios = pd.DataFrame(index=table.index)
+        for name, data in eiq_ratios.items():
+            numerator, denominator = data['columns']
+            if numerator in table.columns and denominator in table.columns:
+                denom = table[denominator].astype(float).replace(0, np.nan)
+                ratios[name] = (table[numerator].astype(float) / denom).round(2)
+        return ratios
+
+    @staticmethod
+    def plan(daily_data: pd.DataFrame, date_column: str, scenarios: Optional[pd.DataFrame] = None,
+             eiq_ratios: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        生成完整容量规划结果
+
+        Args:
+            daily_data: 日聚合数据
+            date_column: 日期列名
+            scenarios: 场景表（为空时使用配置生成的默认场景）
+            eiq_ratios: 统计摘要中的EIQ比值，为空时不计算设计日隐含比值
+
+        Returns:
+            Dict[str, Any]: 设计日表、联合设计日、基准表、场景结果；无可用指标时为空字典
+        """
+        metrics = CapacityPlanner.metric_columns(daily_data)
+        if not metrics or daily_data.empty:
+            return {}
+
+        design_table = CapacityPlanner.design_days(daily_data, metrics)
+        joint = CapacityPlanner.joint_design_day(daily_data, date_column, metrics)
+
+        # 基准表 = 各分位数设计日 + 联合设计日（真实日期）
+        base_table = design_table.copy()
+        if joint:
+            base_table.loc[f"联合P{joint['percentile']:g}"] = joint['values']
+
+        if scenarios is None:
+            scenarios = CapacityPlanner.build_scenarios()
+
+        return {
+            'metrics': metrics,
+            'design_table': design_table,
+            'joint_design_day': joint,
+            'base_table': base_table,
+            'ratios': CapacityPlanner.implied_ratios(base_table, eiq_ratios or {}),
+            'scenarios': scenarios,
+            'scenario_results': CapacityPlanner.evaluate_scenarios(base_table, scenarios)
+        }
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+客户需求模块 - 按客户统计下单频次、行数、件数，客户ABC分类和集中度曲线
+明细只聚合一次为按日排序的(日, 客户)单元；切换日期范围时只对范围内的连续单元bincount，无需重新扫描明细。
+客户数达到百万级时可用近似Top-N模式：每天只缓存件数前K的精确单元，范围查询合并各天单元；
+客户某天未进入前K时，当天最多少计第K+1大的件数（当天阈值），故低估量不超过该客户未保留日期的阈值之和
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, Optional, Tuple
+from core.abc_analysis import ABCAnalyzer
+from core.date_index import SortedDateIndex, NS_PER_DAY
+from core.frame_cache import FrameCache
+from core.key_index import KeyIndex
+from config import CUSTOMER_DEMAND_CONFIG
+
+ABC_LABELS = ['A', 'B', 'C']
+
+class CustomerDemandCube(FrameCache):
+    """按日排序的(日, 客户)需求单元"""
+
+    def __init__(self, df: pd.DataFrame, date_column: str, customer_column: str, order_column: Optional[str] = None,
+                 quantity_column: Optional[str] = None, counters: Optional[int] = None):
+        """
+        构建需求单元（一次排序；近似模式下每天只缓存件数前counters个单元）
+
+        近似模式仍先完成精确聚合，构建期间的临时内存与精确模式相同，缓存的单元数不超过 天数×counters
+
+        Args:
+            df: 出库明细（每行一个拣选行）
+            date_column: 日期列名
+            customer_column: 客户列名
+            order_column: 订单号列名，为空时不统计订单数
+            quantity_column: 件数列名，为空时每行计1件
+            counters: 每天保留的单元数，为空时保留全部单元（精确模式）
+        """
+        super().__init__(df)
+        self.counters = counters
+        date_index = SortedDateIndex.for_frame(df, date_column)
+        customer_index = KeyIndex.for_frame(df, customer_column)
+        self.customers = customer_index.keys
+        n_customers = customer_index.n_keys
+
+        positions = date_index.positions
+        codes = customer_index.codes[positions]
+        valid = codes >= 0
+        positions, codes = positions[valid], codes[valid]
+        days = np.floor_divide(date_index.sorted_values[valid], NS_PER_DAY)
+        if quantity_column:
+            units = pd.to_numeric(df[quantity_column].iloc[positions], errors='coerce')
+            units = np.nan_to_num(units.to_numpy(dtype=np.float64, na_value=np.nan), nan=0.0)
+        else:
+            units = np.ones(positions.size)
+        # 订单计入其首个拣选行（按日期）所在的单元
+        first_order_rows = np.zeros(positions.size)
+        if order_column:
+            order_codes = KeyIndex.for_frame(df, order_column).codes[positions]
+            has_order = np.flatnonzero(order_codes >= 0)
+            first = np.full(int(order_codes.max()) + 1 if has_order.size else 0, positions.size)
+            np.minimum.at(first, order_codes[has_order], has_order)
+            first_order_rows[first[first < positions.size]] = 1
+
+        # (日, 客户) 合成一个int64键，一次排序得到按日排序的单元
+        first_day = int(days[0]) if days.size else 0
+        keys = (days - first_day) * n_customers + codes
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])) if keys.size \
+            else np.zeros(0, dtype=np.int64)
+        cell_keys = sorted_keys[starts]
+        cell_day = cell_keys // max(n_customers, 1) + first_day
+        cell_customer = cell_keys % max(n_customers, 1)
+        cell_lines = np.diff(np.append(starts, keys.size)).astype(np.float64)
+        cell_units = np.add.reduceat(units[order], starts) if keys.size else np.zeros(0)
+        cell_orders = np.add.reduceat(first_order_rows[order], starts) if keys.size else np.zeros(0)
+
+        # 每日合计（集中度的分母，两种模式都精确）
+        self.days, day_starts = np.unique(cell_day, return_index=True)
+        self.day_lines = np.add.reduceat(cell_lines, day_starts) if day_starts.size else np.zeros(0)
+        self.day_units = np.add.reduceat(cell_units, day_starts) if day_starts.size else np.zeros(0)
+        self.day_orders = np.add.reduceat(cell_orders, day_starts) if day_starts.size else np.zeros(0)
+
+        if counters:
+            # 每天按件数保留前counters个单元（件数不扣减）；当天阈值为第counters+1大的件数，
+            # 即当天未保留的任一客户件数的上限，没有被丢弃单元的日期阈值为0
+            rank_order = np.lexsort((-cell_units, cell_day))
+            day_codes = np.searchsorted(self.days, cell_day[rank_order])
+            rank = np.arange(rank_order.size) - day_starts[day_codes]
+            day_sizes = np.diff(np.append(day_starts, cell_day.size))
+            threshold_rows = day_starts + counters
+            sorted_units = cell_units[rank_order]
+            self.day_thresholds = np.where(day_sizes > counters,
+                                           sorted_units[np.minimum(threshold_rows, cell_day.size - 1)], 0.0)
+            kept = rank < counters
+            self.cell_day = cell_day[rank_order][kept]
+            self.cell_customer = cell_customer[rank_order][kept]
+            self.cell_units = sorted_units[kept]
+            self.cell_thresholds = self.day_thresholds[day_codes][kept]
+            self.cell_lines = self.cell_orders = None
+        else:
+            self.day_thresholds = np.zeros(self.days.size)
+            self.cell_thresholds = np.zeros(cell_day.size)
+            self.cell_day, self.cell_customer = cell_day, cell_customer
+            self.cell_lines, self.cell_units, self.cell_orders = cell_lines, cell_units, cell_orders
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame, date_column: str, customer_column: str, order_column: Optional[str] = None,
+                  quantity_column: Optional[str] = None, counters: Optional[int] = None) -> 'CustomerDemandCube':
+        """
+        获取数据框的需求单元（同一数据框同一组参数只构建一次）
+
+        Args:
+            df: 出库明细
+            date_column: 日期列名
+            customer_column: 客户列名
+            order_column: 订单号列名
+            quantity_column: 件数列名
+            counters: 每天保留的单元数，为空时为精确模式
+
+        Returns:
+            CustomerDemandCube: 需求单元
+        """
+        return cls._cached(df, date_column, customer_column, order_column, quantity_column, counters)
+
+    @property
+    def n_customers(self) -> int:
+        """客户数"""
+        return len(self.customers)
+
+    def bounds(self, start_date=None, end_date=None) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """
+        定位日期范围（含首尾两天）对应的日序号范围和单元范围
+
+        Args:
+            start_date: 开始日期，为空时不限
+            end_date: 结束日期，为空时不限
+
+        Returns:
+            tuple: ((日起, 日止), (单元起, 单元止))
+        """
+        lower = SortedDateIndex._day_start_ns(start_date) // NS_PER_DAY if start_date else np.iinfo(np.int64).min
+        upper = SortedDateIndex._day_start_ns(end_date) // NS_PER_DAY + 1 if end_date else np.iinfo(np.int64).max
+        day_range = np.searchsorted(self.days, [lower, upper], side='left')
+        cell_range = np.searchsorted(self.cell_day, [lower, upper], side='left')
+        return (int(day_range[0]), int(day_range[1])), (int(cell_range[0]), int(cell_range[1]))
+
+class CustomerDemandAnalyzer:
+    """客户需求分析器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化客户需求分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def concentration(units: np.ndarray, total: float) -> Dict:
+        """
+        计算集中度曲线、基尼系数和头部客户件数占比
+
+        Args:
+            units: 按件数降序排列的客户件数
+            total: 全部客户的件数合计（近似模式下units只含头部客户）
+
+        Returns:
+            dict: curve（客户占比、件数累计占比，已抽稀）、gini、top_shares
+        """
+        cumulative = np.cumsum(units) / max(total, 1e-12) * 100
+        n = units.size
+        points = np.unique(np.linspace(0, n - 1, min(n, CUSTOMER_DEMAND_CONFIG['curve_points'])).astype(np.int64))
+        curve = pd.DataFrame({'客户数': points + 1, '客户占比(%)': (points + 1) / n * 100,
+                              '件数累计占比(%)': cumulative[points]})
+        # 洛伦兹曲线面积（梯形法），降序累计时基尼系数 = 2 × 面积 - 1
+        area = (np.sum(cumulative) - cumulative[-1] / 2) / n / 100 if n else 0.5
+        top_shares = {}
+        for share in CUSTOMER_DEMAND_CONFIG['top_shares']:
+            count = max(int(np.ceil(n * share / 100)), 1)
+            top_shares[share] = float(cumulative[min(count, n) - 1]) if n else 0.0
+        return {'curve': curve, 'gini': 2 * area - 1 if n > 1 else 0.0, 'top_shares': top_shares}
+
+    @staticmethod
+    def classify_shares(cumulative: np.ndarray, a_percentage: float, b_percentage: float) -> np.ndarray:
+        """
+        按件数累计占比分类（与ABCAnalyzer.classify的规则一致，用于只有头部客户的近似模式）
+
+        Args:
+            cumulative: 件数累计占比(%)
+            a_percentage: A类累计百分比
+            b_percentage: B类累计百分比
+
+        Returns:
+            np.ndarray: 类别编码（0=A, 1=B, 2=C）
+        """
+        return np.where(cumulative <= a_percentage, 0, np.where(cumulative <= a_percentage + b_percentage, 1, 2))
+
+    def analyze(self, df: pd.DataFrame, date_column: str, customer_column: str, order_column: Optional[str] = None,
+                quantity_column: Optional[str] = None, start_date=None, end_date=None, mode: str = "exact",
+                top_n: int = 100, a_percentage: float = 70, b_percentage: float = 20) -> Dict:
+        """
+        执行客户需求分析
+
+        Args:
+            df: 出库明细（每行一个拣选行）
+            date_column: 日期列名
+            customer_column: 客户列名
+            order_column: 订单号列名
+            quantity_column: 件数列名
+            start_date: 开始日期
+            end_date: 结束日期
+            mode: 'exact'（全部客户）或 'approximate'（每天前K单元合并的近似Top-N）
+            top_n: 近似模式输出的头部客户数
+            a_percentage: A类累计百分比
+            b_percentage: B类累计百分比
+
+        Returns:
+            dict: summary、customer_table、class_table、concentration，无有效数据时为空字典
+        """
+        try:
+            counters = top_n * CUSTOMER_DEMAND_CONFIG['counter_factor'] if mode == "approximate" else None
+            cube = CustomerDemandCube.for_frame(df, date_column, customer_column, order_column, quantity_column,
+                                                counters)
+            (day_lo, day_hi), (lo, hi) = cube.bounds(start_date, end_date)
+            total_units = float(cube.day_units[day_lo:day_hi].sum())
+            if hi <= lo or total_units <= 0:
+                return {}
+
+            customers = cube.cell_customer[lo:hi]
+            summary = {
+                'mode': mode,
+                'day_count': day_hi - day_lo,
+                'line_count': int(cube.day_lines[day_lo:day_hi].sum()),
+                'order_count': int(cube.day_orders[day_lo:day_hi].sum()) if order_column else None,
+                'total_units': total_units
+            }
+
+            if counters:
+                # 合并范围内各天保留的单元，估计值为保留件数之和（下限）；
+                # 上限 = 估计值 + 该客户未被保留的日期的阈值之和 = 估计值 + 范围阈值合计 - 保留日期的阈值之和
+                codes, inverse = np.unique(customers, return_inverse=True)
+                estimates = np.bincount(inverse, weights=cube.cell_units[lo:hi])
+                kept_thresholds = np.bincount(inverse, weights=cube.cell_thresholds[lo:hi])
+                error_bound = float(cube.day_thresholds[day_lo:day_hi].sum())
+                rank = np.argsort(-estimates, kind='stable')[:top_n]
+                units = estimates[rank]
+                cumulative = np.cumsum(units) / total_units * 100
+                classes = CustomerDemandAnalyzer.classify_shares(cumulative, a_percentage, b_percentage)
+                customer_table = pd.DataFrame({
+                    '排名': np.arange(1, rank.size + 1),
+                    '客户': np.asarray(cube.customers)[codes[rank]],
+                    '估计件数(下限)': units,
+                    '件数上限': units + np.maximum(error_bound - kept_thresholds[rank], 0.0),
+                    '件数占比(%)': units / total_units * 100,
+                    '累计占比(%)': cumulative,
+                    'ABC分类': np.array(ABC_LABELS)[classes]
+                })
+                summary.update({'customer_count': None, 'tracked_customers': int(codes.size),
+                                'counters': counters, 'error_bound': error_bound})
+            else:
+                n_customers = cube.n_customers
+                lines = np.bincount(customers, weights=cube.cell_lines[lo:hi], minlength=n_customers)
+                active = lines > 0
+                units_all = np.bincount(customers, weights=cube.cell_units[lo:hi], minlength=n_customers)
+                order_days = np.bincount(customers, minlength=n_customers)
+                first_day = np.full(n_customers, np.iinfo(np.int64).max)
+                last_day = np.full(n_customers, np.iinfo(np.int64).min)
+                np.minimum.at(first_day, customers, cube.cell_day[lo:hi])
+                np.maximum.at(last_day, customers, cube.cell_day[lo:hi])
+
+                rank = np.flatnonzero(active)[np.argsort(-units_all[active], kind='stable')]
+                units = units_all[rank]
+                classes = ABCAnalyzer.classify(units, a_percentage, b_percentage)
+                table = {
+                    '排名': np.arange(1, rank.size + 1),
+                    '客户': np.asarray(cube.customers)[rank],
+                    '下单天数': order_days[rank],
+                    '行数': lines[rank].astype(np.int64),
+                    '件数': units,
+                    '件数占比(%)': units / total_units * 100,
+                    '累计占比(%)': np.cumsum(units) / total_units * 100,
+                    'ABC分类': np.array(ABC_LABELS)[classes]
+                }
+                if order_column:
+                    orders = np.bincount(customers, weights=cube.cell_orders[lo:hi], minlength=n_customers)[rank]
+                    table['订单数'] = orders.astype(np.int64)
+                    table['每单行数'] = lines[rank] / np.maximum(orders, 1)
+                    table['每单件数'] = units / np.maximum(orders, 1)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    table['平均下单间隔(天)'] = np.where(order_days[rank] > 1, (last_day[rank] - first_day[rank])
+                                                   / (order_days[rank] - 1), np.nan)
+                table['首次下单日期'] = (first_day[rank] * NS_PER_DAY).view('datetime64[ns]')
+                table['最近下单日期'] = (last_day[rank] * NS_PER_DAY).view('datetime64[ns]')
+                customer_table = pd.DataFrame(table)
+                summary['customer_count'] = int(rank.size)
+
+            # 客户ABC分类汇总（近似模式只含头部客户，其余客户合计为"其他"）
+            class_rows = []
+            value_column = '件数' if '件数' in customer_table else '估计件数(下限)'
+            for code, label in enumerate(ABC_LABELS):
+                selected = customer_table['ABC分类'] == label
+                class_rows.append({'ABC分类': label, '客户数': int(selected.sum()),
+                                   '件数': customer_table.loc[selected, value_column].sum(),
+                                   '件数占比(%)': customer_table.loc[selected, value_column].sum() / total_units * 100})
+            if counters:
+                remainder = total_units - customer_table[value_column].sum()
+                class_rows.append({'ABC分类': '其他', '客户数': np.nan, '件数': remainder,
+                                   '件数占比(%)': remainder / total_units * 100})
+            class_table = pd.DataFrame(class_rows)
+            if summary['customer_count']:
+                class_table.insert(2, '客户占比(%)', class_table['客户数'] / summary['customer_count'] * 100)
+
+            concentration = CustomerDemandAnalyzer.concentration(units, total_units)
+            return {'summary': summary, 'customer_table': customer_table, 'class_table': class_table,
+                    'concentration': concentration}
+
+        except Exception as e:
+            st.error(f"❌ 客户需求计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_concentration_chart(curve: pd.DataFrame, approximate: bool = False):
+        """
+        渲染客户集中度曲线（精确模式横轴为客户占比，近似模式横轴为头部客户数）
+
+        Args:
+            curve: 集中度曲线
+            approximate: 是否为近似Top-N模式
+        """
+        x_column = '客户数' if approximate else '客户占比(%)'
+        fig = go.Figure(go.Scatter(x=curve[x_column], y=curve['件数累计占比(%)'], mode='lines', name='件数累计占比',
+                                   fill='tozeroy'))
+        if not approximate:
+            fig.add_trace(go.Scatter(x=[0, 100], y=[0, 100], mode='lines', name='均匀分布',
+                                     line={'dash': 'dash', 'color': 'gray'}))
+        fig.update_layout(title="客户件数集中度曲线", xaxis_title="头部客户数" if approximate else "客户占比(%)",
+                          yaxis_title="件数累计占比(%)", yaxis={'range': [0, 100]}, height=420)
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""
+日聚合立方体模块 - 一次构建日粒度聚合，周/月/季度粒度由立方体上卷得到
+可加指标直接求和，去重计数指标保存每日去重后的(天, 键)对，上卷时重新去重
+近似模式下去重计数指标保存每日HyperLogLog寄存器，上卷和跨文件合并时按位取最大值
+"""
+
+import json
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Tuple, Optional
+from core.time_series_kernel import TimeSeriesKernel
+from core.hyperloglog import HyperLogLog
+from config import EIQ_CONFIG
+
+# 周编码基准：1970-01-05是星期一
+_MONDAY_OFFSET = 4
+
+class DailyCube:
+    """日聚合立方体"""
+
+    def __init__(self, first_day: int, n_days: int, present_days: np.ndarray,
+                 metric_order: List[str], additive: Dict[str, np.ndarray],
+                 integer_metrics: List[str], distinct_pairs: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                 distinct_key_counts: Dict[str, int],
+                 hll_registers: Optional[Dict[str, np.ndarray]] = None,
+                 hll_precision: Optional[int] = None):
+        """
+        初始化日聚合立方体（一般通过DailyCube.build构建）
+
+        Args:
+            first_day: 首日天编码（1970-01-01起的天数）
+            n_days: 日期跨度天数
+            present_days: 每天是否有数据的掩码（长度n_days）
+            metric_order: 指标顺序（与日聚合表列顺序一致）
+            additive: 可加指标 {指标名: 每日合计数组}
+            integer_metrics: 需要保持整数类型的可加指标
+            distinct_pairs: 去重计数指标 {指标名: (天下标数组, 键编码数组)}，已去重
+            distinct_key_counts: 去重计数指标的键数量
+            hll_registers: 近似去重指标 {指标名: 每日HyperLogLog寄存器矩阵(n_days, 2^p)}
+            hll_precision: HyperLogLog精度p
+        """
+        self.first_day = first_day
+        self.n_days = n_days
+        self.present_days = present_days
+        self.metric_order = metric_order
+        self.additive = additive
+        self.integer_metrics = integer_metrics
+        self.distinct_pairs = distinct_pairs
+        self.distinct_key_counts = distinct_key_counts
+        self.hll_registers = hll_registers or {}
+        self.hll_precision = hll_precision
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, date_column: str,
+              metrics: Dict[str, Tuple[str, str]],
+              distinct_mode: str = 'exact', hll_precision: int = 14) -> 'DailyCube':
+        """
+        扫描一次原始数据构建日聚合立方体
+
+        Args:
+            df: 数据框
+            date_column: 日期列名
+            metrics: 指标字典 {结果列名: (源列名, 'nunique' 或 'sum')}
+            distinct_mode: 去重计数模式，'exact'精确 或 'approximate'近似(HyperLogLog)
+            hll_precision: 近似模式的寄存器位数p（相对误差约1.04/sqrt(2^p)）
+
+        Returns:
+            DailyCube: 日聚合立方体
+        """
+        valid_rows, day_idx, first_day, n_days = TimeSeriesKernel.prepare_day_index(df[date_column])
+        present_days = np.bincount(day_idx, minlength=n_days) > 0
+        all_valid = valid_rows.all()
+
+        additive = {}
+        integer_metrics = []
+        distinct_pairs = {}
+        distinct_key_counts = {}
+        hll_registers = {}
+        approximate = distinct_mode == 'approximate'
+        if approximate:
+            hll_precision = HyperLogLog.validate_precision(hll_precision)
+
+        for target_name, (source_column, agg_func) in metrics.items():
+            source = df[source_column] if all_valid else df[source_column][valid_rows]
+
+            if agg_func == 'nunique' and approximate:
+                key_valid, hashes = HyperLogLog.hash_values(source)
+                hll_registers[target_name] = HyperLogLog.build_registers(
+                    day_idx[key_valid], hashes, n_days, hll_precision
+                )
+            elif agg_func == 'nunique':
+                key_codes, n_keys = TimeSeriesKernel.factorize_keys(source)
+                pairs = TimeSeriesKernel.unique_group_key_pairs(day_idx, key_codes, n_keys)
+                n_keys = max(n_keys, 1)
+                distinct_pairs[target_name] = ((pairs // n_keys).astype(np.int32), pairs % n_keys)
+                distinct_key_counts[target_name] = n_keys
+            elif agg_func == 'sum':
+                numeric, is_integer = TimeSeriesKernel.to_numeric_values(source)
+                additive[target_name] = TimeSeriesKernel.sum_by_group(day_idx, numeric, n_days)
+                if is_integer:
+                    integer_metrics.append(target_name)
+            else:
+                raise ValueError(f"不支持的聚合方式: {agg_func}")
+
+        return cls(first_day, n_days, present_days, list(metrics.keys()), additive,
+                   integer_metrics, distinct_pairs, distinct_key_counts,
+                   hll_registers, hll_precision if approximate else None)
+
+    @classmethod
+    def merge(cls, cubes: List['DailyCube']) -> 'DailyCube':
+        """
+        合并多个立方体（如多个上传文件），日期范围取并集，同一天的数据合并
+
+        Args:
+            cubes: 指标一致的立方体列表
+
+        Returns:
+            DailyCube: 合并后的立方体
+        """
+        cubes = [cube for cube in cubes if cube.n_days > 0] or cubes[:1]
+        base = cubes[0]
+        for cube in cubes:
+            if cube.metric_order != base.metric_order:
+                raise ValueError(f"指标不一致，无法合并: {cube.metric_order} 与 {base.metric_order}")
+            if cube.distinct_pairs:
+                raise ValueError(f"精确去重指标无法跨文件合并: {list(cube.distinct_pairs)}，请使用近似去重模式")
+            if cube.hll_registers and cube.hll_precision != base.hll_precision:
+                raise ValueError("HyperLogLog精度不一致，无法合并")
+
+        if len(cubes) == 1:
+            return base
+
+        first_day = min(cube.first_day for cube in cubes)
+        n_days = max(cube.first_day + cube.n_days for cube in cubes) - first_day
+
+        present_days = np.zeros(n_days, dtype=bool)
+        additive = {name: np.zeros(n_days) for name in base.additive}
+        hll_registers = {
+            name: np.zeros((n_days, registers.shape[1]), dtype=np.uint8)
+            for name, registers in base.hll_registers.items()
+        }
+
+        for cube in cubes:
+            days = slice(cube.first_day - first_day, cube.first_day - first_day + cube.n_days)
+            present_days[days] |= cube.present_days
+            for name, values in cube.additive.items():
+                additive[name][days] += values
+            for name, registers in cube.hll_registers.items():
+                np.maximum(hll_registers[name][days], registers, out=hll_registers[name][days])
+
+        integer_metrics = [name for name in base.integer_metrics
+                           if all(name in cube.integer_metrics for cube in cubes)]
+
+        return cls(first_day, n_days, present_days, list(base.metric_order), additive,
+                   integer_metrics, {}, {}, hll_registers, base.hll_precision)
+
+    def slice(self, start_date, end_date) -> 'DailyCube':
+        """
+        按日期范围切片（含首尾两天），不重新扫描原始数据
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            DailyCube: 仅包含日期范围内数据的立方体
+        """
+        start = int(np.datetime64(pd.Timestamp(start_date).date(), 'D').astype(np.int64)) - self.first_day
+        end = int(np.datetime64(pd.Timestamp(end_date).date(), 'D').astype(np.int64)) - self.first_day + 1
+        start = min(max(start, 0), self.n_days)
+        end = min(max(end, start), self.n_days)
+
+        present_days = self.present_days[start:end]
+        if not present_days.any():
+            return DailyCube(0, 0, np.zeros(0, dtype=bool), list(self.metric_order),
+                             {name: np.zeros(0) for name in self.additive}, list(self.integer_metrics),
+                             {name: (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64))
+                              for name in self.distinct_pairs},
+                             dict(self.distinct_key_counts),
+                             {name: registers[:0] for name, registers in self.hll_registers.items()},
+                             self.hll_precision)
+
+        # 去掉首尾无数据的日期，保证首日有数据
+        present_idx = np.flatnonzero(present_days)
+        start, end = start + int(present_idx[0]), start + int(present_idx[-1]) + 1
+
+        distinct_pairs = {}
+        for name, (pair_days, pair_keys) in self.distinct_pairs.items():
+            # (天, 键)对按天排序，二分定位范围
+            lo, hi = np.searchsorted(pair_days, [start, end])
+            distinct_pairs[name] = (pair_days[lo:hi] - np.int32(start), pair_keys[lo:hi])
+
+        return DailyCube(
+            self.first_day + start, end - start, self.present_days[start:end], list(self.metric_order),
+            {name: values[start:end] for name, values in self.additive.items()},
+            list(self.integer_metrics), distinct_pairs, dict(self.distinct_key_counts),
+            {name: registers[start:end] for name, registers in self.hll_registers.items()},
+            self.hll_precision
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        序列化为数组字典（用于磁盘缓存）
+
+        Returns:
+            Dict[str, np.ndarray]: 数组字典，元数据以JSON字符串存于'meta'
+        """
+        meta = {
+            'first_day': self.first_day,
+            'n_days': self.n_days,
+            'metric_order': self.metric_order,
+            'integer_metrics': self.integer_metrics,
+            'distinct_key_counts': self.distinct_key_counts,
+            'hll_precision': self.hll_precision
+        }
+        arrays = {'meta': np.array(json.dumps(meta, ensure_ascii=False)), 'present_days': self.present_days}
+        # 数组键使用指标下标，避免中文文件名
+        for i, name in enumerate(self.metric_order):
+            if name in self.additive:
+                arrays[f'additive_{i}'] = self.additive[name]
+            elif name in self.hll_registers:
+                arrays[f'hll_{i}'] = self.hll_registers[name]
+            elif name in self.distinct_pairs:
+                arrays[f'pair_days_{i}'], arrays[f'pair_keys_{i}'] = self.distinct_pairs[name]
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'DailyCube':
+        """
+        从数组字典恢复立方体
+
+        Args:
+            arrays: to_arrays的结果
+
+        Returns:
+            DailyCube: 日聚合立方体
+        """
+        meta = json.loads(str(arrays['meta']))
+        additive, hll_registers, distinct_pairs = {}, {}, {}
+        for i, name in enumerate(meta['metric_order']):
+            if f'additive_{i}' in arrays:
+                additive[name] = arrays[f'additive_{i}']
+            elif f'hll_{i}' in arrays:
+                hll_registers[name] = arrays[f'hll_{i}']
+            elif f'pair_days_{i}' in arrays:
+                distinct_pairs[name] = (arrays[f'pair_days_{i}'], arrays[f'pair_keys_{i}'])
+        return cls(meta['first_day'], meta['n_days'], arrays['present_days'], meta['metric_order'],
+                   additive, meta['integer_metrics'], distinct_pairs, meta['distinct_key_counts'],
+                   hll_registers, meta['hll_precision'])
+
+    @property
+    def distinct_error(self) -> Dict[str, float]:
+        """近似去重指标的相对标准误差 {指标名: 误差}"""
+        if not self.hll_registers:
+            return {}
+        error = HyperLogLog.relative_error(self.hll_precision)
+        return {name: error for name in self.hll_registers}
+
+    @property
+    def day_codes(self) -> np.ndarray:
+        """立方体覆盖的全部天编码"""
+        return np.arange(self.n_days, dtype=np.int64) + self.first_day
+
+    def period_codes(self, granularity: str) -> np.ndarray:
+        """
+        计算每天所属周期的编码
+
+        Args:
+            granularity: 粒度（daily/weekly/monthly/quarterly）
+
+        Returns:
+            np.ndarray: 每天的周期编码（长度n_days）
+        """
+        day_codes = self.day_codes
+        if granularity == 'daily':
+            return day_codes
+        if granularity == 'weekly':
+            return (day_codes - _MONDAY_OFFSET) // 7
+        month_codes = day_codes.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        if granularity == 'monthly':
+            return month_codes
+        if granularity == 'quarterly':
+            return month_codes // 3
+        raise ValueError(f"不支持的分析粒度: {granularity}")
+
+    @staticmethod
+    def period_start_dates(period_codes: np.ndarray, granularity: str) -> pd.DatetimeIndex:
+        """
+        将周期编码转换为周期起始日期
+
+        Args:
+            period_codes: 周期编码
+            granularity: 粒度
+
+        Returns:
+            pd.DatetimeIndex: 周期起始日期
+        """
+        if granularity == 'daily':
+            return TimeSeriesKernel.day_codes_to_datetime(period_codes)
+        if granularity == 'weekly':
+            return TimeSeriesKernel.day_codes_to_datetime(period_codes * 7 + _MONDAY_OFFSET)
+        month_codes = period_codes * 3 if granularity == 'quarterly' else period_codes
+        return pd.DatetimeIndex(month_codes.astype('datetime64[M]').astype('datetime64[D]'))
+
+    @staticmethod
+    def period_labels(start_dates: pd.DatetimeIndex, granularity: str) -> List[str]:
+        """生成周期显示标签"""
+        if granularity == 'weekly':
+            return list(start_dates.strftime('%G-W%V'))
+        if granularity == 'monthly':
+            return list(start_dates.strftime('%Y-%m'))
+        if granularity == 'quarterly':
+            return [f"{d.year}Q{d.quarter}" for d in start_dates]
+        return list(start_dates.strftime('%Y-%m-%d'))
+
+    def rollup(self, granularity: str, date_column: str) -> pd.DataFrame:
+        """
+        上卷到指定粒度（不重新扫描原始数据）
+
+        Args:
+            granularity: 粒度（daily/weekly/monthly/quarterly）
+            date_column: 结果日期列名（周期起始日期）
+
+        Returns:
+            pd.DataFrame: 周期聚合表，包含日期、周期标签、有效天数和各指标
+        """
+        if self.n_days == 0:
+            return pd.DataFrame(columns=[date_column, '周期', '有效天数'] + self.metric_order)
+
+        day_period = self.period_codes(granularity)
+        first_period = int(day_period[0])
+        day_period_idx = day_period - first_period
+        n_periods = int(day_period_idx[-1]) + 1
+
+        day_counts = np.bincount(day_period_idx, weights=self.present_days, minlength=n_periods)
+        present_periods = day_counts > 0
+        period_codes = np.flatnonzero(present_periods) + first_period
+        start_dates = self.period_start_dates(period_codes, granularity)
+
+        result = {
+            date_column: start_dates,
+            '周期': self.period_labels(start_dates, granularity),
+            '有效天数': day_counts[present_periods].astype(np.int64)
+        }
+
+        for name in self.metric_order:
+            if name in self.additive:
+                values = np.bincount(day_period_idx, weights=self.additive[name], minlength=n_periods)
+                if name in self.integer_metrics:
+                    values = np.rint(values).astype(np.int64)
+            elif name in self.hll_registers:
+                values = self._rollup_hll(name, granularity, day_period_idx, n_periods)
+            else:
+                values = self._rollup_distinct(name, granularity, day_period_idx, n_periods)
+            result[name] = values[present_periods]
+
+        return pd.DataFrame(result)
+
+    def _rollup_distinct(self, name: str, granularity: str, day_period_idx: np.ndarray,
+                         n_periods: int) -> np.ndarray:
+        """按周期重新去重计数（日粒度的(天, 键)对已去重，直接计数）"""
+        pair_days, pair_keys = self.distinct_pairs[name]
+        n_keys = self.distinct_key_counts[name]
+        if granularity == 'daily':
+            return np.bincount(pair_days, minlength=n_periods).astype(np.int64)
+        return TimeSeriesKernel.count_distinct_by_group(
+            day_period_idx[pair_days], pair_keys, n_keys, n_periods
+        )
+
+    def _rollup_hll(self, name: str, granularity: str, day_period_idx: np.ndarray,
+                    n_periods: int) -> np.ndarray:
+        """按周期合并HyperLogLog寄存器后估算去重数"""
+        registers = self.hll_registers[name]
+        if granularity != 'daily':
+            registers = HyperLogLog.merge_registers(registers, day_period_idx, n_periods)
+        return np.rint(HyperLogLog.estimate(registers)).astype(np.int64)
+
+    def to_frame(self, date_column: str) -> pd.DataFrame:
+        """
+        输出日聚合表（与原按日groupby结果格式一致）
+
+        Args:
+            date_column: 日期列名
+
+        Returns:
+            pd.DataFrame: 日聚合表，仅包含有数据的日期
+        """
+        daily = self.rollup('daily', date_column)
+        return daily.drop(columns=['周期', '有效天数']).reset_index(drop=True)
+
+    def rollup_all(self, date_column: str) -> Dict[str, pd.DataFrame]:
+        """
+        一次性计算所有配置的分析粒度
+
+        Args:
+            date_column: 日期列名
+
+        Returns:
+            Dict[str, pd.DataFrame]: {粒度键: 周期聚合表}
+        """
+        return {
+            granularity: self.rollup(granularity, date_column)
+            for granularity in EIQ_CONFIG['analysis_periods']
+        }
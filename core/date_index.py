@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+有序日期索引模块 - 每个数据集只解析和排序一次日期列
+日期范围过滤通过np.searchsorted二分定位，返回按日期排序数据的连续切片，不修改原数据
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Tuple
+from core.frame_cache import FrameCache
+
+NS_PER_DAY = 86400 * 10 ** 9
+
+class SortedDateIndex(FrameCache):
+    """有序日期索引"""
+
+    def __init__(self, df: pd.DataFrame, date_column: str):
+        """
+        构建有序日期索引（一次解析 + 一次稳定排序）
+
+        Args:
+            df: 数据框
+            date_column: 日期列名
+        """
+        super().__init__(df)
+        self.date_column = date_column
+
+        datetimes = pd.to_datetime(df[date_column], errors='coerce')
+        if getattr(datetimes.dt, 'tz', None) is not None:
+            datetimes = datetimes.dt.tz_localize(None)
+        values = datetimes.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+
+        valid_positions = np.flatnonzero(~datetimes.isna().to_numpy())
+        order = np.argsort(values[valid_positions], kind='stable')
+
+        # 有效日期的原始行位置（按日期排序）与对应的纳秒时间戳
+        self.positions = valid_positions[order]
+        self.sorted_values = values[self.positions]
+        self._sorted_frame = None
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame, date_column: str) -> 'SortedDateIndex':
+        """
+        获取数据框的日期索引（同一数据框同一列只构建一次）
+
+        Args:
+            df: 数据框
+            date_column: 日期列名
+
+        Returns:
+            SortedDateIndex: 日期索引
+        """
+        return cls._cached(df, date_column)
+
+    @property
+    def valid_count(self) -> int:
+        """有效日期行数"""
+        return int(self.sorted_values.size)
+
+    @property
+    def min_date(self):
+        """最早日期（无有效日期时为None）"""
+        if self.valid_count == 0:
+            return None
+        return pd.Timestamp(self.sorted_values[0]).date()
+
+    @property
+    def max_date(self):
+        """最晚日期（无有效日期时为None）"""
+        if self.valid_count == 0:
+            return None
+        return pd.Timestamp(self.sorted_values[-1]).date()
+
+    @staticmethod
+    def _day_start_ns(value) -> int:
+        """日期当天0点的纳秒时间戳"""
+        return int(pd.Timestamp(pd.Timestamp(value).date()).value)
+
+    def range_bounds(self, start_date, end_date) -> Tuple[int, int]:
+        """
+        定位日期范围（含首尾两天）在有序数组中的位置
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            Tuple[int, int]: 有序数组中的[lo, hi)范围
+        """
+        lower = self._day_start_ns(start_date)
+        upper = self._day_start_ns(end_date) + NS_PER_DAY
+        lo, hi = np.searchsorted(self.sorted_values, [lower, upper], side='left')
+        return int(lo), int(max(hi, lo))
+
+    def count_in_range(self, start_date, end_date) -> int:
+        """
+        统计日期范围内的行数
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            int: 行数
+        """
+        lo, hi = self.range_bounds(start_date, end_date)
+        return hi - lo
+
+    @property
+    def sorted_frame(self) -> pd.DataFrame:
+        """按日期排序、仅含有效日期的数据（日期列已转换为datetime，首次访问时生成）"""
+        if self._sorted_frame is None:
+            sorted_frame = self._df_ref().take(self.positions)
+            sorted_frame[self.date_column] = self.sorted_values.view('datetime64[ns]')
+            self._sorted_frame = sorted_frame
+        return self._sorted_frame
+
+    def slice(self, start_date, end_date) -> pd.DataFrame:
+        """
+        按日期范围切片（含首尾两天）
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            pd.DataFrame: 有序数据的连续切片
+        """
+        lo, hi = self.range_bounds(start_date, end_date)
+        return self.sorted_frame.iloc[lo:hi]
@@ -0,0 +1,451 @@
+# -*- coding: utf-8 -*-
+"""
+需求预测模块 - 对全部SKU批量拟合指数平滑模型
+需求矩阵按(天, SKU)存储，递推时每一步对所有SKU和所有参数候选同时向量化更新，
+不为单个SKU创建模型对象，也不按SKU循环
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, List, Optional
+from core.time_series_kernel import TimeSeriesKernel
+from core.robust_statistics import RobustStatistics
+from utils.chart_downsampling import ChartDownsampler
+from config import DEMAND_FORECAST_CONFIG
+
+class DemandForecaster:
+    """SKU需求批量预测器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化需求预测器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def build_demand_matrix(df: pd.DataFrame, date_column: str, sku_column: str,
+                            quantity_column: Optional[str] = None) -> Dict:
+        """
+        构建(天, SKU)日需求矩阵，日期跨度内无出库的日期需求记为0
+
+        Args:
+            df: 出库明细数据框
+            date_column: 日期列名
+            sku_column: SKU列名
+            quantity_column: 件数列名（为空时按明细行数计需求）
+
+        Returns:
+            dict: demand(float32矩阵, 天×SKU)、skus、dates、active_days，无有效数据时为空字典
+        """
+        matrix = TimeSeriesKernel.day_key_matrix(df, date_column, sku_column, quantity_column)
+        if not matrix:
+            return {}
+        return {'demand': matrix['values'], 'skus': matrix['keys'], 'dates': matrix['dates'],
+                'active_days': matrix['active_days']}
+
+    @staticmethod
+    def fit_ses(demand: np.ndarray, alphas: List[float], train_end: int) -> Dict:
+        """
+        简单指数平滑：所有α候选 × 所有SKU同时递推
+
+        Args:
+            demand: 需求矩阵(天, SKU)
+            alphas: α候选列表
+            train_end: 训练期结束位置（之后的天数只更新状态，不计入选参误差）
+
+        Returns:
+            dict: 每个SKU选中的α、训练期末水平、全期末水平
+        """
+        n_days, n_skus = demand.shape
+        alpha = np.asarray(alphas, dtype=np.float64)[:, None]
+        level = np.repeat(demand[:1].astype(np.float64), len(alphas), axis=0)
+        sse = np.zeros_like(level)
+        train_level = level.copy()
+        error = np.empty_like(level)
+        squared = np.empty_like(level)
+
+        for t in range(1, n_days):
+            if t == train_end:
+                train_level = level.copy()
+            np.subtract(demand[t], level, out=error)
+            if t < train_end:
+                np.multiply(error, error, out=squared)
+                sse += squared
+            error *= alpha
+            level += error
+        if train_end >= n_days:
+            train_level = level.copy()
+
+        # 按训练期一步预测误差平方和选参
+        best = np.argmin(sse, axis=0)[None, :]
+        return {
+            'alpha': alpha[best[0], 0],
+            'train_level': np.take_along_axis(train_level, best, axis=0)[0],
+            'level': np.take_along_axis(level, best, axis=0)[0]
+        }
+
+    @staticmethod
+    def fit_seasonal(demand: np.ndarray, alphas: List[float], gammas: List[float],
+                     season_length: int, train_end: int) -> Dict:
+        """
+        加法季节性指数平滑（无趋势项）：所有(α, γ)组合 × 所有SKU同时递推
+
+        Args:
+            demand: 需求矩阵(天, SKU)
+            alphas: α候选列表
+            gammas: γ候选列表
+            season_length: 季节周期
+            train_end: 训练期结束位置
+
+        Returns:
+            dict: 每个SKU选中的参数、训练期末与全期末的水平和季节项
+        """
+        n_days, n_skus = demand.shape
+        m = season_length
+        alpha_grid, gamma_grid = np.meshgrid(alphas, gammas, indexing='ij')
+        alpha = alpha_grid.ravel()[:, None]
+        gamma = gamma_grid.ravel()[:, None]
+        n_params = alpha.shape[0]
+
+        # 以第一个周期初始化：水平为周期均值，季节项为各相位与均值之差
+        # 季节项按(相位, 参数, SKU)存储，每一步更新的相位是连续内存
+        first_cycle = demand[:m].astype(np.float64)
+        base_level = first_cycle.mean(axis=0)
+        level = np.repeat(base_level[None, :], n_params, axis=0)
+        season = np.repeat((first_cycle - base_level)[:, None, :], n_params, axis=1)
+        sse = np.zeros((n_params, n_skus))
+        train_level, train_season = level.copy(), season.copy()
+
+        # 误差 e = y - (水平 + 季节项)，则 水平 += α·e，季节项 += γ·(1-α)·e
+        season_rate = gamma * (1 - alpha)
+        error = np.empty_like(level)
+        update = np.empty_like(level)
+
+        for t in range(m, n_days):
+            if t == train_end:
+                train_level, train_season = level.copy(), season.copy()
+            seasonal = season[t % m]
+            np.subtract(demand[t], level, out=error)
+            error -= seasonal
+            if t < train_end:
+                np.multiply(error, error, out=update)
+                sse += update
+            np.multiply(error, season_rate, out=update)
+            seasonal += update
+            error *= alpha
+            level += error
+        if train_end >= n_days:
+            train_level, train_season = level.copy(), season.copy()
+
+        best = np.argmin(sse, axis=0)
+        columns = np.arange(n_skus)
+        return {
+            'alpha': alpha[best, 0],
+            'gamma': gamma[best, 0],
+            'train_level': train_level[best, columns],
+            'train_season': train_season[:, best, columns],
+            'level': level[best, columns],
+            'season': season[:, best, columns]
+        }
+
+    @staticmethod
+    def fit_in_blocks(fit_function, demand: np.ndarray, *args) -> Dict:
+        """
+        按SKU分块拟合后拼接结果（每块的递推状态可放入CPU缓存，明显快于整矩阵递推）
+
+        Args:
+            fit_function: fit_ses或fit_seasonal
+            demand: 需求矩阵(天, SKU)
+            *args: 传给拟合函数的其余参数
+
+        Returns:
+            dict: 与拟合函数相同结构的结果（SKU维在最后一维）
+        """
+        block_size = DEMAND_FORECAST_CONFIG['sku_block_size']
+        n_skus = demand.shape[1]
+        if n_skus <= block_size:
+            return fit_function(demand, *args)
+
+        parts = [fit_function(demand[:, start:start + block_size], *args)
+                 for start in range(0, n_skus, block_size)]
+        return {key: np.concatenate([part[key] for part in parts], axis=-1) for key in parts[0]}
+
+    @staticmethod
+    def forecast_seasonal(level: np.ndarray, season: np.ndarray, start: int, horizon: int) -> np.ndarray:
+        """
+        由季节性模型状态生成预测
+
+        Args:
+            level: 水平(SKU,)
+            season: 季节项(周期, SKU)，按相位 t % 周期 存储
+            start: 第一个预测日的位置
+            horizon: 预测天数
+
+        Returns:
+            np.ndarray: 预测矩阵(预测天数, SKU)
+        """
+        phases = (start + np.arange(horizon)) % season.shape[0]
+        return level[None, :] + season[phases]
+
+    @staticmethod
+    def forecast_seasonal_naive(demand: np.ndarray, end: int, horizon: int, season_length: int) -> np.ndarray:
+        """
+        季节性朴素预测：重复最近一个周期
+
+        Args:
+            demand: 需求矩阵(天, SKU)
+            end: 历史截止位置（不含）
+            horizon: 预测天数
+            season_length: 季节周期
+
+        Returns:
+            np.ndarray: 预测矩阵(预测天数, SKU)
+        """
+        m = min(season_length, end)
+        rows = end - m + np.arange(horizon) % m
+        return demand[rows].astype(np.float64)
+
+    @staticmethod
+    def error_metrics(actual: np.ndarray, forecast: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        计算每个SKU的留出期误差
+
+        Args:
+            actual: 实际值(天, SKU)
+            forecast: 预测值(天, SKU)
+
+        Returns:
+            dict: MAE、RMSE、绝对误差合计、实际值合计（每个SKU一个值）
+        """
+        error = forecast - actual
+        abs_error = np.abs(error)
+        return {
+            'mae': abs_error.mean(axis=0),
+            'rmse': np.sqrt((error * error).mean(axis=0)),
+            'abs_error_sum': abs_error.sum(axis=0),
+            'actual_sum': actual.sum(axis=0, dtype=np.float64)
+        }
+
+    def forecast_matrix(self, demand: np.ndarray, horizon: int) -> Dict:
+        """
+        对需求矩阵中所有SKU拟合三种模型，按留出期MAE为每个SKU选择模型并输出预测
+
+        Args:
+            demand: 需求矩阵(天, SKU)
+            horizon: 预测天数
+
+        Returns:
+            dict: 各模型预测、选中模型、留出期误差、最终预测
+        """
+        n_days, n_skus = demand.shape
+        m = self.config.get('season_length', DEMAND_FORECAST_CONFIG['season_length'])
+        holdout = min(self.config.get('holdout_days', DEMAND_FORECAST_CONFIG['holdout_days']), n_days // 3)
+        train_end = n_days - holdout
+
+        models = ['ses', 'seasonal_naive']
+        ses = self.fit_in_blocks(self.fit_ses, demand, DEMAND_FORECAST_CONFIG['ses_alphas'], train_end)
+        holdout_forecasts = {'ses': np.repeat(ses['train_level'][None, :], holdout, axis=0)}
+        forecasts = {'ses': np.repeat(ses['level'][None, :], horizon, axis=0)}
+        parameters = {'ses': {'alpha': ses['alpha']}}
+
+        holdout_forecasts['seasonal_naive'] = self.forecast_seasonal_naive(demand, train_end, holdout, m)
+        forecasts['seasonal_naive'] = self.forecast_seasonal_naive(demand, n_days, horizon, m)
+
+        # 训练期至少两个完整周期时才拟合季节性指数平滑
+        if train_end >= 2 * m:
+            seasonal = self.fit_in_blocks(
+                self.fit_seasonal, demand, DEMAND_FORECAST_CONFIG['seasonal_alphas'],
+                DEMAND_FORECAST_CONFIG['seasonal_gammas'], m, train_end
+            )
+            holdout_forecasts['seasonal_es'] = self.forecast_seasonal(
+                seasonal['train_level'], seasonal['train_season'], train_end, holdout)
+            forecasts['seasonal_es'] = self.forecast_seasonal(
+                seasonal['level'], seasonal['season'], n_days, horizon)
+            parameters['seasonal_es'] = {'alpha': seasonal['alpha'], 'gamma': seasonal['gamma']}
+            models.insert(1, 'seasonal_es')
+
+        # 需求不能为负
+        for name in models:
+            np.maximum(forecasts[name], 0, out=forecasts[name])
+            np.maximum(holdout_forecasts[name], 0, out=holdout_forecasts[name])
+
+        metrics = {}
+        if holdout > 0:
+            actual = demand[train_end:]
+            metrics = {name: self.error_metrics(actual, holdout_forecasts[name]) for name in models}
+            # 按留出期MAE选模型（相同时取靠前的简单模型）
+            mae_stack = np.stack([metrics[name]['mae'] for name in models])
+            best = np.argmin(mae_stack, axis=0)
+        else:
+            best = np.zeros(n_skus, dtype=np.int64)
+
+        forecast_stack = np.stack([forecasts[name] for name in models])
+        final = np.take_along_axis(forecast_stack, best[None, None, :], axis=0)[0]
+
+        return {
+            'models': models,
+            'holdout_days': holdout,
+            'forecasts': forecasts,
+            'parameters': parameters,
+            'metrics': metrics,
+            'best_model': best,
+            'final_forecast': final
+        }
+
+    @staticmethod
+    def model_comparison(result: Dict) -> pd.DataFrame:
+        """
+        汇总各模型的整体留出期误差
+
+        Args:
+            result: forecast_matrix的结果
+
+        Returns:
+            pd.DataFrame: 每个模型一行（MAE、RMSE、WAPE、选中SKU数）
+        """
+        if not result['metrics']:
+            return pd.DataFrame()
+
+        model_names = DEMAND_FORECAST_CONFIG['models']
+        selected = np.bincount(result['best_model'], minlength=len(result['models']))
+        rows = []
+        for i, name in enumerate(result['models']):
+            metric = result['metrics'][name]
+            actual_total = metric['actual_sum'].sum()
+            rows.append({
+                '模型': model_names[name],
+                '平均MAE': round(float(metric['mae'].mean()), 3),
+                '平均RMSE': round(float(metric['rmse'].mean()), 3),
+                'WAPE(%)': round(float(metric['abs_error_sum'].sum() / actual_total * 100), 2) if actual_total > 0 else np.nan,
+                '选中SKU数': int(selected[i])
+            })
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def sku_table(matrices: Dict, result: Dict) -> pd.DataFrame:
+        """
+        生成每个SKU的预测汇总表（按历史需求降序）
+
+        Args:
+            matrices: build_demand_matrix的结果
+            result: forecast_matrix的结果
+
+        Returns:
+            pd.DataFrame: 每个SKU一行
+        """
+        demand = matrices['demand']
+        model_names = DEMAND_FORECAST_CONFIG['models']
+        labels = np.array([model_names[name] for name in result['models']], dtype=object)
+        best = result['best_model']
+
+        table = pd.DataFrame({
+            'SKU': matrices['skus'],
+            '历史总量': demand.sum(axis=0, dtype=np.float64),
+            '历史日均': demand.mean(axis=0, dtype=np.float64).round(2),
+            '选用模型': labels[best],
+            '预测日均': result['final_forecast'].mean(axis=0).round(2),
+            '预测总量': result['final_forecast'].sum(axis=0).round(1)
+        })
+        if result['metrics']:
+            mae_stack = np.stack([result['metrics'][name]['mae'] for name in result['models']])
+            wape_stack = np.stack([result['metrics'][name]['abs_error_sum'] for name in result['models']])
+            actual_sum = result['metrics'][result['models'][0]]['actual_sum']
+            columns = np.arange(len(best))
+            table['留出期MAE'] = mae_stack[best, columns].round(3)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                table['留出期WAPE(%)'] = np.where(actual_sum > 0, wape_stack[best, columns] / actual_sum * 100, np.nan).round(2)
+        return table.sort_values('历史总量', ascending=False, kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def forecast_frame(matrices: Dict, result: Dict) -> pd.DataFrame:
+        """
+        生成SKU × 预测日期的宽表
+
+        Args:
+            matrices: build_demand_matrix的结果
+            result: forecast_matrix的结果
+
+        Returns:
+            pd.DataFrame: 每个SKU一行，每个预测日期一列
+        """
+        horizon = result['final_forecast'].shape[0]
+        future_dates = pd.date_range(matrices['dates'][-1] + pd.Timedelta(days=1), periods=horizon, freq='D')
+        frame = pd.DataFrame(result['final_forecast'].T.round(2), columns=future_dates.strftime('%Y-%m-%d'))
+        frame.insert(0, 'SKU', matrices['skus'])
+        return frame
+
+    def analyze(self, df: pd.DataFrame, date_column: str, sku_column: str,
+                quantity_column: Optional[str] = None, horizon: int = 14) -> Dict:
+        """
+        执行需求预测
+
+        Args:
+            df: 出库明细数据框
+            date_column: 日期列名
+            sku_column: SKU列名
+            quantity_column: 件数列名（可选）
+            horizon: 预测天数
+
+        Returns:
+            dict: 包含sku_table、sku_statistics、forecast、model_comparison等，失败时为空字典
+        """
+        try:
+            matrices = self.build_demand_matrix(df, date_column, sku_column, quantity_column)
+            if not matrices:
+                st.error(f"❌ 日期列 '{date_column}' 或SKU列 '{sku_column}' 没有有效数据")
+                return {}
+
+            n_days = matrices['demand'].shape[0]
+            if n_days < 2:
+                st.error("❌ 历史数据不足2天，无法进行需求预测")
+                return {}
+
+            result = self.forecast_matrix(matrices['demand'], horizon)
+            if 'seasonal_es' not in result['models']:
+                st.warning(f"⚠️ 历史数据仅 {n_days} 天，不足以拟合季节性指数平滑，仅使用简单指数平滑和季节性朴素模型")
+
+            return {
+                'matrices': matrices,
+                'result': result,
+                'sku_table': self.sku_table(matrices, result),
+                # 复用同一需求矩阵生成各SKU日需求统计，只统计有出库记录的日期（与出库分析的日口径一致）
+                'sku_statistics': RobustStatistics.summarize_series(
+                    matrices['demand'], matrices['dates'], matrices['skus'], matrices['active_days']
+                ).sort_values('总量', ascending=False, ignore_index=True),
+                'forecast': self.forecast_frame(matrices, result),
+                'model_comparison': self.model_comparison(result)
+            }
+
+        except Exception as e:
+            st.error(f"❌ 需求预测失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_forecast_chart(matrices: Dict, history: np.ndarray, forecast: np.ndarray, title: str):
+        """
+        渲染历史需求与预测曲线
+
+        Args:
+            matrices: build_demand_matrix的结果（dates为历史日期）
+            history: 历史需求序列
+            forecast: 预测序列
+            title: 图表标题
+        """
+        dates = matrices['dates']
+        future_dates = pd.date_range(dates[-1] + pd.Timedelta(days=1), periods=len(forecast), freq='D')
+
+        # 长历史保极值降采样，超过阈值时使用WebGL渲染
+        plot_dates, plot_history = ChartDownsampler.downsample_series(dates, history)
+        fig = go.Figure()
+        fig.add_trace(ChartDownsampler.line_trace(len(history), x=plot_dates, y=plot_history, mode='lines',
+                                                  name='历史需求', line=dict(color='#1f77b4', width=2)))
+        fig.add_trace(go.Scatter(x=future_dates, y=forecast, mode='lines+markers', name='预测需求',
+                                 line=dict(color='#ff7f0e', width=2, dash='dash')))
+        fig.update_layout(title=title, xaxis_title="日期", yaxis_title="需求",
+                          height=400, hovermode='x unified')
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+按数据框缓存模块 - 由数据框派生、按构建参数缓存的结构（有序日期索引等）的公共基类
+每个子类各自持有按(数据框id, 构建参数)索引的缓存表；只弱引用原数据框，数据框被回收时自动清除对应条目
+"""
+
+import weakref
+import pandas as pd
+from typing import Dict, Tuple
+
+class FrameCache:
+    """按数据框缓存的派生结构基类"""
+
+    # 按(数据框id, 构建参数...)缓存已构建的结构，每个子类一张表
+    _registry: Dict[Tuple, 'FrameCache'] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._registry = {}
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        记录原数据框（子类构建时先调用）
+
+        Args:
+            df: 数据框
+        """
+        self.n_rows = len(df)
+        # 弱引用原数据框，避免缓存阻止数据框被回收
+        self._df_ref = weakref.ref(df)
+
+    @classmethod
+    def _cached(cls, df: pd.DataFrame, *args) -> 'FrameCache':
+        """
+        获取数据框的派生结构（同一数据框同一组参数只构建一次；数据框被替换或行数变化时重建）
+
+        Args:
+            df: 数据框
+            *args: 构建参数（按位置传给子类构造函数，同时作为缓存键）
+
+        Returns:
+            FrameCache: 缓存或新构建的子类实例
+        """
+        key = (id(df),) + args
+        cached = cls._registry.get(key)
+        if cached is not None and cached._df_ref() is df and cached.n_rows == len(df):
+            return cached
+
+        cached = cls(df, *args)
+        if key not in cls._registry:
+            weakref.finalize(df, cls._registry.pop, key, None)
+        cls._registry[key] = cached
+        return cached
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+HyperLogLog近似去重计数模块 - 按分组（天）维护寄存器，可跨周期、跨文件合并
+寄存器矩阵形状为(分组数, 2^precision)，合并即按行取最大值
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Tuple
+
+# 精度（寄存器位数）取值范围
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+
+class HyperLogLog:
+    """HyperLogLog寄存器计算工具"""
+
+    @staticmethod
+    def validate_precision(precision: int) -> int:
+        """
+        校验精度参数
+
+        Args:
+            precision: 寄存器位数p（寄存器数量m=2^p）
+
+        Returns:
+            int: 校验后的精度
+        """
+        precision = int(precision)
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(f"HyperLogLog精度必须在{MIN_PRECISION}-{MAX_PRECISION}之间: {precision}")
+        return precision
+
+    @staticmethod
+    def relative_error(precision: int) -> float:
+        """
+        标准误差（相对值）：1.04 / sqrt(m)
+
+        Args:
+            precision: 寄存器位数
+
+        Returns:
+            float: 相对标准误差
+        """
+        return 1.04 / np.sqrt(2 ** precision)
+
+    @staticmethod
+    def hash_values(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算64位哈希值（缺失值不参与计数）
+
+        Args:
+            series: 键序列（订单号、SKU等）
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (有效值掩码, 有效值的uint64哈希)
+        """
+        valid = series.notna().to_numpy()
+        values = series[valid] if not valid.all() else series
+        if pd.api.types.is_numeric_dtype(values):
+            # 数值键直接按值哈希（跨文件合并时需保证同一列类型一致）
+            hashes = pd.util.hash_array(values.to_numpy())
+        else:
+            hashes = pd.util.hash_array(values.to_numpy(dtype=object), categorize=True)
+        return valid, hashes.astype(np.uint64, copy=False)
+
+    @staticmethod
+    def _bit_length(values: np.ndarray) -> np.ndarray:
+        """uint64的有效位数（按高低32位拆分，保证float64转换无精度损失）"""
+        hi = (values >> np.uint64(32)).astype(np.float64)
+        lo = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        hi_bits = np.frexp(hi)[1]
+        lo_bits = np.frexp(lo)[1]
+        return np.where(hi > 0, hi_bits + 32, lo_bits).astype(np.int64)
+
+    @staticmethod
+    def build_registers(group_idx: np.ndarray, hashes: np.ndarray,
+                        n_groups: int, precision: int) -> np.ndarray:
+        """
+        按分组构建寄存器矩阵
+
+        Args:
+            group_idx: 每个哈希值的分组下标
+            hashes: uint64哈希值
+            n_groups: 分组数量
+            precision: 寄存器位数p
+
+        Returns:
+            np.ndarray: uint8寄存器矩阵(n_groups, 2^p)
+        """
+        m = 2 ** precision
+        registers = np.zeros(n_groups * m, dtype=np.uint8)
+        if hashes.size == 0:
+            return registers.reshape(n_groups, m)
+
+        shift = np.uint64(64 - precision)
+        bucket = (hashes >> shift).astype(np.int64)
+        remainder = hashes << np.uint64(precision)
+
+        # rho = 剩余位中前导0的个数 + 1（剩余位全0时取最大值）
+        rho = 64 - HyperLogLog._bit_length(remainder) + 1
+        rho = np.minimum(rho, 64 - precision + 1).astype(np.uint8)
+
+        np.maximum.at(registers, group_idx.astype(np.int64) * m + bucket, rho)
+        return registers.reshape(n_groups, m)
+
+    @staticmethod
+    def merge_registers(registers: np.ndarray, target_idx: np.ndarray, n_targets: int) -> np.ndarray:
+        """
+        将多行寄存器按目标下标合并（按位置取最大值）
+
+        Args:
+            registers: 寄存器矩阵(n_rows, m)
+            target_idx: 每行合并到的目标下标
+            n_targets: 目标数量
+
+        Returns:
+            np.ndarray: 合并后的寄存器矩阵(n_targets, m)
+        """
+        merged = np.zeros((n_targets, registers.shape[1]), dtype=np.uint8)
+        np.maximum.at(merged, np.asarray(target_idx, dtype=np.int64), registers)
+        return merged
+
+    @staticmethod
+    def estimate(registers: np.ndarray) -> np.ndarray:
+        """
+        估算每行寄存器的基数
+
+        Args:
+            registers: 寄存器矩阵(n_rows, m)
+
+        Returns:
+            np.ndarray: 每行的基数估计(float64)
+        """
+        registers = np.atleast_2d(registers)
+        m = registers.shape[1]
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)), axis=1)
+
+        # 小基数修正：存在空寄存器时使用线性计数
+        zeros = np.count_nonzero(registers == 0, axis=1)
+        with np.errstate(divide='ignore'):
+            linear = m * np.log(m / np.maximum(zeros, 1))
+        use_linear = (raw <= 2.5 * m) & (zeros > 0)
+        return np.where(use_linear, linear, raw)
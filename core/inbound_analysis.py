@@ -9,6 +9,14 @@ import streamlit as st
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
+from core.daily_cube import DailyCube
+from core.date_index import SortedDateIndex
+from core.hyperloglog import HyperLogLog
+from core.robust_statistics import RobustStatistics
+from core.seasonality import SeasonalDecomposer
+from config import DISTINCT_COUNT_CONFIG, CUBE_CACHE_CONFIG
+from utils.cube_cache import CubeCache
+from utils.chart_downsampling import ChartDownsampler
 
 class InboundAnalyzer:
     """入库通用分析器"""
@@ -21,6 +29,39 @@ class InboundAnalyzer:
             config: 分析配置参数
         """
         self.config = config
+        # 最近一次增强聚合构建的日聚合立方体（用于周/月/季度上卷）
+        self.daily_cube = None
+        self.cube_cache = CubeCache(CUBE_CACHE_CONFIG['cache_dir'], CUBE_CACHE_CONFIG['memory_entries'],
+                                    CUBE_CACHE_CONFIG['disk_entries'])
+        
+    def _get_distinct_count_options(self) -> Tuple[str, int]:
+        """获取去重计数模式和HyperLogLog精度"""
+        distinct_mode = self.config.get('入库分析_distinct_mode') or DISTINCT_COUNT_CONFIG['default_mode']
+        hll_precision = int(self.config.get('入库分析_hll_precision') or DISTINCT_COUNT_CONFIG['default_precision'])
+        return distinct_mode, hll_precision
+    
+    def _get_cube_cache_key(self, df: pd.DataFrame, column_mapping: Dict) -> Optional[str]:
+        """
+        计算日聚合缓存键
+        
+        Args:
+            df: 原始数据框
+            column_mapping: 列映射及聚合参数
+            
+        Returns:
+            Optional[str]: 缓存键，缓存关闭时为None
+        """
+        if not CUBE_CACHE_CONFIG['enabled']:
+            return None
+        
+        # 优先使用源工作表指纹（由分析引擎传入），否则对用到的列计算内容哈希
+        data_fingerprint = self.config.get('source_fingerprint')
+        if not data_fingerprint:
+            columns = [col for key, col in column_mapping.items()
+                       if key.endswith('_column') and col and col in df.columns]
+            data_fingerprint = CubeCache.frame_fingerprint(df, columns)
+        
+        return CubeCache.make_key(data_fingerprint, column_mapping)
         
     def clean_date_column(self, df: pd.DataFrame, date_column: str) -> pd.DataFrame:
         """
@@ -140,15 +181,9 @@ class InboundAnalyzer:
             elif hasattr(end_date, 'date'):
                 end_date = end_date.date()
             
-            # 确保日期列是datetime类型
-            df[date_column] = pd.to_datetime(df[date_column])
-            
-            # 转换为日期进行比较
-            df_dates = df[date_column].dt.date
-            
-            # 过滤日期范围
-            mask = (df_dates >= start_date) & (df_dates <= end_date)
-            filtered_df = df[mask]
+            # 🚀 有序日期索引：每个数据集只解析排序一次，二分定位范围，不修改原数据
+            date_index = SortedDateIndex.for_frame(df, date_column)
+            filtered_df = date_index.slice(start_date, end_date)
             
             st.info(f"📊 日期过滤：{start_date} 至 {end_date}，共 {len(filtered_df)} 条记录")
             
@@ -316,43 +351,8 @@ class InboundAnalyzer:
                 }
             }
             
-            # 计算各维度的统计信息
-            for col in daily_data.columns:
-                if col != date_column and daily_data[col].dtype in ['int64', 'float64']:
-                    avg_without_outliers = self.calculate_average_without_outliers(daily_data[col])
-                    
-                    # 使用98%分位数过滤离群值，然后计算真正的最大最小值
-                    filtered_data = self.filter_outliers_98_percentile(daily_data[col])
-                    
-                    # 在过滤后的数据中找到最高和最低点
-                    if len(filtered_data) > 0:
-                        filtered_max = filtered_data.max()
-                        filtered_min = filtered_data.min()
-                        
-                        # 找到对应的日期（在原始数据中）
-                        max_mask = daily_data[col] == filtered_max
-                        min_mask = daily_data[col] == filtered_min
-                        
-                        # 如果有多个相同的最大/最小值，取第一个
-                        max_date = daily_data.loc[max_mask, date_column].iloc[0] if max_mask.any() else daily_data.loc[daily_data[col].idxmax(), date_column]
-                        min_date = daily_data.loc[min_mask, date_column].iloc[0] if min_mask.any() else daily_data.loc[daily_data[col].idxmin(), date_column]
-                    else:
-                        # 如果过滤后没有数据，使用原始数据
-                        filtered_max = daily_data[col].max()
-                        filtered_min = daily_data[col].min()
-                        max_date = daily_data.loc[daily_data[col].idxmax(), date_column]
-                        min_date = daily_data.loc[daily_data[col].idxmin(), date_column]
-                    
-                    summary[col] = {
-                        'total': daily_data[col].sum(),
-                        'daily_avg': daily_data[col].mean(),
-                        'daily_avg_no_outliers': avg_without_outliers,  # 剔除离群值后的平均数
-                        'daily_max': filtered_max,  # 使用过滤后的最大值
-                        'daily_min': filtered_min,  # 使用过滤后的最小值
-                        'max_date': max_date,  # 最高点日期
-                        'min_date': min_date,  # 最低点日期
-                        'trend': 'increasing' if daily_data[col].iloc[-1] > daily_data[col].iloc[0] else 'decreasing'
-                    }
+            # 所有指标一次性计算（分位数、剔除离群值均值、过滤后最值及日期）
+            summary.update(RobustStatistics.summarize_frame(daily_data, date_column))
             
             return summary
             
@@ -374,15 +374,13 @@ class InboundAnalyzer:
                 st.warning("⚠️ 没有数据可供绘图")
                 return
             
-            # 🚀 性能优化：对大数据集进行智能采样
-            sample_data = daily_data.copy()
+            # 指标列与全量数组只提取一次，后续所有曲线、标注、坐标范围都基于这些数组
+            metric_columns = [col for col in daily_data.columns
+                              if col != date_column and daily_data[col].dtype in ['int64', 'float64']]
+            x = pd.to_datetime(daily_data[date_column]).to_numpy().astype('datetime64[ns]')
+            values = daily_data[metric_columns].to_numpy(dtype=np.float64)
             original_count = len(daily_data)
-            
-            if len(daily_data) > 1000:  # 超过1000个点时进行采样
-                # 计算采样比例，最多保留1000个点
-                sample_ratio = min(1000 / len(daily_data), 1.0)
-                sample_data = daily_data.sample(frac=sample_ratio, random_state=42).sort_values(date_column)
-                st.info(f"📊 图表性能优化：从 {original_count:,} 个数据点采样 {len(sample_data):,} 个点以提升交互性能")
+            summary = summary or {}
             
             # 创建图表
             fig = go.Figure()
@@ -392,157 +390,128 @@ class InboundAnalyzer:
             line_styles = ['solid', 'dash', 'dot', 'dashdot']
             marker_symbols = ['circle', 'square', 'diamond', 'triangle-up', 'star']
             
-            color_idx = 0
+            avg_texts = []  # 收集所有平均值文本，统一显示在右上角
+            plotted_count = original_count
             
-            for col in sample_data.columns:
-                if col != date_column and sample_data[col].dtype in ['int64', 'float64']:
-                    # 调整线条样式，避免重叠
-                    line_width = 3 if color_idx == 0 else 2  # 第一条线更粗
-                    marker_size = 6 if color_idx == 0 else 4  # 第一条线的点更大
-                    opacity = 0.9 if color_idx == 0 else 0.8  # 第一条线更不透明
-                    
-                    fig.add_trace(go.Scatter(
-                        x=sample_data[date_column],
-                        y=sample_data[col],
-                        mode='lines+markers',
-                        name=col,
-                        line=dict(
-                            color=colors[color_idx % len(colors)], 
-                            width=line_width,
-                            dash=line_styles[color_idx % len(line_styles)] if color_idx > 0 else 'solid'
-                        ),
-                        marker=dict(
-                            size=marker_size,
-                            symbol=marker_symbols[color_idx % len(marker_symbols)],
-                            opacity=opacity
-                        ),
-                        opacity=opacity,
-                        hovertemplate=f'<b>{col}</b><br>日期: %{{x}}<br>数量: %{{y:,.0f}}<extra></extra>'
-                    ))
-                    color_idx += 1
-            
-            # 🔹 添加最高最低点标注
-            if summary:
-                point_color_idx = 0
-                for col in sample_data.columns:
-                    if col != date_column and sample_data[col].dtype in ['int64', 'float64']:
-                        col_summary = summary.get(col, {})
-                        line_color = colors[point_color_idx % len(colors)]
-                        
-                        # 添加最高点标注
-                        if 'daily_max' in col_summary and 'max_date' in col_summary:
-                            max_value = col_summary['daily_max']
-                            max_date = col_summary['max_date']
-                            
-                            fig.add_annotation(
-                                x=max_date,
-                                y=max_value,
-                                xref="x", 
-                                yref="y",
-                                text=f"🔴 最高: {max_value:.0f}",
-                                font=dict(color=line_color, size=10, family="Arial"),
-                                bgcolor="rgba(255,255,255,0.9)",
-                                bordercolor=line_color,
-                                borderwidth=1,
-                                showarrow=True,
-                                arrowhead=2,
-                                arrowsize=1,
-                                arrowwidth=2,
-                                arrowcolor=line_color,
-                                ax=0,
-                                ay=-25  # 标注在点上方
-                            )
-                        
-                        # 添加最低点标注
-                        if 'daily_min' in col_summary and 'min_date' in col_summary:
-                            min_value = col_summary['daily_min']
-                            min_date = col_summary['min_date']
-                            
-                            fig.add_annotation(
-                                x=min_date,
-                                y=min_value,
-                                xref="x", 
-                                yref="y",
-                                text=f"🔵 最低: {min_value:.0f}",
-                                font=dict(color=line_color, size=10, family="Arial"),
-                                bgcolor="rgba(255,255,255,0.9)",
-                                bordercolor=line_color,
-                                borderwidth=1,
-                                showarrow=True,
-                                arrowhead=2,
-                                arrowsize=1,
-                                arrowwidth=2,
-                                arrowcolor=line_color,
-                                ax=0,
-                                ay=25   # 标注在点下方
-                            )
-                        point_color_idx += 1
-            
-            # 🔹 添加平均数线（剔除离群值）- 颜色匹配数据线，带数值标注
-            if summary:
-                avg_color_idx = 0
-                avg_texts = []  # 收集所有平均值文本，统一显示在右上角
+            for color_idx, col in enumerate(metric_columns):
+                col_summary = summary.get(col, {})
+                line_color = colors[color_idx % len(colors)]
                 
-                for col in sample_data.columns:
-                    if col != date_column and sample_data[col].dtype in ['int64', 'float64']:
-                        col_summary = summary.get(col, {})
-                        avg_no_outliers = col_summary.get('daily_avg_no_outliers')
-                        
-                        if avg_no_outliers is not None:
-                            # 使用与数据线相同的颜色
-                            line_color = colors[avg_color_idx % len(colors)]
-                            
-                            # 添加水平平均线
-                            fig.add_hline(
-                                y=avg_no_outliers,
-                                line_dash="dot",
-                                line_width=1.5,  # 线条变细
-                                line_color=line_color,
-                                opacity=0.8
-                            )
-                            
-                            # 收集平均值文本，用于右上角显示
-                            avg_texts.append(f"<span style='color:{line_color}'>●</span> {col} 平均: {avg_no_outliers:.1f}")
-                            avg_color_idx += 1
+                # 🚀 性能优化：保极值降采样，最高/最低标注日期一定保留
+                y = values[:, color_idx]
+                keep = ChartDownsampler.positions_of(x, [col_summary.get('max_date'), col_summary.get('min_date')])
+                indices = ChartDownsampler.select_indices(x, y, keep=keep)
+                plotted_count = len(indices)
                 
-                # 📊 在右上角统一显示所有平均值
-                if avg_texts:
-                    avg_text_combined = "<br>".join(avg_texts)
+                # 调整线条样式，避免重叠
+                line_width = 3 if color_idx == 0 else 2  # 第一条线更粗
+                marker_size = 6 if color_idx == 0 else 4  # 第一条线的点更大
+                opacity = 0.9 if color_idx == 0 else 0.8  # 第一条线更不透明
+                
+                fig.add_trace(ChartDownsampler.line_trace(
+                    original_count,
+                    x=x[indices],
+                    y=y[indices],
+                    mode='lines+markers',
+                    name=col,
+                    line=dict(
+                        color=line_color, 
+                        width=line_width,
+                        dash=line_styles[color_idx % len(line_styles)] if color_idx > 0 else 'solid'
+                    ),
+                    marker=dict(
+                        size=marker_size,
+                        symbol=marker_symbols[color_idx % len(marker_symbols)],
+                        opacity=opacity
+                    ),
+                    opacity=opacity,
+                    hovertemplate=f'<b>{col}</b><br>日期: %{{x}}<br>数量: %{{y:,.0f}}<extra></extra>'
+                ))
+                
+                # 🔹 添加最高点标注
+                if 'daily_max' in col_summary and 'max_date' in col_summary:
+                    max_value = col_summary['daily_max']
                     fig.add_annotation(
-                        x=1,  # 右侧
-                        y=1,  # 顶部
-                        xref="paper",  # 使用纸张坐标
-                        yref="paper",
-                        text=avg_text_combined,
-                        font=dict(color='white', size=11),
-                        bgcolor="rgba(17,17,17,0.9)",  # 与图表背景一致的深色
-                        bordercolor="rgba(128,128,128,0.5)",
+                        x=col_summary['max_date'],
+                        y=max_value,
+                        xref="x", 
+                        yref="y",
+                        text=f"🔴 最高: {max_value:.0f}",
+                        font=dict(color=line_color, size=10, family="Arial"),
+                        bgcolor="rgba(255,255,255,0.9)",
+                        bordercolor=line_color,
                         borderwidth=1,
-                        showarrow=False,
-                        xanchor="right",
-                        yanchor="top",
-                        align="left"
+                        showarrow=True,
+                        arrowhead=2,
+                        arrowsize=1,
+                        arrowwidth=2,
+                        arrowcolor=line_color,
+                        ax=0,
+                        ay=-25  # 标注在点上方
                     )
-            
-            # 🔧 计算Y轴的合适范围
-            y_min_overall = float('inf')
-            y_max_overall = 0
-            
-            for col in sample_data.columns:
-                if col != date_column and sample_data[col].dtype in ['int64', 'float64']:
-                    col_min = sample_data[col].min()
-                    col_max = sample_data[col].max()
-                    y_min_overall = min(y_min_overall, col_min)
-                    y_max_overall = max(y_max_overall, col_max)
-            
-            # 计算合适的Y轴边界，留10%的空间用于视觉效果
-            if y_min_overall != float('inf'):
-                y_range = y_max_overall - y_min_overall
-                margin = y_range * 0.1  # 10%的边距
+                
+                # 🔹 添加最低点标注
+                if 'daily_min' in col_summary and 'min_date' in col_summary:
+                    min_value = col_summary['daily_min']
+                    fig.add_annotation(
+                        x=col_summary['min_date'],
+                        y=min_value,
+                        xref="x", 
+                        yref="y",
+                        text=f"🔵 最低: {min_value:.0f}",
+                        font=dict(color=line_color, size=10, family="Arial"),
+                        bgcolor="rgba(255,255,255,0.9)",
+                        bordercolor=line_color,
+                        borderwidth=1,
+                        showarrow=True,
+                        arrowhead=2,
+                        arrowsize=1,
+                        arrowwidth=2,
+                        arrowcolor=line_color,
+                        ax=0,
+                        ay=25   # 标注在点下方
+                    )
+                
+                # 🔹 添加平均数线（剔除离群值）- 颜色匹配数据线
+                avg_no_outliers = col_summary.get('daily_avg_no_outliers')
+                if avg_no_outliers is not None:
+                    fig.add_hline(
+                        y=avg_no_outliers,
+                        line_dash="dot",
+                        line_width=1.5,  # 线条变细
+                        line_color=line_color,
+                        opacity=0.8
+                    )
+                    avg_texts.append(f"<span style='color:{line_color}'>●</span> {col} 平均: {avg_no_outliers:.1f}")
+            
+            if plotted_count < original_count:
+                st.info(f"📊 图表性能优化：{original_count:,} 个数据点降采样为约 {plotted_count:,} 个点（保留峰谷与标注日期），使用WebGL渲染")
+            
+            # 📊 在右上角统一显示所有平均值
+            if avg_texts:
+                fig.add_annotation(
+                    x=1,  # 右侧
+                    y=1,  # 顶部
+                    xref="paper",  # 使用纸张坐标
+                    yref="paper",
+                    text="<br>".join(avg_texts),
+                    font=dict(color='white', size=11),
+                    bgcolor="rgba(17,17,17,0.9)",  # 与图表背景一致的深色
+                    bordercolor="rgba(128,128,128,0.5)",
+                    borderwidth=1,
+                    showarrow=False,
+                    xanchor="right",
+                    yanchor="top",
+                    align="left"
+                )
+            
+            # 🔧 计算Y轴的合适范围（基于全量数据，降采样不影响坐标范围）
+            if values.size and not np.isnan(values).all():
+                y_min_overall = float(np.nanmin(values))
+                y_max_overall = float(np.nanmax(values))
+                margin = (y_max_overall - y_min_overall) * 0.1  # 10%的边距
                 y_axis_min = max(0, y_min_overall - margin)  # 不低于0
                 y_axis_max = y_max_overall + margin
-                
-    
             else:
                 y_axis_min = None
                 y_axis_max = None
@@ -587,24 +556,29 @@ class InboundAnalyzer:
                 hovermode='x unified'
             )
             
-            # 🚀 性能优化：减少渲染复杂度
-            fig.update_traces(
-                connectgaps=False,  # 不连接缺失数据的间隙
-                line_smoothing=0.5  # 适度平滑
-            )
+            # 🚀 性能优化：减少渲染复杂度（WebGL折线不支持平滑）
+            if ChartDownsampler.use_webgl(original_count):
+                fig.update_traces(connectgaps=False)
+            else:
+                fig.update_traces(
+                    connectgaps=False,  # 不连接缺失数据的间隙
+                    line_smoothing=0.5  # 适度平滑
+                )
             
             st.plotly_chart(fig, use_container_width=True)
             
         except Exception as e:
             st.error(f"❌ 图表渲染失败: {str(e)}")
     
-    def generate_optimization_suggestions(self, daily_data: pd.DataFrame, summary: Dict) -> List[str]:
+    def generate_optimization_suggestions(self, daily_data: pd.DataFrame, summary: Dict,
+                                          seasonality: Optional[pd.DataFrame] = None) -> List[str]:
         """
         生成优化建议（包含详细统计数据）
         
         Args:
             daily_data: 日聚合数据
             summary: 统计摘要
+            seasonality: 各指标的季节性分解汇总表（可选，由SeasonalDecomposer.analyze生成）
             
         Returns:
             List[str]: 优化建议列表
@@ -642,6 +616,10 @@ class InboundAnalyzer:
                     elif daily_max > avg_no_outliers * 2:
                         suggestions.append(f"⚠️ {col}波动较大，建议分析入库高峰期的处理能力")
             
+            # 季节性分解结论
+            if seasonality is not None:
+                suggestions.extend(SeasonalDecomposer.insights(seasonality, '指标'))
+            
             # 基于数据分布的建议
             if len(daily_data) >= 7:
                 suggestions.append("📅 建议按周/月维度分析入库规律，优化收货计划")
@@ -711,39 +689,18 @@ class InboundAnalyzer:
                 st.error(f"❌ 缺失的源列: {missing_columns}")
                 return pd.DataFrame()
             
-            # 执行聚合 - 使用简单有效的方法（参考出库分析）
+            # 执行聚合 - 使用共享聚合内核（与出库分析一致）
             try:
-                # 先按现有列名聚合，后续重命名
-                simple_agg_dict = {}
-                target_column_names = []
-                
-                for target_name, (source_column, agg_func) in agg_dict.items():
-                    simple_agg_dict[source_column] = agg_func
-                    target_column_names.append(target_name)
-                
-                # 🔧 重要修复：将日期时间转换为日期，确保按日聚合
-                df_for_grouping = df.copy()
-                df_for_grouping[date_column] = pd.to_datetime(df_for_grouping[date_column]).dt.date
-                
-                # 执行分组聚合（按日期聚合）
-                grouped = df_for_grouping.groupby(date_column)
-                
-                # 执行聚合操作
-                daily_data = grouped.agg(simple_agg_dict)
-                
-                # 重置索引
-                daily_data = daily_data.reset_index()
-                
-                # 重命名列名
-                if len(daily_data.columns) == len(target_column_names) + 1:  # +1 for date column
-                    new_columns = [date_column] + target_column_names
-                    daily_data.columns = new_columns
-                
-                # 将日期列转换回datetime格式以便图表显示
-                daily_data[date_column] = pd.to_datetime(daily_data[date_column])
-                
+                # 🚀 构建日聚合立方体：日期一次编码为天编码，保留每日去重键对供周/月/季度上卷
+                distinct_mode, hll_precision = self._get_distinct_count_options()
+                self.daily_cube = DailyCube.build(
+                    df, date_column, agg_dict,
+                    distinct_mode=distinct_mode, hll_precision=hll_precision
+                )
+                daily_data = self.daily_cube.to_frame(date_column)
+
             except Exception as e:
-                st.error(f"❌ pandas聚合操作失败: {str(e)}")
+                st.error(f"❌ 聚合计算失败: {str(e)}")
                 return pd.DataFrame()
             
             # 检查日期列是否存在
@@ -797,28 +754,69 @@ class InboundAnalyzer:
             Tuple[pd.DataFrame, Dict]: (聚合后的日期数据, 统计摘要)
         """
         try:
-            # 1. 清理日期列
-            df_cleaned = self.clean_date_column(df, date_column)
+            # 1. 查找日聚合缓存（源数据指纹 + 列映射）
+            distinct_mode, hll_precision = self._get_distinct_count_options()
+            column_mapping = {
+                'analysis': '入库分析',
+                'date_column': date_column,
+                'sku_column': sku_column,
+                'sku_count_column': sku_count_column,
+                'quantity_column': quantity_column,
+                'quantity_count_column': quantity_count_column,
+                'distinct_mode': distinct_mode,
+                'hll_precision': hll_precision
+            }
+            cache_key = self._get_cube_cache_key(df, column_mapping)
+            cached_arrays = self.cube_cache.load(cache_key) if cache_key else None
             
-            if df_cleaned.empty:
-                return pd.DataFrame(), {}
+            if cached_arrays is not None:
+                full_cube = DailyCube.from_arrays(cached_arrays)
+                st.info("⚡ 命中日聚合缓存，跳过原始数据聚合")
+            else:
+                # 2. 清理日期列（有序日期索引：解析一次，去除无效日期，与日期过滤和界面日期选择共享）
+                df_cleaned = SortedDateIndex.for_frame(df, date_column).sorted_frame
+                st.info(f"📅 日期列已清理：保留 {len(df_cleaned)} 行有效日期数据")
+                
+                if df_cleaned.empty:
+                    return pd.DataFrame(), {}
+                
+                # 3. 全量按日聚合（日期范围在立方体上切片，调整日期范围无需重新聚合）
+                daily_data = self.aggregate_daily_data_enhanced(
+                    df_cleaned, date_column, sku_column, sku_count_column,
+                    quantity_column, quantity_count_column
+                )
+                
+                if daily_data.empty:
+                    return pd.DataFrame(), {}
+                
+                full_cube = self.daily_cube
+                if cache_key:
+                    self.cube_cache.save(cache_key, full_cube.to_arrays())
             
-            # 2. 日期过滤
+            # 4. 日期过滤
             if start_date and end_date:
-                df_cleaned = self.filter_date_range(df_cleaned, date_column, start_date, end_date)
-            
-            # 3. 按日聚合数据（增强版）
-            daily_data = self.aggregate_daily_data_enhanced(
-                df_cleaned, date_column, sku_column, sku_count_column,
-                quantity_column, quantity_count_column
-            )
+                self.daily_cube = full_cube.slice(start_date, end_date)
+                daily_data = self.daily_cube.to_frame(date_column)
+                st.info(f"📊 日期过滤：{start_date} 至 {end_date}，共 {len(daily_data)} 天")
+            else:
+                self.daily_cube = full_cube
+                daily_data = full_cube.to_frame(date_column)
             
             if daily_data.empty:
                 return pd.DataFrame(), {}
             
-            # 4. 生成统计摘要
+            # 5. 生成统计摘要
             summary = self.generate_summary_statistics(daily_data, date_column)
             
+            # 6. 近似去重模式下记录误差范围
+            if summary and self.daily_cube is not None and self.daily_cube.distinct_error:
+                summary['distinct_count'] = {
+                    'mode': 'approximate',
+                    'precision': self.daily_cube.hll_precision,
+                    'relative_error': HyperLogLog.relative_error(self.daily_cube.hll_precision),
+                    'metrics': list(self.daily_cube.distinct_error.keys())
+                }
+            
             return daily_data, summary
             
         except Exception as e:
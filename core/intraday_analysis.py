@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+时段峰值分析模块 - 出入库数据的小时/分钟级时段分布与峰值小时分析
+时间戳一次编码为分钟编码，按(天, 时段)编码bincount聚合，不使用逐行datetime访问器
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, List, Optional
+from core.time_series_kernel import TimeSeriesKernel
+from utils.chart_downsampling import ChartDownsampler
+from config import INTRADAY_CONFIG
+
+MINUTES_PER_DAY = 24 * 60
+
+class IntradayAnalyzer:
+    """时段峰值分析器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化时段峰值分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def build_slot_matrices(df: pd.DataFrame, datetime_column: str,
+                            order_column: Optional[str] = None,
+                            quantity_column: Optional[str] = None,
+                            slot_minutes: int = 60) -> Dict:
+        """
+        按(天, 时段)聚合行数、订单数、件数
+
+        Args:
+            df: 明细数据框（每行为一个订单行）
+            datetime_column: 日期时间列名
+            order_column: 订单号列名（可选）
+            quantity_column: 件数列名（可选）
+            slot_minutes: 时段长度（分钟，需能整除60）
+
+        Returns:
+            dict: 包含首日编码、天数、时段矩阵(天×时段)和小时矩阵(天×24)
+        """
+        if 60 % slot_minutes != 0:
+            raise ValueError(f"时段长度必须能整除60分钟: {slot_minutes}")
+
+        valid_rows, minute_codes = TimeSeriesKernel.to_minute_codes(df[datetime_column])
+        if minute_codes.size == 0:
+            return {}
+
+        day_codes = minute_codes // MINUTES_PER_DAY
+        first_day = int(day_codes.min())
+        n_days = int(day_codes.max()) - first_day + 1
+        slots_per_hour = 60 // slot_minutes
+        n_slots = 24 * slots_per_hour
+
+        # (天, 时段)组合编码：天下标 * 每天时段数 + 时段下标
+        slot_cells = (day_codes - first_day) * n_slots + (minute_codes % MINUTES_PER_DAY) // slot_minutes
+        n_cells = n_days * n_slots
+        all_valid = valid_rows.all()
+
+        slot_metrics = {}
+        hour_metrics = {}
+
+        lines = np.bincount(slot_cells, minlength=n_cells).reshape(n_days, n_slots)
+        slot_metrics['行数'] = lines
+        hour_metrics['行数'] = lines.reshape(n_days, 24, slots_per_hour).sum(axis=2)
+
+        if order_column:
+            source = df[order_column] if all_valid else df[order_column][valid_rows]
+            key_codes, n_keys = TimeSeriesKernel.factorize_keys(source)
+            n_keys = max(n_keys, 1)
+            # 先按时段去重，再将时段映射到小时重新去重（跨时段订单在小时内只计一次）
+            pairs = TimeSeriesKernel.unique_group_key_pairs(slot_cells, key_codes, n_keys)
+            pair_cells = pairs // n_keys
+            slot_metrics['订单数'] = np.bincount(pair_cells, minlength=n_cells).reshape(n_days, n_slots)
+            hour_metrics['订单数'] = TimeSeriesKernel.count_distinct_by_group(
+                pair_cells // slots_per_hour, pairs % n_keys, n_keys, n_days * 24
+            ).reshape(n_days, 24)
+
+        if quantity_column:
+            source = df[quantity_column] if all_valid else df[quantity_column][valid_rows]
+            numeric, _ = TimeSeriesKernel.to_numeric_values(source)
+            units = TimeSeriesKernel.sum_by_group(slot_cells, numeric, n_cells).reshape(n_days, n_slots)
+            slot_metrics['件数'] = units
+            hour_metrics['件数'] = units.reshape(n_days, 24, slots_per_hour).sum(axis=2)
+
+        # 按订单数、行数、件数的固定顺序输出
+        order = [name for name in ['订单数', '行数', '件数'] if name in slot_metrics]
+
+        return {
+            'first_day': first_day,
+            'n_days': n_days,
+            'slot_minutes': slot_minutes,
+            'present_days': lines.sum(axis=1) > 0,
+            'has_time': bool((minute_codes % MINUTES_PER_DAY).any()),
+            'metric_names': order,
+            'slot_metrics': {name: slot_metrics[name] for name in order},
+            'hour_metrics': {name: hour_metrics[name] for name in order}
+        }
+
+    @staticmethod
+    def slot_labels(slot_minutes: int) -> List[str]:
+        """生成时段标签（HH:MM）"""
+        starts = np.arange(0, MINUTES_PER_DAY, slot_minutes)
+        return [f"{m // 60:02d}:{m % 60:02d}" for m in starts]
+
+    @staticmethod
+    def compute_daily_peaks(matrices: Dict) -> pd.DataFrame:
+        """
+        计算每天的峰值小时及峰值小时订单数、行数、件数
+
+        Args:
+            matrices: build_slot_matrices的结果
+
+        Returns:
+            pd.DataFrame: 每天一行的峰值表（仅包含有数据的日期）
+        """
+        present = matrices['present_days']
+        day_codes = np.flatnonzero(present) + matrices['first_day']
+        hour_lines = matrices['hour_metrics']['行数'][present]
+
+        # 以行数最高的小时作为当天峰值小时
+        peak_hour = hour_lines.argmax(axis=1)
+        rows = np.arange(peak_hour.size)
+
+        result = {
+            '日期': TimeSeriesKernel.day_codes_to_datetime(day_codes),
+            '星期': [INTRADAY_CONFIG['weekday_labels'][w] for w in (day_codes + 3) % 7],
+            '峰值小时': [f"{h:02d}:00" for h in peak_hour]
+        }
+
+        for name in matrices['metric_names']:
+            hour_values = matrices['hour_metrics'][name][present]
+            day_totals = hour_values.sum(axis=1)
+            result[f'全天{name}'] = day_totals
+            result[f'峰值小时{name}'] = hour_values[rows, peak_hour]
+            # 各指标自身的最高小时值（可能与行数峰值小时不同）
+            result[f'最高小时{name}'] = hour_values.max(axis=1)
+
+        result['峰值小时行数占比(%)'] = np.round(
+            result['峰值小时行数'] / np.maximum(result['全天行数'], 1) * 100, 2
+        )
+
+        slot_minutes = matrices['slot_minutes']
+        if slot_minutes < 60:
+            for name in matrices['metric_names']:
+                result[f'最高{slot_minutes}分钟{name}'] = matrices['slot_metrics'][name][present].max(axis=1)
+
+        return pd.DataFrame(result)
+
+    @staticmethod
+    def compute_slot_profile(matrices: Dict, percentile: float) -> pd.DataFrame:
+        """
+        计算时段分布曲线（各时段的日均值和分位数值）
+
+        Args:
+            matrices: build_slot_matrices的结果
+            percentile: 分位数（如95）
+
+        Returns:
+            pd.DataFrame: 每个时段一行
+        """
+        present = matrices['present_days']
+        profile = {'时段': IntradayAnalyzer.slot_labels(matrices['slot_minutes'])}
+
+        for name in matrices['metric_names']:
+            values = matrices['slot_metrics'][name][present]
+            profile[f'日均{name}'] = np.round(values.mean(axis=0), 2)
+            profile[f'P{percentile:g}{name}'] = np.round(np.percentile(values, percentile, axis=0), 2)
+
+        return pd.DataFrame(profile)
+
+    @staticmethod
+    def compute_weekday_hour(matrices: Dict, metric_name: str) -> pd.DataFrame:
+        """
+        计算星期×小时热力矩阵（各星期对应日期的小时平均值）
+
+        Args:
+            matrices: build_slot_matrices的结果
+            metric_name: 指标名（订单数/行数/件数）
+
+        Returns:
+            pd.DataFrame: 行为星期一至星期日，列为0-23时
+        """
+        present = matrices['present_days']
+        day_codes = np.flatnonzero(present) + matrices['first_day']
+        weekdays = (day_codes + 3) % 7  # 1970-01-01为星期四，星期一为0
+
+        hour_values = matrices['hour_metrics'][metric_name][present].astype(np.float64)
+        totals = np.zeros((7, 24))
+        np.add.at(totals, weekdays, hour_values)
+        day_counts = np.bincount(weekdays, minlength=7)
+
+        averages = totals / np.maximum(day_counts, 1)[:, None]
+        return pd.DataFrame(
+            np.round(averages, 2),
+            index=INTRADAY_CONFIG['weekday_labels'],
+            columns=[f"{h:02d}时" for h in range(24)]
+        )
+
+    @staticmethod
+    def compute_peak_summary(daily_peaks: pd.DataFrame, metric_names: List[str],
+                             percentile: float) -> Dict:
+        """
+        计算全年峰值小时统计（设备能力按峰值小时而非峰值日设计）
+
+        Args:
+            daily_peaks: 每日峰值表
+            metric_names: 指标名列表
+            percentile: 设计分位数
+
+        Returns:
+            dict: {指标名: 峰值统计}
+        """
+        summary = {}
+        for name in metric_names:
+            values = daily_peaks[f'最高小时{name}'].to_numpy(dtype=np.float64)
+            max_idx = int(values.argmax())
+            summary[name] = {
+                'percentile': percentile,
+                'design_value': float(np.percentile(values, percentile)),
+                'mean': float(values.mean()),
+                'max': float(values[max_idx]),
+                'max_date': daily_peaks['日期'].iloc[max_idx],
+                'peak_hour_share': float(
+                    daily_peaks[f'峰值小时{name}'].sum() / max(daily_peaks[f'全天{name}'].sum(), 1) * 100
+                )
+            }
+
+        # 最常出现的峰值小时
+        summary['common_peak_hour'] = daily_peaks['峰值小时'].mode().iloc[0]
+        return summary
+
+    def analyze(self, df: pd.DataFrame, datetime_column: str,
+                order_column: Optional[str] = None,
+                quantity_column: Optional[str] = None,
+                slot_minutes: int = 60) -> Dict:
+        """
+        执行时段峰值分析
+
+        Args:
+            df: 明细数据框
+            datetime_column: 日期时间列名
+            order_column: 订单号列名（可选）
+            quantity_column: 件数列名（可选）
+            slot_minutes: 时段长度（分钟）
+
+        Returns:
+            dict: 包含daily_peaks、slot_profile、weekday_hour、peak_summary，失败时为空字典
+        """
+        try:
+            matrices = self.build_slot_matrices(
+                df, datetime_column, order_column, quantity_column, slot_minutes
+            )
+            if not matrices:
+                st.error(f"❌ 日期列 '{datetime_column}' 没有有效的日期时间数据")
+                return {}
+
+            if not matrices['has_time']:
+                st.warning("⚠️ 日期列不包含时分信息，所有数据将落在00:00时段")
+
+            percentile = self.config.get('peak_percentile', INTRADAY_CONFIG['peak_percentile'])
+            daily_peaks = self.compute_daily_peaks(matrices)
+
+            return {
+                'matrices': matrices,
+                'daily_peaks': daily_peaks,
+                'slot_profile': self.compute_slot_profile(matrices, percentile),
+                'weekday_hour': {
+                    name: self.compute_weekday_hour(matrices, name)
+                    for name in matrices['metric_names']
+                },
+                'peak_summary': self.compute_peak_summary(
+                    daily_peaks, matrices['metric_names'], percentile
+                )
+            }
+
+        except Exception as e:
+            st.error(f"❌ 时段峰值分析失败: {str(e)}")
+            return {}
+
+    def render_weekday_hour_heatmap(self, weekday_hour: pd.DataFrame, metric_name: str):
+        """
+        渲染星期×小时热力图
+
+        Args:
+            weekday_hour: 星期×小时矩阵
+            metric_name: 指标名
+        """
+        fig = go.Figure(data=go.Heatmap(
+            z=weekday_hour.values,
+            x=list(weekday_hour.columns),
+            y=list(weekday_hour.index),
+            colorscale='YlOrRd',
+            hovertemplate=f'%{{y}} %{{x}}<br>平均{metric_name}: %{{z:,.1f}}<extra></extra>'
+        ))
+        fig.update_layout(
+            title=f"星期×小时 平均{metric_name}",
+            height=360,
+            yaxis=dict(autorange='reversed'),
+            margin=dict(l=40, r=20, t=50, b=40)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    def render_slot_profile(self, slot_profile: pd.DataFrame, metric_names: List[str], percentile: float):
+        """
+        渲染时段分布曲线
+
+        Args:
+            slot_profile: 时段分布表
+            metric_names: 指标名列表
+            percentile: 分位数
+        """
+        fig = go.Figure()
+        for name in metric_names:
+            fig.add_trace(go.Bar(
+                x=slot_profile['时段'], y=slot_profile[f'日均{name}'], name=f'日均{name}'
+            ))
+            # 时段数最多为一天的分钟数，无需降采样，仅按点数选择渲染方式
+            fig.add_trace(ChartDownsampler.line_trace(
+                len(slot_profile), x=slot_profile['时段'], y=slot_profile[f'P{percentile:g}{name}'],
+                name=f'P{percentile:g}{name}', mode='lines', line=dict(dash='dash')
+            ))
+        fig.update_layout(
+            title="时段分布（日均值与分位数）",
+            height=400,
+            barmode='group',
+            xaxis_title="时段",
+            yaxis_title="数量",
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig, use_container_width=True)
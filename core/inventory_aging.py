@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+库龄分析模块 - 按先进先出(FIFO)将出库数量匹配到入库批次，统计在库时长和库龄结构
+入库、出库各自按(SKU, 日期)排序后换算为累计数量区间，每个SKU占用一段互不重叠的全局坐标；
+两侧区间端点合并排序后，每个小区间用searchsorted定位所属入库批次和出库行，不为SKU维护逐件队列
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, Optional
+from core.stock_reconciliation import StockReconciler
+from config import INVENTORY_AGING_CONFIG
+
+class InventoryAgingAnalyzer:
+    """FIFO库龄分析器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化库龄分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def _sorted_intervals(sku: np.ndarray, day: np.ndarray, quantity: np.ndarray,
+                          sku_offset: np.ndarray, n_days: int) -> Dict:
+        """按(SKU, 日期)排序并换算为全局累计数量区间[start, end)"""
+        # 合成单个int64排序键排序，比lexsort快得多（同一SKU同一天的多行先后对库龄没有影响）
+        order = np.argsort(sku * n_days + day)
+        sku, day, quantity = sku[order], day[order], quantity[order]
+
+        # SKU内累计数量 + SKU起点坐标；区间起点直接取上一条的终点，保证两侧端点完全相等
+        totals = np.bincount(sku, weights=quantity, minlength=len(sku_offset))
+        before = np.concatenate([[0.0], np.cumsum(totals)])[sku]
+        end = sku_offset[sku] + np.cumsum(quantity) - before
+        is_first = np.ones(len(sku), dtype=bool)
+        is_first[1:] = sku[1:] != sku[:-1]
+        start = np.where(is_first, sku_offset[sku], np.concatenate([[0.0], end[:-1]]))
+        return {'sku': sku, 'day': day, 'start': start, 'end': end, 'total': totals}
+
+    @staticmethod
+    def _locate(intervals: Dict, points: np.ndarray) -> np.ndarray:
+        """查找每个坐标点所在的区间下标，不在任何区间内时为-1"""
+        position = np.searchsorted(intervals['end'], points, side='right')
+        inside = position < len(intervals['end'])
+        inside[inside] = intervals['start'][position[inside]] <= points[inside]
+        return np.where(inside, position, -1)
+
+    @staticmethod
+    def match_fifo(flows: Dict) -> Dict:
+        """
+        按FIFO匹配入库批次和出库行
+
+        Args:
+            flows: StockReconciler.encode_flows的结果
+
+        Returns:
+            dict: 匹配片段（sku、数量、入库天、出库天）、剩余库存片段和未匹配出库片段
+        """
+        n_skus = len(flows['skus'])
+        n_days = len(flows['dates'])
+        is_in = flows['inbound'] > 0
+        is_out = flows['outbound'] > 0
+        sku, day = flows['sku_codes'], flows['day_idx']
+
+        inbound_total = np.bincount(sku[is_in], weights=flows['inbound'][is_in], minlength=n_skus)
+        outbound_total = np.bincount(sku[is_out], weights=flows['outbound'][is_out], minlength=n_skus)
+        # 每个SKU占用长度为max(入库, 出库)的坐标段，段与段之间不重叠
+        sku_offset = np.concatenate([[0.0], np.cumsum(np.maximum(inbound_total, outbound_total))[:-1]])
+
+        lots = InventoryAgingAnalyzer._sorted_intervals(sku[is_in], day[is_in], flows['inbound'][is_in],
+                                                        sku_offset, n_days)
+        lines = InventoryAgingAnalyzer._sorted_intervals(sku[is_out], day[is_out], flows['outbound'][is_out],
+                                                         sku_offset, n_days)
+
+        # 两侧端点合并，相邻端点构成的小区间只属于一个入库批次和一个出库行
+        boundaries = np.unique(np.concatenate([sku_offset, lots['end'], lines['end']]))
+        segment_start = boundaries[:-1]
+        segment_quantity = np.diff(boundaries)
+
+        # 小数数量（kg、m³）的累计和有舍入误差，两侧本应相等的端点会留下极短的虚假片段，按SKU数量级的相对容差剔除
+        extent = np.maximum(inbound_total, outbound_total)
+        segment_sku = np.clip(np.searchsorted(sku_offset, segment_start, side='right') - 1, 0, max(n_skus - 1, 0))
+        tolerance = INVENTORY_AGING_CONFIG['quantity_tolerance'] * extent[segment_sku] \
+            + 64 * np.spacing(np.abs(boundaries[1:]))
+        kept = segment_quantity > tolerance
+        segment_start, segment_quantity = segment_start[kept], segment_quantity[kept]
+        lot = InventoryAgingAnalyzer._locate(lots, segment_start)
+        line = InventoryAgingAnalyzer._locate(lines, segment_start)
+
+        matched = (lot >= 0) & (line >= 0)
+        remaining = (lot >= 0) & (line < 0)
+        unmatched = (lot < 0) & (line >= 0)
+        return {
+            'matched': {
+                'sku': lots['sku'][lot[matched]],
+                'quantity': segment_quantity[matched],
+                'inbound_day': lots['day'][lot[matched]],
+                'outbound_day': lines['day'][line[matched]]
+            },
+            'remaining': {
+                'sku': lots['sku'][lot[remaining]],
+                'quantity': segment_quantity[remaining],
+                'inbound_day': lots['day'][lot[remaining]]
+            },
+            'unmatched': {
+                'sku': lines['sku'][line[unmatched]],
+                'quantity': segment_quantity[unmatched]
+            },
+            'inbound_total': inbound_total,
+            'outbound_total': outbound_total
+        }
+
+    @staticmethod
+    def bucket_labels(age_buckets) -> list:
+        """库龄分段标签（如 0-30天、31-90天、90天以上）"""
+        edges = [0] + list(age_buckets)
+        labels = [f"{edges[0]}-{edges[1]}天"]
+        labels += [f"{low + 1}-{high}天" for low, high in zip(edges[1:-1], edges[2:])]
+        labels.append(f"{edges[-1]}天以上")
+        return labels
+
+    @staticmethod
+    def weighted_percentiles(values: np.ndarray, weights: np.ndarray, percentiles) -> Dict[int, float]:
+        """按数量加权的分位数（天数为整数，按天直方图累计求取）"""
+        if values.size == 0 or weights.sum() <= 0:
+            return {p: np.nan for p in percentiles}
+        low = int(values.min())
+        histogram = np.bincount(values - low, weights=weights)
+        cumulative = np.cumsum(histogram) / histogram.sum()
+        return {p: float(np.searchsorted(cumulative, p / 100 - 1e-12) + low) for p in percentiles}
+
+    def analyze(self, inbound_df: pd.DataFrame, inbound_columns: Dict[str, Optional[str]],
+                outbound_df: pd.DataFrame, outbound_columns: Dict[str, Optional[str]]) -> Dict:
+        """
+        执行FIFO库龄分析
+
+        Args:
+            inbound_df: 入库明细
+            inbound_columns: 入库列名 {'date', 'sku', 'quantity'}
+            outbound_df: 出库明细
+            outbound_columns: 出库列名 {'date', 'sku', 'quantity'}
+
+        Returns:
+            dict: summary、dwell_distribution、aging_buckets、sku_table，无有效数据时为空字典
+        """
+        try:
+            flows = StockReconciler.encode_flows(inbound_df, inbound_columns, outbound_df, outbound_columns)
+            if not flows:
+                return {}
+
+            age_buckets = self.config.get('age_buckets', INVENTORY_AGING_CONFIG['age_buckets'])
+            percentiles = INVENTORY_AGING_CONFIG['dwell_percentiles']
+            n_skus = len(flows['skus'])
+            as_of_day = len(flows['dates']) - 1
+            segments = InventoryAgingAnalyzer.match_fifo(flows)
+            matched, remaining = segments['matched'], segments['remaining']
+
+            # 在库时长：出库日 - 入库日；为负表示出库早于可匹配的入库（通常缺少期初库存）
+            dwell = (matched['outbound_day'] - matched['inbound_day']).astype(np.int64)
+            early = dwell < 0
+            dwell_quantity = np.where(early, 0.0, matched['quantity'])
+            dwell_stats = InventoryAgingAnalyzer.weighted_percentiles(dwell[~early], matched['quantity'][~early], percentiles)
+            dwell_histogram = np.bincount(np.maximum(dwell, 0), weights=dwell_quantity)
+
+            # 剩余库存库龄：截至最后一天，按分段汇总数量和SKU数
+            age = (as_of_day - remaining['inbound_day']).astype(np.int64)
+            bucket = np.searchsorted(np.asarray(age_buckets), age, side='left')
+            labels = InventoryAgingAnalyzer.bucket_labels(age_buckets)
+            bucket_quantity = np.bincount(bucket, weights=remaining['quantity'], minlength=len(labels))
+            sku_bucket = np.bincount(remaining['sku'] * len(labels) + bucket, weights=remaining['quantity'],
+                                     minlength=n_skus * len(labels)).reshape(n_skus, len(labels))
+            total_remaining = bucket_quantity.sum()
+            aging_buckets = pd.DataFrame({
+                '库龄': labels,
+                '库存数量': bucket_quantity,
+                '数量占比(%)': bucket_quantity / total_remaining * 100 if total_remaining > 0 else 0.0,
+                'SKU数': (sku_bucket > 0).sum(axis=0)
+            })
+
+            # SKU明细：加权平均在库天数、剩余库存、最老库龄
+            matched_quantity = np.bincount(matched['sku'], weights=dwell_quantity, minlength=n_skus)
+            dwell_sum = np.bincount(matched['sku'], weights=dwell_quantity * np.maximum(dwell, 0), minlength=n_skus)
+            oldest = np.full(n_skus, -1, dtype=np.int64)
+            np.maximum.at(oldest, remaining['sku'], age)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                average_dwell = np.where(matched_quantity > 0, dwell_sum / matched_quantity, np.nan)
+
+            sku_table = pd.DataFrame({
+                'SKU': flows['skus'],
+                '入库总量': segments['inbound_total'],
+                '出库总量': segments['outbound_total'],
+                '剩余库存': sku_bucket.sum(axis=1),
+                '平均在库天数': np.round(average_dwell, 1),
+                '最老库龄(天)': np.where(oldest >= 0, oldest, np.nan)
+            })
+            for position, label in enumerate(labels):
+                sku_table[f'库龄{label}'] = sku_bucket[:, position]
+            sku_table = sku_table.sort_values(['最老库龄(天)', '剩余库存'], ascending=False,
+                                              kind='stable', na_position='last').reset_index(drop=True)
+
+            matched_total = float(matched['quantity'].sum())
+            summary = {
+                'sku_count': n_skus,
+                'as_of_date': flows['dates'][-1],
+                'matched_quantity': matched_total,
+                'remaining_quantity': float(total_remaining),
+                'unmatched_outbound': float(segments['unmatched']['quantity'].sum()),
+                'early_outbound': float(matched['quantity'][early].sum()),
+                'average_dwell': float((dwell_histogram * np.arange(dwell_histogram.size)).sum() / dwell_histogram.sum())
+                if dwell_histogram.sum() > 0 else np.nan,
+                'dwell_percentiles': dwell_stats
+            }
+            return {
+                'summary': summary,
+                'dwell_distribution': pd.DataFrame({
+                    '在库天数': np.arange(dwell_histogram.size),
+                    '出库数量': dwell_histogram
+                }),
+                'aging_buckets': aging_buckets,
+                'sku_table': sku_table
+            }
+
+        except Exception as e:
+            st.error(f"❌ 库龄计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_dwell_chart(dwell_distribution: pd.DataFrame, dwell_percentiles: Dict[int, float]):
+        """
+        渲染在库时长分布图（按出库数量加权）
+
+        Args:
+            dwell_distribution: 在库天数分布
+            dwell_percentiles: 在库天数分位数
+        """
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=dwell_distribution['在库天数'], y=dwell_distribution['出库数量'],
+                             name='出库数量', marker_color='#1f77b4'))
+        for percentile, value in dwell_percentiles.items():
+            if not np.isnan(value):
+                fig.add_vline(x=value, line_dash="dash", line_color='#d62728',
+                              annotation_text=f"P{percentile}: {value:.0f}天")
+        fig.update_layout(title="在库时长分布（FIFO）", xaxis_title="在库天数", yaxis_title="出库数量",
+                          height=400, bargap=0)
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+库存周转分析模块 - 库存快照关联出库历史，计算SKU和品类的周转率、可供天数和覆盖分类
+出库行按距截止日的天数一次性划入30/90/365天等窗口分段，单次bincount得到所有SKU所有窗口的出库量，
+不按窗口或SKU重复扫描历史
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, List, Optional
+from core.time_series_kernel import TimeSeriesKernel, MISSING_DAY_CODE
+from config import TURNOVER_CONFIG
+
+class TurnoverAnalyzer:
+    """库存周转与可供天数分析器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化库存周转分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def snapshot_arrays(snapshot_df: pd.DataFrame, sku_column: str, stock_column: str,
+                        category_column: Optional[str] = None) -> Dict:
+        """
+        按SKU汇总库存快照（同一SKU多库位的库存相加）
+
+        Args:
+            snapshot_df: 库存快照
+            sku_column: SKU列名
+            stock_column: 库存数量列名
+            category_column: 品类列名（可选，同一SKU取第一条的品类）
+
+        Returns:
+            dict: skus、stock（按SKU编码）、categories（按SKU编码，无品类列时为None）
+        """
+        sku_codes, skus = pd.factorize(snapshot_df[sku_column], use_na_sentinel=True)
+        valid = sku_codes >= 0
+        stock, _ = TimeSeriesKernel.to_numeric_values(snapshot_df[stock_column])
+        stock = np.bincount(sku_codes[valid], weights=np.nan_to_num(stock[valid], nan=0.0), minlength=len(skus))
+
+        categories = None
+        if category_column:
+            _, first_row = np.unique(sku_codes[valid], return_index=True)
+            categories = snapshot_df[category_column].to_numpy()[np.flatnonzero(valid)[first_row]]
+        return {'skus': pd.Index(skus), 'stock': stock, 'categories': categories}
+
+    @staticmethod
+    def window_outbound(sku_codes: np.ndarray, day_codes: np.ndarray, quantity: np.ndarray,
+                        n_skus: int, windows: List[int], end_day: int) -> np.ndarray:
+        """
+        一次计算所有SKU在各滚动窗口（截至end_day的最近N天）内的出库量
+
+        Args:
+            sku_codes: 每行的SKU编码（-1为不在快照中的SKU）
+            day_codes: 每行的天编码
+            quantity: 每行的出库数量
+            n_skus: SKU数
+            windows: 窗口天数（升序）
+            end_day: 截止日天编码
+
+        Returns:
+            np.ndarray: (SKU, 窗口)出库量矩阵
+        """
+        age = end_day - day_codes.astype(np.int64)
+        valid = (sku_codes >= 0) & (day_codes != MISSING_DAY_CODE) & (age >= 0)
+        # 分段k表示落在第k个窗口内但不在更短窗口内；对分段做累计和即得到各窗口合计
+        segment = np.searchsorted(np.asarray(windows), age[valid], side='right')
+        n_segments = len(windows) + 1
+        counts = np.bincount(sku_codes[valid] * n_segments + segment, weights=quantity[valid],
+                             minlength=n_skus * n_segments).reshape(n_skus, n_segments)
+        return np.cumsum(counts[:, :len(windows)], axis=1)
+
+    def coverage_class(self, days_of_supply: np.ndarray, stock: np.ndarray,
+                       window_demand: np.ndarray) -> np.ndarray:
+        """
+        按可供天数划分覆盖分类
+
+        Args:
+            days_of_supply: 可供天数
+            stock: 当前库存
+            window_demand: 最长窗口内的出库量（为0且有库存视为呆滞）
+
+        Returns:
+            np.ndarray: 覆盖分类标签
+        """
+        thresholds = self.config.get('coverage_days', TURNOVER_CONFIG['coverage_days'])
+        labels = TURNOVER_CONFIG['coverage_labels']
+        classes = np.array(labels, dtype=object)[np.searchsorted(np.asarray(thresholds), days_of_supply, side='left')]
+        classes = np.where(stock <= 0, '无库存', classes)
+        return np.where((stock > 0) & (window_demand <= 0), '呆滞', classes)
+
+    @staticmethod
+    def turnover_metrics(stock: np.ndarray, window_outbound: np.ndarray, window_days: List[int]) -> Dict[str, np.ndarray]:
+        """
+        计算各窗口的年化周转次数和可供天数
+
+        Args:
+            stock: 库存（SKU或品类）
+            window_outbound: (行, 窗口)出库量
+            window_days: 各窗口实际覆盖的天数（出库历史短于窗口时为历史天数）
+
+        Returns:
+            dict: turnover、days_of_supply（均为(行, 窗口)矩阵，无库存周转为NaN，无出库可供天数为inf）
+        """
+        daily_demand = window_outbound / np.asarray(window_days, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            turnover = np.where(stock[:, None] > 0, daily_demand * 365 / stock[:, None], np.nan)
+            days_of_supply = np.where(daily_demand > 0, np.maximum(stock, 0)[:, None] / daily_demand,
+                                      np.where(stock[:, None] > 0, np.inf, 0.0))
+        return {'turnover': turnover, 'days_of_supply': days_of_supply}
+
+    def analyze(self, snapshot_df: pd.DataFrame, snapshot_columns: Dict[str, Optional[str]],
+                outbound_df: pd.DataFrame, outbound_columns: Dict[str, Optional[str]]) -> Dict:
+        """
+        执行库存周转分析
+
+        Args:
+            snapshot_df: 库存快照
+            snapshot_columns: 快照列名 {'sku', 'stock', 'category'}（category可为空）
+            outbound_df: 出库明细
+            outbound_columns: 出库列名 {'date', 'sku', 'quantity'}（quantity可为空）
+
+        Returns:
+            dict: summary、sku_table、category_table、class_table，无有效数据时为空字典
+        """
+        try:
+            snapshot = TurnoverAnalyzer.snapshot_arrays(snapshot_df, snapshot_columns['sku'],
+                                                        snapshot_columns['stock'], snapshot_columns.get('category'))
+            day_codes = TimeSeriesKernel.to_day_codes(outbound_df[outbound_columns['date']])
+            has_date = day_codes != MISSING_DAY_CODE
+            if len(snapshot['skus']) == 0 or not has_date.any():
+                return {}
+
+            windows = sorted(self.config.get('windows', TURNOVER_CONFIG['windows']))
+            primary = TURNOVER_CONFIG['primary_window'] if TURNOVER_CONFIG['primary_window'] in windows else windows[-1]
+            primary_position = windows.index(primary)
+            end_day = int(day_codes[has_date].max())
+            # 出库历史短于窗口时按实际覆盖的天数折算日均出库，避免低估周转、高估可供天数
+            history_days = end_day - int(day_codes[has_date].min()) + 1
+            window_days = [min(window, history_days) for window in windows]
+
+            # 出库SKU映射到快照SKU编码（哈希查找，不做DataFrame合并）
+            sku_codes = snapshot['skus'].get_indexer(outbound_df[outbound_columns['sku']])
+            if outbound_columns.get('quantity'):
+                quantity, _ = TimeSeriesKernel.to_numeric_values(outbound_df[outbound_columns['quantity']])
+                quantity = np.nan_to_num(quantity, nan=0.0)
+            else:
+                quantity = np.ones(len(outbound_df), dtype=np.float64)
+
+            n_skus = len(snapshot['skus'])
+            stock = snapshot['stock']
+            window_outbound = TurnoverAnalyzer.window_outbound(sku_codes, day_codes, quantity, n_skus, windows, end_day)
+            metrics = TurnoverAnalyzer.turnover_metrics(stock, window_outbound, window_days)
+            days_of_supply = metrics['days_of_supply'][:, primary_position]
+            classes = self.coverage_class(days_of_supply, stock, window_outbound[:, -1])
+
+            sku_table = pd.DataFrame({'SKU': snapshot['skus'], '库存': stock})
+            if snapshot['categories'] is not None:
+                sku_table.insert(1, '品类', snapshot['categories'])
+            for position, window in enumerate(windows):
+                sku_table[f'近{window}天出库'] = window_outbound[:, position]
+            for position, window in enumerate(windows):
+                sku_table[f'周转次数({window}天)'] = np.round(metrics['turnover'][:, position], 2)
+            sku_table['可供天数'] = np.round(days_of_supply, 1)
+            sku_table['覆盖分类'] = classes
+
+            labels = ['无库存'] + TURNOVER_CONFIG['coverage_labels'] + ['呆滞']
+            class_table = (sku_table.groupby('覆盖分类', observed=True)
+                           .agg(SKU数=('SKU', 'size'), 库存=('库存', 'sum'))
+                           .reindex(labels, fill_value=0).reset_index())
+            total_stock = stock[stock > 0].sum()
+            class_table['库存占比(%)'] = np.where(total_stock > 0, class_table['库存'].clip(lower=0) / total_stock * 100, 0.0)
+
+            category_table = pd.DataFrame()
+            if snapshot['categories'] is not None:
+                category_codes, categories = pd.factorize(snapshot['categories'], use_na_sentinel=True)
+                has_category = category_codes >= 0
+                n_categories = len(categories)
+                category_stock = np.bincount(category_codes[has_category], weights=stock[has_category],
+                                             minlength=n_categories)
+                category_outbound = np.stack([
+                    np.bincount(category_codes[has_category], weights=window_outbound[has_category, position],
+                                minlength=n_categories)
+                    for position in range(len(windows))
+                ], axis=1)
+                category_metrics = TurnoverAnalyzer.turnover_metrics(category_stock, category_outbound, window_days)
+                category_table = pd.DataFrame({
+                    '品类': categories,
+                    'SKU数': np.bincount(category_codes[has_category], minlength=n_categories),
+                    '库存': category_stock
+                })
+                for position, window in enumerate(windows):
+                    category_table[f'周转次数({window}天)'] = np.round(category_metrics['turnover'][:, position], 2)
+                category_table['可供天数'] = np.round(category_metrics['days_of_supply'][:, primary_position], 1)
+                category_table = category_table.sort_values('库存', ascending=False, kind='stable').reset_index(drop=True)
+
+            outbound_metrics = TurnoverAnalyzer.turnover_metrics(
+                np.array([total_stock]), window_outbound.sum(axis=0, keepdims=True), window_days
+            )
+            summary = {
+                'sku_count': n_skus,
+                'end_date': TimeSeriesKernel.day_codes_to_datetime(np.array([end_day]))[0],
+                'windows': windows,
+                'primary_window': primary,
+                'history_days': history_days,
+                'total_stock': float(total_stock),
+                'turnover': {window: float(outbound_metrics['turnover'][0, position])
+                             for position, window in enumerate(windows)},
+                'days_of_supply': float(outbound_metrics['days_of_supply'][0, primary_position]),
+                'unknown_outbound_skus': int(pd.unique(np.asarray(outbound_df[outbound_columns['sku']])[sku_codes < 0]).size)
+            }
+            sku_table = sku_table.sort_values('可供天数', ascending=False, kind='stable').reset_index(drop=True)
+            return {'summary': summary, 'sku_table': sku_table, 'category_table': category_table, 'class_table': class_table}
+
+        except Exception as e:
+            st.error(f"❌ 库存周转计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_class_chart(class_table: pd.DataFrame):
+        """
+        渲染覆盖分类的SKU数与库存占比
+
+        Args:
+            class_table: 覆盖分类汇总表
+        """
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=class_table['覆盖分类'], y=class_table['SKU数'], name='SKU数',
+                             marker_color='#1f77b4', yaxis='y'))
+        fig.add_trace(go.Scatter(x=class_table['覆盖分类'], y=class_table['库存占比(%)'], name='库存占比(%)',
+                                 mode='lines+markers', line=dict(color='#ff7f0e', width=2), yaxis='y2'))
+        fig.update_layout(
+            title="库存覆盖分类",
+            yaxis=dict(title="SKU数"),
+            yaxis2=dict(title="库存占比(%)", overlaying='y', side='right'),
+            height=400
+        )
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+键列对齐索引模块 - 每个数据集的每个键列（SKU、订单号、客户、供应商等）只编码一次，各分析按编码得到对齐的数组
+ABC分类、装箱等按SKU的中间结果、按订单汇总的特征都直接以数组下标对齐，无需再通过格式化的结果表合并
+"""
+
+import pandas as pd
+import numpy as np
+from core.frame_cache import FrameCache
+
+class KeyIndex(FrameCache):
+    """键列对齐索引"""
+
+    def __init__(self, df: pd.DataFrame, column: str):
+        """
+        构建键列索引（一次编码；编码按首次出现顺序分配）
+
+        Args:
+            df: 数据框
+            column: 键列名（SKU、订单号等）
+        """
+        super().__init__(df)
+        self.column = column
+        self.codes, keys = pd.factorize(df[column], use_na_sentinel=True)
+        self.keys = pd.Index(keys)
+
+        # 编码按首次出现顺序分配，某行是该键首行当且仅当其编码大于之前出现过的最大编码
+        running_max = np.maximum.accumulate(np.concatenate([[-1], self.codes]))
+        self.first_rows = np.flatnonzero(self.codes > running_max[:-1])
+        self.valid = self.codes >= 0
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame, column: str) -> 'KeyIndex':
+        """
+        获取数据框的键列索引（同一数据框同一列只构建一次）
+
+        Args:
+            df: 数据框
+            column: 键列名
+
+        Returns:
+            KeyIndex: 键列索引
+        """
+        return cls._cached(df, column)
+
+    @property
+    def n_keys(self) -> int:
+        """不同键值数"""
+        return len(self.keys)
+
+    def sum(self, values) -> np.ndarray:
+        """
+        按键求和（非数值和缺失值按0计）
+
+        Args:
+            values: 与数据框行对齐的数值序列
+
+        Returns:
+            np.ndarray: 每个键编码的合计
+        """
+        numeric = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        weights = np.nan_to_num(numeric[self.valid], nan=0.0)
+        return np.bincount(self.codes[self.valid], weights=weights, minlength=self.n_keys)
+
+    def first(self, values) -> np.ndarray:
+        """
+        取每个键首行的值
+
+        Args:
+            values: 与数据框行对齐的序列
+
+        Returns:
+            np.ndarray: 每个键编码首行的值
+        """
+        return np.asarray(values)[self.first_rows]
+
+    def first_numeric(self, values) -> np.ndarray:
+        """
+        取每个键首行的数值（非数值为NaN）
+
+        Args:
+            values: 与数据框行对齐的序列
+
+        Returns:
+            np.ndarray: 每个键编码首行的float64数值
+        """
+        return pd.to_numeric(pd.Series(self.first(values)), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
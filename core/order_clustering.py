@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+订单聚类模块 - 按订单画像（行数、件数、体积、重量、ABC构成）聚类，识别需要建设的履约流程
+订单号只编码一次，全部订单特征由同一套订单编码bincount汇总；聚类为NumPy实现的小批量k-means，
+每次迭代只处理一个随机小批量，百万级订单无需额外的机器学习依赖
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, List, Optional, Tuple
+from core.abc_analysis import ABCAnalyzer
+from core.key_index import KeyIndex
+from config import PACKING_CONFIG, ORDER_CLUSTER_CONFIG
+
+ABC_LABELS = ['A', 'B', 'C']
+
+class OrderClusterAnalyzer:
+    """订单画像聚类分析器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化订单聚类分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def order_features(df: pd.DataFrame, order_column: str, sku_column: str, quantity_column: Optional[str] = None,
+                       dimension_columns: Optional[List[str]] = None, weight_column: Optional[str] = None,
+                       data_unit: str = "cm", weight_unit: str = "kg", a_percentage: float = 70,
+                       b_percentage: float = 20) -> Tuple[KeyIndex, pd.DataFrame]:
+        """
+        按订单汇总画像特征（订单号编码一次，所有特征按同一订单编码bincount）
+
+        Args:
+            df: 出库订单明细（每行一个拣选行）
+            order_column: 订单号列名
+            sku_column: SKU列名
+            quantity_column: 件数列名，为空时每行计1件
+            dimension_columns: 单件长、宽、高列名，为空时不计算体积
+            weight_column: 单件重量列名，为空时不计算重量
+            data_unit: 尺寸单位
+            weight_unit: 重量单位
+            a_percentage: A类累计百分比（按SKU出库件数分类）
+            b_percentage: B类累计百分比
+
+        Returns:
+            tuple: (订单索引, 每个订单编码一行的特征表)
+        """
+        orders = KeyIndex.for_frame(df, order_column)
+        skus = KeyIndex.for_frame(df, sku_column)
+        valid = orders.valid & skus.valid
+        line_orders = orders.codes[valid]
+
+        def order_sum(values: np.ndarray) -> np.ndarray:
+            return np.bincount(line_orders, weights=values[valid], minlength=orders.n_keys)
+
+        if quantity_column:
+            units = np.nan_to_num(pd.to_numeric(df[quantity_column], errors='coerce').to_numpy(
+                dtype=np.float64, na_value=np.nan), nan=0.0)
+        else:
+            units = np.ones(len(df))
+        features = {'行数': np.bincount(line_orders, minlength=orders.n_keys).astype(np.float64),
+                    '件数': order_sum(units)}
+
+        if dimension_columns:
+            conversion = PACKING_CONFIG["unit_conversion"][data_unit]
+            unit_volume = np.ones(len(df))
+            for column in dimension_columns:
+                unit_volume = unit_volume * pd.to_numeric(df[column], errors='coerce').to_numpy(
+                    dtype=np.float64, na_value=np.nan) * conversion
+            features['体积(L)'] = order_sum(np.nan_to_num(unit_volume * units / 1e6, nan=0.0))
+        if weight_column:
+            unit_weight = pd.to_numeric(df[weight_column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            unit_weight = unit_weight * PACKING_CONFIG["weight_conversion"][weight_unit]
+            features['重量(kg)'] = order_sum(np.nan_to_num(unit_weight * units, nan=0.0))
+
+        # ABC构成：SKU按出库件数分类，订单内各类拣选行占比
+        sku_classes = ABCAnalyzer.classify(skus.sum(units), a_percentage, b_percentage)
+        class_lines = np.bincount(line_orders * len(ABC_LABELS) + sku_classes[skus.codes[valid]],
+                                  minlength=orders.n_keys * len(ABC_LABELS)).reshape(-1, len(ABC_LABELS))
+        lines = np.maximum(features['行数'], 1)
+        for code, label in enumerate(ABC_LABELS):
+            features[f'{label}类行占比'] = class_lines[:, code] / lines
+        return orders, pd.DataFrame(features)
+
+    @staticmethod
+    def standardize(features: pd.DataFrame) -> np.ndarray:
+        """
+        特征标准化（行数、件数、体积、重量先取log1p压缩长尾，再按列z-score）
+
+        Args:
+            features: 订单特征表
+
+        Returns:
+            np.ndarray: 标准化后的特征矩阵
+        """
+        matrix = features.to_numpy(dtype=np.float64).copy()
+        skewed = [position for position, name in enumerate(features.columns) if not name.endswith('占比')]
+        matrix[:, skewed] = np.log1p(np.maximum(matrix[:, skewed], 0))
+        std = matrix.std(axis=0)
+        return (matrix - matrix.mean(axis=0)) / np.where(std > 0, std, 1)
+
+    @staticmethod
+    def assign(points: np.ndarray, centers: np.ndarray, chunk_size: int = 200000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        把每个点分配到最近的中心（分块计算距离矩阵，控制内存）
+
+        Args:
+            points: 点矩阵（n × d）
+            centers: 中心矩阵（k × d）
+            chunk_size: 每块的点数
+
+        Returns:
+            tuple: (每个点的中心编码, 到该中心的距离平方)
+        """
+        labels = np.empty(len(points), dtype=np.int64)
+        distances = np.empty(len(points))
+        center_norms = (centers ** 2).sum(axis=1)
+        for start in range(0, len(points), chunk_size):
+            chunk = points[start:start + chunk_size]
+            squared = (chunk ** 2).sum(axis=1)[:, None] - 2 * chunk @ centers.T + center_norms[None, :]
+            labels[start:start + chunk_size] = squared.argmin(axis=1)
+            distances[start:start + chunk_size] = np.maximum(squared.min(axis=1), 0)
+        return labels, distances
+
+    @staticmethod
+    def init_centers(points: np.ndarray, n_clusters: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        k-means++ 初始化（在随机抽样上进行）
+
+        Args:
+            points: 点矩阵
+            n_clusters: 聚类数
+            rng: 随机数生成器
+
+        Returns:
+            np.ndarray: 初始中心矩阵
+        """
+        sample_size = min(len(points), ORDER_CLUSTER_CONFIG['init_sample'])
+        sample = points[rng.choice(len(points), sample_size, replace=False)]
+        centers = np.empty((n_clusters, points.shape[1]))
+        centers[0] = sample[rng.integers(sample_size)]
+        closest = ((sample - centers[0]) ** 2).sum(axis=1)
+        for index in range(1, n_clusters):
+            total = closest.sum()
+            pick = rng.choice(sample_size, p=closest / total) if total > 0 else rng.integers(sample_size)
+            centers[index] = sample[pick]
+            closest = np.minimum(closest, ((sample - centers[index]) ** 2).sum(axis=1))
+        return centers
+
+    @staticmethod
+    def mini_batch_kmeans(points: np.ndarray, n_clusters: int, seed: Optional[int] = None) -> Dict:
+        """
+        小批量k-means（每次迭代按小批量更新中心，学习率为1/中心累计样本数）
+
+        Args:
+            points: 点矩阵（n × d）
+            n_clusters: 聚类数（不超过点数）
+            seed: 随机种子
+
+        Returns:
+            dict: centers、labels、inertia（距离平方和）、iterations
+        """
+        rng = np.random.default_rng(ORDER_CLUSTER_CONFIG['seed'] if seed is None else seed)
+        n_clusters = min(n_clusters, len(points))
+        centers = OrderClusterAnalyzer.init_centers(points, n_clusters, rng)
+        counts = np.zeros(n_clusters)
+        batch_size = min(len(points), ORDER_CLUSTER_CONFIG['batch_size'])
+
+        iteration = 0
+        for iteration in range(1, ORDER_CLUSTER_CONFIG['max_iterations'] + 1):
+            batch = points[rng.integers(0, len(points), batch_size)]
+            labels, _ = OrderClusterAnalyzer.assign(batch, centers)
+            batch_counts = np.bincount(labels, minlength=n_clusters)
+            batch_sums = np.zeros_like(centers)
+            np.add.at(batch_sums, labels, batch)
+
+            # 逐点更新 c += (x - c) / v 的批量形式：中心为已见样本的累计均值
+            counts += batch_counts
+            updated = batch_counts > 0
+            previous = centers.copy()
+            centers[updated] += ((batch_sums[updated] - batch_counts[updated, None] * centers[updated])
+                                 / counts[updated, None])
+            if ((centers - previous) ** 2).sum() / n_clusters < ORDER_CLUSTER_CONFIG['tolerance']:
+                break
+
+        labels, distances = OrderClusterAnalyzer.assign(points, centers, ORDER_CLUSTER_CONFIG['assign_chunk'])
+        return {'centers': centers, 'labels': labels, 'inertia': float(distances.sum()), 'iterations': iteration}
+
+    def analyze(self, df: pd.DataFrame, order_column: str, sku_column: str, quantity_column: Optional[str] = None,
+                date_column: Optional[str] = None, dimension_columns: Optional[List[str]] = None,
+                weight_column: Optional[str] = None, data_unit: str = "cm", weight_unit: str = "kg",
+                n_clusters: int = 5, a_percentage: float = 70, b_percentage: float = 20) -> Dict:
+        """
+        执行订单画像聚类
+
+        Args:
+            df: 出库订单明细（每行一个拣选行）
+            order_column: 订单号列名
+            sku_column: SKU列名
+            quantity_column: 件数列名，为空时每行计1件
+            date_column: 日期列名（订单日期取订单首行），为空时不统计每日构成
+            dimension_columns: 单件长、宽、高列名
+            weight_column: 单件重量列名
+            data_unit: 尺寸单位
+            weight_unit: 重量单位
+            n_clusters: 聚类数
+            a_percentage: A类累计百分比
+            b_percentage: B类累计百分比
+
+        Returns:
+            dict: summary、profile_table、daily_table、order_table，无有效数据时为空字典
+        """
+        try:
+            orders, features = OrderClusterAnalyzer.order_features(
+                df, order_column, sku_column, quantity_column, dimension_columns, weight_column,
+                data_unit, weight_unit, a_percentage, b_percentage)
+            has_lines = features['行数'].to_numpy() > 0
+            if not has_lines.any():
+                return {}
+            kept = np.flatnonzero(has_lines)
+            features = features.iloc[kept].reset_index(drop=True)
+
+            result = OrderClusterAnalyzer.mini_batch_kmeans(OrderClusterAnalyzer.standardize(features), n_clusters)
+            # 按订单数从多到少重新编号聚类
+            sizes = np.bincount(result['labels'], minlength=len(result['centers']))
+            rank = np.empty(sizes.size, dtype=np.int64)
+            rank[np.argsort(-sizes, kind='stable')] = np.arange(sizes.size)
+            labels = rank[result['labels']]
+            n_found = sizes.size
+            names = np.array([f'类{code + 1}' for code in range(n_found)])
+
+            # 聚类画像：数量特征取每单均值，ABC构成按拣选行合计计算
+            counts = np.bincount(labels, minlength=n_found)
+            lines = np.bincount(labels, weights=features['行数'], minlength=n_found)
+            profile = {'聚类': names, '订单数': counts, '订单占比(%)': counts / counts.sum() * 100}
+            for name in features.columns:
+                if name.endswith('占比'):
+                    class_lines = np.bincount(labels, weights=features[name] * features['行数'], minlength=n_found)
+                    profile[f'{name}(%)'] = class_lines / np.maximum(lines, 1) * 100
+                else:
+                    totals = np.bincount(labels, weights=features[name], minlength=n_found)
+                    profile[f'每单{name}'] = totals / np.maximum(counts, 1)
+                    profile[f'{name}占比(%)'] = totals / max(totals.sum(), 1e-12) * 100
+            profile['单行订单占比(%)'] = (np.bincount(labels, weights=(features['行数'] == 1).astype(float), minlength=n_found)
+                                    / np.maximum(counts, 1) * 100)
+            profile_table = pd.DataFrame(profile)
+
+            order_table = pd.DataFrame({'订单号': orders.keys[kept], '聚类': names[labels]})
+            order_table = pd.concat([order_table, features], axis=1)
+
+            # 每日聚类构成：订单日期 × 聚类 组合键一次bincount
+            daily_table = pd.DataFrame()
+            if date_column:
+                order_dates = pd.to_datetime(pd.Series(orders.first(df[date_column])[kept]), errors='coerce')
+                dated = order_dates.notna().to_numpy()
+                if dated.any():
+                    day_codes, days = pd.factorize(order_dates[dated].dt.normalize(), sort=True)
+                    mix = np.bincount(day_codes * n_found + labels[dated],
+                                      minlength=len(days) * n_found).reshape(len(days), n_found)
+                    daily_table = pd.DataFrame(mix / mix.sum(axis=1, keepdims=True) * 100,
+                                               columns=[f'{name}占比(%)' for name in names])
+                    daily_table.insert(0, '日期', days)
+                    daily_table.insert(1, '订单数', mix.sum(axis=1))
+                    order_table['日期'] = order_dates.dt.normalize().to_numpy()
+
+            summary = {
+                'order_count': int(kept.size),
+                'line_count': int(features['行数'].sum()),
+                'cluster_count': n_found,
+                'features': list(features.columns),
+                'inertia': result['inertia'],
+                'iterations': result['iterations']
+            }
+            return {'summary': summary, 'profile_table': profile_table, 'daily_table': daily_table,
+                    'order_table': order_table}
+
+        except Exception as e:
+            st.error(f"❌ 订单聚类计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_daily_mix(daily_table: pd.DataFrame):
+        """
+        渲染每日订单的聚类构成（堆叠面积图）
+
+        Args:
+            daily_table: 每日聚类构成表
+        """
+        fig = go.Figure()
+        for column in daily_table.columns[2:]:
+            fig.add_trace(go.Scatter(x=daily_table['日期'], y=daily_table[column], name=column.replace('占比(%)', ''),
+                                     mode='lines', stackgroup='mix'))
+        fig.update_layout(title="每日订单聚类构成", xaxis_title="日期", yaxis_title="订单占比(%)",
+                          yaxis={'range': [0, 100]}, height=420)
+        st.plotly_chart(fig, use_container_width=True)
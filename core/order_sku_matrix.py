@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+订单×SKU稀疏矩阵模块 - 订单和SKU编码复用数据集的键列索引，构建去重的CSR关联矩阵
+各种按SKU分组的方案（分区、品类等）通过与SKU→分组的稀疏指示矩阵相乘得到订单×分组关联，无需重新分组订单明细
+"""
+
+import pandas as pd
+import numpy as np
+import scipy.sparse as sp
+from core.frame_cache import FrameCache
+from core.key_index import KeyIndex
+
+class OrderSkuMatrix(FrameCache):
+    """订单×SKU稀疏关联矩阵"""
+
+    def __init__(self, df: pd.DataFrame, order_column: str, sku_column: str):
+        """
+        构建订单×SKU矩阵（订单、SKU编码取自键列索引；同一订单内重复的SKU合并，值为拣选行数）
+
+        Args:
+            df: 订单明细数据框（每行一个拣选行）
+            order_column: 订单号列名
+            sku_column: SKU列名
+        """
+        super().__init__(df)
+        self.order_column = order_column
+        self.sku_column = sku_column
+
+        order_index = KeyIndex.for_frame(df, order_column)
+        sku_index = KeyIndex.for_frame(df, sku_column)
+        self.orders, self.skus = order_index.keys, sku_index.keys
+        order_codes, sku_codes = order_index.codes, sku_index.codes
+        valid = order_index.valid & sku_index.valid
+        self.line_count = int(valid.sum())
+
+        matrix = sp.csr_matrix(
+            (np.ones(self.line_count, dtype=np.int32), (order_codes[valid], sku_codes[valid])),
+            shape=(len(self.orders), len(self.skus)))
+        matrix.sum_duplicates()
+        self.matrix = matrix
+        # 每个SKU的拣选行数（按明细行计）
+        self.sku_lines = np.bincount(sku_codes[valid], minlength=len(self.skus))
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame, order_column: str, sku_column: str) -> 'OrderSkuMatrix':
+        """
+        获取数据框的订单×SKU矩阵（同一数据框同一组列只构建一次）
+
+        Args:
+            df: 订单明细数据框
+            order_column: 订单号列名
+            sku_column: SKU列名
+
+        Returns:
+            OrderSkuMatrix: 订单×SKU矩阵
+        """
+        return cls._cached(df, order_column, sku_column)
+
+    @property
+    def n_orders(self) -> int:
+        """订单数（含订单号有效但SKU全部缺失的订单）"""
+        return len(self.orders)
+
+    @property
+    def n_skus(self) -> int:
+        """SKU数"""
+        return len(self.skus)
+
+    def group_incidence(self, sku_groups: np.ndarray, n_groups: int) -> sp.csr_matrix:
+        """
+        计算订单×分组关联矩阵
+
+        Args:
+            sku_groups: 每个SKU编码对应的分组编码（0 ~ n_groups-1）
+            n_groups: 分组数
+
+        Returns:
+            csr_matrix: 订单×分组矩阵，值为该订单在该分组的拣选行数，每行非零元个数即订单涉及的分组数
+        """
+        indicator = sp.csr_matrix(
+            (np.ones(self.n_skus, dtype=np.int32), (np.arange(self.n_skus), np.asarray(sku_groups))),
+            shape=(self.n_skus, n_groups))
+        return (self.matrix @ indicator).tocsr()
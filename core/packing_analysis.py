@@ -142,6 +142,41 @@ class PackingAnalyzer:
             
         return packing_options
         
+    def max_per_box_batch(self, goods_length, goods_width, goods_height, weight_kg=None):
+        """
+        向量化计算多个SKU的最大装箱数（与逐个SKU的6种摆放方式和重量限制规则一致）
+
+        Args:
+            goods_length, goods_width, goods_height: 货物尺寸数组(mm)
+            weight_kg: 单件货物重量数组(kg)，可选；缺失或不大于0时不受重量限制
+
+        Returns:
+            np.ndarray: 每个SKU的最大装箱数，尺寸无效或装不下时为0
+        """
+        goods = np.stack([np.asarray(goods_length, dtype=np.float64),
+                          np.asarray(goods_width, dtype=np.float64),
+                          np.asarray(goods_height, dtype=np.float64)])
+        container = np.array([self.container_length_mm, self.container_width_mm, self.container_height_mm],
+                             dtype=np.float64)
+        limits = PACKING_CONFIG["size_limits"]
+        with np.errstate(invalid='ignore'):
+            valid = ((goods >= limits["min_size_mm"]) & (goods <= limits["max_size_mm"])).all(axis=0)
+        safe = np.where(valid, goods, np.inf)
+
+        # 货物长、宽、高分别对应容器的某一边（6种摆放方式）
+        max_per_box = np.zeros(goods.shape[1], dtype=np.int64)
+        for axes in [(0, 1, 2), (0, 2, 1), (1, 0, 2), (2, 0, 1), (1, 2, 0), (2, 1, 0)]:
+            counts = np.floor(container[list(axes)][:, None] / safe)
+            option = np.minimum(counts.prod(axis=0), PACKING_CONFIG["max_items_per_box"])
+            max_per_box = np.maximum(max_per_box, option.astype(np.int64))
+
+        if weight_kg is not None:
+            weight = np.asarray(weight_kg, dtype=np.float64)
+            has_weight = np.isfinite(weight) & (weight > 0)
+            by_weight = np.floor(self.container_weight_limit_kg / np.where(has_weight, weight, 1.0)).astype(np.int64)
+            max_per_box = np.where(has_weight, np.minimum(max_per_box, by_weight), max_per_box)
+        return np.where(valid, max_per_box, 0)
+
     def analyze_single_sku(self, goods_length, goods_width, goods_height, inventory_qty, sku_index, weight_kg=None):
         """
         分析单个SKU的装箱情况
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+拣选路径模块 - 在矩形平行巷道布局上按S型和最大间隙策略估算每个订单/批次的拣选行走距离
+拣选行按(批次, 巷道, 列)合成单个整数键排序一次，每个(批次, 巷道)单元的最远拣选位置和最大间隙由reduceat求出，
+再按批次bincount汇总巷道内和横向行走距离，不为每个订单单独规划路线
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, List, Optional
+from core.slotting import SlottingOptimizer
+from config import PICK_PATH_CONFIG, SLOTTING_CONFIG
+
+class PickPathEstimator:
+    """拣选路径距离估算器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化拣选路径估算器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def route_distances(batch_codes: np.ndarray, n_batches: int, aisle: np.ndarray, bay: np.ndarray,
+                        grid: Dict) -> Dict[str, np.ndarray]:
+        """
+        计算每个批次的S型和最大间隙路线距离
+
+        出发点位于第一条巷道前端，巷道前后均有横向通道；横向距离为往返最右侧访问巷道。
+        S型：访问的巷道依次整条穿越，访问巷道数为奇数时最后一条巷道进入后折返。
+        最大间隙：最左和最右访问巷道整条穿越，中间巷道分别从前后进入到最大间隙为止；只访问一条巷道时进入后折返。
+
+        Args:
+            batch_codes: 每个拣选行的批次编码
+            n_batches: 批次数
+            aisle: 每个拣选行的巷道下标
+            bay: 每个拣选行的列下标（两侧储位共用巷道）
+            grid: 储位网格参数（aisles、bays、bay_width、aisle_pitch）
+
+        Returns:
+            dict: s_shape、largest_gap（每批距离）、aisles_visited（每批访问巷道数）
+        """
+        n_aisles, n_bays = int(grid['aisles']), int(grid['bays'])
+        aisle_length = n_bays * grid['bay_width']
+        s_shape = np.zeros(n_batches)
+        largest_gap = np.zeros(n_batches)
+        aisles_visited = np.zeros(n_batches, dtype=np.int64)
+        if batch_codes.size == 0:
+            return {'s_shape': s_shape, 'largest_gap': largest_gap, 'aisles_visited': aisles_visited}
+
+        key = np.sort((batch_codes.astype(np.int64) * n_aisles + aisle) * n_bays + bay)
+        cell = key // n_bays
+        y = (key % n_bays + 0.5) * grid['bay_width']
+
+        # (批次, 巷道)单元：最远拣选位置和最大间隙（含前端到第一个拣选位、最后一个拣选位到后端）
+        is_first = np.ones(key.size, dtype=bool)
+        is_first[1:] = cell[1:] != cell[:-1]
+        starts = np.flatnonzero(is_first)
+        ends = np.append(starts[1:], key.size) - 1
+        gap = np.where(is_first, y, y - np.concatenate([[0.0], y[:-1]]))
+        farthest = y[ends]
+        cell_gap = np.maximum(np.maximum.reduceat(gap, starts), aisle_length - farthest)
+        cell_batch = cell[starts] // n_aisles
+        cell_aisle = cell[starts] % n_aisles
+
+        # 每批首末访问巷道
+        batch_start = np.ones(starts.size, dtype=bool)
+        batch_start[1:] = cell_batch[1:] != cell_batch[:-1]
+        batch_end = np.append(batch_start[1:], True)
+        batches = cell_batch[batch_end]
+        visited = np.bincount(cell_batch, minlength=n_batches)[batches]
+        last_farthest = farthest[batch_end]
+        horizontal = 2 * cell_aisle[batch_end] * grid['aisle_pitch']
+
+        s_vertical = np.where(visited % 2 == 0, visited * aisle_length,
+                              (visited - 1) * aisle_length + 2 * last_farthest)
+        middle = ~batch_start & ~batch_end
+        middle_return = np.bincount(cell_batch[middle], weights=2 * (aisle_length - cell_gap[middle]),
+                                    minlength=n_batches)[batches]
+        gap_vertical = np.where(visited == 1, 2 * last_farthest, 2 * aisle_length + middle_return)
+
+        s_shape[batches] = horizontal + s_vertical
+        largest_gap[batches] = horizontal + gap_vertical
+        aisles_visited[batches] = visited
+        return {'s_shape': s_shape, 'largest_gap': largest_gap, 'aisles_visited': aisles_visited}
+
+    @staticmethod
+    def frequency_slotting(sku_codes: np.ndarray, n_skus: int, grid: Dict) -> Optional[Dict[str, np.ndarray]]:
+        """
+        按拣选行数由高到低把SKU依次放到距离出发点最近的储位（每个SKU一个储位）
+
+        Args:
+            sku_codes: 每个拣选行的SKU编码
+            n_skus: SKU数
+            grid: 储位网格参数
+
+        Returns:
+            dict: 每个SKU编码的aisle、bay；储位不足时为None
+        """
+        locations = SlottingOptimizer.location_grid(grid)
+        if n_skus > locations['distance'].size:
+            return None
+        rank = np.argsort(-np.bincount(sku_codes, minlength=n_skus), kind='stable')
+        aisle = np.empty(n_skus, dtype=np.int64)
+        bay = np.empty(n_skus, dtype=np.int64)
+        aisle[rank] = locations['aisle'][:n_skus]
+        bay[rank] = locations['bay'][:n_skus]
+        return {'aisle': aisle, 'bay': bay}
+
+    def analyze(self, order_df: pd.DataFrame, order_column: str, sku_column: str,
+                location_df: pd.DataFrame, location_sku_column: str, location_column: str,
+                batch_sizes: List[int], grid: Optional[Dict] = None) -> Dict:
+        """
+        执行拣选路径估算
+
+        Args:
+            order_df: 出库订单明细（每行一个拣选行）
+            order_column: 订单号列名
+            sku_column: SKU列名
+            location_df: SKU储位表
+            location_sku_column: 储位表SKU列名
+            location_column: 储位编码列名（依次包含巷道、列、层编号）
+            batch_sizes: 每批订单数列表（订单按首次出现顺序分批）
+            grid: 储位网格参数（缺省项取默认值）
+
+        Returns:
+            dict: summary、scenario_table、batch_table，无有效数据时为空字典
+        """
+        try:
+            grid = {**SLOTTING_CONFIG['grid'], **(grid or {})}
+            order_codes, orders = pd.factorize(order_df[order_column], use_na_sentinel=True)
+            sku_codes, skus = pd.factorize(order_df[sku_column], use_na_sentinel=True)
+
+            # SKU → 当前储位（储位表中同一SKU取第一条）
+            location_first = location_df.drop_duplicates(location_sku_column)
+            parsed = SlottingOptimizer.parse_locations(location_first[location_column].reset_index(drop=True), grid)
+            position = pd.Index(location_first[location_sku_column]).get_indexer(skus)
+            has_location = np.zeros(len(skus), dtype=bool)
+            has_location[position >= 0] = parsed['valid'][position[position >= 0]]
+
+            valid = (order_codes >= 0) & (sku_codes >= 0)
+            valid[valid] = has_location[sku_codes[valid]]
+            if not valid.any():
+                return {}
+            line_orders, line_skus = order_codes[valid], sku_codes[valid]
+            current_aisle = np.zeros(len(skus), dtype=np.int64)
+            current_bay = np.zeros(len(skus), dtype=np.int64)
+            current_aisle[has_location] = parsed['aisle'][position[has_location]]
+            current_bay[has_location] = parsed['bay'][position[has_location]]
+
+            # 储位方案：当前储位；按拣选行数重排（只重排有储位的SKU）
+            scenarios = {'当前储位': {'aisle': current_aisle, 'bay': current_bay}}
+            located = np.flatnonzero(has_location)
+            compact = np.full(len(skus), -1, dtype=np.int64)
+            compact[located] = np.arange(located.size)
+            reslotted = PickPathEstimator.frequency_slotting(compact[line_skus], located.size, grid)
+            if reslotted is not None:
+                aisle, bay = current_aisle.copy(), current_bay.copy()
+                aisle[located], bay[located] = reslotted['aisle'], reslotted['bay']
+                scenarios['按频次重排'] = {'aisle': aisle, 'bay': bay}
+
+            # 有有效拣选行的订单重新编码，保持首次出现顺序
+            has_lines = np.zeros(len(orders), dtype=bool)
+            has_lines[line_orders] = True
+            kept_orders = np.flatnonzero(has_lines)
+            line_orders = (np.cumsum(has_lines) - 1)[line_orders]
+            n_orders = kept_orders.size
+
+            methods = PICK_PATH_CONFIG['methods']
+            rows = []
+            batch_table = pd.DataFrame()
+            for scenario, location in scenarios.items():
+                for size in sorted(batch_sizes):
+                    batch_codes = line_orders // size
+                    n_batches = -(-n_orders // size)
+                    distances = PickPathEstimator.route_distances(
+                        batch_codes, n_batches, location['aisle'][line_skus], location['bay'][line_skus], grid)
+                    row = {'储位方案': scenario, '每批订单数': size, '批次数': n_batches,
+                           '平均访问巷道数': distances['aisles_visited'].mean()}
+                    for method, label in methods.items():
+                        total = distances[method].sum()
+                        row[f'{label}总距离(km)'] = total / 1000
+                        row[f'{label}每单距离(m)'] = total / n_orders
+                        row[f'{label}每行距离(m)'] = total / line_orders.size
+                    rows.append(row)
+
+                    # 批次明细只保留第一个方案（当前储位、最小批次）
+                    if batch_table.empty:
+                        batch_table = pd.DataFrame({
+                            '批次': np.arange(1, n_batches + 1),
+                            '订单数': np.minimum(size, n_orders - np.arange(n_batches) * size),
+                            '拣选行数': np.bincount(batch_codes, minlength=n_batches),
+                            '访问巷道数': distances['aisles_visited'],
+                            **{f'{label}距离(m)': np.round(distances[method], 1) for method, label in methods.items()}
+                        })
+                        if size == 1:
+                            batch_table.insert(1, '订单号', np.asarray(orders)[kept_orders])
+
+            scenario_table = pd.DataFrame(rows)
+            summary = {
+                'order_count': n_orders,
+                'line_count': int(line_orders.size),
+                'unlocated_lines': int(((order_codes >= 0) & (sku_codes >= 0)).sum() - line_orders.size),
+                'unlocated_skus': int((~has_location).sum()),
+                'location_count': int(grid['aisles']) * SLOTTING_CONFIG['sides'] * int(grid['bays']) * int(grid['levels']),
+                'reslotted': reslotted is not None
+            }
+            return {'summary': summary, 'scenario_table': scenario_table, 'batch_table': batch_table}
+
+        except Exception as e:
+            st.error(f"❌ 拣选路径计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_scenario_chart(scenario_table: pd.DataFrame):
+        """
+        渲染各储位方案、批次大小下的每单行走距离
+
+        Args:
+            scenario_table: 方案对比表
+        """
+        fig = go.Figure()
+        colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
+        position = 0
+        for scenario, group in scenario_table.groupby('储位方案', sort=False):
+            for label in PICK_PATH_CONFIG['methods'].values():
+                fig.add_trace(go.Bar(x=group['每批订单数'].astype(str), y=group[f'{label}每单距离(m)'],
+                                     name=f'{scenario}·{label}', marker_color=colors[position % len(colors)]))
+                position += 1
+        fig.update_layout(title="每单拣选行走距离（按每批订单数）", xaxis_title="每批订单数",
+                          yaxis_title="每单距离(m)", barmode='group', height=420)
+        st.plotly_chart(fig, use_container_width=True)
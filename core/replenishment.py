@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+补货频次模块 - 结合拣选位容量（装箱分析的最大装箱数或储位容量）和每日出库件数，估算每个SKU每天的补货次数
+SKU主数据和出库明细的SKU键合并编码一次（哈希连接），出库行按(SKU, 日)合成单个整数键排序一次，
+由reduceat得到(SKU, 日)出库件数后按编码取容量，一次算出补货次数、峰值日分布和所需拣选位数
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, Optional
+from core.packing_analysis import PackingAnalyzer
+from core.time_series_kernel import TimeSeriesKernel
+from config import PACKING_CONFIG, REPLENISHMENT_CONFIG
+
+class ReplenishmentAnalyzer:
+    """补货频次分析器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化补货频次分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def sku_capacity(sku_df: pd.DataFrame, sku_columns: Dict[str, Optional[str]], data_unit: str,
+                     container_info: Dict, weight_unit: str = "kg") -> pd.DataFrame:
+        """
+        计算每个SKU的拣选位容量（优先使用储位容量列，否则为拣选容器的最大装箱数）
+
+        Args:
+            sku_df: SKU主数据（同一SKU取第一行）
+            sku_columns: 列名映射 sku、length、width、height，可选 weight、capacity
+            data_unit: 尺寸单位
+            container_info: 拣选容器信息（length、width、height(mm)、weight_limit(kg)）
+            weight_unit: 重量单位
+
+        Returns:
+            pd.DataFrame: SKU、容量（装不下或无效为0）、容量来源
+        """
+        first = sku_df.drop_duplicates(sku_columns['sku'])
+        conversion = PACKING_CONFIG["unit_conversion"][data_unit]
+        dimensions = [pd.to_numeric(first[sku_columns[name]], errors='coerce').to_numpy(dtype=np.float64) * conversion
+                      for name in ['length', 'width', 'height']]
+        weight = None
+        if sku_columns.get('weight'):
+            weight = (pd.to_numeric(first[sku_columns['weight']], errors='coerce').to_numpy(dtype=np.float64)
+                      * PACKING_CONFIG["weight_conversion"][weight_unit])
+        capacity = PackingAnalyzer(container_info).max_per_box_batch(*dimensions, weight_kg=weight).astype(np.float64)
+        source = np.full(capacity.size, '装箱分析', dtype=object)
+
+        if sku_columns.get('capacity'):
+            override = pd.to_numeric(first[sku_columns['capacity']], errors='coerce').to_numpy(dtype=np.float64)
+            has_override = np.isfinite(override) & (override > 0)
+            capacity = np.where(has_override, np.floor(override), capacity)
+            source[has_override] = '储位容量'
+
+        return pd.DataFrame({'SKU': first[sku_columns['sku']].to_numpy(), '容量': capacity, '容量来源': source})
+
+    @staticmethod
+    def daily_units(day_idx: np.ndarray, sku_codes: np.ndarray, quantity: np.ndarray,
+                    n_days: int) -> Dict[str, np.ndarray]:
+        """
+        按(SKU, 日)汇总出库件数（合成单个整数键排序一次，reduceat求和）
+
+        Args:
+            day_idx: 每个出库行的天下标
+            sku_codes: 每个出库行的SKU编码
+            quantity: 每个出库行的件数
+            n_days: 日期跨度天数
+
+        Returns:
+            dict: sku、day、units（每个有出库的(SKU, 日)一项，按SKU、日排序）
+        """
+        key = sku_codes.astype(np.int64) * n_days + day_idx
+        order = np.argsort(key)
+        key = key[order]
+        is_first = np.ones(key.size, dtype=bool)
+        is_first[1:] = key[1:] != key[:-1]
+        starts = np.flatnonzero(is_first)
+        return {
+            'sku': key[starts] // n_days,
+            'day': key[starts] % n_days,
+            'units': np.add.reduceat(quantity[order], starts) if starts.size else np.empty(0)
+        }
+
+    def analyze(self, sku_df: pd.DataFrame, sku_columns: Dict[str, Optional[str]], data_unit: str,
+                container_info: Dict, outbound_df: pd.DataFrame, date_column: str, outbound_sku_column: str,
+                quantity_column: Optional[str] = None, refills_per_face: int = 1,
+                peak_percentile: float = 95, weight_unit: str = "kg") -> Dict:
+        """
+        执行补货频次分析
+
+        Args:
+            sku_df: SKU主数据
+            sku_columns: SKU主数据列名映射（见sku_capacity）
+            data_unit: 尺寸单位
+            container_info: 拣选容器信息
+            outbound_df: 出库明细
+            date_column: 出库日期列名
+            outbound_sku_column: 出库明细SKU列名
+            quantity_column: 出库件数列名（为空时每行计1件）
+            refills_per_face: 每个拣选位每天最多补货次数（用于计算所需拣选位数）
+            peak_percentile: 峰值日的日出库件数分位数(%)
+            weight_unit: 重量单位
+
+        Returns:
+            dict: summary、sku_table、daily_table、peak_distribution，无有效数据时为空字典
+        """
+        try:
+            capacity_table = ReplenishmentAnalyzer.sku_capacity(sku_df, sku_columns, data_unit,
+                                                                container_info, weight_unit)
+            valid_rows, day_idx, first_day, n_days = TimeSeriesKernel.prepare_day_index(outbound_df[date_column])
+            if n_days == 0:
+                return {}
+
+            # 两张表的SKU键合并编码一次，容量按编码直接取值
+            outbound_skus = outbound_df[outbound_sku_column]
+            if not valid_rows.all():
+                outbound_skus = outbound_skus[valid_rows]
+            codes, skus = pd.factorize(pd.concat([capacity_table['SKU'], outbound_skus], ignore_index=True),
+                                       use_na_sentinel=True)
+            master_codes, line_codes = codes[:len(capacity_table)], codes[len(capacity_table):]
+            capacity = np.zeros(len(skus))
+            in_master = np.zeros(len(skus), dtype=bool)
+            known = master_codes >= 0
+            capacity[master_codes[known]] = capacity_table['容量'].to_numpy()[known]
+            in_master[master_codes[known]] = True
+
+            if quantity_column:
+                quantity_source = outbound_df[quantity_column] if valid_rows.all() else outbound_df[quantity_column][valid_rows]
+                quantity, _ = TimeSeriesKernel.to_numeric_values(quantity_source)
+                quantity = np.nan_to_num(quantity, nan=0.0)
+            else:
+                quantity = np.ones(line_codes.size)
+
+            has_sku = line_codes >= 0
+            outbound_mask = np.zeros(len(skus), dtype=bool)
+            outbound_mask[line_codes[has_sku]] = True
+            keep = has_sku & (quantity > 0)
+            keep[keep] = capacity[line_codes[keep]] > 0
+            if not keep.any():
+                return {}
+
+            cells = ReplenishmentAnalyzer.daily_units(day_idx[keep], line_codes[keep], quantity[keep], n_days)
+            cell_capacity = capacity[cells['sku']]
+            trips = np.ceil(cells['units'] / cell_capacity)
+
+            # 每日汇总与峰值日
+            day_cells = np.bincount(cells['day'], minlength=n_days)
+            active_days = np.flatnonzero(day_cells)
+            daily_skus = day_cells[active_days]
+            daily_units = np.bincount(cells['day'], weights=cells['units'], minlength=n_days)[active_days]
+            daily_trips = np.bincount(cells['day'], weights=trips, minlength=n_days)[active_days]
+            threshold = np.percentile(daily_units, peak_percentile)
+            is_peak_day = np.zeros(n_days, dtype=bool)
+            is_peak_day[active_days[daily_units >= threshold]] = True
+
+            # 峰值日每个SKU的补货次数分布
+            max_bucket = REPLENISHMENT_CONFIG['max_trip_bucket']
+            peak_trips = np.minimum(trips[is_peak_day[cells['day']]], max_bucket).astype(np.int64)
+            peak_counts = np.bincount(peak_trips, minlength=max_bucket + 1)[1:]
+            peak_distribution = pd.DataFrame({
+                '每SKU日补货次数': [str(n) for n in range(1, max_bucket)] + [f'{max_bucket}+'],
+                'SKU日数': peak_counts,
+                '占比(%)': peak_counts / max(peak_counts.sum(), 1) * 100
+            })
+
+            # 每个SKU：(SKU, 日)按SKU连续排列，reduceat求各SKU的合计与单日最大值
+            sku_start = np.ones(cells['sku'].size, dtype=bool)
+            sku_start[1:] = cells['sku'][1:] != cells['sku'][:-1]
+            sku_first = np.flatnonzero(sku_start)
+            sku_group = np.cumsum(sku_start) - 1
+            sku_codes = cells['sku'][sku_first]
+            sku_capacity = capacity[sku_codes]
+            max_units = np.maximum.reduceat(cells['units'], sku_first)
+            faces = np.ceil(max_units / (sku_capacity * max(int(refills_per_face), 1))).astype(np.int64)
+            operating_days = active_days.size
+            peak_day_count = int(is_peak_day.sum())
+            sku_table = pd.DataFrame({
+                'SKU': np.asarray(skus)[sku_codes],
+                '拣选位容量': sku_capacity.astype(np.int64),
+                '出库天数': np.bincount(sku_group),
+                '出库件数': np.add.reduceat(cells['units'], sku_first),
+                '日均补货次数': np.add.reduceat(trips, sku_first) / operating_days,
+                '峰值日均补货次数': np.bincount(sku_group, weights=np.where(is_peak_day[cells['day']], trips, 0),
+                                        minlength=sku_first.size) / peak_day_count,
+                '单日最大件数': max_units,
+                '单日最大补货次数': np.maximum.reduceat(trips, sku_first).astype(np.int64),
+                '所需拣选位数': faces
+            })
+            sku_table = sku_table.sort_values('日均补货次数', ascending=False, kind='stable').reset_index(drop=True)
+
+            daily_table = pd.DataFrame({
+                '日期': TimeSeriesKernel.day_codes_to_datetime(first_day + active_days),
+                '出库件数': daily_units,
+                '出库SKU数': daily_skus,
+                '补货次数': daily_trips.astype(np.int64),
+                '峰值日': is_peak_day[active_days]
+            })
+
+            summary = {
+                'sku_count': int(outbound_mask.sum()),
+                'matched_skus': int(sku_codes.size),
+                'unknown_skus': int((outbound_mask & ~in_master).sum()),
+                'unfit_skus': int((outbound_mask & in_master & (capacity <= 0)).sum()),
+                'excluded_lines': int(has_sku.sum() - keep.sum()),
+                'operating_days': int(operating_days),
+                'avg_daily_trips': float(daily_trips.mean()),
+                'p95_daily_trips': float(np.percentile(daily_trips, 95)),
+                'max_daily_trips': int(daily_trips.max()),
+                'peak_day': pd.Timestamp(daily_table['日期'].iloc[int(np.argmax(daily_trips))]).date(),
+                'peak_days': peak_day_count,
+                'peak_threshold_units': float(threshold),
+                'multi_face_skus': int((faces > 1).sum()),
+                'refills_per_face': max(int(refills_per_face), 1)
+            }
+            return {'summary': summary, 'sku_table': sku_table, 'daily_table': daily_table,
+                    'peak_distribution': peak_distribution}
+
+        except Exception as e:
+            st.error(f"❌ 补货频次计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_daily_trips(daily_table: pd.DataFrame):
+        """
+        渲染每日补货次数（峰值日高亮）
+
+        Args:
+            daily_table: 每日汇总表
+        """
+        colors = np.where(daily_table['峰值日'], '#d62728', '#1f77b4')
+        fig = go.Figure(go.Bar(x=daily_table['日期'], y=daily_table['补货次数'], marker_color=colors, name='补货次数'))
+        fig.update_layout(title="每日补货次数（红色为峰值日）", xaxis_title="日期", yaxis_title="补货次数", height=400)
+        st.plotly_chart(fig, use_container_width=True)
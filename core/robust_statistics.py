@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+稳健统计内核 - 对多个指标（或数千个SKU序列）一次性计算统计摘要
+每列排序一次，由排序结果得到全部分位数，再以二维掩码计算剔除离群值均值、过滤后最值及其位置
+规则与出入库分析原有的IQR均值和单向低值过滤逻辑一致
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+
+class RobustStatistics:
+    """稳健统计内核"""
+
+    @staticmethod
+    def _quantiles_from_sorted(sorted_values: np.ndarray, counts: np.ndarray,
+                               probs: List[float]) -> np.ndarray:
+        """
+        由按列排序的矩阵计算线性插值分位数（与pandas quantile默认方法一致）
+
+        Args:
+            sorted_values: 按列升序排序的矩阵，NaN排在末尾
+            counts: 每列有效值个数
+            probs: 分位点列表
+
+        Returns:
+            np.ndarray: 分位数矩阵(len(probs), 列数)，无有效值的列为NaN
+        """
+        n_cols = sorted_values.shape[1]
+        result = np.full((len(probs), n_cols), np.nan)
+        has_data = counts > 0
+        if not has_data.any():
+            return result
+
+        last = np.maximum(counts - 1, 0)
+        for i, p in enumerate(probs):
+            position = last * p
+            lo = np.floor(position).astype(np.int64)
+            hi = np.minimum(lo + 1, last)
+            frac = position - lo
+            lo_values = np.take_along_axis(sorted_values, lo[None, :], axis=0)[0]
+            hi_values = np.take_along_axis(sorted_values, hi[None, :], axis=0)[0]
+            result[i] = np.where(has_data, lo_values + (hi_values - lo_values) * frac, np.nan)
+        return result
+
+    @staticmethod
+    def summarize_matrix(values: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        对矩阵的每一列（一个指标或一个SKU的时间序列）计算统计量
+
+        Args:
+            values: 二维数值矩阵(观测数, 序列数)，NaN表示缺失
+
+        Returns:
+            Dict[str, np.ndarray]: 每个统计量一个长度为序列数的数组
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        n_obs, n_cols = values.shape
+
+        valid = ~np.isnan(values)
+        counts = valid.sum(axis=0)
+        safe_counts = np.maximum(counts, 1)
+        filled = np.where(valid, values, 0.0)
+        totals = filled.sum(axis=0)
+        means = np.where(counts > 0, totals / safe_counts, np.nan)
+
+        # 每列排序一次，得到所有分位数
+        q05, q25, median, q75 = RobustStatistics._quantiles_from_sorted(
+            np.sort(values, axis=0), counts, [0.05, 0.25, 0.5, 0.75]
+        )
+
+        # IQR剔除离群值后的均值（少于4个点或剔除超过50%时使用普通均值）
+        iqr = q75 - q25
+        in_range = (values >= q25 - 1.5 * iqr) & (values <= q75 + 1.5 * iqr)
+        in_count = in_range.sum(axis=0)
+        in_mean = np.where(in_range, values, 0.0).sum(axis=0) / np.maximum(in_count, 1)
+        use_plain_mean = (counts < 4) | (in_count < counts * 0.5)
+        mean_no_outliers = np.where(use_plain_mean, means, in_mean)
+
+        # 单向低值过滤：中位数大于50时阈值为max(10, Q1×10%)，否则为max(1, 中位数×10%)
+        threshold = np.where(median > 50, np.maximum(10, q25 * 0.1), np.maximum(1, median * 0.1))
+        keep_count = (values >= threshold).sum(axis=0)
+        # 过滤掉超过70%时改用5%分位数作为下边界
+        threshold = np.where(keep_count < counts * 0.3, q05, threshold)
+        keep = values >= threshold
+        # 少于10个点或过滤后少于5个点时不过滤
+        use_filter = (counts >= 10) & (keep.sum(axis=0) >= 5)
+        keep = np.where(use_filter, keep, valid)
+
+        filtered_max = np.where(keep, values, -np.inf).max(axis=0)
+        filtered_min = np.where(keep, values, np.inf).min(axis=0)
+        empty = counts == 0
+        filtered_max[empty] = np.nan
+        filtered_min[empty] = np.nan
+
+        # 最值在原序列中第一次出现的位置
+        max_idx = np.argmax(values == filtered_max, axis=0)
+        min_idx = np.argmax(values == filtered_min, axis=0)
+
+        # 趋势：最后一个有效值与第一个有效值比较
+        first_idx = np.argmax(valid, axis=0)
+        last_idx = n_obs - 1 - np.argmax(valid[::-1], axis=0)
+        columns = np.arange(n_cols)
+        trend_up = values[last_idx, columns] > values[first_idx, columns]
+
+        return {
+            'count': counts,
+            'total': totals,
+            'mean': means,
+            'mean_no_outliers': mean_no_outliers,
+            'q05': q05,
+            'q25': q25,
+            'median': median,
+            'q75': q75,
+            'filtered_max': filtered_max,
+            'filtered_min': filtered_min,
+            'max_idx': max_idx,
+            'min_idx': min_idx,
+            'trend_up': trend_up
+        }
+
+    @staticmethod
+    def summarize_frame(daily_data: pd.DataFrame, date_column: str) -> Dict[str, Dict]:
+        """
+        生成日聚合表中各数值指标的统计摘要（出入库分析的摘要格式）
+
+        Args:
+            daily_data: 日聚合数据
+            date_column: 日期列名
+
+        Returns:
+            Dict[str, Dict]: {指标名: 统计信息}
+        """
+        metric_columns = [col for col in daily_data.columns
+                          if col != date_column and daily_data[col].dtype in ['int64', 'float64']]
+        if not metric_columns or daily_data.empty:
+            return {}
+
+        stats = RobustStatistics.summarize_matrix(daily_data[metric_columns].to_numpy(dtype=np.float64))
+        dates = daily_data[date_column]
+
+        summary = {}
+        for i, col in enumerate(metric_columns):
+            # 整数指标的合计与最值保持整数
+            cast = int if pd.api.types.is_integer_dtype(daily_data[col]) else float
+            summary[col] = {
+                'total': cast(stats['total'][i]),
+                'daily_avg': float(stats['mean'][i]),
+                'daily_avg_no_outliers': float(stats['mean_no_outliers'][i]),  # 剔除离群值后的平均数
+                'daily_max': cast(stats['filtered_max'][i]),  # 过滤异常低值后的最大值
+                'daily_min': cast(stats['filtered_min'][i]),  # 过滤异常低值后的最小值
+                'max_date': dates.iloc[stats['max_idx'][i]],  # 最高点日期
+                'min_date': dates.iloc[stats['min_idx'][i]],  # 最低点日期
+                'median': float(stats['median'][i]),
+                'q25': float(stats['q25'][i]),
+                'q75': float(stats['q75'][i]),
+                'trend': 'increasing' if stats['trend_up'][i] else 'decreasing'
+            }
+        return summary
+
+    @staticmethod
+    def summarize_series(values: np.ndarray, dates: pd.DatetimeIndex, keys: pd.Index,
+                         active_days: Optional[np.ndarray] = None, series_name: str = 'SKU') -> pd.DataFrame:
+        """
+        对多个序列（如每个SKU的日出库量）一次性生成统计摘要表
+
+        Args:
+            values: 天×序列的日合计矩阵（如TimeSeriesKernel.day_key_matrix的values）
+            dates: 矩阵各行对应的日期
+            keys: 矩阵各列对应的序列键
+            active_days: 参与统计的日期掩码（为空时统计全部日期），传入有明细记录的日期可与出入库分析的日口径一致
+            series_name: 序列列的显示名称
+
+        Returns:
+            pd.DataFrame: 每个序列一行的统计表
+        """
+        if active_days is not None:
+            values, dates = values[active_days], dates[active_days]
+        if values.size == 0:
+            return pd.DataFrame()
+
+        stats = RobustStatistics.summarize_matrix(np.asarray(values, dtype=np.float64))
+        return pd.DataFrame({
+            series_name: keys,
+            '总量': stats['total'],
+            '日均': np.round(stats['mean'], 2),
+            '日均(剔除离群值)': np.round(stats['mean_no_outliers'], 2),
+            '中位数': stats['median'],
+            'P25': stats['q25'],
+            'P75': stats['q75'],
+            '最高': stats['filtered_max'],
+            '最高日期': dates[stats['max_idx']],
+            '最低': stats['filtered_min'],
+            '最低日期': dates[stats['min_idx']],
+            '趋势': np.where(stats['trend_up'], '上升', '下降')
+        })
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+安全库存模块 - 按出库历史批量计算所有SKU在多个服务水平下的安全库存和再订货点
+需求的均值和标准差由(SKU, 周期)合计的和与平方和得出（无出库的周期贡献0），按SKU分块累加，不展开整张SKU×周期稠密矩阵；
+多个服务水平通过z值向量广播一次算出(SKU, 服务水平)结果
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from statistics import NormalDist
+from typing import Dict, List, Optional
+from core.time_series_kernel import TimeSeriesKernel
+from config import SAFETY_STOCK_CONFIG
+
+class SafetyStockCalculator:
+    """安全库存与再订货点批量计算器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化安全库存计算器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def demand_moments(df: pd.DataFrame, date_column: str, sku_column: str,
+                       quantity_column: Optional[str] = None, period_days: int = 1) -> Dict:
+        """
+        计算每个SKU的周期需求均值和标准差
+
+        Args:
+            df: 出库明细
+            date_column: 日期列名
+            sku_column: SKU列名
+            quantity_column: 件数列名（为空时按行数计需求）
+            period_days: 周期天数（1为日，7为周；末尾不完整的周期不参与统计）
+
+        Returns:
+            dict: skus、mean、std、total（按SKU编码）、n_periods，无有效数据时为空字典
+        """
+        valid_rows, day_idx, _, n_days = TimeSeriesKernel.prepare_day_index(df[date_column])
+        n_periods = n_days // period_days
+        if n_periods < 2:
+            return {}
+
+        sku_source = df[sku_column] if valid_rows.all() else df[sku_column][valid_rows]
+        sku_codes, skus = pd.factorize(sku_source, use_na_sentinel=True)
+        if quantity_column:
+            value_source = df[quantity_column] if valid_rows.all() else df[quantity_column][valid_rows]
+            quantity, _ = TimeSeriesKernel.to_numeric_values(value_source)
+            quantity = np.nan_to_num(quantity, nan=0.0)
+        else:
+            quantity = np.ones(day_idx.size, dtype=np.float64)
+
+        period_idx = day_idx // period_days
+        keep = (sku_codes >= 0) & (period_idx < n_periods)
+        n_skus = len(skus)
+
+        sku_codes, period_idx, quantity = sku_codes[keep], period_idx[keep], quantity[keep]
+        total = np.bincount(sku_codes, weights=quantity, minlength=n_skus)
+        square_total = np.zeros(n_skus)
+
+        # 平方和需要(SKU, 周期)合计：按SKU分块展开为稠密小矩阵，块号是小整数，稳定排序走基数排序
+        block_skus = max(1, SAFETY_STOCK_CONFIG['cell_block_size'] // n_periods)
+        n_blocks = -(-n_skus // block_skus)
+        block = (sku_codes // block_skus).astype(np.uint16 if n_blocks <= np.iinfo(np.uint16).max else np.int64)
+        order = np.argsort(block, kind='stable')
+        bounds = np.searchsorted(block[order], np.arange(n_blocks + 1))
+        for block_id in range(n_blocks):
+            rows = order[bounds[block_id]:bounds[block_id + 1]]
+            first_sku = block_id * block_skus
+            size = min(block_skus, n_skus - first_sku)
+            cells = (sku_codes[rows] - first_sku) * n_periods + period_idx[rows]
+            cell_sums = np.bincount(cells, weights=quantity[rows], minlength=size * n_periods)
+            square_total[first_sku:first_sku + size] = np.square(cell_sums).reshape(size, n_periods).sum(axis=1)
+
+        mean = total / n_periods
+        variance = np.maximum(square_total - n_periods * mean ** 2, 0) / (n_periods - 1)
+        return {'skus': pd.Index(skus), 'mean': mean, 'std': np.sqrt(variance), 'total': total, 'n_periods': n_periods}
+
+    @staticmethod
+    def z_values(service_levels: List[float]) -> np.ndarray:
+        """服务水平(周期服务水平, 0-1)对应的标准正态分位数"""
+        normal = NormalDist()
+        return np.array([normal.inv_cdf(level) for level in service_levels])
+
+    @staticmethod
+    def lead_time_sigma(mean: np.ndarray, std: np.ndarray, lead_time: float, lead_time_std: float = 0.0) -> np.ndarray:
+        """
+        提前期内需求的标准差 sqrt(L·σd² + μd²·σL²)
+
+        Args:
+            mean: 周期需求均值
+            std: 周期需求标准差
+            lead_time: 提前期（周期数）
+            lead_time_std: 提前期标准差（周期数，为0时只考虑需求波动）
+
+        Returns:
+            np.ndarray: 每个SKU的提前期需求标准差
+        """
+        return np.sqrt(lead_time * std ** 2 + (mean * lead_time_std) ** 2)
+
+    @staticmethod
+    def compute(mean: np.ndarray, std: np.ndarray, lead_time: float, lead_time_std: float,
+                service_levels: List[float]) -> Dict[str, np.ndarray]:
+        """
+        一次计算所有SKU × 所有服务水平的安全库存和再订货点
+
+        Args:
+            mean: 周期需求均值
+            std: 周期需求标准差
+            lead_time: 提前期（周期数）
+            lead_time_std: 提前期标准差（周期数）
+            service_levels: 服务水平列表
+
+        Returns:
+            dict: sigma（SKU,）、safety_stock、reorder_point（SKU, 服务水平）
+        """
+        sigma = SafetyStockCalculator.lead_time_sigma(mean, std, lead_time, lead_time_std)
+        safety_stock = sigma[:, None] * SafetyStockCalculator.z_values(service_levels)[None, :]
+        return {
+            'sigma': sigma,
+            'safety_stock': safety_stock,
+            'reorder_point': (mean * lead_time)[:, None] + safety_stock
+        }
+
+    @staticmethod
+    def investment_curve(sigma: np.ndarray, unit_cost: Optional[np.ndarray], service_levels) -> pd.DataFrame:
+        """
+        安全库存总投入随服务水平的变化（总量 = z × Σσ，按单价加权时为金额）
+
+        Args:
+            sigma: 每个SKU的提前期需求标准差
+            unit_cost: 每个SKU的单价（为空时按件数）
+            service_levels: 服务水平序列
+
+        Returns:
+            pd.DataFrame: 服务水平、安全库存总量、（安全库存金额）
+        """
+        levels = np.asarray(service_levels, dtype=np.float64)
+        z = SafetyStockCalculator.z_values(levels)
+        curve = pd.DataFrame({'服务水平(%)': np.round(levels * 100, 2), '安全库存总量': z * sigma.sum()})
+        if unit_cost is not None:
+            curve['安全库存金额'] = z * (sigma * unit_cost).sum()
+        return curve
+
+    def analyze(self, df: pd.DataFrame, date_column: str, sku_column: str, quantity_column: Optional[str],
+                cost_column: Optional[str], service_levels: List[float], lead_time_days: float,
+                lead_time_std_days: float = 0.0, period_days: int = 1) -> Dict:
+        """
+        执行安全库存分析
+
+        Args:
+            df: 出库明细
+            date_column: 日期列名
+            sku_column: SKU列名
+            quantity_column: 件数列名（可选）
+            cost_column: 单价列名（可选，同一SKU取第一条）
+            service_levels: 服务水平列表（0-1）
+            lead_time_days: 提前期（天）
+            lead_time_std_days: 提前期标准差（天）
+            period_days: 需求统计周期（天）
+
+        Returns:
+            dict: summary、sku_table、level_table、curve，无有效数据时为空字典
+        """
+        try:
+            moments = SafetyStockCalculator.demand_moments(df, date_column, sku_column, quantity_column, period_days)
+            if not moments:
+                return {}
+
+            service_levels = sorted(service_levels)
+            lead_time = lead_time_days / period_days
+            lead_time_std = lead_time_std_days / period_days
+            result = SafetyStockCalculator.compute(moments['mean'], moments['std'], lead_time, lead_time_std,
+                                                   service_levels)
+
+            unit_cost = None
+            if cost_column:
+                costs, _ = TimeSeriesKernel.to_numeric_values(df[cost_column])
+                codes = pd.Series(moments['skus'].get_indexer(df[sku_column]))
+                first_rows = codes[codes >= 0].drop_duplicates()
+                unit_cost = np.zeros(len(moments['skus']))
+                unit_cost[first_rows.to_numpy()] = np.nan_to_num(costs[first_rows.index.to_numpy()], nan=0.0)
+
+            period_label = '日' if period_days == 1 else f'{period_days}天'
+            mean, std = moments['mean'], moments['std']
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cv = np.where(mean > 0, std / mean, np.nan)
+            sku_table = pd.DataFrame({
+                'SKU': moments['skus'],
+                f'需求均值/{period_label}': np.round(mean, 2),
+                f'需求标准差/{period_label}': np.round(std, 2),
+                '变异系数': np.round(cv, 2),
+                '提前期需求': np.round(mean * lead_time, 1)
+            })
+            if unit_cost is not None:
+                sku_table['单价'] = unit_cost
+            for position, level in enumerate(service_levels):
+                label = f'{level * 100:g}%'
+                sku_table[f'安全库存@{label}'] = np.ceil(result['safety_stock'][:, position])
+                sku_table[f'再订货点@{label}'] = np.ceil(result['reorder_point'][:, position])
+            sku_table = sku_table.sort_values(f'安全库存@{service_levels[-1] * 100:g}%', ascending=False,
+                                              kind='stable').reset_index(drop=True)
+
+            level_table = pd.DataFrame({
+                '服务水平(%)': [level * 100 for level in service_levels],
+                'z值': np.round(SafetyStockCalculator.z_values(service_levels), 3),
+                '安全库存总量': np.ceil(result['safety_stock']).sum(axis=0),
+                '再订货点总量': np.ceil(result['reorder_point']).sum(axis=0)
+            })
+            if unit_cost is not None:
+                level_table['安全库存金额'] = (np.ceil(result['safety_stock']) * unit_cost[:, None]).sum(axis=0)
+
+            curve_levels = np.linspace(*SAFETY_STOCK_CONFIG['curve_range'], SAFETY_STOCK_CONFIG['curve_points'])
+            curve_levels = np.unique(np.concatenate([curve_levels, service_levels]))
+            summary = {
+                'sku_count': len(moments['skus']),
+                'n_periods': moments['n_periods'],
+                'period_label': period_label,
+                'lead_time_days': lead_time_days,
+                'lead_time_std_days': lead_time_std_days,
+                'zero_demand_skus': int((mean <= 0).sum())
+            }
+            return {
+                'summary': summary,
+                'sku_table': sku_table,
+                'level_table': level_table,
+                'curve': SafetyStockCalculator.investment_curve(result['sigma'], unit_cost, curve_levels)
+            }
+
+        except Exception as e:
+            st.error(f"❌ 安全库存计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_investment_curve(curve: pd.DataFrame, level_table: pd.DataFrame):
+        """
+        渲染安全库存投入-服务水平曲线
+
+        Args:
+            curve: investment_curve的结果
+            level_table: 所选服务水平的汇总
+        """
+        value_column = '安全库存金额' if '安全库存金额' in curve.columns else '安全库存总量'
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=curve['服务水平(%)'], y=curve[value_column], mode='lines',
+                                 name=value_column, line=dict(color='#1f77b4', width=2)))
+        fig.add_trace(go.Scatter(x=level_table['服务水平(%)'], y=level_table[value_column], mode='markers+text',
+                                 name='所选服务水平', marker=dict(color='#d62728', size=9),
+                                 text=[f"{value:,.0f}" for value in level_table[value_column]],
+                                 textposition='top left'))
+        fig.update_layout(title="安全库存投入 vs 服务水平", xaxis_title="服务水平(%)", yaxis_title=value_column,
+                          height=420, hovermode='x unified')
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+季节性分解模块 - 对日量序列批量做趋势/周季节/年季节/残差的加法分解
+所有序列组成(天, 序列)矩阵，移动平均由累积和一次算出，季节指数按相位对所有序列同时求均值，
+汇总指标或上万个SKU/品类序列都只需少量整矩阵运算
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, List, Optional
+from utils.chart_downsampling import ChartDownsampler
+from config import SEASONALITY_CONFIG
+
+class SeasonalDecomposer:
+    """季节性分解工具"""
+
+    @staticmethod
+    def frame_to_matrix(daily_data: pd.DataFrame, date_column: str, metrics: List[str]) -> Dict:
+        """
+        将日聚合表转换为日历连续的(天, 指标)矩阵，无数据的日期记为0
+
+        Args:
+            daily_data: 日聚合数据（仅包含有数据的日期）
+            date_column: 日期列名
+            metrics: 指标列名
+
+        Returns:
+            dict: values矩阵、dates（连续日期）、labels（指标名）
+        """
+        dates = pd.to_datetime(daily_data[date_column], errors='coerce')
+        valid = dates.notna().to_numpy()
+        if not valid.any():
+            return {}
+
+        dates = dates[valid].dt.normalize()
+        calendar = pd.date_range(dates.min(), dates.max(), freq='D')
+        positions = ((dates - calendar[0]) // pd.Timedelta(days=1)).to_numpy(dtype=np.int64)
+
+        values = np.zeros((len(calendar), len(metrics)), dtype=np.float64)
+        source = daily_data.loc[valid, metrics].apply(pd.to_numeric, errors='coerce').fillna(0)
+        np.add.at(values, positions, source.to_numpy(dtype=np.float64))
+        return {'values': values, 'dates': calendar, 'labels': pd.Index(metrics)}
+
+    @staticmethod
+    def centered_moving_average(values: np.ndarray, window: int) -> np.ndarray:
+        """
+        按列计算居中移动平均（偶数窗口使用2×window移动平均），两端不足窗口处为NaN
+
+        Args:
+            values: 矩阵(观测数, 序列数)
+            window: 窗口长度
+
+        Returns:
+            np.ndarray: 与输入同形状的趋势矩阵
+        """
+        n_obs = values.shape[0]
+        result = np.full(values.shape, np.nan)
+        if n_obs < window + (window % 2 == 0):
+            return result
+
+        cumulative = np.zeros((n_obs + 1, values.shape[1]))
+        np.cumsum(values, axis=0, out=cumulative[1:])
+        # moving[i] = values[i:i+window]的均值
+        moving = (cumulative[window:] - cumulative[:-window]) / window
+        if window % 2:
+            offset = window // 2
+            result[offset:offset + moving.shape[0]] = moving
+        else:
+            centered = (moving[:-1] + moving[1:]) / 2
+            offset = window // 2
+            result[offset:offset + centered.shape[0]] = centered
+        return result
+
+    @staticmethod
+    def seasonal_index(detrended: np.ndarray, phases: np.ndarray, period: int) -> np.ndarray:
+        """
+        计算加法季节指数：每个相位的去趋势均值，再中心化使各相位之和为0
+
+        Args:
+            detrended: 去趋势矩阵(观测数, 序列数)，无趋势处为NaN
+            phases: 每个观测的相位
+            period: 周期长度
+
+        Returns:
+            np.ndarray: 季节指数(周期, 序列数)
+        """
+        valid = ~np.isnan(detrended)
+        filled = np.where(valid, detrended, 0.0)
+        sums = np.zeros((period, detrended.shape[1]))
+        counts = np.zeros((period, detrended.shape[1]))
+        for phase in range(period):
+            rows = phases == phase
+            sums[phase] = filled[rows].sum(axis=0)
+            counts[phase] = valid[rows].sum(axis=0)
+        index = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        return index - index.mean(axis=0)
+
+    @staticmethod
+    def strength(component: np.ndarray, residual: np.ndarray) -> np.ndarray:
+        """
+        成分强度：max(0, 1 - Var(残差) / Var(成分 + 残差))
+
+        Args:
+            component: 季节或趋势成分
+            residual: 残差
+
+        Returns:
+            np.ndarray: 每个序列的强度(0-1)，无法计算时为NaN
+        """
+        valid = ~(np.isnan(component) | np.isnan(residual))
+        counts = valid.sum(axis=0)
+
+        def _variance(matrix):
+            filled = np.where(valid, matrix, 0.0)
+            mean = filled.sum(axis=0) / np.maximum(counts, 1)
+            deviation = np.where(valid, matrix - mean, 0.0)
+            return (deviation * deviation).sum(axis=0) / np.maximum(counts, 1)
+
+        residual_var = _variance(residual)
+        total_var = _variance(component + residual)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.where(total_var > 0, np.maximum(0.0, 1 - residual_var / total_var), 0.0)
+        return np.where(counts >= 2, result, np.nan)
+
+    @staticmethod
+    def trend_change_pct(trend: np.ndarray, level: np.ndarray, days: int = 30) -> np.ndarray:
+        """
+        趋势线的最小二乘斜率，换算为每N天相对平均水平的变化百分比
+
+        Args:
+            trend: 趋势矩阵(天, 序列数)，两端为NaN
+            level: 每个序列的平均水平
+            days: 换算天数
+
+        Returns:
+            np.ndarray: 每个序列的趋势变化(%)
+        """
+        valid = ~np.isnan(trend)
+        x = np.arange(trend.shape[0], dtype=np.float64)[:, None]
+        n = valid.sum(axis=0)
+        y = np.where(valid, trend, 0.0)
+        xv = np.where(valid, x, 0.0)
+        sx, sy = xv.sum(axis=0), y.sum(axis=0)
+        sxx, sxy = (xv * xv).sum(axis=0), (xv * y).sum(axis=0)
+        denominator = n * sxx - sx * sx
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, np.nan)
+            return np.where(level > 0, slope * days / level * 100, np.nan)
+
+    @staticmethod
+    def decompose(values: np.ndarray, dates: pd.DatetimeIndex) -> Dict[str, np.ndarray]:
+        """
+        周季节性加法分解：值 = 趋势(7日居中移动平均) + 周季节项 + 残差
+
+        Args:
+            values: 日历连续的矩阵(天, 序列数)
+            dates: 对应日期
+
+        Returns:
+            dict: trend、seasonal、residual矩阵与weekly_index(周一至周日, 序列数)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        phases = np.asarray(dates.dayofweek, dtype=np.int64)
+        trend = SeasonalDecomposer.centered_moving_average(values, 7)
+        weekly_index = SeasonalDecomposer.seasonal_index(values - trend, phases, 7)
+        seasonal = weekly_index[phases]
+        return {
+            'trend': trend,
+            'seasonal': seasonal,
+            'residual': values - trend - seasonal,
+            'weekly_index': weekly_index
+        }
+
+    @staticmethod
+    def yearly_index(values: np.ndarray, dates: pd.DatetimeIndex) -> Optional[Dict[str, np.ndarray]]:
+        """
+        年季节性：按完整自然月求日均，再对月序列做12个月周期的加法分解
+
+        Args:
+            values: 日历连续的矩阵(天, 序列数)（建议先去除周季节项）
+            dates: 对应日期
+
+        Returns:
+            dict: monthly_index(1-12月, 序列数)与强度；完整月份不足时为None
+        """
+        month_codes = np.asarray(dates.year * 12 + dates.month - 1, dtype=np.int64)
+        starts = np.flatnonzero(np.r_[True, month_codes[1:] != month_codes[:-1]])
+        counts = np.diff(np.r_[starts, len(month_codes)])
+        month_days = np.asarray(dates[starts].days_in_month)
+
+        # 仅使用完整自然月
+        complete = counts == month_days
+        if complete.sum() < SEASONALITY_CONFIG['min_yearly_months']:
+            return None
+
+        monthly = np.add.reduceat(values, starts, axis=0) / counts[:, None]
+        monthly = monthly[complete]
+        months = (month_codes[starts] % 12)[complete]
+        # 完整月份连续时才能做移动平均（数据只在首尾可能缺月）
+        trend = SeasonalDecomposer.centered_moving_average(monthly, 12)
+        monthly_index = SeasonalDecomposer.seasonal_index(monthly - trend, months, 12)
+        seasonal = monthly_index[months]
+        residual = monthly - trend - seasonal
+        return {
+            'monthly_index': monthly_index,
+            'strength': SeasonalDecomposer.strength(seasonal, residual)
+        }
+
+    @staticmethod
+    def analyze(values: np.ndarray, dates: pd.DatetimeIndex, labels, series_name: str = '序列') -> Dict:
+        """
+        对所有序列批量分解并生成季节性汇总表
+
+        Args:
+            values: 日历连续的矩阵(天, 序列数)
+            dates: 对应日期
+            labels: 序列名称
+            series_name: 序列列的显示名称
+
+        Returns:
+            dict: summary汇总表、weekly_index、monthly_index；天数不足时为空字典
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape[0] < SEASONALITY_CONFIG['min_weekly_days']:
+            return {}
+
+        weekday_labels = np.array(SEASONALITY_CONFIG['weekday_labels'], dtype=object)
+        month_labels = np.array(SEASONALITY_CONFIG['month_labels'], dtype=object)
+
+        weekly = SeasonalDecomposer.decompose(values, dates)
+        weekly_index = weekly['weekly_index']
+        level = values.mean(axis=0)
+
+        summary = pd.DataFrame({
+            series_name: list(labels),
+            '日均': level.round(2),
+            '周季节强度': SeasonalDecomposer.strength(weekly['seasonal'], weekly['residual']).round(3),
+            '峰值星期': weekday_labels[np.argmax(weekly_index, axis=0)],
+            '低谷星期': weekday_labels[np.argmin(weekly_index, axis=0)],
+        })
+        with np.errstate(divide='ignore', invalid='ignore'):
+            summary['周波动幅度(%)'] = np.where(
+                level > 0, (weekly_index.max(axis=0) - weekly_index.min(axis=0)) / level * 100, np.nan
+            ).round(1)
+        summary['趋势强度'] = SeasonalDecomposer.strength(weekly['trend'], weekly['residual']).round(3)
+        summary['趋势变化(%/30天)'] = SeasonalDecomposer.trend_change_pct(weekly['trend'], level).round(2)
+
+        # 年季节性基于去除周季节项后的序列
+        yearly = SeasonalDecomposer.yearly_index(values - weekly['seasonal'], dates)
+        monthly_index = None
+        if yearly is not None:
+            monthly_index = yearly['monthly_index']
+            summary['年季节强度'] = yearly['strength'].round(3)
+            summary['旺季月份'] = month_labels[np.argmax(monthly_index, axis=0)]
+            summary['淡季月份'] = month_labels[np.argmin(monthly_index, axis=0)]
+
+        return {
+            'summary': summary,
+            'weekly_index': pd.DataFrame(weekly_index, index=weekday_labels, columns=list(labels)),
+            'monthly_index': (pd.DataFrame(monthly_index, index=month_labels, columns=list(labels))
+                              if monthly_index is not None else None),
+            'n_days': values.shape[0]
+        }
+
+    @staticmethod
+    def insights(summary: pd.DataFrame, series_name: str = '序列') -> List[str]:
+        """
+        根据季节性汇总表生成文字结论（供优化建议使用）
+
+        Args:
+            summary: analyze返回的汇总表
+            series_name: 序列列名
+
+        Returns:
+            List[str]: 结论列表
+        """
+        messages = []
+        if summary is None or summary.empty:
+            return messages
+
+        threshold = SEASONALITY_CONFIG['strength_threshold']
+        trend_threshold = SEASONALITY_CONFIG['trend_threshold_pct']
+        for _, row in summary.iterrows():
+            name = row[series_name]
+            if row['周季节强度'] >= threshold:
+                messages.append(
+                    f"🗓️ {name}存在明显周季节性（强度 {row['周季节强度']:.2f}），"
+                    f"{row['峰值星期']}最高、{row['低谷星期']}最低，波动幅度约 {row['周波动幅度(%)']:.0f}%，建议按星期配置人力"
+                )
+            if '年季节强度' in summary.columns and row['年季节强度'] >= threshold:
+                messages.append(
+                    f"📆 {name}存在年度季节性（强度 {row['年季节强度']:.2f}），"
+                    f"{row['旺季月份']}为旺季、{row['淡季月份']}为淡季，建议提前规划旺季产能与库存"
+                )
+            change = row['趋势变化(%/30天)']
+            if pd.notna(change) and abs(change) >= trend_threshold:
+                if change > 0:
+                    messages.append(f"📈 {name}去除季节性后趋势上升，约 {change:.1f}%/30天，建议关注产能规划")
+                else:
+                    messages.append(f"📉 {name}去除季节性后趋势下降，约 {abs(change):.1f}%/30天，建议关注库存积压风险")
+        return messages
+
+    @staticmethod
+    def render_decomposition_chart(values: np.ndarray, dates: pd.DatetimeIndex, title: str):
+        """
+        渲染单个序列的分解图（原始值与趋势、周季节项、残差）
+
+        Args:
+            values: 单个序列的日历连续数组
+            dates: 对应日期
+            title: 图表标题
+        """
+        from plotly.subplots import make_subplots
+
+        components = SeasonalDecomposer.decompose(np.asarray(values, dtype=np.float64)[:, None], dates)
+        fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.06,
+                            subplot_titles=("原始值与趋势", "周季节项", "残差"))
+        # 各分量分别保极值降采样，超过阈值时使用WebGL渲染
+        n_points = len(dates)
+        lines = [(values, '原始值', dict(color='#1f77b4', width=1), 1),
+                 (components['trend'][:, 0], '趋势', dict(color='#ff7f0e', width=2), 1),
+                 (components['seasonal'][:, 0], '周季节项', dict(color='#2ca02c', width=1), 2)]
+        for series, name, line, row in lines:
+            plot_x, plot_y = ChartDownsampler.downsample_series(dates, series)
+            fig.add_trace(ChartDownsampler.line_trace(n_points, x=plot_x, y=plot_y, mode='lines', name=name, line=line),
+                          row=row, col=1)
+        plot_x, plot_y = ChartDownsampler.downsample_series(dates, components['residual'][:, 0])
+        fig.add_trace(go.Bar(x=plot_x, y=plot_y, name='残差', marker_color='#7f7f7f'), row=3, col=1)
+        fig.update_layout(title=title, height=650, showlegend=True, hovermode='x unified')
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+储位优化模块 - 按COI（体积/拣选频次）为SKU排序，依行走距离由近到远分配储位网格，评估相对随机或当前储位的行走节省
+储位网格的距离表由数组广播一次生成；SKU按COI排序后按所需储位数累计，直接得到连续的储位区间，
+每个SKU的平均行走距离由排序后距离的前缀和O(1)求出，不逐储位循环
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, Optional
+from core.time_series_kernel import TimeSeriesKernel
+from config import SLOTTING_CONFIG, PACKING_CONFIG
+
+class SlottingOptimizer:
+    """COI储位分配优化器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化储位优化器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def travel_distance(grid: Dict, aisle: np.ndarray, bay: np.ndarray, level: np.ndarray) -> np.ndarray:
+        """
+        储位的往返行走距离（出发点位于第一条巷道入口，巷道间与巷道内均为直角距离，层高折算为距离）
+
+        Args:
+            grid: 储位网格参数
+            aisle: 巷道下标（从0开始）
+            bay: 列下标（从0开始）
+            level: 层下标（从0开始）
+
+        Returns:
+            np.ndarray: 往返行走距离(m)
+        """
+        return (2 * (aisle * grid['aisle_pitch'] + (bay + 0.5) * grid['bay_width'])
+                + level * grid['level_penalty'])
+
+    @staticmethod
+    def location_grid(grid: Dict) -> Dict[str, np.ndarray]:
+        """
+        生成储位网格并按行走距离由近到远排序
+
+        Args:
+            grid: 储位网格参数（巷道数、列数、层数、尺寸与距离参数）
+
+        Returns:
+            dict: aisle、side、bay、level、distance（均按距离升序）
+        """
+        shape = (int(grid['aisles']), SLOTTING_CONFIG['sides'], int(grid['bays']), int(grid['levels']))
+        aisle, side, bay, level = np.indices(shape).reshape(4, -1)
+        distance = SlottingOptimizer.travel_distance(grid, aisle, bay, level)
+        order = np.argsort(distance, kind='stable')
+        return {'aisle': aisle[order], 'side': side[order], 'bay': bay[order], 'level': level[order],
+                'distance': distance[order]}
+
+    @staticmethod
+    def sku_profile(sku_df: pd.DataFrame, sku_column: str, dimension_columns: Dict[str, str],
+                    inventory_column: Optional[str], data_unit: str,
+                    outbound_df: pd.DataFrame, outbound_sku_column: str) -> Dict:
+        """
+        汇总SKU的存储体积和拣选频次
+
+        Args:
+            sku_df: SKU主数据/库存表（同一SKU多行时库存相加，尺寸取第一条）
+            sku_column: SKU列名
+            dimension_columns: 尺寸列名 {'length', 'width', 'height'}
+            inventory_column: 库存件数列名（可选，不选择时按单件体积）
+            data_unit: 尺寸单位（mm/cm/m）
+            outbound_df: 出库明细
+            outbound_sku_column: 出库表SKU列名
+
+        Returns:
+            dict: skus、first_rows（每个SKU第一条所在行）、unit_volume、stock_volume(mm³)、picks（出库行数）
+        """
+        codes, skus = pd.factorize(sku_df[sku_column], use_na_sentinel=True)
+        first_rows = pd.Series(codes)[codes >= 0].drop_duplicates()
+        n_skus = len(skus)
+        positions = np.empty(n_skus, dtype=np.int64)
+        positions[first_rows.to_numpy()] = first_rows.index.to_numpy()
+
+        factor = PACKING_CONFIG['unit_conversion'].get(data_unit, 1)
+        unit_volume = np.ones(n_skus)
+        for key in ['length', 'width', 'height']:
+            values, _ = TimeSeriesKernel.to_numeric_values(sku_df[dimension_columns[key]])
+            unit_volume *= values[positions] * factor
+        unit_volume = np.where(unit_volume > 0, unit_volume, np.nan)
+
+        if inventory_column:
+            stock, _ = TimeSeriesKernel.to_numeric_values(sku_df[inventory_column])
+            valid = codes >= 0
+            stock = np.bincount(codes[valid], weights=np.nan_to_num(stock[valid], nan=0.0), minlength=n_skus)
+            stock_volume = unit_volume * np.maximum(stock, 1)
+        else:
+            stock_volume = unit_volume
+
+        outbound_codes = pd.Index(skus).get_indexer(outbound_df[outbound_sku_column])
+        picks = np.bincount(outbound_codes[outbound_codes >= 0], minlength=n_skus).astype(np.float64)
+        return {
+            'skus': pd.Index(skus),
+            'first_rows': positions,
+            'unit_volume': unit_volume,
+            'stock_volume': stock_volume,
+            'picks': picks,
+            'unknown_outbound_lines': int((outbound_codes < 0).sum())
+        }
+
+    @staticmethod
+    def assign(slots: np.ndarray, sorted_distance: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        按给定顺序为SKU连续分配排序后的储位
+
+        Args:
+            slots: 每个SKU（已按COI排序）所需储位数
+            sorted_distance: 按距离升序的储位距离
+
+        Returns:
+            dict: start、end（储位区间[start, end)）、assigned（储位是否足够）、distance（区间平均距离）
+        """
+        end = np.cumsum(slots)
+        start = end - slots
+        assigned = end <= sorted_distance.size
+        prefix = np.concatenate([[0.0], np.cumsum(sorted_distance)])
+        distance = np.full(slots.size, np.nan)
+        distance[assigned] = (prefix[end[assigned]] - prefix[start[assigned]]) / slots[assigned]
+        return {'start': start, 'end': end, 'assigned': assigned, 'distance': distance}
+
+    @staticmethod
+    def parse_locations(values: pd.Series, grid: Dict) -> Dict[str, np.ndarray]:
+        """
+        从储位编码中依次提取巷道、列、层编号（如 03-012-2，编号从1开始），超出网格时视为无效
+
+        Args:
+            values: 储位编码
+            grid: 储位网格参数
+
+        Returns:
+            dict: aisle、bay、level（从0开始）与valid
+        """
+        parts = values.astype(str).str.extract(r'(\d+)\D+(\d+)\D+(\d+)').astype(np.float64).to_numpy() - 1
+        limits = np.array([grid['aisles'], grid['bays'], grid['levels']], dtype=np.float64)
+        valid = np.all((parts >= 0) & (parts < limits), axis=1)
+        parts = np.where(valid[:, None], parts, 0).astype(np.int64)
+        return {'aisle': parts[:, 0], 'bay': parts[:, 1], 'level': parts[:, 2], 'valid': valid}
+
+    def analyze(self, sku_df: pd.DataFrame, sku_columns: Dict[str, Optional[str]], data_unit: str,
+                outbound_df: pd.DataFrame, outbound_sku_column: str, grid: Optional[Dict] = None) -> Dict:
+        """
+        执行COI储位优化
+
+        Args:
+            sku_df: SKU主数据/库存表
+            sku_columns: 列名 {'sku', 'length', 'width', 'height', 'inventory', 'location'}（inventory、location可为空）
+            data_unit: 尺寸单位
+            outbound_df: 出库明细
+            outbound_sku_column: 出库表SKU列名
+            grid: 储位网格参数（缺省项取默认值）
+
+        Returns:
+            dict: summary、sku_table、band_table、curve、location_table，无有效数据时为空字典
+        """
+        try:
+            grid = {**SLOTTING_CONFIG['grid'], **(grid or {})}
+            profile = SlottingOptimizer.sku_profile(sku_df, sku_columns['sku'], sku_columns, sku_columns.get('inventory'),
+                                                    data_unit, outbound_df, outbound_sku_column)
+            locations = SlottingOptimizer.location_grid(grid)
+            if len(profile['skus']) == 0 or locations['distance'].size == 0:
+                return {}
+
+            # COI = 存储体积 / 拣选频次，越小越靠近出发点；无出库的SKU排在最后，尺寸无效的SKU不参与分配
+            picks = profile['picks']
+            has_volume = ~np.isnan(profile['stock_volume'])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                coi = np.where(picks > 0, profile['stock_volume'] / picks, np.inf)
+            candidates = np.flatnonzero(has_volume)
+            order = candidates[np.argsort(coi[candidates], kind='stable')]
+
+            location_volume = (grid['location_length'] * grid['location_width'] * grid['location_height']
+                               * SLOTTING_CONFIG['fill_rate'])
+            slots = np.maximum(np.ceil(profile['stock_volume'][order] / location_volume), 1).astype(np.int64)
+            placement = SlottingOptimizer.assign(slots, locations['distance'])
+            assigned = placement['assigned']
+            placed = order[assigned]
+            placed_picks = picks[placed]
+
+            # 预期行走距离 = Σ 拣选频次 × 所在储位往返距离（单品单次拣选）；随机分配的期望为网格平均距离
+            coi_travel = float((placed_picks * placement['distance'][assigned]).sum())
+            random_travel = float(placed_picks.sum() * locations['distance'].mean())
+
+            sku_table = pd.DataFrame({
+                'SKU': profile['skus'][order],
+                '存储体积(m³)': np.round(profile['stock_volume'][order] / 1e9, 4),
+                '拣选频次': picks[order],
+                'COI(m³/次)': coi[order] / 1e9,
+                '储位数': slots,
+                '储位序号': np.where(assigned, placement['start'] + 1, -1),
+                '平均往返距离(m)': np.round(placement['distance'], 1)
+            })
+
+            summary = {
+                'sku_count': len(profile['skus']),
+                'invalid_dimension_skus': int((~has_volume).sum()),
+                'assigned_skus': int(assigned.sum()),
+                'unassigned_skus': int((~assigned).sum()),
+                'location_count': int(locations['distance'].size),
+                'used_locations': int(slots[assigned].sum()),
+                'coi_travel': coi_travel,
+                'random_travel': random_travel,
+                'random_saving': 1 - coi_travel / random_travel if random_travel > 0 else np.nan,
+                'unknown_outbound_lines': profile['unknown_outbound_lines']
+            }
+
+            # 当前储位：解析编码后按同一距离公式计算，只比较两种方案都有储位的SKU
+            if sku_columns.get('location'):
+                current = SlottingOptimizer.parse_locations(
+                    sku_df[sku_columns['location']].iloc[profile['first_rows'][order]].reset_index(drop=True), grid)
+                current_distance = SlottingOptimizer.travel_distance(grid, current['aisle'], current['bay'],
+                                                                     current['level'])
+                sku_table['当前往返距离(m)'] = np.where(current['valid'], np.round(current_distance, 1), np.nan)
+                both = current['valid'] & assigned
+                current_travel = float((picks[order][both] * current_distance[both]).sum())
+                compared_travel = float((picks[order][both] * placement['distance'][both]).sum())
+                summary.update({
+                    'current_compared_skus': int(both.sum()),
+                    'current_travel': current_travel,
+                    'current_compared_coi_travel': compared_travel,
+                    'current_saving': 1 - compared_travel / current_travel if current_travel > 0 else np.nan
+                })
+
+            # 按储位展开：每个SKU的拣选频次平均分摊到其各个储位
+            location_sku = np.full(locations['distance'].size, -1, dtype=np.int64)
+            used = summary['used_locations']
+            location_sku[:used] = np.repeat(placed, slots[assigned])
+            location_picks = np.zeros(locations['distance'].size)
+            location_picks[:used] = np.repeat(placed_picks / slots[assigned], slots[assigned])
+
+            # 储位数少于分段数时（如1×2×1网格）按储位数分段，保证每段至少一个储位
+            n_bands = min(SLOTTING_CONFIG['distance_bands'], locations['distance'].size)
+            band = np.arange(locations['distance'].size) * n_bands // locations['distance'].size
+            total_picks = location_picks.sum()
+            band_table = pd.DataFrame({
+                '距离分段': [f"第{index + 1}段" for index in range(n_bands)],
+                '最远往返距离(m)': np.round(np.maximum.reduceat(locations['distance'], np.searchsorted(band, np.arange(n_bands))), 1),
+                '储位数': np.bincount(band, minlength=n_bands),
+                '已用储位': np.bincount(band, weights=location_sku >= 0, minlength=n_bands).astype(np.int64),
+                '拣选频次占比(%)': np.bincount(band, weights=location_picks, minlength=n_bands) / total_picks * 100
+                if total_picks > 0 else 0.0
+            })
+
+            # 累计拣选占比曲线（按储位由近到远），抽取固定点数绘图
+            points = np.unique(np.linspace(0, locations['distance'].size - 1, 200).astype(np.int64))
+            cumulative = np.cumsum(location_picks)
+            curve = pd.DataFrame({
+                '储位占比(%)': (points + 1) / locations['distance'].size * 100,
+                'COI分配(%)': cumulative[points] / total_picks * 100 if total_picks > 0 else 0.0
+            })
+
+            location_table = pd.DataFrame({
+                '储位序号': np.arange(1, locations['distance'].size + 1),
+                '巷道': locations['aisle'] + 1,
+                '侧': np.where(locations['side'] == 0, '左', '右'),
+                '列': locations['bay'] + 1,
+                '层': locations['level'] + 1,
+                '往返距离(m)': np.round(locations['distance'], 1),
+                'SKU': np.where(location_sku >= 0, np.asarray(profile['skus'], dtype=object)[np.maximum(location_sku, 0)], '')
+            })
+            return {'summary': summary, 'sku_table': sku_table, 'band_table': band_table, 'curve': curve,
+                    'location_table': location_table}
+
+        except Exception as e:
+            st.error(f"❌ 储位优化计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_pick_curve(curve: pd.DataFrame):
+        """
+        渲染累计拣选占比曲线（COI分配 vs 随机分配）
+
+        Args:
+            curve: 储位占比与累计拣选占比
+        """
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=curve['储位占比(%)'], y=curve['COI分配(%)'], mode='lines',
+                                 name='COI分配', line=dict(color='#1f77b4', width=2)))
+        fig.add_trace(go.Scatter(x=[0, 100], y=[0, 100], mode='lines', name='随机分配',
+                                 line=dict(color='#7f7f7f', width=1, dash='dash')))
+        fig.update_layout(title="累计拣选频次占比（储位由近到远）", xaxis_title="储位占比(%)",
+                          yaxis_title="累计拣选频次占比(%)", height=420)
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""
+出入库对账模块 - 合并入库表与出库表，按SKU推算每日在库量
+SKU和日期统一编码为整数后按(SKU, 天)汇总净流量，在SKU内做累计和得到库存轨迹；
+库存在两次出入库之间保持不变，因此只按有流水的(SKU, 天)计算区间，不展开稠密的SKU×天矩阵。
+期初库存取自库存快照；未提供快照时按首次入库前的累计出库推定最低期初库存（净流量相对口径）
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from typing import Dict, Optional
+from core.time_series_kernel import TimeSeriesKernel, MISSING_DAY_CODE
+from utils.chart_downsampling import ChartDownsampler
+from config import RECONCILIATION_CONFIG
+
+class StockReconciler:
+    """出入库对账与在库量推算"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化对账分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def _side_arrays(df: pd.DataFrame, date_column: str, sku_column: str,
+                     quantity_column: Optional[str]) -> Dict:
+        """提取单侧流水的天编码、SKU和数量（无件数列时每行计1）"""
+        day_codes = TimeSeriesKernel.to_day_codes(df[date_column])
+        if quantity_column:
+            quantity, _ = TimeSeriesKernel.to_numeric_values(df[quantity_column])
+            quantity = np.nan_to_num(quantity, nan=0.0)
+        else:
+            quantity = np.ones(len(df), dtype=np.float64)
+        return {'day_codes': day_codes, 'skus': df[sku_column], 'quantity': quantity}
+
+    @staticmethod
+    def encode_flows(inbound_df: pd.DataFrame, inbound_columns: Dict[str, Optional[str]],
+                     outbound_df: pd.DataFrame, outbound_columns: Dict[str, Optional[str]]) -> Dict:
+        """
+        将入库、出库流水编码到同一套SKU编码和天下标上
+
+        Args:
+            inbound_df: 入库明细
+            inbound_columns: 入库列名 {'date', 'sku', 'quantity'}（quantity可为空）
+            outbound_df: 出库明细
+            outbound_columns: 出库列名 {'date', 'sku', 'quantity'}
+
+        Returns:
+            dict: sku_codes、day_idx、inbound、outbound（同长度数组，入库行outbound为0，反之亦然）、
+                  skus、dates，无有效数据时为空字典
+        """
+        inbound = StockReconciler._side_arrays(inbound_df, inbound_columns['date'],
+                                               inbound_columns['sku'], inbound_columns.get('quantity'))
+        outbound = StockReconciler._side_arrays(outbound_df, outbound_columns['date'],
+                                                outbound_columns['sku'], outbound_columns.get('quantity'))
+        n_inbound = len(inbound_df)
+
+        # 两张表的SKU一起编码，保证同一SKU在两侧编码相同
+        sku_codes, skus = pd.factorize(
+            pd.concat([inbound['skus'], outbound['skus']], ignore_index=True), use_na_sentinel=True
+        )
+        day_codes = np.concatenate([inbound['day_codes'], outbound['day_codes']])
+        valid = (sku_codes >= 0) & (day_codes != MISSING_DAY_CODE)
+        if not valid.any():
+            return {}
+
+        inbound_quantity = np.concatenate([inbound['quantity'], np.zeros(len(outbound_df))])
+        outbound_quantity = np.concatenate([np.zeros(n_inbound), outbound['quantity']])
+
+        first_day = int(day_codes[valid].min())
+        day_idx = (day_codes[valid] - first_day).astype(np.int64)
+        n_days = int(day_idx.max()) + 1
+        return {
+            'sku_codes': sku_codes[valid].astype(np.int64),
+            'day_idx': day_idx,
+            'inbound': inbound_quantity[valid],
+            'outbound': outbound_quantity[valid],
+            'skus': pd.Index(skus),
+            'dates': TimeSeriesKernel.day_codes_to_datetime(np.arange(n_days) + first_day)
+        }
+
+    @staticmethod
+    def opening_from_snapshot(flows: Dict, snapshot_df: pd.DataFrame, sku_column: str,
+                              quantity_column: str) -> np.ndarray:
+        """
+        将库存快照按encode_flows的SKU编码对齐为期初库存（同一SKU多行累加，流水中没有的SKU忽略）
+
+        Args:
+            flows: encode_flows的结果
+            snapshot_df: 期初库存快照
+            sku_column: 快照SKU列名
+            quantity_column: 快照库存数量列名
+
+        Returns:
+            np.ndarray: 各SKU期初库存（按flows['skus']顺序）
+        """
+        codes = flows['skus'].get_indexer(snapshot_df[sku_column])
+        quantity, _ = TimeSeriesKernel.to_numeric_values(snapshot_df[quantity_column])
+        matched = codes >= 0
+        return np.bincount(codes[matched], weights=np.nan_to_num(quantity[matched], nan=0.0),
+                           minlength=len(flows['skus']))
+
+    def project_stock(self, flows: Dict, opening_stock: Optional[np.ndarray] = None) -> Dict:
+        """
+        推算每个SKU的在库量轨迹，统计缺货天数和积压天数
+
+        在库量 = 期初库存 + 累计入库 - 累计出库；在库量<0的天记为缺货，
+        在库量超过 积压覆盖天数 × 日均出库 的天记为积压（无出库SKU有库存即积压）。
+        未提供期初库存时，数据通常截取自SKU生命周期中段，首次入库前的出库消耗的是未知的期初库存：
+        期初库存推定为首次入库前累计净流量的最大缺口，首次入库前不会出现缺货
+
+        Args:
+            flows: encode_flows的结果
+            opening_stock: 各SKU期初库存（按flows['skus']顺序，为空时按首次入库前的缺口推定）
+
+        Returns:
+            dict: 各SKU统计数组（按SKU编码）和逐日汇总数组
+        """
+        n_skus = len(flows['skus'])
+        n_days = len(flows['dates'])
+        excess_cover_days = self.config.get('excess_cover_days', RECONCILIATION_CONFIG['excess_cover_days'])
+
+        # 按(SKU, 天)汇总当天入库、出库；排序后的单元格天然按SKU分组、组内按天升序
+        cells = flows['sku_codes'] * n_days + flows['day_idx']
+        unique_cells, inverse = np.unique(cells, return_inverse=True)
+        inbound = np.bincount(inverse, weights=flows['inbound'], minlength=unique_cells.size)
+        outbound = np.bincount(inverse, weights=flows['outbound'], minlength=unique_cells.size)
+        cell_sku = unique_cells // n_days
+        cell_day = unique_cells % n_days
+
+        # SKU内累计净流量：全局累计和减去各SKU起点之前的累计值
+        is_start = np.ones(unique_cells.size, dtype=bool)
+        is_start[1:] = cell_sku[1:] != cell_sku[:-1]
+        starts = np.flatnonzero(is_start)
+        cumulative = np.cumsum(inbound - outbound)
+        before_start = np.concatenate([[0.0], cumulative[:-1]])[starts]
+        stock = cumulative - np.repeat(before_start, np.diff(np.append(starts, unique_cells.size)))
+        if opening_stock is None:
+            # 首次入库（含当天，按日汇总无法区分当天入库、出库的先后）及之前的单元格：期初库存至少要覆盖这些天的累计出库
+            positions = np.arange(unique_cells.size)
+            first_inbound = np.full(n_skus, unique_cells.size, dtype=np.int64)
+            np.minimum.at(first_inbound, cell_sku, np.where(inbound > 0, positions, unique_cells.size))
+            before_inbound = positions <= first_inbound[cell_sku]
+            lowest = np.zeros(n_skus)
+            np.minimum.at(lowest, cell_sku[before_inbound], stock[before_inbound])
+            opening_stock = -lowest
+        stock = stock + opening_stock[cell_sku]
+
+        # 每个流水日的在库量一直保持到该SKU下一次流水日（最后一次保持到期末）
+        segment_end = np.full(unique_cells.size, n_days, dtype=np.int64)
+        same_sku_next = ~is_start[1:]
+        segment_end[:-1][same_sku_next] = cell_day[1:][same_sku_next]
+        segment_days = segment_end - cell_day
+
+        inbound_total = np.bincount(cell_sku, weights=inbound, minlength=n_skus)
+        outbound_total = np.bincount(cell_sku, weights=outbound, minlength=n_skus)
+        excess_threshold = excess_cover_days * outbound_total / n_days
+
+        # 每个SKU首次流水日之前的天数保持期初库存（无流水的SKU整个期间都保持期初库存），作为前置区间参与统计
+        lead_end = np.full(n_skus, n_days, dtype=np.int64)
+        lead_end[cell_sku[starts]] = cell_day[starts]
+        lead_sku = np.flatnonzero(lead_end > 0)
+        span_sku = np.concatenate([cell_sku, lead_sku])
+        span_start = np.concatenate([cell_day, np.zeros(lead_sku.size, dtype=np.int64)])
+        span_end = np.concatenate([segment_end, lead_end[lead_sku]])
+        span_stock = np.concatenate([stock, opening_stock[lead_sku]])
+        span_days = span_end - span_start
+
+        stockout = span_stock < -1e-9
+        excess = (span_stock > 1e-9) & (span_stock > excess_threshold[span_sku] + 1e-9)
+        stockout_days = np.bincount(span_sku[stockout], weights=span_days[stockout], minlength=n_skus)
+        excess_days = np.bincount(span_sku[excess], weights=span_days[excess], minlength=n_skus)
+
+        # 首次缺货日：各SKU缺货区间起点的最小值
+        first_stockout = np.full(n_skus, n_days, dtype=np.int64)
+        np.minimum.at(first_stockout, span_sku[stockout], span_start[stockout])
+        first_stockout[first_stockout == n_days] = -1
+
+        # 逐日汇总：区间起点+1、终点-1后做累计和，得到每天处于缺货/积压状态的SKU数
+        daily_inbound = np.bincount(cell_day, weights=inbound, minlength=n_days)
+        daily_outbound = np.bincount(cell_day, weights=outbound, minlength=n_days)
+        daily_stock = np.cumsum(daily_inbound - daily_outbound) + opening_stock.sum()
+
+        def active_per_day(mask: np.ndarray) -> np.ndarray:
+            change = (np.bincount(span_start[mask], minlength=n_days + 1)
+                      - np.bincount(span_end[mask], minlength=n_days + 1))
+            return np.cumsum(change)[:n_days]
+
+        # 期末库存取各SKU最后一条流水后的在库量（日期无效导致无流水的SKU按期初库存计）；最低库存含首次流水前的期初库存
+        ending_stock = opening_stock.astype(np.float64).copy()
+        ending_stock[cell_sku[starts]] = stock[np.append(starts[1:], unique_cells.size) - 1]
+        min_stock = np.full(n_skus, np.inf)
+        np.minimum.at(min_stock, span_sku, span_stock)
+
+        return {
+            'opening_stock': opening_stock,
+            'inbound_total': inbound_total,
+            'outbound_total': outbound_total,
+            'ending_stock': ending_stock,
+            'min_stock': min_stock,
+            'stockout_days': stockout_days.astype(np.int64),
+            'excess_days': excess_days.astype(np.int64),
+            'first_stockout': first_stockout,
+            'daily_inbound': daily_inbound,
+            'daily_outbound': daily_outbound,
+            'daily_stock': daily_stock,
+            'daily_stockout_skus': active_per_day(stockout),
+            'daily_excess_skus': active_per_day(excess)
+        }
+
+    @staticmethod
+    def sku_table(flows: Dict, projection: Dict) -> pd.DataFrame:
+        """
+        生成SKU对账明细表（缺货天数、积压天数降序）
+
+        Args:
+            flows: encode_flows的结果
+            projection: project_stock的结果
+
+        Returns:
+            pd.DataFrame: SKU对账表
+        """
+        first_stockout = projection['first_stockout']
+        first_dates = pd.Series(flows['dates'][np.maximum(first_stockout, 0)]).where(first_stockout >= 0)
+        status = np.where(projection['stockout_days'] > 0, '缺货',
+                          np.where(projection['excess_days'] > 0, '积压', '正常'))
+        status = np.where(projection['outbound_total'] == 0, '仅入库', status)
+        status = np.where(projection['inbound_total'] == 0, '仅出库', status)
+
+        table = pd.DataFrame({
+            'SKU': flows['skus'],
+            '期初库存': projection['opening_stock'],
+            '入库总量': projection['inbound_total'],
+            '出库总量': projection['outbound_total'],
+            '期末库存': projection['ending_stock'],
+            '最低库存': projection['min_stock'],
+            '缺货天数': projection['stockout_days'],
+            '积压天数': projection['excess_days'],
+            '首次缺货日期': first_dates.to_numpy(),
+            '状态': status
+        })
+        return table.sort_values(['缺货天数', '积压天数'], ascending=False, kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def daily_table(flows: Dict, projection: Dict) -> pd.DataFrame:
+        """
+        生成逐日汇总表
+
+        Args:
+            flows: encode_flows的结果
+            projection: project_stock的结果
+
+        Returns:
+            pd.DataFrame: 逐日入库、出库、推算库存和缺货/积压SKU数
+        """
+        return pd.DataFrame({
+            '日期': flows['dates'],
+            '入库量': projection['daily_inbound'],
+            '出库量': projection['daily_outbound'],
+            '净流量': projection['daily_inbound'] - projection['daily_outbound'],
+            '推算库存': projection['daily_stock'],
+            '缺货SKU数': projection['daily_stockout_skus'],
+            '积压SKU数': projection['daily_excess_skus']
+        })
+
+    def analyze(self, inbound_df: pd.DataFrame, inbound_columns: Dict[str, Optional[str]],
+                outbound_df: pd.DataFrame, outbound_columns: Dict[str, Optional[str]],
+                opening_df: Optional[pd.DataFrame] = None, opening_columns: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        执行出入库对账分析
+
+        Args:
+            inbound_df: 入库明细
+            inbound_columns: 入库列名 {'date', 'sku', 'quantity'}
+            outbound_df: 出库明细
+            outbound_columns: 出库列名 {'date', 'sku', 'quantity'}
+            opening_df: 期初库存快照，为空时按首次入库前的缺口推定期初库存
+            opening_columns: 快照列名 {'sku', 'quantity'}
+
+        Returns:
+            dict: summary、sku_table、daily_table，无有效数据时为空字典
+        """
+        try:
+            flows = StockReconciler.encode_flows(inbound_df, inbound_columns, outbound_df, outbound_columns)
+            if not flows:
+                return {}
+
+            opening_stock = None
+            if opening_df is not None and opening_columns:
+                opening_stock = StockReconciler.opening_from_snapshot(
+                    flows, opening_df, opening_columns['sku'], opening_columns['quantity'])
+            projection = self.project_stock(flows, opening_stock)
+            sku_table = StockReconciler.sku_table(flows, projection)
+            summary = {
+                'opening_source': 'snapshot' if opening_stock is not None else 'implied',
+                'opening_total': float(projection['opening_stock'].sum()),
+                'sku_count': len(flows['skus']),
+                'day_count': len(flows['dates']),
+                'inbound_total': float(projection['inbound_total'].sum()),
+                'outbound_total': float(projection['outbound_total'].sum()),
+                'stockout_skus': int((projection['stockout_days'] > 0).sum()),
+                'excess_skus': int((projection['excess_days'] > 0).sum()),
+                'inbound_only_skus': int((sku_table['状态'] == '仅入库').sum()),
+                'outbound_only_skus': int((sku_table['状态'] == '仅出库').sum())
+            }
+            return {
+                'summary': summary,
+                'sku_table': sku_table,
+                'daily_table': StockReconciler.daily_table(flows, projection)
+            }
+
+        except Exception as e:
+            st.error(f"❌ 出入库对账计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_stock_chart(daily_table: pd.DataFrame):
+        """
+        渲染推算库存与缺货SKU数趋势图
+
+        Args:
+            daily_table: daily_table的结果
+        """
+        # 长期间保极值降采样（峰值缺货/积压日一定保留），超过阈值时使用WebGL渲染
+        dates = daily_table['日期']
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        plot_x, plot_y = ChartDownsampler.downsample_series(dates, daily_table['推算库存'])
+        fig.add_trace(ChartDownsampler.line_trace(len(daily_table), x=plot_x, y=plot_y, mode='lines', name='推算库存',
+                                                  line=dict(color='#1f77b4', width=2)), secondary_y=False)
+        for column, color in [('缺货SKU数', 'rgba(214,39,40,0.6)'), ('积压SKU数', 'rgba(255,127,14,0.4)')]:
+            plot_x, plot_y = ChartDownsampler.downsample_series(dates, daily_table[column])
+            fig.add_trace(go.Bar(x=plot_x, y=plot_y, name=column, marker_color=color), secondary_y=True)
+        fig.update_layout(title="推算库存与缺货/积压SKU数", height=450, hovermode='x unified', barmode='overlay')
+        fig.update_yaxes(title_text="推算库存", secondary_y=False)
+        fig.update_yaxes(title_text="SKU数", secondary_y=True)
+        st.plotly_chart(fig, use_container_width=True)
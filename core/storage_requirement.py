@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+存储需求模块 - 结合ABC分类和装箱结果，按ABC类别汇总不同存储策略下所需的容器数、容积和储位数
+ABC数量、库存、尺寸和最大装箱数都是按KeyIndex对齐的SKU数组，类别汇总直接bincount，不经过结果表合并
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, List, Optional
+from core.abc_analysis import ABCAnalyzer
+from core.packing_analysis import PackingAnalyzer
+from core.key_index import KeyIndex
+from config import PACKING_CONFIG, STORAGE_REQUIREMENT_CONFIG
+
+ABC_LABELS = ['A', 'B', 'C']
+
+class StorageRequirementAnalyzer:
+    """ABC × 装箱存储需求分析器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化存储需求分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def divided_container(container_info: Dict, dividers: int) -> Dict:
+        """
+        隔口容器的单个隔口规格（隔板沿容器长边等分，重量限制按隔口数均分）
+
+        Args:
+            container_info: 容器信息（length、width、height(mm)、weight_limit(kg)）
+            dividers: 隔口数
+
+        Returns:
+            dict: 单个隔口的容器信息
+        """
+        return {**container_info,
+                'length': container_info['length'] / dividers,
+                'weight_limit': container_info.get('weight_limit', 30) / dividers}
+
+    @staticmethod
+    def policy_containers(policy: str, classes: np.ndarray, volume: np.ndarray,
+                          weight: Optional[np.ndarray], dedicated: np.ndarray, container_info: Dict,
+                          compartments: Optional[np.ndarray] = None, dividers: int = 1) -> np.ndarray:
+        """
+        计算一种存储策略下每个ABC类别所需的容器数
+
+        Args:
+            policy: 'dedicated'（每个SKU独占容器）、'shared'（同类SKU按体积/重量混放）或 'divided'（每个SKU独占隔口）
+            classes: 每个SKU的类别编码
+            volume: 每个SKU的库存体积(mm³)
+            weight: 每个SKU的库存重量(kg)，为空时不考虑重量
+            dedicated: 每个SKU独占容器时的容器数
+            container_info: 容器信息
+            compartments: 每个SKU所需的隔口数（divided策略）
+            dividers: 每个容器的隔口数（divided策略）
+
+        Returns:
+            np.ndarray: 每个类别的容器数
+        """
+        n_classes = len(ABC_LABELS)
+        if policy == 'dedicated':
+            return np.bincount(classes, weights=dedicated, minlength=n_classes)
+        if policy == 'divided':
+            return np.ceil(np.bincount(classes, weights=compartments, minlength=n_classes) / dividers)
+
+        capacity = (container_info['length'] * container_info['width'] * container_info['height']
+                    * STORAGE_REQUIREMENT_CONFIG['shared_fill_rate'])
+        containers = np.bincount(classes, weights=volume, minlength=n_classes) / capacity
+        if weight is not None:
+            by_weight = np.bincount(classes, weights=weight, minlength=n_classes) / container_info.get('weight_limit', 30)
+            containers = np.maximum(containers, by_weight)
+        return np.ceil(containers)
+
+    def analyze(self, df: pd.DataFrame, sku_column: str, abc_quantity_column: str, columns: Dict[str, Optional[str]],
+                data_unit: str, container_info: Dict, location_info: Dict, a_percentage: float = 70,
+                b_percentage: float = 20, divider_counts: Optional[List[int]] = None, weight_unit: str = "kg") -> Dict:
+        """
+        执行ABC × 装箱存储需求分析
+
+        Args:
+            df: 库存数据（每行一个SKU或SKU的一个批次，同一SKU的ABC数量和库存累加，尺寸取首行）
+            sku_column: SKU列名
+            abc_quantity_column: ABC分类依据的数量列名
+            columns: 装箱列名映射 length、width、height、inventory，可选 weight
+            data_unit: 尺寸单位
+            container_info: 容器信息（length、width、height(mm)、weight_limit(kg)）
+            location_info: 储位尺寸（length、width、height(mm)）
+            a_percentage: A类累计百分比
+            b_percentage: B类累计百分比
+            divider_counts: 隔口策略的隔口数列表（大于1的值有效）
+            weight_unit: 重量单位
+
+        Returns:
+            dict: summary、class_table、sku_table，无有效数据时为空字典
+        """
+        try:
+            index = KeyIndex.for_frame(df, sku_column)
+            if index.n_keys == 0:
+                return {}
+
+            # 按SKU对齐的中间数组：ABC数量与类别、库存、尺寸、最大装箱数
+            abc_quantity = index.sum(df[abc_quantity_column])
+            classes = ABCAnalyzer.classify(abc_quantity, a_percentage, b_percentage)
+            inventory = np.floor(np.maximum(index.sum(df[columns['inventory']]), 0))
+            conversion = PACKING_CONFIG["unit_conversion"][data_unit]
+            length, width, height = (index.first_numeric(df[columns[name]]) * conversion
+                                     for name in ['length', 'width', 'height'])
+            unit_weight = None
+            if columns.get('weight'):
+                unit_weight = index.first_numeric(df[columns['weight']]) * PACKING_CONFIG["weight_conversion"][weight_unit]
+            max_per_box = PackingAnalyzer(container_info).max_per_box_batch(length, width, height, weight_kg=unit_weight)
+
+            # 只统计有库存且能装入容器的SKU
+            stored = (inventory > 0) & (max_per_box > 0)
+            if not stored.any():
+                return {}
+            classes_stored = classes[stored]
+            inventory_stored = inventory[stored]
+            volume = (length * width * height)[stored] * inventory_stored
+            weight = None
+            if unit_weight is not None:
+                weight = np.nan_to_num(unit_weight[stored], nan=0.0) * inventory_stored
+            dedicated = np.ceil(inventory_stored / max_per_box[stored])
+
+            policies = {'专用容器': {'policy': 'dedicated'}, '共享容器': {'policy': 'shared'}}
+            for dividers in sorted({int(count) for count in divider_counts or [] if int(count) > 1}):
+                compartment_capacity = PackingAnalyzer(
+                    StorageRequirementAnalyzer.divided_container(container_info, dividers)
+                ).max_per_box_batch(length, width, height, weight_kg=unit_weight)[stored]
+                # 装不进隔口的SKU占用整箱（全部隔口）
+                compartments = np.where(compartment_capacity > 0,
+                                        np.ceil(inventory_stored / np.maximum(compartment_capacity, 1)),
+                                        dedicated * dividers)
+                policies[f'{dividers}隔口专用'] = {'policy': 'divided', 'compartments': compartments, 'dividers': dividers}
+
+            # 每个储位可放的容器数（把容器当作货物装入储位）
+            containers_per_location = int(PackingAnalyzer(location_info).max_per_box_batch(
+                [container_info['length']], [container_info['width']], [container_info['height']])[0])
+
+            container_volume = container_info['length'] * container_info['width'] * container_info['height']
+            class_skus = np.bincount(classes_stored, minlength=len(ABC_LABELS))
+            class_inventory = np.bincount(classes_stored, weights=inventory_stored, minlength=len(ABC_LABELS))
+            class_volume = np.bincount(classes_stored, weights=volume, minlength=len(ABC_LABELS))
+            rows = []
+            for name, policy in policies.items():
+                containers = StorageRequirementAnalyzer.policy_containers(
+                    policy['policy'], classes_stored, volume, weight, dedicated, container_info,
+                    policy.get('compartments'), policy.get('dividers', 1))
+                locations = (np.ceil(containers / containers_per_location) if containers_per_location > 0
+                             else np.full(len(ABC_LABELS), np.nan))
+                for code, label in enumerate(ABC_LABELS + ['合计']):
+                    selected = slice(None) if label == '合计' else code
+                    class_containers = float(np.sum(containers[selected]))
+                    rows.append({
+                        '存储策略': name,
+                        'ABC分类': label,
+                        'SKU数': int(np.sum(class_skus[selected])),
+                        '库存件数': int(np.sum(class_inventory[selected])),
+                        '货物体积(m³)': np.sum(class_volume[selected]) / 1e9,
+                        '容器数': int(class_containers),
+                        '容器容积(m³)': class_containers * container_volume / 1e9,
+                        '容积利用率(%)': (np.sum(class_volume[selected]) / (class_containers * container_volume) * 100
+                                      if class_containers else 0.0),
+                        '储位数': np.sum(locations[selected])
+                    })
+            class_table = pd.DataFrame(rows)
+
+            sku_table = pd.DataFrame({
+                'SKU': index.keys,
+                'ABC分类': np.array(ABC_LABELS)[classes],
+                'ABC数量': abc_quantity,
+                '库存件数': inventory.astype(np.int64),
+                '最大装箱数': max_per_box,
+                '专用容器数': np.where(stored, np.ceil(inventory / np.maximum(max_per_box, 1)), 0).astype(np.int64),
+                '货物体积(m³)': np.nan_to_num(length * width * height * inventory / 1e9, nan=0.0)
+            })
+
+            summary = {
+                'sku_count': index.n_keys,
+                'stored_skus': int(stored.sum()),
+                'no_stock_skus': int((inventory <= 0).sum()),
+                'unfit_skus': int(((inventory > 0) & (max_per_box == 0)).sum()),
+                'containers_per_location': containers_per_location,
+                'policies': list(policies)
+            }
+            return {'summary': summary, 'class_table': class_table, 'sku_table': sku_table}
+
+        except Exception as e:
+            st.error(f"❌ 存储需求计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_policy_chart(class_table: pd.DataFrame):
+        """
+        渲染各存储策略下每个ABC类别所需的容器数
+
+        Args:
+            class_table: 类别 × 策略汇总表
+        """
+        fig = go.Figure()
+        colors = {'A': '#d62728', 'B': '#ff7f0e', 'C': '#2ca02c'}
+        classes = class_table[class_table['ABC分类'] != '合计']
+        for label, group in classes.groupby('ABC分类', sort=False):
+            fig.add_trace(go.Bar(x=group['存储策略'], y=group['容器数'], name=f'{label}类',
+                                 marker_color=colors.get(label)))
+        fig.update_layout(title="各存储策略所需容器数（按ABC分类）", xaxis_title="存储策略",
+                          yaxis_title="容器数", barmode='stack', height=420)
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+供应商表现模块 - 按供应商统计交期（下单/ASN日期到入库日期）、准时交货率、每次交货的行数/件数/箱数及交期波动，并综合排名
+入库日期复用有序日期索引（只解析排序一次），交期为向量化的日期差；供应商只编码一次，各指标按供应商编码一次bincount得到
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, Optional
+from core.date_index import SortedDateIndex, NS_PER_DAY
+from core.key_index import KeyIndex
+from config import SUPPLIER_CONFIG
+
+class SupplierPerformanceAnalyzer:
+    """供应商表现分析器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化供应商表现分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def to_days(values) -> np.ndarray:
+        """
+        把日期序列转换为自1970-01-01起的天数（无效日期为NaN）
+
+        Args:
+            values: 日期序列
+
+        Returns:
+            np.ndarray: float64天数
+        """
+        datetimes = pd.to_datetime(pd.Series(values), errors='coerce')
+        if getattr(datetimes.dt, 'tz', None) is not None:
+            datetimes = datetimes.dt.tz_localize(None)
+        nanoseconds = datetimes.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        return np.where(datetimes.isna().to_numpy(), np.nan, np.floor_divide(nanoseconds, NS_PER_DAY))
+
+    @staticmethod
+    def group_percentiles(codes: np.ndarray, values: np.ndarray, n_groups: int, percentiles) -> np.ndarray:
+        """
+        按分组计算整数值（如天数）的分位数：(分组, 值) 合成一个int64键一次排序，各组取最近秩位置
+
+        Args:
+            codes: 分组编码
+            values: 整数值
+            n_groups: 分组数
+            percentiles: 分位数列表(0-100)
+
+        Returns:
+            np.ndarray: n_groups × 分位数个数，无数据的分组为NaN
+        """
+        result = np.full((n_groups, len(percentiles)), np.nan)
+        if values.size == 0:
+            return result
+        offset = values.astype(np.int64) - int(values.min())
+        span = int(offset.max()) + 1
+        sorted_keys = np.sort(codes.astype(np.int64) * span + offset)
+        counts = np.bincount(codes, minlength=n_groups)
+        starts = np.cumsum(counts) - counts
+        has_values = counts > 0
+        for position, percentile in enumerate(percentiles):
+            rank = starts[has_values] + np.floor((counts[has_values] - 1) * percentile / 100).astype(np.int64)
+            result[has_values, position] = sorted_keys[rank] % span + values.min()
+        return result
+
+    def analyze(self, df: pd.DataFrame, supplier_column: str, receipt_date_column: str,
+                reference_date_column: Optional[str] = None, quantity_column: Optional[str] = None,
+                box_column: Optional[str] = None, delivery_column: Optional[str] = None,
+                on_time_days: float = None, start_date=None, end_date=None) -> Dict:
+        """
+        执行供应商表现分析
+
+        Args:
+            df: 入库明细（每行一个入库行）
+            supplier_column: 供应商列名
+            receipt_date_column: 入库日期列名
+            reference_date_column: 下单日期或ASN预计到货日期列名，为空时不计算交期
+            quantity_column: 件数列名，为空时每行计1件
+            box_column: 箱数列名，为空时不统计箱数
+            delivery_column: 入库单号/ASN单号列名，为空时同一供应商同一天的入库视为一次交货
+            on_time_days: 准时阈值（交期不超过该天数为准时；参考日期为ASN预计到货日时即允许延迟天数）
+            start_date: 开始日期（按入库日期过滤）
+            end_date: 结束日期
+
+        Returns:
+            dict: summary、supplier_table，无有效数据时为空字典
+        """
+        try:
+            if on_time_days is None:
+                on_time_days = SUPPLIER_CONFIG['default_on_time_days']
+
+            # 入库日期：有序日期索引切片，只取行位置，不复制整表
+            date_index = SortedDateIndex.for_frame(df, receipt_date_column)
+            lo, hi = (date_index.range_bounds(start_date, end_date) if start_date and end_date
+                      else (0, date_index.valid_count))
+            positions = date_index.positions[lo:hi]
+            receipt_days = np.floor_divide(date_index.sorted_values[lo:hi], NS_PER_DAY)
+
+            # 供应商编码对整个数据集只做一次（切换日期范围时复用），范围内没有入库的供应商随后剔除
+            supplier_index = KeyIndex.for_frame(df, supplier_column)
+            supplier_codes = supplier_index.codes[positions]
+            valid = supplier_codes >= 0
+            if not valid.any():
+                return {}
+            positions, receipt_days = positions[valid], receipt_days[valid]
+            active = np.zeros(supplier_index.n_keys, dtype=bool)
+            active[supplier_codes[valid]] = True
+            codes = (np.cumsum(active) - 1)[supplier_codes[valid]]
+            suppliers = supplier_index.keys[active]
+            n_suppliers = len(suppliers)
+
+            def column_values(column: Optional[str]) -> np.ndarray:
+                if not column:
+                    return np.ones(positions.size)
+                values = pd.to_numeric(df[column].iloc[positions], errors='coerce')
+                return np.nan_to_num(values.to_numpy(dtype=np.float64, na_value=np.nan), nan=0.0)
+
+            lines = np.bincount(codes, minlength=n_suppliers)
+            units = np.bincount(codes, weights=column_values(quantity_column), minlength=n_suppliers)
+
+            # 交货：(供应商, 入库日[, 入库单号]) 组合键编码一次
+            delivery_key = codes.astype(np.int64) * (int(receipt_days.max() - receipt_days.min()) + 1) \
+                + (receipt_days - receipt_days.min())
+            if delivery_column:
+                delivery_ids, delivery_values = pd.factorize(df[delivery_column].to_numpy()[positions],
+                                                             use_na_sentinel=True)
+                delivery_key = delivery_key * (len(delivery_values) + 1) + delivery_ids + 1
+            delivery_codes, delivery_keys = pd.factorize(delivery_key)
+            n_deliveries = len(delivery_keys)
+            delivery_suppliers = np.empty(n_deliveries, dtype=np.int64)
+            delivery_suppliers[delivery_codes] = codes
+            deliveries = np.bincount(delivery_suppliers, minlength=n_suppliers)
+
+            table = {
+                '供应商': np.asarray(suppliers),
+                '交货次数': deliveries,
+                '行数': lines,
+                '件数': units,
+                '每次交货行数': lines / np.maximum(deliveries, 1),
+                '每次交货件数': units / np.maximum(deliveries, 1)
+            }
+            if box_column:
+                boxes = np.bincount(codes, weights=column_values(box_column), minlength=n_suppliers)
+                table['箱数'] = boxes
+                table['每次交货箱数'] = boxes / np.maximum(deliveries, 1)
+
+            first_day = np.full(n_suppliers, np.iinfo(np.int64).max)
+            last_day = np.full(n_suppliers, np.iinfo(np.int64).min)
+            np.minimum.at(first_day, codes, receipt_days)
+            np.maximum.at(last_day, codes, receipt_days)
+            table['首次入库日期'] = (first_day * NS_PER_DAY).view('datetime64[ns]')
+            table['最近入库日期'] = (last_day * NS_PER_DAY).view('datetime64[ns]')
+
+            summary = {
+                'supplier_count': n_suppliers,
+                'line_count': int(codes.size),
+                'delivery_count': n_deliveries,
+                'lead_lines': 0,
+                'on_time_days': on_time_days
+            }
+
+            if reference_date_column:
+                # 交期（天）= 入库日期 - 参考日期，向量化日期差
+                lead = receipt_days - SupplierPerformanceAnalyzer.to_days(df[reference_date_column].to_numpy()[positions])
+                has_lead = ~np.isnan(lead)
+                lead_codes, lead_values = codes[has_lead], lead[has_lead]
+                lead_lines = np.bincount(lead_codes, minlength=n_suppliers)
+                lead_sum = np.bincount(lead_codes, weights=lead_values, minlength=n_suppliers)
+                lead_square = np.bincount(lead_codes, weights=lead_values ** 2, minlength=n_suppliers)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    mean = lead_sum / lead_lines
+                    std = np.sqrt(np.maximum(lead_square / lead_lines - mean ** 2, 0))
+                    cv = np.where(mean > 0, std / mean, np.nan)
+
+                # 交货准时：该次交货中所有有交期的行都不超过准时阈值
+                delivery_lead_lines = np.bincount(delivery_codes[has_lead], minlength=n_deliveries)
+                late = (lead_values > on_time_days).astype(np.float64)
+                delivery_late = np.bincount(delivery_codes[has_lead], weights=late, minlength=n_deliveries)
+                measured = delivery_lead_lines > 0
+                measured_deliveries = np.bincount(delivery_suppliers[measured], minlength=n_suppliers)
+                on_time = np.bincount(delivery_suppliers[measured & (delivery_late == 0)], minlength=n_suppliers)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    on_time_rate = on_time / measured_deliveries * 100
+
+                table['平均交期(天)'] = mean
+                table['交期标准差(天)'] = std
+                table['交期变异系数'] = cv
+                percentiles = SupplierPerformanceAnalyzer.group_percentiles(
+                    lead_codes, lead_values, n_suppliers, SUPPLIER_CONFIG['lead_percentiles'])
+                for position, percentile in enumerate(SUPPLIER_CONFIG['lead_percentiles']):
+                    table[f'交期P{percentile}(天)'] = percentiles[:, position]
+                table['准时交货率(%)'] = on_time_rate
+
+                summary.update({
+                    'lead_lines': int(has_lead.sum()),
+                    'mean_lead_days': float(lead_values.mean()) if lead_values.size else np.nan,
+                    'on_time_rate': float(on_time.sum() / max(measured_deliveries.sum(), 1) * 100)
+                })
+
+            supplier_table = pd.DataFrame(table)
+            if reference_date_column:
+                supplier_table = SupplierPerformanceAnalyzer.rank_suppliers(supplier_table)
+                summary['ranked_suppliers'] = int(supplier_table['排名'].notna().sum())
+            else:
+                supplier_table = supplier_table.sort_values('件数', ascending=False, kind='stable')
+            return {'summary': summary, 'supplier_table': supplier_table.reset_index(drop=True)}
+
+        except Exception as e:
+            st.error(f"❌ 供应商表现计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def rank_suppliers(supplier_table: pd.DataFrame) -> pd.DataFrame:
+        """
+        综合排名：准时交货率、平均交期、交期稳定性分别取百分位后加权（交货次数不足的供应商不参与排名）
+
+        Args:
+            supplier_table: 供应商指标表
+
+        Returns:
+            pd.DataFrame: 增加综合得分和排名列、按排名排序的供应商表
+        """
+        weights = SUPPLIER_CONFIG['score_weights']
+        eligible = ((supplier_table['交货次数'] >= SUPPLIER_CONFIG['min_deliveries'])
+                    & supplier_table['准时交货率(%)'].notna())
+        ranked = supplier_table[eligible]
+        score = (weights['准时交货率'] * ranked['准时交货率(%)'].rank(pct=True)
+                 + weights['平均交期'] * ranked['平均交期(天)'].rank(pct=True, ascending=False)
+                 + weights['交期稳定性'] * ranked['交期标准差(天)'].rank(pct=True, ascending=False))
+        score = score / sum(weights.values()) * 100
+        supplier_table = supplier_table.assign(综合得分=score)
+        supplier_table.insert(0, '排名', supplier_table['综合得分'].rank(ascending=False, method='min'))
+        return supplier_table.sort_values(['排名', '件数'], ascending=[True, False], na_position='last', kind='stable')
+
+    @staticmethod
+    def render_supplier_chart(supplier_table: pd.DataFrame):
+        """
+        渲染供应商平均交期与准时交货率散点图（点大小为件数，只显示件数最多的若干供应商）
+
+        Args:
+            supplier_table: 供应商指标表
+        """
+        top = supplier_table.nlargest(SUPPLIER_CONFIG['max_chart_suppliers'], '件数')
+        top = top[top['准时交货率(%)'].notna()]
+        size = np.sqrt(top['件数'] / max(top['件数'].max(), 1)) * 40 + 4
+        fig = go.Figure(go.Scatter(
+            x=top['平均交期(天)'], y=top['准时交货率(%)'], mode='markers', text=top['供应商'].astype(str),
+            marker={'size': size, 'color': top['交期标准差(天)'], 'colorscale': 'RdYlGn_r', 'showscale': True,
+                    'colorbar': {'title': '交期标准差'}},
+            hovertemplate='%{text}<br>平均交期 %{x:.1f} 天<br>准时交货率 %{y:.1f}%<extra></extra>'))
+        fig.update_layout(title="供应商交期与准时交货率（点大小为件数）", xaxis_title="平均交期(天)",
+                          yaxis_title="准时交货率(%)", height=460)
+        st.plotly_chart(fig, use_container_width=True)
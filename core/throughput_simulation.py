@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+吞吐仿真模块 - 由出库的日量和小时分布自助抽样生成大量仿真作业日，按工作站处理能力估算达到目标服务水平所需的工作站数
+日量与小时分布分别从历史作业日中抽样并叠加泊松波动，整块向量化生成；重复仿真按固定大小分块，
+每块使用SeedSequence派生的独立随机流并在进程池中执行，结果与进程数无关
+"""
+
+import os
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Dict, Optional
+from core.intraday_analysis import IntradayAnalyzer
+from config import THROUGHPUT_SIMULATION_CONFIG
+
+def _simulate_chunk(seed_sequence: np.random.SeedSequence, n_replications: int, daily_totals: np.ndarray,
+                    hourly_shares: np.ndarray, days_per_replication: int, capacity: float,
+                    backlog_hours: float, service_level: float) -> Dict[str, np.ndarray]:
+    """
+    执行一块重复仿真（模块级函数，供进程池调用）
+
+    Returns:
+        dict: stations（每次重复达到服务水平所需工作站数）、daily_histogram（仿真日所需工作站数的直方图）
+    """
+    rng = np.random.default_rng(seed_sequence)
+    n_days = n_replications * days_per_replication
+    volume_day = rng.integers(0, daily_totals.size, n_days)
+    profile_day = rng.integers(0, daily_totals.size, n_days)
+    load = rng.poisson(daily_totals[volume_day, None] * hourly_shares[profile_day]).astype(np.float64)
+
+    required = ThroughputSimulator.required_stations(load, capacity, backlog_hours)
+    required = required.reshape(n_replications, days_per_replication)
+    rank = max(int(np.ceil(service_level * days_per_replication)) - 1, 0)
+    return {
+        'stations': np.partition(required, rank, axis=1)[:, rank],
+        'daily_histogram': np.bincount(required.ravel())
+    }
+
+class ThroughputSimulator:
+    """工作站吞吐蒙特卡洛仿真器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化吞吐仿真器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def workload_profiles(hour_matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        由(天, 小时)作业量矩阵提取作业日的日量和小时分布
+
+        Args:
+            hour_matrix: (天, 24)作业量矩阵
+
+        Returns:
+            dict: daily_totals、hourly_shares（仅含有作业的天）、open_hours（每天有作业的小时数）
+        """
+        hour_matrix = np.asarray(hour_matrix, dtype=np.float64)
+        totals = hour_matrix.sum(axis=1)
+        operating = totals > 0
+        return {
+            'daily_totals': totals[operating],
+            'hourly_shares': hour_matrix[operating] / totals[operating, None],
+            'open_hours': (hour_matrix[operating] > 0).sum(axis=1)
+        }
+
+    @staticmethod
+    def required_stations(load: np.ndarray, capacity: float, backlog_hours: float = 0.0) -> np.ndarray:
+        """
+        每个仿真日所需的最少工作站数
+
+        不允许积压时为峰值小时作业量 / 单站小时能力；允许积压时，未完成作业顺延到下一小时，
+        要求每小时末积压不超过 backlog_hours 小时的总能力，按工作站数二分查找
+
+        Args:
+            load: (天, 24)小时作业量
+            capacity: 单站每小时处理量
+            backlog_hours: 允许积压的小时数
+
+        Returns:
+            np.ndarray: 每天所需工作站数（至少1）
+        """
+        high = np.maximum(np.ceil(load.max(axis=1) / capacity), 1).astype(np.int64)
+        if backlog_hours <= 0:
+            return high
+
+        low = np.ones_like(high)
+        active = np.flatnonzero(low < high)
+        while active.size:
+            middle = (low[active] + high[active]) // 2
+            hour_capacity = middle * capacity
+            backlog = np.zeros(active.size)
+            served = np.ones(active.size, dtype=bool)
+            for hour in range(load.shape[1]):
+                backlog = np.maximum(backlog + load[active, hour] - hour_capacity, 0)
+                served &= backlog <= backlog_hours * hour_capacity
+            high[active] = np.where(served, middle, high[active])
+            low[active] = np.where(served, low[active], middle + 1)
+            active = active[low[active] < high[active]]
+        return high
+
+    @staticmethod
+    def simulate(profiles: Dict[str, np.ndarray], capacity: float, service_level: float,
+                 replications: int, backlog_hours: float = 0.0, seed: Optional[int] = None,
+                 max_workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        执行蒙特卡洛重复仿真
+
+        Args:
+            profiles: workload_profiles的结果
+            capacity: 单站每小时处理量
+            service_level: 目标服务水平（满足当日作业的天数占比）
+            replications: 重复次数
+            backlog_hours: 允许积压的小时数
+            seed: 随机种子
+            max_workers: 进程数（1为当前进程内执行）
+
+        Returns:
+            dict: stations（每次重复所需工作站数）、daily_histogram（全部仿真日所需工作站数直方图）
+        """
+        chunk = THROUGHPUT_SIMULATION_CONFIG['chunk_replications']
+        sizes = [min(chunk, replications - start) for start in range(0, replications, chunk)]
+        seeds = np.random.SeedSequence(THROUGHPUT_SIMULATION_CONFIG['seed'] if seed is None else seed).spawn(len(sizes))
+        worker = partial(
+            _simulate_chunk,
+            daily_totals=profiles['daily_totals'], hourly_shares=profiles['hourly_shares'],
+            days_per_replication=THROUGHPUT_SIMULATION_CONFIG['days_per_replication'],
+            capacity=capacity, backlog_hours=backlog_hours, service_level=service_level
+        )
+
+        workers = min(max_workers or os.cpu_count() or 1, len(sizes))
+        parts = None
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    parts = list(pool.map(worker, seeds, sizes))
+            except (OSError, BrokenProcessPool):
+                parts = None
+        if parts is None:
+            parts = [worker(seed_sequence, size) for seed_sequence, size in zip(seeds, sizes)]
+
+        histogram = np.zeros(max(part['daily_histogram'].size for part in parts))
+        for part in parts:
+            histogram[:part['daily_histogram'].size] += part['daily_histogram']
+        return {
+            'stations': np.concatenate([part['stations'] for part in parts]),
+            'daily_histogram': histogram
+        }
+
+    def analyze(self, df: pd.DataFrame, datetime_column: str, quantity_column: Optional[str],
+                workload: str, picks_per_hour: float, hit_rate: float, service_level: float,
+                replications: int, backlog_hours: float = 0.0) -> Dict:
+        """
+        执行吞吐仿真
+
+        Args:
+            df: 出库明细
+            datetime_column: 日期时间列名
+            quantity_column: 件数列名（可选，作业量为件数时必选）
+            workload: 作业量口径（行数/件数）
+            picks_per_hour: 单站每小时拣选次数
+            hit_rate: 命中率（每次拣选完成的行数/件数）
+            service_level: 目标服务水平
+            replications: 重复次数
+            backlog_hours: 允许积压的小时数
+
+        Returns:
+            dict: summary、station_table、service_curve，无有效数据时为空字典
+        """
+        try:
+            matrices = IntradayAnalyzer.build_slot_matrices(df, datetime_column, None, quantity_column)
+            if not matrices or workload not in matrices['hour_metrics']:
+                return {}
+            profiles = ThroughputSimulator.workload_profiles(matrices['hour_metrics'][workload])
+            if profiles['daily_totals'].size == 0:
+                return {}
+
+            capacity = picks_per_hour * hit_rate
+            simulation = ThroughputSimulator.simulate(
+                profiles, capacity, service_level, replications, backlog_hours,
+                max_workers=self.config.get('max_workers', THROUGHPUT_SIMULATION_CONFIG['max_workers'])
+            )
+            stations = simulation['stations']
+            confidence = THROUGHPUT_SIMULATION_CONFIG['confidence']
+
+            # 按均值测算：日均作业量 / 日均作业小时 / 单站能力（忽略日间和小时间波动）
+            average_hourly = profiles['daily_totals'].mean() / profiles['open_hours'].mean()
+            historical_peak = ThroughputSimulator.required_stations(
+                profiles['daily_totals'][:, None] * profiles['hourly_shares'], capacity, backlog_hours
+            )
+
+            histogram = simulation['daily_histogram']
+            station_counts = np.arange(histogram.size)
+            service_curve = pd.DataFrame({
+                '工作站数': station_counts,
+                '满足天数占比(%)': np.cumsum(histogram) / histogram.sum() * 100
+            }).iloc[1:].reset_index(drop=True)
+
+            station_values, station_frequency = np.unique(stations, return_counts=True)
+            station_table = pd.DataFrame({
+                '所需工作站数': station_values,
+                '重复次数': station_frequency,
+                '占比(%)': station_frequency / stations.size * 100
+            })
+
+            summary = {
+                'operating_days': int(profiles['daily_totals'].size),
+                'workload': workload,
+                'capacity': capacity,
+                'service_level': service_level,
+                'replications': int(stations.size),
+                'simulated_days': int(histogram.sum()),
+                'average_stations': int(max(np.ceil(average_hourly / capacity), 1)),
+                'historical_stations': int(np.sort(historical_peak)[
+                    max(int(np.ceil(service_level * historical_peak.size)) - 1, 0)]),
+                'median_stations': int(np.ceil(np.median(stations))),
+                'confidence': confidence,
+                'recommended_stations': int(np.ceil(np.percentile(stations, confidence))),
+                'has_time': matrices['has_time']
+            }
+            return {'summary': summary, 'station_table': station_table, 'service_curve': service_curve}
+
+        except Exception as e:
+            st.error(f"❌ 吞吐仿真失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_service_curve(service_curve: pd.DataFrame, service_level: float, recommended: int):
+        """
+        渲染工作站数-服务水平曲线
+
+        Args:
+            service_curve: 各工作站数下满足当日作业的仿真日占比
+            service_level: 目标服务水平
+            recommended: 推荐工作站数
+        """
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=service_curve['工作站数'], y=service_curve['满足天数占比(%)'],
+                                 mode='lines+markers', name='满足天数占比', line=dict(color='#1f77b4', width=2)))
+        fig.add_hline(y=service_level * 100, line_dash="dash", line_color='#d62728',
+                      annotation_text=f"目标 {service_level * 100:g}%")
+        fig.add_vline(x=recommended, line_dash="dot", line_color='#2ca02c',
+                      annotation_text=f"推荐 {recommended} 站")
+        fig.update_layout(title="工作站数 vs 服务水平（全部仿真日）", xaxis_title="工作站数",
+                          yaxis_title="满足天数占比(%)", height=420)
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+时间序列聚合内核 - 出库/入库分析共享的按日聚合计算
+日期只转换一次为int32天编码，去重计数基于(天, 键)整数对排序去重
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Tuple, Optional
+
+# 天编码缺失值标记
+MISSING_DAY_CODE = np.iinfo(np.int32).min
+
+class TimeSeriesKernel:
+    """时间序列聚合内核"""
+
+    @staticmethod
+    def to_day_codes(date_series: pd.Series) -> np.ndarray:
+        """
+        将日期列转换为int32天编码（1970-01-01起的天数）
+
+        Args:
+            date_series: 日期序列（任意可被pd.to_datetime解析的格式）
+
+        Returns:
+            np.ndarray: int32天编码，无法解析的日期为MISSING_DAY_CODE
+        """
+        datetimes = pd.to_datetime(date_series, errors='coerce')
+        if getattr(datetimes.dt, 'tz', None) is not None:
+            datetimes = datetimes.dt.tz_localize(None)
+
+        values = datetimes.to_numpy(dtype='datetime64[ns]')
+        missing = np.isnat(values)
+        day_codes = values.astype('datetime64[D]').astype(np.int64)
+        day_codes[missing] = MISSING_DAY_CODE
+        return day_codes.astype(np.int32)
+
+    @staticmethod
+    def to_minute_codes(date_series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        将日期时间列转换为int64分钟编码（1970-01-01 00:00起的分钟数）
+        
+        Args:
+            date_series: 日期时间序列
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (有效行掩码, 有效行的分钟编码)
+        """
+        datetimes = pd.to_datetime(date_series, errors='coerce')
+        if getattr(datetimes.dt, 'tz', None) is not None:
+            datetimes = datetimes.dt.tz_localize(None)
+        
+        values = datetimes.to_numpy(dtype='datetime64[ns]')
+        valid_rows = ~np.isnat(values)
+        if not valid_rows.all():
+            values = values[valid_rows]
+        return valid_rows, values.astype('datetime64[m]').astype(np.int64)
+
+    @staticmethod
+    def day_codes_to_datetime(day_codes: np.ndarray) -> pd.DatetimeIndex:
+        """
+        将天编码转换回datetime（用于图表和结果展示）
+
+        Args:
+            day_codes: 天编码数组
+
+        Returns:
+            pd.DatetimeIndex: 日期索引
+        """
+        return pd.DatetimeIndex(np.asarray(day_codes, dtype=np.int64).astype('datetime64[D]'))
+
+    @staticmethod
+    def factorize_keys(key_series: pd.Series) -> Tuple[np.ndarray, int]:
+        """
+        将键列（订单号、SKU等）编码为整数
+
+        Args:
+            key_series: 键序列
+
+        Returns:
+            Tuple[np.ndarray, int]: (int64编码，缺失值为-1, 不同键的数量)
+        """
+        codes, uniques = pd.factorize(key_series, use_na_sentinel=True)
+        return codes.astype(np.int64, copy=False), len(uniques)
+
+    @staticmethod
+    def unique_group_key_pairs(group_idx: np.ndarray, key_codes: np.ndarray,
+                               n_keys: int) -> np.ndarray:
+        """
+        计算去重后的(分组, 键)整数对
+
+        Args:
+            group_idx: 每行的分组下标（非负整数）
+            key_codes: 每行的键编码（-1表示缺失，将被忽略）
+            n_keys: 键的数量
+
+        Returns:
+            np.ndarray: 排序去重后的组合编码（group * n_keys + key）
+        """
+        valid = key_codes >= 0
+        pairs = group_idx[valid].astype(np.int64) * max(n_keys, 1) + key_codes[valid]
+        if pairs.size == 0:
+            return pairs
+
+        pairs.sort()
+        keep = np.empty(pairs.size, dtype=bool)
+        keep[0] = True
+        np.not_equal(pairs[1:], pairs[:-1], out=keep[1:])
+        return pairs[keep]
+
+    @staticmethod
+    def count_distinct_by_group(group_idx: np.ndarray, key_codes: np.ndarray,
+                                n_keys: int, n_groups: int) -> np.ndarray:
+        """
+        按分组统计不同键的数量（排序去重计数，替代groupby nunique）
+
+        Args:
+            group_idx: 每行的分组下标
+            key_codes: 每行的键编码（-1表示缺失）
+            n_keys: 键的数量
+            n_groups: 分组数量
+
+        Returns:
+            np.ndarray: 每个分组的去重计数(int64)
+        """
+        unique_pairs = TimeSeriesKernel.unique_group_key_pairs(group_idx, key_codes, n_keys)
+        return np.bincount(unique_pairs // max(n_keys, 1), minlength=n_groups).astype(np.int64)
+
+    @staticmethod
+    def sum_by_group(group_idx: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+        """
+        按分组求和（缺失值按0处理）
+
+        Args:
+            group_idx: 每行的分组下标
+            values: 数值数组
+            n_groups: 分组数量
+
+        Returns:
+            np.ndarray: 每个分组的合计(float64)
+        """
+        weights = np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0)
+        return np.bincount(group_idx, weights=weights, minlength=n_groups)
+
+    @staticmethod
+    def to_numeric_values(series: pd.Series) -> Tuple[np.ndarray, bool]:
+        """
+        将数值列转换为float64数组，并判断结果是否应保持整数类型
+
+        Args:
+            series: 数值序列
+
+        Returns:
+            Tuple[np.ndarray, bool]: (float64数组, 是否为整数列)
+        """
+        numeric = pd.to_numeric(series, errors='coerce')
+        is_integer = pd.api.types.is_integer_dtype(numeric) or pd.api.types.is_bool_dtype(numeric)
+        return numeric.to_numpy(dtype=np.float64, na_value=np.nan), is_integer
+
+    @staticmethod
+    def prepare_day_index(date_series: pd.Series) -> Tuple[np.ndarray, np.ndarray, int, int]:
+        """
+        将日期列压缩为从首日开始的连续天下标
+
+        Args:
+            date_series: 日期序列
+
+        Returns:
+            Tuple: (有效行掩码, 有效行的天下标int64, 首日天编码, 日期跨度天数)
+        """
+        day_codes = TimeSeriesKernel.to_day_codes(date_series)
+        valid_rows = day_codes != MISSING_DAY_CODE
+
+        if not valid_rows.any():
+            return valid_rows, np.empty(0, dtype=np.int64), 0, 0
+
+        if not valid_rows.all():
+            day_codes = day_codes[valid_rows]
+
+        # 压缩为连续的天下标，bincount长度等于日期跨度
+        first_day = int(day_codes.min())
+        day_idx = (day_codes - first_day).astype(np.int64)
+        n_days = int(day_idx.max()) + 1
+        return valid_rows, day_idx, first_day, n_days
+
+    @staticmethod
+    def aggregate_daily(df: pd.DataFrame, date_column: str,
+                        metrics: Dict[str, Tuple[str, str]]) -> pd.DataFrame:
+        """
+        按日聚合多个指标（一次日期编码，所有指标共享）
+
+        Args:
+            df: 数据框
+            date_column: 日期列名
+            metrics: 指标字典 {结果列名: (源列名, 'nunique' 或 'sum')}
+
+        Returns:
+            pd.DataFrame: 按日期排序的日聚合表，第一列为日期(datetime)，仅包含有数据的日期
+        """
+        valid_rows, day_idx, first_day, n_days = TimeSeriesKernel.prepare_day_index(df[date_column])
+
+        if n_days == 0:
+            return pd.DataFrame(columns=[date_column] + list(metrics.keys()))
+
+        present_days = np.bincount(day_idx, minlength=n_days) > 0
+
+        result = {
+            date_column: TimeSeriesKernel.day_codes_to_datetime(
+                np.flatnonzero(present_days) + first_day
+            )
+        }
+
+        for target_name, (source_column, agg_func) in metrics.items():
+            source = df[source_column]
+            if not valid_rows.all():
+                source = source[valid_rows]
+
+            if agg_func == 'nunique':
+                key_codes, n_keys = TimeSeriesKernel.factorize_keys(source)
+                values = TimeSeriesKernel.count_distinct_by_group(day_idx, key_codes, n_keys, n_days)
+            elif agg_func == 'sum':
+                numeric, is_integer = TimeSeriesKernel.to_numeric_values(source)
+                values = TimeSeriesKernel.sum_by_group(day_idx, numeric, n_days)
+                if is_integer:
+                    values = np.rint(values).astype(np.int64)
+            else:
+                raise ValueError(f"不支持的聚合方式: {agg_func}")
+
+            result[target_name] = values[present_days]
+
+        return pd.DataFrame(result)
+
+    @staticmethod
+    def day_key_matrix(df: pd.DataFrame, date_column: str, key_column: Optional[str],
+                       value_column: Optional[str] = None) -> Dict:
+        """
+        构建日历连续的(天, 键)合计矩阵（如SKU日需求），日期跨度内无记录的日期记为0
+
+        Args:
+            df: 明细数据框
+            date_column: 日期列名
+            key_column: 键列名（SKU、品类等，为空时所有行合为一个序列"全部"）
+            value_column: 数值列名（为空时按明细行数计）
+
+        Returns:
+            dict: values(float32矩阵, 天×键)、keys、dates、active_days(当天有明细记录的布尔掩码)，
+                  无有效数据时为空字典
+        """
+        valid_rows, day_idx, first_day, n_days = TimeSeriesKernel.prepare_day_index(df[date_column])
+        if n_days == 0:
+            return {}
+
+        all_valid = valid_rows.all()
+        if key_column:
+            key_source = df[key_column] if all_valid else df[key_column][valid_rows]
+            key_codes, keys = pd.factorize(key_source, use_na_sentinel=True)
+        else:
+            key_codes, keys = np.zeros(day_idx.size, dtype=np.int64), np.array(["全部"], dtype=object)
+        n_keys = len(keys)
+        if n_keys == 0:
+            return {}
+
+        if value_column:
+            value_source = df[value_column] if all_valid else df[value_column][valid_rows]
+            numeric, _ = TimeSeriesKernel.to_numeric_values(value_source)
+            numeric = np.nan_to_num(numeric, nan=0.0)
+        else:
+            numeric = np.ones(day_idx.size, dtype=np.float64)
+
+        # 先对出现过的(天, 键)组合求和，再写入稠密矩阵，避免按全矩阵大小做bincount
+        has_key = key_codes >= 0
+        cells = day_idx[has_key] * n_keys + key_codes[has_key]
+        unique_cells, inverse = np.unique(cells, return_inverse=True)
+        sums = np.bincount(inverse, weights=numeric[has_key], minlength=unique_cells.size)
+
+        values = np.zeros(n_days * n_keys, dtype=np.float32)
+        values[unique_cells] = sums
+        return {
+            'values': values.reshape(n_days, n_keys),
+            'keys': pd.Index(keys),
+            'dates': TimeSeriesKernel.day_codes_to_datetime(np.arange(n_days) + first_day),
+            'active_days': np.bincount(day_idx, minlength=n_days) > 0
+        }
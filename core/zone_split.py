@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+分区拆单模块 - 评估多分区拣选方案下订单涉及的分区数分布和合流工作量
+订单×SKU稀疏矩阵只构建一次；每个分区方案只需一次与SKU→分区指示矩阵的稀疏乘法，
+订单×分区关联矩阵每行的非零元个数即订单涉及的分区数
+"""
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Dict, List, Optional, Tuple
+from core.abc_analysis import ABCAnalyzer
+from core.order_sku_matrix import OrderSkuMatrix
+from config import ZONE_SPLIT_CONFIG
+
+class ZoneSplitAnalyzer:
+    """分区拆单分析器"""
+
+    def __init__(self, config: Dict):
+        """
+        初始化分区拆单分析器
+
+        Args:
+            config: 分析配置参数
+        """
+        self.config = config
+
+    @staticmethod
+    def abc_zones(sku_lines: np.ndarray, a_percentage: float, b_percentage: float) -> Tuple[np.ndarray, List[str]]:
+        """
+        按拣选行数累计占比把SKU分为A/B/C三区（与ABC分析的划分规则一致）
+
+        Args:
+            sku_lines: 每个SKU编码的拣选行数
+            a_percentage: A类累计百分比
+            b_percentage: B类累计百分比
+
+        Returns:
+            tuple: (每个SKU编码的分区编码, 分区名称)
+        """
+        zones = ABCAnalyzer.classify(sku_lines, a_percentage, b_percentage)
+        return zones, ['A', 'B', 'C']
+
+    @staticmethod
+    def balanced_zones(skus: pd.Index, sku_lines: np.ndarray, n_zones: int) -> Tuple[np.ndarray, List[str]]:
+        """
+        按SKU编码顺序连续切分为拣选行数大致相等的若干分区
+
+        Args:
+            skus: SKU值（与SKU编码对应）
+            sku_lines: 每个SKU编码的拣选行数
+            n_zones: 分区数
+
+        Returns:
+            tuple: (每个SKU编码的分区编码, 分区名称)
+        """
+        order = np.argsort(np.asarray(skus.astype(str)), kind='stable')
+        before = np.cumsum(sku_lines[order]) - sku_lines[order]
+        zones = np.empty(sku_lines.size, dtype=np.int64)
+        zones[order] = np.minimum(before * n_zones // max(sku_lines.sum(), 1), n_zones - 1)
+        return zones, [f'{code}区' for code in range(1, n_zones + 1)]
+
+    @staticmethod
+    def attribute_zones(df: pd.DataFrame, sku_column: str, zone_column: str,
+                        skus: pd.Index) -> Tuple[np.ndarray, List[str]]:
+        """
+        按明细中的分区字段划分SKU（同一SKU取第一个非空值，无值的SKU归入未分区）
+
+        Args:
+            df: 订单明细数据框
+            sku_column: SKU列名
+            zone_column: 分区字段列名
+            skus: SKU值（与SKU编码对应）
+
+        Returns:
+            tuple: (每个SKU编码的分区编码, 分区名称)
+        """
+        first = df[[sku_column, zone_column]].dropna().drop_duplicates(sku_column)
+        position = pd.Index(first[sku_column]).get_indexer(skus)
+        zone_codes, labels = pd.factorize(first[zone_column])
+        labels = [str(label) for label in labels]
+        zones = np.where(position >= 0, zone_codes[position], len(labels))
+        if (position < 0).any():
+            labels.append(ZONE_SPLIT_CONFIG['unassigned_label'])
+        return zones.astype(np.int64), labels
+
+    @staticmethod
+    def split_profile(matrix: OrderSkuMatrix, sku_zones: np.ndarray, n_zones: int) -> Dict[str, np.ndarray]:
+        """
+        计算一个分区方案下每个订单涉及的分区数和各分区的作业量
+
+        Args:
+            matrix: 订单×SKU矩阵
+            sku_zones: 每个SKU编码的分区编码
+            n_zones: 分区数
+
+        Returns:
+            dict: zones_per_order（每个订单涉及分区数，无有效拣选行为0）、zone_lines、zone_orders、zone_split_orders
+        """
+        incidence = matrix.group_incidence(sku_zones, n_zones)
+        zones_per_order = np.diff(incidence.indptr)
+        split_entries = np.repeat(zones_per_order > 1, zones_per_order)
+        return {
+            'zones_per_order': zones_per_order,
+            'zone_lines': np.bincount(incidence.indices, weights=incidence.data, minlength=n_zones).astype(np.int64),
+            'zone_orders': np.bincount(incidence.indices, minlength=n_zones),
+            'zone_split_orders': np.bincount(incidence.indices[split_entries], minlength=n_zones)
+        }
+
+    def analyze(self, df: pd.DataFrame, order_column: str, sku_column: str, zone_columns: List[str],
+                zone_counts: List[int], abc_percentages: Optional[Tuple[float, float]] = None) -> Dict:
+        """
+        执行分区拆单分析（依次评估ABC分区、字段分区和按拣选行数均分的分区方案）
+
+        Args:
+            df: 出库订单明细（每行一个拣选行）
+            order_column: 订单号列名
+            sku_column: SKU列名
+            zone_columns: 作为分区依据的字段列名列表
+            zone_counts: 按拣选行数均分的分区数列表
+            abc_percentages: ABC分区的(A类, B类)累计百分比，None表示不评估ABC分区
+
+        Returns:
+            dict: summary、zoning_table、distribution_table、zone_table，无有效数据时为空字典
+        """
+        try:
+            matrix = OrderSkuMatrix.for_frame(df, order_column, sku_column)
+            if matrix.line_count == 0:
+                return {}
+
+            zonings = {}
+            if abc_percentages is not None:
+                zonings['ABC分区'] = ZoneSplitAnalyzer.abc_zones(matrix.sku_lines, *abc_percentages)
+            for column in zone_columns:
+                zonings[f'按{column}'] = ZoneSplitAnalyzer.attribute_zones(df, sku_column, column, matrix.skus)
+            for count in sorted(set(zone_counts)):
+                zonings[f'均分{count}区'] = ZoneSplitAnalyzer.balanced_zones(matrix.skus, matrix.sku_lines, count)
+            if not zonings:
+                return {}
+
+            rows, distribution_rows, zone_rows = [], [], []
+            for name, (sku_zones, labels) in zonings.items():
+                profile = ZoneSplitAnalyzer.split_profile(matrix, sku_zones, len(labels))
+                zones_per_order = profile['zones_per_order']
+                distribution = np.bincount(zones_per_order, minlength=2)
+                order_count = int(zones_per_order.size - distribution[0])
+                sub_orders = int(zones_per_order.sum())
+                split_orders = order_count - int(distribution[1])
+                rows.append({
+                    '分区方案': name,
+                    '分区数': len(labels),
+                    '单区订单占比(%)': distribution[1] / order_count * 100,
+                    '拆单率(%)': split_orders / order_count * 100,
+                    '平均每单分区数': sub_orders / order_count,
+                    '最多分区数': int(zones_per_order.max()),
+                    '子订单数': sub_orders,
+                    '需合流子订单数': sub_orders - int(distribution[1]),
+                    '新增子订单数': sub_orders - order_count,
+                    '最大分区拣选行占比(%)': profile['zone_lines'].max() / matrix.line_count * 100
+                })
+                cumulative = 0
+                for zone_count in range(1, distribution.size):
+                    if distribution[zone_count] == 0:
+                        continue
+                    cumulative += distribution[zone_count]
+                    distribution_rows.append({
+                        '分区方案': name,
+                        '涉及分区数': zone_count,
+                        '订单数': int(distribution[zone_count]),
+                        '订单占比(%)': distribution[zone_count] / order_count * 100,
+                        '累计占比(%)': cumulative / order_count * 100
+                    })
+                sku_counts = np.bincount(sku_zones, minlength=len(labels))
+                for code, label in enumerate(labels):
+                    zone_orders = int(profile['zone_orders'][code])
+                    zone_rows.append({
+                        '分区方案': name,
+                        '分区': label,
+                        'SKU数': int(sku_counts[code]),
+                        '拣选行数': int(profile['zone_lines'][code]),
+                        '拣选行占比(%)': profile['zone_lines'][code] / matrix.line_count * 100,
+                        '订单数': zone_orders,
+                        '跨区订单数': int(profile['zone_split_orders'][code]),
+                        '跨区订单占比(%)': profile['zone_split_orders'][code] / zone_orders * 100 if zone_orders else 0.0
+                    })
+
+            summary = {
+                'order_count': int((np.diff(matrix.matrix.indptr) > 0).sum()),
+                'line_count': matrix.line_count,
+                'sku_count': matrix.n_skus,
+                'zoning_count': len(zonings)
+            }
+            return {
+                'summary': summary,
+                'zoning_table': pd.DataFrame(rows),
+                'distribution_table': pd.DataFrame(distribution_rows),
+                'zone_table': pd.DataFrame(zone_rows)
+            }
+
+        except Exception as e:
+            st.error(f"❌ 分区拆单计算失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def render_distribution_chart(distribution_table: pd.DataFrame):
+        """
+        渲染各分区方案下订单涉及分区数的占比（堆叠条形，超过上限的分区数合并显示）
+
+        Args:
+            distribution_table: 涉及分区数分布表
+        """
+        max_zones = ZONE_SPLIT_CONFIG['max_chart_zones']
+        buckets = distribution_table.assign(
+            分组=np.minimum(distribution_table['涉及分区数'], max_zones))
+        shares = buckets.pivot_table(index='分区方案', columns='分组', values='订单占比(%)',
+                                     aggfunc='sum', sort=False).fillna(0)
+        fig = go.Figure()
+        for zone_count in shares.columns:
+            label = f'{zone_count}+区' if zone_count == max_zones else f'{zone_count}区'
+            fig.add_trace(go.Bar(y=shares.index, x=shares[zone_count], name=label, orientation='h'))
+        fig.update_layout(title="订单涉及分区数占比（按分区方案）", xaxis_title="订单占比(%)",
+                          barmode='stack', height=max(320, 40 * len(shares) + 120),
+                          yaxis={'autorange': 'reversed'})
+        st.plotly_chart(fig, use_container_width=True)
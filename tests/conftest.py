@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共夹具
+"""
+
+import sys
+import os
+import pytest
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.helpers import run_dimension
+
+@pytest.fixture
+def run_engine():
+    """执行分析维度并返回结果的函数（见tests.helpers.run_dimension）"""
+    return run_dimension
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+测试辅助函数
+run_dimension：打桩streamlit后执行分析引擎的一个分析维度，需要时从模拟的同一文件中加载其他工作表，
+断言执行成功且没有报错，返回该维度的分析结果
+"""
+
+import sys
+import os
+from contextlib import ExitStack
+from unittest.mock import patch, MagicMock
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def run_dimension(engine, dimension, config, modules=(), sheets=None, current_sheet=None):
+    """
+    执行分析维度（pytest中通过run_engine夹具获取，各测试文件的__main__直接调用）
+
+    Args:
+        engine: AnalysisEngine实例
+        dimension: 分析维度名称
+        config: 配置参数
+        modules: 需要打桩streamlit的分析模块（如'core.safety_stock'）
+        sheets: 同一文件中其他工作表 {工作表名: 数据框}，为空时不模拟上传文件
+        current_sheet: 当前工作表名称
+
+    Returns:
+        dict: engine.analysis_results[dimension]
+    """
+    with ExitStack() as stack:
+        mock_st = stack.enter_context(patch('core.analysis_engine.st'))
+        mock_st.columns.side_effect = lambda n: [MagicMock() for _ in range(n)]
+        for module in modules:
+            stack.enter_context(patch(f'{module}.st'))
+        if sheets is not None:
+            mock_st.session_state = {'selected_sheet': current_sheet, 'uploaded_file': MagicMock()}
+            stack.enter_context(patch('core.analysis_engine.DataUtils.load_excel_data',
+                                      side_effect=lambda uploaded_file, sheet_name: sheets[sheet_name]))
+        assert engine.execute_analysis_dimension(dimension, config)
+        mock_st.error.assert_not_called()
+    return engine.analysis_results[dimension]
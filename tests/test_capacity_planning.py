@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+容量规划测试
+验证分位数设计日、联合设计日取真实日期、场景批量计算结果，以及设计日隐含比值取自统计摘要的EIQ比值定义
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import patch, MagicMock
+from core.capacity_planning import CapacityPlanner
+from core.analysis_engine import AnalysisEngine
+
+def make_daily(n_days=200, seed=3):
+    """生成订单/行/件相关的日聚合数据"""
+    rng = np.random.default_rng(seed)
+    orders = rng.integers(200, 1000, n_days)
+    lines = (orders * rng.uniform(1.5, 2.5, n_days)).astype(np.int64)
+    pieces = lines * rng.uniform(2.0, 4.0, n_days)
+    return pd.DataFrame({
+        '日期': pd.date_range('2024-01-01', periods=n_days, freq='D'),
+        '订单数/天': orders,
+        'SKU数/天': lines,
+        '件数/天': pieces
+    })
+
+def summary_ratios(daily):
+    """按出库统计摘要计算EIQ比值（容量规划的比值定义来源）"""
+    summary = {col: {'daily_avg_no_outliers': daily[col].mean()} for col in CapacityPlanner.metric_columns(daily)}
+    with patch('core.analysis_engine.st') as mock_st:
+        mock_st.columns.side_effect = lambda n: [MagicMock() for _ in range(n)]
+        return AnalysisEngine(daily)._add_eiq_ratios_to_summary(summary)
+
+def test_design_days_match_quantiles():
+    """测试设计日与pandas分位数一致"""
+    daily = make_daily()
+    metrics = CapacityPlanner.metric_columns(daily)
+    assert metrics == ['订单数/天', 'SKU数/天', '件数/天']
+
+    table = CapacityPlanner.design_days(daily, metrics)
+    assert table.index.tolist() == ['P50', 'P80', 'P95', 'P99']
+    for col in metrics:
+        for p in [50, 80, 95, 99]:
+            assert np.isclose(table.loc[f'P{p}', col], daily[col].quantile(p / 100))
+
+def test_joint_design_day_is_real_day():
+    """测试联合设计日取自真实日期，比例与当天一致"""
+    daily = make_daily()
+    metrics = CapacityPlanner.metric_columns(daily)
+    joint = CapacityPlanner.joint_design_day(daily, '日期', metrics, 95)
+
+    row = daily.loc[daily['日期'] == joint['date']].iloc[0]
+    assert np.allclose(joint['values'].to_numpy(), row[metrics].to_numpy(dtype=float))
+
+    # 负荷指数高于约95%的日期
+    targets = daily[metrics].quantile(0.95)
+    loads = (daily[metrics] / targets).mean(axis=1)
+    assert np.isclose(joint['load_index'], loads[row.name])
+    assert (loads <= joint['load_index']).mean() >= 0.95
+
+def test_scenarios_evaluated_in_one_batch():
+    """测试50个默认场景一次计算，结果等于乘数 × 基准值"""
+    daily = make_daily()
+    plan = CapacityPlanner.plan(daily, '日期', eiq_ratios=summary_ratios(daily))
+    scenarios = plan['scenarios']
+    assert len(scenarios) == 50
+
+    results = plan['scenario_results']
+    assert len(results) == 50 * len(plan['base_table'])
+    row = results[(results['业务增长(%)'] == 20) & (results['峰值系数'] == 1.3) & (results['设计日'] == 'P95')].iloc[0]
+    for col in plan['metrics']:
+        assert row[col] == np.ceil(plan['base_table'].loc['P95', col] * 1.2 * 1.3)
+
+    # 联合设计日的隐含比值与真实日期一致
+    joint_label = f"联合P{plan['joint_design_day']['percentile']:g}"
+    values = plan['joint_design_day']['values']
+    assert np.isclose(plan['ratios'].loc[joint_label, '件单比'], round(values['件数/天'] / values['订单数/天'], 2))
+
+def test_missing_metrics():
+    """测试入库数据（无订单列）只规划可用指标"""
+    daily = make_daily().drop(columns=['订单数/天'])
+    plan = CapacityPlanner.plan(daily, '日期', eiq_ratios=summary_ratios(daily))
+    assert plan['metrics'] == ['SKU数/天', '件数/天']
+    assert plan['ratios'].columns.tolist() == ['件行比']
+    assert CapacityPlanner.plan(daily, '日期')['ratios'].columns.empty
+    assert CapacityPlanner.plan(daily[['日期']], '日期') == {}
+
+if __name__ == "__main__":
+    test_design_days_match_quantiles()
+    test_joint_design_day_is_real_day()
+    test_scenarios_evaluated_in_one_batch()
+    test_missing_metrics()
+    print("🎉 容量规划测试通过")
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+图表降采样测试
+验证降采样保留峰谷和标注日期、输出点数受控，以及大数据量趋势图、预测图、分解图和对账图切换WebGL渲染
+"""
+
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+import sys
+import os
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chart_downsampling import ChartDownsampler
+from core.outbound_analysis import OutboundAnalyzer
+from core.demand_forecast import DemandForecaster
+from core.seasonality import SeasonalDecomposer
+from core.stock_reconciliation import StockReconciler
+from config import CHART_CONFIG
+
+def make_daily(n_days=20000, seed=6):
+    """生成带尖峰的日聚合数据"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('1970-01-01', periods=n_days, freq='D')
+    orders = rng.normal(1000, 50, n_days)
+    orders[12345] = 5000  # 单日尖峰
+    orders[777] = 10      # 单日低谷
+    return pd.DataFrame({'日期': dates, '订单数/天': orders, '件数/天': orders * 3})
+
+def test_lttb_and_minmax_sizes():
+    """测试LTTB和最大最小值降采样的输出点数与首尾点"""
+    daily = make_daily()
+    x = daily['日期'].to_numpy().astype('datetime64[ns]').astype(np.int64)
+    y = daily['订单数/天'].to_numpy()
+
+    lttb = ChartDownsampler.lttb_indices(x, y, 500)
+    assert len(lttb) == 500 and lttb[0] == 0 and lttb[-1] == len(y) - 1
+    assert (np.diff(lttb) > 0).all()
+    # 尖峰在三角形面积上最突出，LTTB自然会选中
+    assert 12345 in lttb
+
+    minmax = ChartDownsampler.minmax_indices(y, 500)
+    assert len(minmax) <= 502
+    assert 12345 in minmax and 777 in minmax
+
+    # 数据量未超阈值时原样返回
+    assert len(ChartDownsampler.select_indices(x[:100], y[:100])) == 100
+
+def test_extremes_and_keep_dates_retained():
+    """测试全局最高/最低点和指定日期一定保留"""
+    daily = make_daily()
+    x = daily['日期'].to_numpy().astype('datetime64[ns]')
+    y = daily['订单数/天'].to_numpy()
+    keep = ChartDownsampler.positions_of(x, [daily['日期'].iloc[4321], None, pd.Timestamp('2300-01-01')])
+    assert keep.tolist() == [4321]
+
+    for method in ['lttb', 'minmax']:
+        indices = ChartDownsampler.select_indices(x, y, max_points=300, keep=keep, method=method)
+        assert {12345, 777, 4321} <= set(indices.tolist())
+        assert len(indices) <= 305
+
+    plot_x, plot_y = ChartDownsampler.downsample_series(daily['日期'], y, [daily['日期'].iloc[9]])
+    assert len(plot_x) <= CHART_CONFIG['max_points'] + 3
+    assert plot_y.max() == 5000 and plot_y.min() == 10
+    assert pd.Timestamp(daily['日期'].iloc[9]).to_datetime64() in plot_x
+
+def test_trace_type():
+    """测试超过阈值使用Scattergl，并去掉WebGL不支持的平滑参数"""
+    small = ChartDownsampler.line_trace(10, x=[1, 2], y=[1, 2], line=dict(shape='spline', color='red'))
+    large = ChartDownsampler.line_trace(CHART_CONFIG['webgl_threshold'] + 1, x=[1, 2], y=[1, 2],
+                                        line=dict(shape='spline', color='red'))
+    assert isinstance(small, go.Scatter) and small.line.shape == 'spline'
+    assert isinstance(large, go.Scattergl) and large.line.color == 'red'
+
+def test_trend_chart_downsamples():
+    """测试趋势图不再随机采样：绘制点数受控且保留峰谷"""
+    daily = make_daily()
+    analyzer = OutboundAnalyzer({})
+    summary = analyzer.generate_summary_statistics(daily, '日期')
+
+    with patch('core.outbound_analysis.st') as mock_st, \
+         patch.object(pd.DataFrame, 'sample', side_effect=AssertionError('不应随机采样')):
+        analyzer.render_trend_chart(daily, '日期', summary)
+        mock_st.error.assert_not_called()
+        fig = mock_st.plotly_chart.call_args[0][0]
+
+    assert len(fig.data) == 2
+    for trace in fig.data:
+        assert isinstance(trace, go.Scattergl)
+        assert len(trace.x) <= CHART_CONFIG['max_points'] + 3
+        assert max(trace.y) == daily[trace.name].max()
+        assert min(trace.y) == daily[trace.name].min()
+    mock_st.info.assert_called_once()
+
+def test_series_charts_downsample():
+    """测试预测图、季节性分解图和对账图对长序列保极值降采样"""
+    daily = make_daily()
+    dates, values = daily['日期'], daily['订单数/天'].to_numpy()
+    limit = CHART_CONFIG['max_points'] + 3
+
+    def rendered(module, render, *args):
+        with patch(f'{module}.st') as mock_st:
+            render(*args)
+            return mock_st.plotly_chart.call_args[0][0]
+
+    fig = rendered('core.demand_forecast', DemandForecaster.render_forecast_chart,
+                   {'dates': pd.DatetimeIndex(dates)}, values, np.full(14, 1000.0), '预测')
+    history = fig.data[0]
+    assert isinstance(history, go.Scattergl) and len(history.x) <= limit
+    assert max(history.y) == 5000 and min(history.y) == 10
+    assert len(fig.data[1].x) == 14
+
+    fig = rendered('core.seasonality', SeasonalDecomposer.render_decomposition_chart,
+                   values, pd.DatetimeIndex(dates), '分解')
+    assert all(len(trace.x) <= limit for trace in fig.data)
+    assert max(fig.data[0].y) == 5000
+
+    daily_table = pd.DataFrame({'日期': dates, '推算库存': values, '缺货SKU数': np.arange(len(dates)) % 7,
+                                '积压SKU数': np.zeros(len(dates))})
+    fig = rendered('core.stock_reconciliation', StockReconciler.render_stock_chart, daily_table)
+    assert all(len(trace.x) <= limit for trace in fig.data)
+    assert isinstance(fig.data[0], go.Scattergl) and min(fig.data[0].y) == 10
+    assert max(fig.data[1].y) == 6
+
+if __name__ == "__main__":
+    test_lttb_and_minmax_sizes()
+    test_extremes_and_keep_dates_retained()
+    test_trace_type()
+    test_trend_chart_downsamples()
+    test_series_charts_downsample()
+    print("🎉 图表降采样测试通过")
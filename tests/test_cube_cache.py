@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+日聚合缓存测试
+验证立方体序列化、日期切片，以及出入库分析器命中缓存后不再扫描原始数据
+"""
+
+import pandas as pd
+import numpy as np
+import tempfile
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.daily_cube import DailyCube
+from core.outbound_analysis import OutboundAnalyzer
+from core.inbound_analysis import InboundAnalyzer
+from utils.cube_cache import CubeCache
+
+METRICS = {
+    '订单数/天': ('订单号', 'nunique'),
+    'SKU数/天': ('SKU', 'nunique'),
+    '件数/天': ('件数', 'sum')
+}
+
+def make_lines(n_rows=6000, seed=21):
+    """生成出库明细"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '出库时间': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 90 * 24, n_rows), unit='h'),
+        '订单号': [f'SO{i:05d}' for i in rng.integers(0, 3000, n_rows)],
+        'SKU': [f'SKU{i:04d}' for i in rng.integers(0, 400, n_rows)],
+        '件数': rng.integers(1, 9, n_rows)
+    })
+
+def test_slice_matches_filtered_build():
+    """测试立方体切片与先过滤再聚合结果一致"""
+    df = make_lines()
+    cube = DailyCube.build(df, '出库时间', METRICS)
+    start, end = pd.Timestamp('2024-02-03').date(), pd.Timestamp('2024-03-10').date()
+
+    sliced = cube.slice(start, end)
+    dates = df['出库时间'].dt.date
+    expected = DailyCube.build(df[(dates >= start) & (dates <= end)], '出库时间', METRICS)
+
+    for granularity in ['daily', 'weekly', 'monthly']:
+        a = sliced.rollup(granularity, '出库时间')
+        b = expected.rollup(granularity, '出库时间')
+        assert a.equals(b), granularity
+
+    # 超出数据范围的切片为空
+    assert cube.slice('2030-01-01', '2030-02-01').to_frame('出库时间').empty
+
+def test_arrays_roundtrip_on_disk():
+    """测试立方体写入磁盘后恢复一致（精确与近似模式）"""
+    df = make_lines(n_rows=2000)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CubeCache(cache_dir, memory_entries=1)
+        for mode in ['exact', 'approximate']:
+            cube = DailyCube.build(df, '出库时间', METRICS, distinct_mode=mode, hll_precision=10)
+            cache.save(mode, cube.to_arrays())
+        cache._memory.clear()
+
+        for mode in ['exact', 'approximate']:
+            restored = DailyCube.from_arrays(cache.load(mode))
+            original = DailyCube.build(df, '出库时间', METRICS, distinct_mode=mode, hll_precision=10)
+            assert restored.rollup('monthly', '出库时间').equals(original.rollup('monthly', '出库时间')), mode
+
+        assert cache.load('missing') is None
+
+def test_disk_entries_evict_least_recently_used():
+    """测试磁盘缓存超过上限时删除最久未使用的文件，命中的文件保留"""
+    arrays = {'values': np.arange(3)}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CubeCache(cache_dir, memory_entries=1, disk_entries=2)
+        for position, key in enumerate(['a', 'b']):
+            cache.save(key, arrays)
+            os.utime(cache._path(key), (position, position))
+        cache._memory.clear()
+        assert cache.load('a') is not None  # 刷新a的使用时间
+        cache.save('c', arrays)
+        assert sorted(os.listdir(cache_dir)) == ['a.npz', 'c.npz']
+
+        cache.clear()
+        assert os.listdir(cache_dir) == []
+
+def test_cache_key_changes_with_mapping_and_content():
+    """测试缓存键随列映射和数据内容变化"""
+    df = make_lines(n_rows=500)
+    fingerprint = CubeCache.frame_fingerprint(df, ['出库时间', '订单号'])
+    key = CubeCache.make_key(fingerprint, {'order_id_column': '订单号'})
+
+    assert key == CubeCache.make_key(CubeCache.frame_fingerprint(df.copy(), ['出库时间', '订单号']), {'order_id_column': '订单号'})
+    assert key != CubeCache.make_key(fingerprint, {'order_id_column': 'SKU'})
+
+    changed = df.copy()
+    changed.loc[0, '订单号'] = 'SO99999'
+    assert fingerprint != CubeCache.frame_fingerprint(changed, ['出库时间', '订单号'])
+
+def test_analyzers_reuse_cached_cube():
+    """测试第二次分析（调整日期范围）命中缓存，不再重新聚合原始行"""
+    df = make_lines()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        CubeCache._memory.clear()
+
+        outbound = OutboundAnalyzer({})
+        outbound.cube_cache = CubeCache(cache_dir)
+        full_daily, _ = outbound.analyze_batch_enhanced(
+            df, '出库时间', order_id_column='订单号', sku_column='SKU', item_column='件数'
+        )
+
+        def fail(*args, **kwargs):
+            raise AssertionError("命中缓存时不应重新聚合")
+
+        second = OutboundAnalyzer({})
+        second.cube_cache = CubeCache(cache_dir)
+        second.aggregate_daily_data_enhanced = fail
+        daily, summary = second.analyze_batch_enhanced(
+            df, '出库时间', order_id_column='订单号', sku_column='SKU', item_column='件数',
+            start_date='2024-02-01', end_date='2024-02-29'
+        )
+        assert len(daily) == 29
+        expected = full_daily[(full_daily['出库时间'] >= '2024-02-01') & (full_daily['出库时间'] <= '2024-02-29')]
+        assert (daily['件数/天'].to_numpy() == expected['件数/天'].to_numpy()).all()
+        assert summary['件数/天']['total'] == expected['件数/天'].sum()
+
+        # 入库分析使用独立的缓存键
+        inbound = InboundAnalyzer({})
+        inbound.cube_cache = CubeCache(cache_dir)
+        inbound_daily, _ = inbound.analyze_batch_enhanced(df, '出库时间', sku_column='SKU', quantity_column='件数')
+        assert list(inbound_daily.columns) == ['出库时间', 'SKU数/天', '件数/天']
+        assert len(os.listdir(cache_dir)) == 2
+
+if __name__ == "__main__":
+    test_slice_matches_filtered_build()
+    test_arrays_roundtrip_on_disk()
+    test_disk_entries_evict_least_recently_used()
+    test_cache_key_changes_with_mapping_and_content()
+    test_analyzers_reuse_cached_cube()
+    print("🎉 日聚合缓存测试通过")
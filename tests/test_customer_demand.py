@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+客户需求测试
+验证按日客户单元切片得到的客户订单数、行数、件数和下单天数与groupby参考实现一致，
+近似Top-N模式的估计值落在误差范围内，以及集中度指标和分析引擎集成
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+from datetime import date
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.customer_demand import CustomerDemandAnalyzer, CustomerDemandCube
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+def make_lines(n=30000, n_customers=3000, seed=49):
+    """生成出库明细（客户需求长尾分布，含空客户和无效日期）"""
+    rng = np.random.default_rng(seed)
+    customer = (rng.zipf(1.6, n) - 1) % n_customers
+    order = rng.integers(0, n // 3, n)
+    df = pd.DataFrame({
+        '客户': [f'C{code:04d}' for code in customer],
+        '出库日期': (pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 120 * 24, n), unit='h')).astype(object),
+        '订单号': [f'O{code}' for code in order],
+        '件数': rng.integers(1, 20, n)
+    })
+    df.loc[:9, '客户'] = None
+    df.loc[10:19, '出库日期'] = 'bad'
+    return df
+
+def valid_lines(df, start=None, end=None):
+    """参考实现使用的有效明细（可按日期范围过滤）"""
+    data = df.assign(出库日期=pd.to_datetime(df['出库日期'], errors='coerce')).dropna(subset=['客户', '出库日期'])
+    data['出库日'] = data['出库日期'].dt.normalize()
+    if start is not None:
+        data = data[(data['出库日'] >= pd.Timestamp(start)) & (data['出库日'] <= pd.Timestamp(end))]
+    return data
+
+def test_exact_matches_groupby():
+    """测试精确模式各客户指标与groupby参考实现一致（订单计入其最早拣选行的客户）"""
+    df = make_lines()
+    with patch('core.customer_demand.st'):
+        results = CustomerDemandAnalyzer({}).analyze(df, '出库日期', '客户', '订单号', '件数')
+    table = results['customer_table'].set_index('客户')
+    data = valid_lines(df)
+    grouped = data.groupby('客户')
+    first_rows = data.sort_values('出库日期', kind='stable').drop_duplicates('订单号')
+    expected = pd.DataFrame({
+        '行数': grouped.size(),
+        '件数': grouped['件数'].sum(),
+        '下单天数': grouped['出库日'].nunique(),
+        '首次下单日期': grouped['出库日'].min(),
+        '最近下单日期': grouped['出库日'].max(),
+        '订单数': first_rows.groupby('客户').size()
+    }).fillna({'订单数': 0}).loc[table.index]
+    for column in expected.columns:
+        assert np.array_equal(table[column].to_numpy(), expected[column].to_numpy()), column
+    summary = results['summary']
+    assert summary['customer_count'] == data['客户'].nunique()
+    assert summary['line_count'] == len(data)
+    assert summary['order_count'] == data['订单号'].nunique()
+    assert table['件数'].is_monotonic_decreasing
+    assert np.isclose(table['累计占比(%)'].iloc[-1], 100)
+    assert results['class_table']['客户数'].sum() == summary['customer_count']
+
+def test_date_range_slices_cube():
+    """测试切换日期范围复用同一个需求单元，结果与过滤后的参考实现一致"""
+    df = make_lines()
+    with patch('core.customer_demand.st'):
+        analyzer = CustomerDemandAnalyzer({})
+        analyzer.analyze(df, '出库日期', '客户', quantity_column='件数')
+        cube = CustomerDemandCube.for_frame(df, '出库日期', '客户', None, '件数')
+        results = analyzer.analyze(df, '出库日期', '客户', quantity_column='件数',
+                                   start_date=date(2024, 2, 1), end_date=date(2024, 2, 29))
+    assert CustomerDemandCube.for_frame(df, '出库日期', '客户', None, '件数') is cube
+    data = valid_lines(df, '2024-02-01', '2024-02-29')
+    table = results['customer_table'].set_index('客户')
+    expected = data.groupby('客户')['件数'].sum().loc[table.index]
+    assert np.array_equal(table['件数'].to_numpy(), expected.to_numpy())
+    assert results['summary']['day_count'] == 29
+    assert results['summary']['order_count'] is None
+    assert '订单数' not in table
+    assert table['最近下单日期'].max() <= pd.Timestamp('2024-02-29')
+
+def test_approximate_top_n_within_bound():
+    """测试近似Top-N的估计值不高于真实值、不低于真实值减误差上限，且头部客户与精确结果一致"""
+    df = make_lines(n=60000, n_customers=50000)
+    with patch('core.customer_demand.st'):
+        analyzer = CustomerDemandAnalyzer({})
+        exact = analyzer.analyze(df, '出库日期', '客户', '订单号', '件数', date(2024, 1, 15), date(2024, 3, 15))
+        approx = analyzer.analyze(df, '出库日期', '客户', '订单号', '件数', date(2024, 1, 15), date(2024, 3, 15),
+                                  mode='approximate', top_n=10)
+    truth = exact['customer_table'].set_index('客户')['件数']
+    table = approx['customer_table']
+    actual = truth.reindex(table['客户']).fillna(0).to_numpy()
+    assert (table['估计件数(下限)'].to_numpy() <= actual + 1e-9).all()
+    assert (table['件数上限'].to_numpy() >= actual - 1e-9).all()
+    assert list(table['客户'].head(5)) == list(truth.index[:5])
+    assert approx['summary']['total_units'] == exact['summary']['total_units']
+    assert len(table) == 10
+
+def test_approximate_bounds_per_customer():
+    """测试近似模式保留的件数不扣减，件数上限只累加客户未被保留日期的阈值"""
+    # 每天保留前2个客户：第1天丢弃C(5)，第2天不丢弃，第3天丢弃A(2)
+    df = pd.DataFrame({
+        '客户': ['A', 'B', 'C', 'C', 'A', 'B', 'C', 'A'],
+        '出库日期': pd.to_datetime(['2024-01-01'] * 3 + ['2024-01-02'] * 2 + ['2024-01-03'] * 3),
+        '件数': [10, 8, 5, 9, 1, 7, 6, 2]
+    })
+    with patch('core.customer_demand.st'), patch.dict('core.customer_demand.CUSTOMER_DEMAND_CONFIG', {'counter_factor': 1}):
+        results = CustomerDemandAnalyzer({}).analyze(df, '出库日期', '客户', None, '件数', mode='approximate', top_n=2)
+    # 真实件数 A=13、B=15、C=20；估计值相同时按客户首次出现的顺序排列
+    table = results['customer_table'].set_index('客户')
+    assert table['估计件数(下限)'].to_dict() == {'B': 15, 'C': 15}
+    assert table['件数上限'].to_dict() == {'B': 15, 'C': 20}
+    assert results['summary']['tracked_customers'] == 3
+    assert results['summary']['error_bound'] == 7
+    assert results['summary']['total_units'] == 48
+
+def test_concentration():
+    """测试集中度：均匀分布基尼系数为0，单一客户占满时接近1"""
+    uniform = CustomerDemandAnalyzer.concentration(np.full(100, 5.0), 500.0)
+    assert abs(uniform['gini']) < 1e-9
+    assert np.isclose(uniform['top_shares'][20], 20)
+    skewed = CustomerDemandAnalyzer.concentration(np.array([1000.0] + [0.0] * 99), 1000.0)
+    assert skewed['gini'] > 0.98
+    assert skewed['top_shares'][1] == 100
+
+def test_engine_customer_demand(run_engine):
+    """测试分析引擎在出库分析中输出客户需求（未选择客户列时跳过）"""
+    df = make_lines()
+    engine = AnalysisEngine(df)
+    config = {'出库分析_date_column': '出库日期', '出库分析_order_id_column': '订单号',
+              '出库分析_item_column': '件数', '出库分析_customer_column': '客户',
+              '出库分析_customer_mode': 'exact'}
+    results = run_engine(engine, "出库分析", config, ['core.outbound_analysis', 'core.customer_demand'])["customer_demand"]
+    assert engine._render_customer_demand({'出库分析_customer_column': '无数据'}, '出库日期', None, None) == {}
+    assert results['summary']['customer_count'] == valid_lines(df)['客户'].nunique()
+
+if __name__ == "__main__":
+    test_exact_matches_groupby()
+    test_date_range_slices_cube()
+    test_approximate_top_n_within_bound()
+    test_approximate_bounds_per_customer()
+    test_concentration()
+    test_engine_customer_demand(run_dimension)
+    print("🎉 客户需求测试通过")
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+日聚合立方体测试
+验证周/月/季度上卷结果与直接按周期groupby一致
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.daily_cube import DailyCube
+from core.outbound_analysis import OutboundAnalyzer
+
+METRICS = {
+    '订单数/天': ('订单号', 'nunique'),
+    'SKU数/天': ('SKU', 'nunique'),
+    '件数/天': ('件数', 'sum')
+}
+
+PERIOD_FREQ = {'weekly': 'W-MON', 'monthly': 'M', 'quarterly': 'Q'}
+
+def make_lines(n_rows=6000, seed=11):
+    """生成跨季度、带空白日期的出库明细"""
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 200, n_rows)
+    days = days[(days % 9) != 3]  # 制造无数据的日期
+    n = len(days)
+    return pd.DataFrame({
+        '出库时间': pd.Timestamp('2024-01-03') + pd.to_timedelta(days, unit='D')
+                    + pd.to_timedelta(rng.integers(0, 86400, n), unit='s'),
+        '订单号': [f'SO{i:05d}' for i in rng.integers(0, 3000, n)],
+        'SKU': [f'SKU{i:04d}' for i in rng.integers(0, 200, n)],
+        '件数': rng.integers(1, 10, n)
+    })
+
+def reference_rollup(df, granularity):
+    """直接按周期分组的参考结果"""
+    if granularity == 'weekly':
+        keys = df['出库时间'].dt.to_period('W-SUN').dt.start_time
+    else:
+        keys = df['出库时间'].dt.to_period(PERIOD_FREQ[granularity][0]).dt.start_time
+    grouped = df.groupby(keys)
+    return pd.DataFrame({
+        name: grouped[col].agg(func) for name, (col, func) in METRICS.items()
+    }).sort_index()
+
+def test_daily_frame():
+    """测试日粒度输出与原结果格式一致"""
+    df = make_lines()
+    cube = DailyCube.build(df, '出库时间', METRICS)
+    daily = cube.to_frame('出库时间')
+    expected = df.groupby(df['出库时间'].dt.normalize())['SKU'].nunique()
+
+    assert list(daily.columns) == ['出库时间', '订单数/天', 'SKU数/天', '件数/天']
+    assert len(daily) == len(expected)
+    assert (daily['SKU数/天'].to_numpy() == expected.to_numpy()).all()
+    assert daily['件数/天'].dtype == np.int64
+
+def test_rollups_match_groupby():
+    """测试周/月/季度上卷与直接分组一致（去重计数跨天重新去重）"""
+    df = make_lines()
+    cube = DailyCube.build(df, '出库时间', METRICS)
+
+    for granularity in ['weekly', 'monthly', 'quarterly']:
+        rollup = cube.rollup(granularity, '出库时间')
+        expected = reference_rollup(df, granularity)
+
+        assert len(rollup) == len(expected), granularity
+        assert (rollup['出库时间'].to_numpy() == expected.index.to_numpy()).all(), granularity
+        for name in METRICS:
+            assert (rollup[name].to_numpy() == expected[name].to_numpy()).all(), (granularity, name)
+
+        # 各周期有效天数之和等于有数据的天数
+        assert rollup['有效天数'].sum() == df['出库时间'].dt.normalize().nunique()
+        print(f"✅ {granularity} 上卷一致：{len(rollup)} 个周期")
+
+def test_period_labels():
+    """测试周期标签"""
+    df = pd.DataFrame({
+        '出库时间': pd.to_datetime(['2024-12-30', '2025-01-05', '2025-01-06']),
+        '订单号': ['A', 'A', 'B'],
+        'SKU': ['X', 'Y', 'X'],
+        '件数': [1, 2, 3]
+    })
+    cube = DailyCube.build(df, '出库时间', METRICS)
+
+    weekly = cube.rollup('weekly', '出库时间')
+    assert weekly['周期'].tolist() == ['2025-W01', '2025-W02']
+    assert weekly['订单数/天'].tolist() == [1, 1]
+    assert weekly['SKU数/天'].tolist() == [2, 1]
+
+    quarterly = cube.rollup('quarterly', '出库时间')
+    assert quarterly['周期'].tolist() == ['2024Q4', '2025Q1']
+    assert quarterly['件数/天'].tolist() == [1, 5]
+
+def test_analyzer_keeps_cube():
+    """测试分析器保留最近一次构建的立方体"""
+    df = make_lines(n_rows=500)
+    analyzer = OutboundAnalyzer({})
+    daily = analyzer.aggregate_daily_data_enhanced(
+        df, '出库时间', order_id_column='订单号', sku_column='SKU', item_column='件数'
+    )
+    assert analyzer.daily_cube is not None
+    rollups = analyzer.daily_cube.rollup_all('出库时间')
+    assert set(rollups) == {'daily', 'weekly', 'monthly', 'quarterly'}
+    assert rollups['monthly']['件数/天'].sum() == daily['件数/天'].sum()
+
+if __name__ == "__main__":
+    test_daily_frame()
+    test_rollups_match_groupby()
+    test_period_labels()
+    test_analyzer_keeps_cube()
+    print("🎉 日聚合立方体测试通过")
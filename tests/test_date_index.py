@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+有序日期索引测试
+验证二分范围过滤与逐行掩码过滤一致，且不修改原数据
+"""
+
+import gc
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.date_index import SortedDateIndex
+from core.outbound_analysis import OutboundAnalyzer
+from core.inbound_analysis import InboundAnalyzer
+
+def make_lines(n_rows=5000, seed=9):
+    """生成日期为字符串、含无效值的乱序明细"""
+    rng = np.random.default_rng(seed)
+    stamps = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 60 * 86400, n_rows), unit='s')
+    dates = stamps.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object)
+    dates[5::97] = '无效日期'
+    return pd.DataFrame({'日期': dates, '件数': rng.integers(1, 10, n_rows)})
+
+def test_slice_matches_mask():
+    """测试切片结果与原掩码过滤一致（含首尾两天）"""
+    df = make_lines()
+    index = SortedDateIndex.for_frame(df, '日期')
+
+    parsed = pd.to_datetime(df['日期'], errors='coerce')
+    for start, end in [('2024-01-10', '2024-01-20'), ('2023-12-01', '2024-01-01'), ('2024-02-29', '2024-02-29')]:
+        sliced = index.slice(start, end)
+        dates = parsed.dt.date
+        mask = (dates >= pd.Timestamp(start).date()) & (dates <= pd.Timestamp(end).date())
+        assert len(sliced) == mask.sum() == index.count_in_range(start, end)
+        assert sliced['件数'].sum() == df.loc[mask, '件数'].sum()
+        assert sliced['日期'].is_monotonic_increasing
+
+    assert index.valid_count == parsed.notna().sum()
+    assert index.min_date == parsed.min().date()
+    assert index.max_date == parsed.max().date()
+    assert index.slice('2025-01-01', '2025-12-31').empty
+
+def test_index_is_shared_and_released():
+    """测试同一数据框共享索引，数据框回收后索引释放"""
+    df = make_lines(n_rows=300)
+    first = SortedDateIndex.for_frame(df, '日期')
+    assert SortedDateIndex.for_frame(df, '日期') is first
+    assert SortedDateIndex.for_frame(df.copy(), '日期') is not first
+
+    key = (id(df), '日期')
+    del df, first
+    gc.collect()
+    assert key not in SortedDateIndex._registry
+
+def test_filter_date_range_does_not_mutate():
+    """测试出入库分析器的日期过滤不再修改传入的数据框"""
+    df = make_lines(n_rows=1000)
+    original_dtype = df['日期'].dtype
+
+    for analyzer in [OutboundAnalyzer({}), InboundAnalyzer({})]:
+        filtered = analyzer.filter_date_range(df, '日期', '2024-01-05', '2024-01-25')
+        assert df['日期'].dtype == original_dtype
+        assert pd.api.types.is_datetime64_any_dtype(filtered['日期'])
+        assert filtered['日期'].min() >= pd.Timestamp('2024-01-05')
+        assert filtered['日期'].max() < pd.Timestamp('2024-01-26')
+
+if __name__ == "__main__":
+    test_slice_matches_mask()
+    test_index_is_shared_and_released()
+    test_filter_date_range_does_not_mutate()
+    print("🎉 有序日期索引测试通过")
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+需求预测测试
+验证需求矩阵构建、向量化递推与逐SKU标量递推一致，以及模型选择和分块拟合
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.demand_forecast import DemandForecaster
+from config import DEMAND_FORECAST_CONFIG
+
+def make_lines(n_rows=20000, n_skus=300, n_days=120, seed=4):
+    """生成带周季节性的出库明细"""
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, n_days, n_rows)
+    # 周末需求翻倍
+    weekend = (pd.Timestamp('2024-01-01') + pd.to_timedelta(days, unit='D')).dayofweek >= 5
+    quantity = rng.integers(1, 5, n_rows) * np.where(weekend, 2, 1)
+    return pd.DataFrame({
+        '日期': pd.Timestamp('2024-01-01') + pd.to_timedelta(days, unit='D'),
+        'SKU': rng.choice([f'S{i:03d}' for i in range(n_skus)], n_rows),
+        '件数': quantity
+    })
+
+def scalar_ses(series, alpha):
+    """单序列简单指数平滑（参考实现）"""
+    level = series[0]
+    for value in series[1:]:
+        level = level + alpha * (value - level)
+    return level
+
+def scalar_seasonal(series, alpha, gamma, m):
+    """单序列加法季节性指数平滑（参考实现）"""
+    level = series[:m].mean()
+    season = list(series[:m] - level)
+    for t in range(m, len(series)):
+        s = season[t % m]
+        new_level = alpha * (series[t] - s) + (1 - alpha) * level
+        season[t % m] = gamma * (series[t] - new_level) + (1 - gamma) * s
+        level = new_level
+    return level, np.array(season)
+
+def test_demand_matrix():
+    """测试需求矩阵与groupby结果一致，缺失日期补0"""
+    df = make_lines()
+    matrices = DemandForecaster.build_demand_matrix(df, '日期', 'SKU', '件数')
+    expected = df.pivot_table(index='日期', columns='SKU', values='件数', aggfunc='sum', fill_value=0)
+    expected = expected.reindex(matrices['dates'], fill_value=0)[list(matrices['skus'])]
+    assert np.allclose(matrices['demand'], expected.to_numpy())
+
+    # 不选件数列时按行数计需求
+    rows = DemandForecaster.build_demand_matrix(df, '日期', 'SKU')
+    assert rows['demand'].sum() == len(df)
+
+def test_recurrences_match_scalar():
+    """测试向量化递推与标量递推一致"""
+    demand = DemandForecaster.build_demand_matrix(make_lines(), '日期', 'SKU', '件数')['demand']
+    n_days = demand.shape[0]
+
+    ses = DemandForecaster.fit_ses(demand, [0.3], n_days)
+    seasonal = DemandForecaster.fit_seasonal(demand, [0.3], [0.2], 7, n_days)
+    for sku in [0, 17, 150]:
+        series = demand[:, sku].astype(np.float64)
+        assert np.isclose(ses['level'][sku], scalar_ses(series, 0.3))
+        level, season = scalar_seasonal(series, 0.3, 0.2, 7)
+        assert np.isclose(seasonal['level'][sku], level)
+        assert np.allclose(seasonal['season'][:, sku], season)
+
+def test_blocked_fit_matches_full():
+    """测试按SKU分块拟合与整矩阵拟合结果一致"""
+    demand = DemandForecaster.build_demand_matrix(make_lines(n_skus=500), '日期', 'SKU', '件数')['demand']
+    original = DEMAND_FORECAST_CONFIG['sku_block_size']
+    DEMAND_FORECAST_CONFIG['sku_block_size'] = 64
+    try:
+        blocked = DemandForecaster.fit_in_blocks(DemandForecaster.fit_seasonal, demand, [0.1, 0.5], [0.05, 0.2], 7, 100)
+    finally:
+        DEMAND_FORECAST_CONFIG['sku_block_size'] = original
+    full = DemandForecaster.fit_seasonal(demand, [0.1, 0.5], [0.05, 0.2], 7, 100)
+    for key in full:
+        assert np.allclose(blocked[key], full[key])
+
+def test_analyze_outputs():
+    """测试预测输出、误差指标与季节性模型的选用"""
+    forecaster = DemandForecaster({})
+    results = forecaster.analyze(make_lines(), '日期', 'SKU', '件数', horizon=14)
+    result = results['result']
+
+    assert result['models'] == ['ses', 'seasonal_es', 'seasonal_naive']
+    assert result['final_forecast'].shape == (14, 300)
+    assert (result['final_forecast'] >= 0).all()
+    assert results['forecast'].shape == (300, 15)
+    assert results['model_comparison']['选中SKU数'].sum() == 300
+    assert results['sku_table']['历史总量'].is_monotonic_decreasing
+    assert len(results['sku_statistics']) == 300
+    assert results['sku_statistics']['总量'].is_monotonic_decreasing
+
+    # 纯周季节性序列：季节性模型误差最小
+    days = np.arange(70)
+    pattern = np.array([5, 5, 5, 5, 5, 20, 20], dtype=np.float32)
+    seasonal_demand = np.tile(pattern, 10)[:, None].repeat(3, axis=1)
+    seasonal_result = forecaster.forecast_matrix(seasonal_demand, 7)
+    assert (np.array(seasonal_result['models'])[seasonal_result['best_model']] != 'ses').all()
+    phases = (days[-1] + 1 + np.arange(7)) % 7
+    assert np.allclose(seasonal_result['final_forecast'][:, 0], pattern[phases], atol=0.5)
+
+def test_short_history():
+    """测试历史不足两个周期时仅使用非季节性平滑和季节性朴素模型"""
+    df = make_lines(n_days=12)
+    results = DemandForecaster({}).analyze(df, '日期', 'SKU', '件数', horizon=7)
+    assert results['result']['models'] == ['ses', 'seasonal_naive']
+
+if __name__ == "__main__":
+    test_demand_matrix()
+    test_recurrences_match_scalar()
+    test_blocked_fit_matches_full()
+    test_analyze_outputs()
+    test_short_history()
+    print("🎉 需求预测测试通过")
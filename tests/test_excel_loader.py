@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Excel流式加载测试
+验证单次流式读取的结果与pd.read_excel一致（类型推断、pandas默认及配置的缺失值字符串、以文本存储的数字、全空列、
+空表头/重复表头、末尾空行），进度按dimension元数据中的总行数单调回报，以及后台加载函数只解析一次工作簿
+"""
+
+import io
+import pandas as pd
+import numpy as np
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.excel_loader import ExcelStreamLoader
+from utils.utils import DataUtils
+from config import EXCEL_LOADER_CONFIG
+
+def make_workbook(n=3000, seed=50):
+    """生成测试工作簿字节（含日期、整数、带缺失值的数值、NULL字符串和混合类型列）"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        '日期': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 1000, n), unit='h'),
+        'SKU': [f'S{code}' for code in rng.integers(0, 200, n)],
+        '数量': rng.integers(1, 50, n),
+        '重量': rng.random(n).round(3),
+        '备注': ['NULL' if value < 0.3 else 'ok' for value in rng.random(n)],
+        '混合': [1 if value < 0.5 else 'x' for value in rng.random(n)]
+    })
+    df['体积'] = rng.integers(1, 9, n).astype(float)
+    df.loc[7, '体积'] = np.nan
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False, sheet_name='明细')
+    return buffer.getvalue()
+
+def test_matches_read_excel():
+    """测试流式读取结果与pd.read_excel一致"""
+    content = make_workbook()
+    expected = pd.read_excel(io.BytesIO(content), sheet_name='明细', na_values=EXCEL_LOADER_CONFIG['na_values'])
+    result = ExcelStreamLoader.load(io.BytesIO(content), '明细', chunk_rows=500)
+    assert list(result.columns) == list(expected.columns)
+    for column in expected.columns:
+        assert result[column].dtype == expected[column].dtype, column
+        assert result[column].equals(expected[column]), column
+    assert result['备注'].isna().sum() > 0
+    assert result['数量'].dtype == np.int64
+
+def test_na_strings_and_numeric_text_match_read_excel():
+    """测试pandas默认缺失值字符串、以文本存储的数字和全空列的类型与pd.read_excel一致"""
+    import openpyxl
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = '表'
+    sheet.append(['SKU', '文本数字', '文本整数', '全空', '混合', '缺失数值', '带空格', '布尔', '整数值浮点'])
+    rows = [
+        ['None', '123', '1', None, '12', 'N/A', ' 7 ', True, 1.0],
+        ['A1', '456', '2', None, 'x', '3', None, False, 2.0],
+        ['NaN', '0012', '3', None, '1.5', '4.5', '8', 'TRUE', 3.0],
+        ['<NA>', '1e3', '4', None, None, '#NA', '9', None, 4.0],
+        ['#NA', '7', '5', None, '5', 'NA', '1', True, 5.0]
+    ]
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    content = buffer.getvalue()
+
+    expected = pd.read_excel(io.BytesIO(content), sheet_name='表', na_values=EXCEL_LOADER_CONFIG['na_values'])
+    result = ExcelStreamLoader.load(content, '表')
+    for column in expected.columns:
+        assert result[column].dtype == expected[column].dtype, column
+        assert result[column].equals(expected[column]), column
+    assert result['SKU'].isna().sum() == 4
+    assert result['文本整数'].dtype == np.int64
+    assert result['全空'].dtype == np.float64
+
+def test_progress_uses_sheet_dimension():
+    """测试进度按元数据总行数单调递增并以1结束，文件指针复位"""
+    content = make_workbook()
+    source = io.BytesIO(content)
+    progress = []
+    ExcelStreamLoader.load(source, '明细', lambda fraction, text: progress.append((fraction, text)), chunk_rows=1000)
+    fractions = [fraction for fraction, _ in progress]
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == 1.0
+    assert progress[0][1] == "已读取 1,000 / 3,000 行"
+    assert source.tell() == 0
+
+    import openpyxl
+    workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True)
+    assert ExcelStreamLoader.sheet_dimensions(workbook['明细']) == (3000, 7)
+    workbook.close()
+
+def test_headers_and_trailing_rows():
+    """测试空表头、重复表头、比表头宽的数据行和末尾空行与pd.read_excel一致"""
+    import openpyxl
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = '表'
+    sheet.append(['a', None, 'a', 'b'])
+    sheet.append([1, 2, 3, 'n/a'])
+    sheet.append([4, None, 6, 'y', 'extra'])
+    sheet.append([None, None, None, None])
+    sheet.cell(row=8, column=2).number_format = '0.00'  # 只有格式的空单元格
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    content = buffer.getvalue()
+
+    expected = pd.read_excel(io.BytesIO(content), sheet_name='表', na_values=EXCEL_LOADER_CONFIG['na_values'])
+    result = ExcelStreamLoader.load(content, '表')
+    assert list(result.columns) == list(expected.columns) == ['a', 'Unnamed: 1', 'a.1', 'b', 'Unnamed: 4']
+    assert len(result) == len(expected) == 2
+    for column in expected.columns:
+        assert result[column].equals(expected[column]), column
+
+def test_background_loader_parses_once():
+    """测试后台加载只解析一次工作簿并回报真实进度"""
+    content = make_workbook()
+    uploaded = io.BytesIO(content)
+    uploaded.name, uploaded.size = 'test.xlsx', len(content)
+    placeholder = MagicMock()
+    with patch('utils.utils.st') as mock_st, patch('pandas.read_excel') as read_excel:
+        mock_st.session_state = {}
+        df = DataUtils.load_data_in_background(uploaded, '明细', placeholder)
+        read_excel.assert_not_called()
+    assert df.shape == (3000, 7)
+    assert placeholder.progress.call_count >= 2
+    placeholder.success.assert_called_once()
+
+if __name__ == "__main__":
+    test_matches_read_excel()
+    test_na_strings_and_numeric_text_match_read_excel()
+    test_progress_uses_sheet_dimension()
+    test_headers_and_trailing_rows()
+    test_background_loader_parses_once()
+    print("🎉 Excel流式加载测试通过")
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+HyperLogLog近似去重测试
+验证估算误差、寄存器合并以及日聚合立方体的近似模式上卷与跨文件合并
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.hyperloglog import HyperLogLog
+from core.daily_cube import DailyCube
+from core.outbound_analysis import OutboundAnalyzer
+
+METRICS = {
+    '订单数/天': ('订单号', 'nunique'),
+    'SKU数/天': ('SKU', 'nunique'),
+    '件数/天': ('件数', 'sum')
+}
+
+def make_lines(n_rows=40000, seed=5):
+    """生成出库明细"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '出库时间': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 120, n_rows), unit='D'),
+        '订单号': [f'SO{i:06d}' for i in rng.integers(0, 30000, n_rows)],
+        'SKU': rng.integers(0, 5000, n_rows),
+        '件数': rng.integers(1, 6, n_rows)
+    })
+
+def test_estimate_within_error_bound():
+    """测试不同基数下的估算误差在4倍标准误差以内"""
+    precision = 12
+    bound = 4 * HyperLogLog.relative_error(precision)
+    for n in [50, 2000, 100000]:
+        keys = pd.Series([f'K{i}' for i in range(n)] * 2)  # 重复值不影响计数
+        _, hashes = HyperLogLog.hash_values(keys)
+        registers = HyperLogLog.build_registers(np.zeros(hashes.size, dtype=np.int64), hashes, 1, precision)
+        estimate = HyperLogLog.estimate(registers)[0]
+        assert abs(estimate / n - 1) < bound, (n, estimate)
+        print(f"✅ 基数 {n}: 估算 {estimate:.0f}")
+
+def test_missing_and_merge():
+    """测试缺失值忽略及寄存器合并等价于并集"""
+    keys = pd.Series(['a', None, 'b', 'c', np.nan, 'a'])
+    valid, hashes = HyperLogLog.hash_values(keys)
+    assert valid.tolist() == [True, False, True, True, False, True]
+    assert hashes.size == 4
+
+    group_idx = np.array([0, 0, 1, 1])
+    registers = HyperLogLog.build_registers(group_idx, hashes, 2, 10)
+    merged = HyperLogLog.merge_registers(registers, np.array([0, 0]), 1)
+    union = HyperLogLog.build_registers(np.zeros(4, dtype=np.int64), hashes, 1, 10)
+    assert (merged == union).all()
+    assert round(HyperLogLog.estimate(merged)[0]) == 3
+
+def test_cube_approximate_rollup():
+    """测试近似模式的日/月上卷接近精确结果"""
+    df = make_lines()
+    exact = DailyCube.build(df, '出库时间', METRICS)
+    approx = DailyCube.build(df, '出库时间', METRICS, distinct_mode='approximate', hll_precision=14)
+    bound = 4 * approx.distinct_error['订单数/天']
+
+    for granularity in ['daily', 'monthly']:
+        e = exact.rollup(granularity, '出库时间')
+        a = approx.rollup(granularity, '出库时间')
+        assert (a['件数/天'] == e['件数/天']).all()
+        for name in ['订单数/天', 'SKU数/天']:
+            assert a[name].dtype == np.int64
+            assert (np.abs(a[name] / e[name] - 1) < bound).all(), (granularity, name)
+
+def test_cube_merge_across_files():
+    """测试跨文件合并与整体构建的寄存器完全一致"""
+    df = make_lines(n_rows=10000)
+    parts = [df.iloc[:4000], df.iloc[4000:]]
+    cubes = [DailyCube.build(part, '出库时间', METRICS, 'approximate', 12) for part in parts]
+    merged = DailyCube.merge(cubes)
+    whole = DailyCube.build(df, '出库时间', METRICS, 'approximate', 12)
+
+    assert merged.first_day == whole.first_day and merged.n_days == whole.n_days
+    for name in ['订单数/天', 'SKU数/天']:
+        assert (merged.hll_registers[name] == whole.hll_registers[name]).all()
+    assert (merged.rollup('weekly', '出库时间')['件数/天'].to_numpy()
+            == whole.rollup('weekly', '出库时间')['件数/天'].to_numpy()).all()
+
+    # 精确模式不支持跨文件合并
+    exact_cubes = [DailyCube.build(part, '出库时间', METRICS) for part in parts]
+    try:
+        DailyCube.merge(exact_cubes)
+        assert False, "精确模式合并应报错"
+    except ValueError:
+        pass
+
+def test_analyzer_reports_error_bound():
+    """测试分析器在近似模式下在摘要中记录误差"""
+    df = make_lines(n_rows=3000)
+    analyzer = OutboundAnalyzer({'出库分析_distinct_mode': 'approximate', '出库分析_hll_precision': 12})
+    daily, summary = analyzer.analyze_batch_enhanced(
+        df, '出库时间', order_id_column='订单号', sku_column='SKU', item_column='件数'
+    )
+    assert not daily.empty
+    assert summary['distinct_count']['precision'] == 12
+    assert abs(summary['distinct_count']['relative_error'] - 1.04 / 64) < 1e-12
+    assert summary['distinct_count']['metrics'] == ['订单数/天', 'SKU数/天']
+
+if __name__ == "__main__":
+    test_estimate_within_error_bound()
+    test_missing_and_merge()
+    test_cube_approximate_rollup()
+    test_cube_merge_across_files()
+    test_analyzer_reports_error_bound()
+    print("🎉 HyperLogLog近似去重测试通过")
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+时段峰值分析测试
+验证(天, 时段)编码聚合结果与pandas按小时分组一致
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.intraday_analysis import IntradayAnalyzer
+
+def make_lines(n_rows=8000, seed=3):
+    """生成带时分的出库明细，订单可能跨小时"""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2024-03-01T00:00')
+    minutes = rng.integers(0, 60 * 24 * 30, n_rows)
+    return pd.DataFrame({
+        '出库时间': pd.to_datetime(start + minutes.astype('timedelta64[m]')),
+        '订单号': [f'SO{i:05d}' for i in rng.integers(0, 4000, n_rows)],
+        '件数': rng.integers(1, 8, n_rows)
+    })
+
+def test_hour_matrices_match_groupby():
+    """测试小时矩阵与pandas按小时分组一致"""
+    df = make_lines()
+    matrices = IntradayAnalyzer.build_slot_matrices(df, '出库时间', '订单号', '件数', slot_minutes=15)
+    hours = df['出库时间'].dt.floor('h')
+    expected = df.groupby(hours).agg(订单数=('订单号', 'nunique'), 行数=('订单号', 'size'), 件数=('件数', 'sum'))
+
+    first = pd.Timestamp(np.datetime64(matrices['first_day'], 'D'))
+    for name in ['订单数', '行数', '件数']:
+        flat = matrices['hour_metrics'][name].reshape(-1)
+        hour_index = ((expected.index - first) // pd.Timedelta(hours=1)).to_numpy()
+        assert (flat[hour_index] == expected[name].to_numpy()).all(), name
+        assert flat.sum() == expected[name].sum(), name
+
+    # 15分钟行数合计等于小时行数
+    assert matrices['slot_metrics']['行数'].shape[1] == 96
+    assert matrices['slot_metrics']['行数'].sum() == len(df)
+    print(f"✅ 小时矩阵与groupby一致：{matrices['n_days']} 天")
+
+def test_daily_peaks_and_weekday():
+    """测试每日峰值与星期归属"""
+    df = pd.DataFrame({
+        '出库时间': pd.to_datetime([
+            '2024-01-01 09:05', '2024-01-01 09:40', '2024-01-01 09:50', '2024-01-01 14:00',
+            '2024-01-03 20:10', '2024-01-03 20:15'
+        ]),
+        '订单号': ['A', 'A', 'B', 'C', 'D', 'E'],
+        '件数': [1, 2, 3, 4, 5, 6]
+    })
+    analyzer = IntradayAnalyzer({})
+    results = analyzer.analyze(df, '出库时间', '订单号', '件数')
+    peaks = results['daily_peaks']
+
+    assert len(peaks) == 2  # 2024-01-02无数据
+    assert peaks['星期'].tolist() == ['周一', '周三']
+    assert peaks['峰值小时'].tolist() == ['09:00', '20:00']
+    assert peaks['峰值小时订单数'].tolist() == [2, 2]
+    assert peaks['峰值小时行数'].tolist() == [3, 2]
+    assert peaks['峰值小时件数'].tolist() == [6, 11]
+
+    heatmap = results['weekday_hour']['行数']
+    assert heatmap.loc['周一', '09时'] == 3
+    assert heatmap.loc['周三', '20时'] == 2
+    assert heatmap.values.sum() == len(df)
+
+    summary = results['peak_summary']
+    assert summary['件数']['max'] == 11
+    assert summary['行数']['design_value'] <= summary['行数']['max']
+
+def test_lines_only():
+    """测试仅有日期时间列时按行数统计"""
+    df = make_lines(n_rows=300)
+    results = IntradayAnalyzer({}).analyze(df[['出库时间']], '出库时间')
+    assert results['matrices']['metric_names'] == ['行数']
+    assert results['daily_peaks']['全天行数'].sum() == 300
+    assert len(results['slot_profile']) == 24
+
+if __name__ == "__main__":
+    test_hour_matrices_match_groupby()
+    test_daily_peaks_and_weekday()
+    test_lines_only()
+    print("🎉 时段峰值分析测试通过")
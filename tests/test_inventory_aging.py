@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+库龄分析测试
+验证区间匹配的FIFO结果与逐SKU队列实现一致，以及库龄分段、分位数和跨工作表执行
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+from collections import deque, defaultdict
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.inventory_aging import InventoryAgingAnalyzer
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+COLUMNS = {'date': '日期', 'sku': 'SKU', 'quantity': '数量'}
+
+def make_flows(n_skus=30, n_days=200, seed=21):
+    """生成入库批次和出库明细（每个SKU每天最多一条入库，避免同日批次先后不确定）"""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2024-01-01')
+    lots = pd.DataFrame({
+        'day': rng.integers(0, n_days, 400),
+        'SKU': rng.choice([f'S{i:02d}' for i in range(n_skus)], 400)
+    }).drop_duplicates()
+    inbound = pd.DataFrame({
+        '日期': start + pd.to_timedelta(lots['day'], unit='D'),
+        'SKU': lots['SKU'],
+        '数量': rng.integers(10, 60, len(lots))
+    })
+    outbound = pd.DataFrame({
+        '日期': start + pd.to_timedelta(rng.integers(0, n_days, 1500), unit='D'),
+        'SKU': rng.choice([f'S{i:02d}' for i in range(n_skus)], 1500),
+        '数量': rng.integers(1, 12, 1500)
+    })
+    return inbound, outbound
+
+def queue_reference(inbound, outbound):
+    """逐SKU队列的FIFO匹配（参考实现）：返回在库天数->数量、剩余批次、未匹配出库数量"""
+    queues = defaultdict(deque)
+    for row in inbound.sort_values(['SKU', '日期']).itertuples(index=False):
+        queues[row.SKU].append([row.日期, float(row.数量)])
+
+    dwell, unmatched = defaultdict(float), 0.0
+    for row in outbound.sort_values(['SKU', '日期'], kind='stable').itertuples(index=False):
+        need = float(row.数量)
+        queue = queues[row.SKU]
+        while need > 0 and queue:
+            take = min(need, queue[0][1])
+            dwell[(row.日期 - queue[0][0]).days] += take
+            queue[0][1] -= take
+            need -= take
+            if queue[0][1] == 0:
+                queue.popleft()
+        unmatched += need
+    remaining = [(sku, date, qty) for sku, queue in queues.items() for date, qty in queue]
+    return dwell, remaining, unmatched
+
+def test_matches_queue_reference():
+    """测试FIFO匹配结果与逐SKU队列实现一致"""
+    inbound, outbound = make_flows()
+    results = InventoryAgingAnalyzer({}).analyze(inbound, COLUMNS, outbound, COLUMNS)
+    dwell, remaining, unmatched = queue_reference(inbound, outbound)
+    summary = results['summary']
+
+    assert np.isclose(summary['unmatched_outbound'], unmatched)
+    assert np.isclose(summary['remaining_quantity'], sum(qty for _, _, qty in remaining))
+    assert np.isclose(summary['early_outbound'], sum(qty for days, qty in dwell.items() if days < 0))
+
+    distribution = results['dwell_distribution'].set_index('在库天数')['出库数量']
+    for days, qty in dwell.items():
+        if days > 0:
+            assert np.isclose(distribution[days], qty)
+
+    # 剩余库存按库龄分段
+    as_of = max(inbound['日期'].max(), outbound['日期'].max())
+    ages = np.array([(as_of - date).days for _, date, _ in remaining])
+    quantities = np.array([qty for _, _, qty in remaining])
+    buckets = results['aging_buckets']['库存数量'].to_numpy()
+    assert np.isclose(buckets[0], quantities[ages <= 30].sum())
+    assert np.isclose(buckets[1], quantities[(ages > 30) & (ages <= 90)].sum())
+    assert np.isclose(buckets[2], quantities[ages > 90].sum())
+
+    table = results['sku_table'].set_index('SKU')
+    for sku in ['S00', 'S07']:
+        expected = sum(qty for s, _, qty in remaining if s == sku)
+        assert np.isclose(table.loc[sku, '剩余库存'], expected)
+
+def test_partial_lots_and_percentiles():
+    """测试一条出库跨多个批次的拆分和加权分位数"""
+    inbound = pd.DataFrame({'日期': pd.to_datetime(['2024-01-01', '2024-01-05', '2024-01-01']),
+                            'SKU': ['A', 'A', 'B'], '数量': [10, 10, 5]})
+    outbound = pd.DataFrame({'日期': pd.to_datetime(['2024-01-03', '2024-01-10', '2024-01-02']),
+                             'SKU': ['A', 'A', 'B'], '数量': [4, 10, 7]})
+    results = InventoryAgingAnalyzer({}).analyze(inbound, COLUMNS, outbound, COLUMNS)
+    distribution = results['dwell_distribution'].set_index('在库天数')['出库数量']
+
+    # A: 4件在库2天；第二条出库10件 = 第一批剩余6件(9天) + 第二批4件(5天)；B: 5件在库1天，2件无入库
+    assert distribution[2] == 4 and distribution[9] == 6 and distribution[5] == 4 and distribution[1] == 5
+    assert results['summary']['unmatched_outbound'] == 2
+    assert results['summary']['remaining_quantity'] == 6
+    assert results['summary']['dwell_percentiles'][50] == 5
+    assert InventoryAgingAnalyzer.bucket_labels([30, 90]) == ['0-30天', '31-90天', '90天以上']
+
+    table = results['sku_table'].set_index('SKU')
+    assert table.loc['A', '最老库龄(天)'] == 5
+    assert np.isnan(table.loc['B', '最老库龄(天)'])
+
+def test_fractional_quantities_leave_no_phantom_stock():
+    """测试小数数量（kg、m³）出库等于入库时不残留舍入误差造成的虚假库存"""
+    rng = np.random.default_rng(38)
+    n = 20000
+    inbound = pd.DataFrame({
+        '日期': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 100, n), unit='D'),
+        'SKU': [f'S{code:03d}' for code in rng.integers(0, 500, n)],
+        '数量': rng.integers(1, 100000, n) / 1000
+    })
+    totals = inbound.groupby('SKU')['数量'].sum().round(3)
+    first, second = (totals / 3).round(3), (totals / 3).round(3)
+    outbound = pd.DataFrame({
+        'SKU': np.concatenate([totals.index] * 3),
+        '数量': np.concatenate([first, second, (totals - first - second).round(3)])
+    })
+    outbound['日期'] = pd.Timestamp('2024-06-01')
+    # S000少出库1.5，保留真实的剩余库存
+    outbound.loc[0, '数量'] -= 1.5
+
+    results = InventoryAgingAnalyzer({}).analyze(inbound, COLUMNS, outbound, COLUMNS)
+    table = results['sku_table'].set_index('SKU')
+    assert np.isclose(results['summary']['remaining_quantity'], 1.5)
+    assert list(table.index[table['剩余库存'] > 0]) == ['S000']
+    assert table['最老库龄(天)'].notna().sum() == 1
+    assert results['aging_buckets']['SKU数'].sum() == 1
+    assert np.isclose(results['summary']['unmatched_outbound'], 0)
+
+def test_engine_with_inbound_current_sheet(run_engine):
+    """测试当前工作表为入库时从另一张工作表加载出库数据"""
+    inbound, outbound = make_flows()
+    engine = AnalysisEngine(inbound)
+    config = {
+        '库龄分析_current_role': '入库',
+        '库龄分析_date_column': '日期', '库龄分析_sku_column': 'SKU', '库龄分析_quantity_column': '数量',
+        '库龄分析_sheet': '出库',
+        '库龄分析_sheet_date_column': '日期', '库龄分析_sheet_sku_column': 'SKU',
+        '库龄分析_sheet_quantity_column': '数量'
+    }
+    results = run_engine(engine, "库龄分析", config, ['core.inventory_aging'],
+                         sheets={'出库': outbound}, current_sheet='入库')
+    _, remaining, _ = queue_reference(inbound, outbound)
+    assert np.isclose(results['summary']['remaining_quantity'], sum(qty for _, _, qty in remaining))
+
+if __name__ == "__main__":
+    test_matches_queue_reference()
+    test_partial_lots_and_percentiles()
+    test_fractional_quantities_leave_no_phantom_stock()
+    test_engine_with_inbound_current_sheet(run_dimension)
+    print("🎉 库龄分析测试通过")
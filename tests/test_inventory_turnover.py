@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+库存周转测试
+验证单次分段计数的多窗口出库量与按窗口groupby一致，以及周转次数、可供天数（历史短于窗口时按实际天数折算）、覆盖分类和品类汇总
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.inventory_turnover import TurnoverAnalyzer
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+SNAPSHOT_COLUMNS = {'sku': 'SKU', 'stock': '库存', 'category': '品类'}
+OUTBOUND_COLUMNS = {'date': '日期', 'sku': 'SKU', 'quantity': '数量'}
+
+def make_data(n_skus=200, n_rows=20000, seed=31):
+    """生成库存快照（含同SKU多库位）和两年出库历史"""
+    rng = np.random.default_rng(seed)
+    skus = [f'S{i:03d}' for i in range(n_skus)]
+    snapshot = pd.DataFrame({
+        'SKU': skus + skus[:50],
+        '库存': rng.integers(0, 300, n_skus + 50),
+        '品类': [f'C{i % 4}' for i in range(n_skus)] + [f'C{i % 4}' for i in range(50)]
+    })
+    outbound = pd.DataFrame({
+        '日期': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, n_rows), unit='D'),
+        # S190之后的SKU没有出库；X开头的SKU不在快照中
+        'SKU': rng.choice(skus[:190] + ['X1', 'X2'], n_rows),
+        '数量': rng.integers(1, 6, n_rows)
+    })
+    return snapshot, outbound
+
+def test_windows_match_groupby():
+    """测试各窗口出库量、周转次数和可供天数与groupby计算一致"""
+    snapshot, outbound = make_data()
+    results = TurnoverAnalyzer({}).analyze(snapshot, SNAPSHOT_COLUMNS, outbound, OUTBOUND_COLUMNS)
+    table = results['sku_table'].set_index('SKU')
+    stock = snapshot.groupby('SKU')['库存'].sum()
+    end = outbound['日期'].max()
+
+    for window in [30, 90, 365]:
+        recent = outbound[outbound['日期'] > end - pd.Timedelta(days=window)]
+        expected = recent.groupby('SKU')['数量'].sum().reindex(stock.index, fill_value=0)
+        assert np.allclose(table.loc[stock.index, f'近{window}天出库'], expected)
+
+        turnover = (expected / window * 365 / stock).where(stock > 0)
+        assert np.allclose(table.loc[stock.index, f'周转次数({window}天)'], turnover.round(2), equal_nan=True)
+
+    demand90 = table.loc[stock.index, '近90天出库'] / 90
+    has_demand = demand90 > 0
+    assert np.allclose(table.loc[stock.index, '可供天数'][has_demand], (stock / demand90)[has_demand].round(1))
+    assert results['summary']['unknown_outbound_skus'] == 2
+
+def test_coverage_classes_and_categories():
+    """测试覆盖分类（无库存、呆滞）和品类汇总"""
+    snapshot, outbound = make_data()
+    snapshot.loc[snapshot['SKU'] == 'S000', '库存'] = 0
+    results = TurnoverAnalyzer({}).analyze(snapshot, SNAPSHOT_COLUMNS, outbound, OUTBOUND_COLUMNS)
+    table = results['sku_table'].set_index('SKU')
+
+    assert table.loc['S000', '覆盖分类'] == '无库存'
+    stocked_idle = [sku for sku in ['S195', 'S199'] if table.loc[sku, '库存'] > 0]
+    assert all(table.loc[sku, '覆盖分类'] == '呆滞' for sku in stocked_idle)
+    assert results['class_table']['SKU数'].sum() == 200
+
+    categories = results['category_table'].set_index('品类')
+    assert categories['SKU数'].sum() == 200
+    assert np.isclose(categories['库存'].sum(), snapshot['库存'].sum())
+
+    # 不选品类列时不输出品类汇总
+    no_category = TurnoverAnalyzer({}).analyze(snapshot, {'sku': 'SKU', 'stock': '库存'}, outbound, OUTBOUND_COLUMNS)
+    assert no_category['category_table'].empty and '品类' not in no_category['sku_table'].columns
+
+def test_history_shorter_than_window():
+    """测试出库历史短于窗口时按实际天数折算日均出库（4个月历史的365天窗口按历史天数计）"""
+    snapshot, outbound = make_data()
+    outbound = outbound[outbound['日期'] >= pd.Timestamp('2024-09-01')]
+    results = TurnoverAnalyzer({}).analyze(snapshot, SNAPSHOT_COLUMNS, outbound, OUTBOUND_COLUMNS)
+    table = results['sku_table'].set_index('SKU')
+    stock = snapshot.groupby('SKU')['库存'].sum()
+    history_days = (outbound['日期'].max() - outbound['日期'].min()).days + 1
+    assert results['summary']['history_days'] == history_days < 365
+
+    for window in [30, 90, 365]:
+        demand = table.loc[stock.index, f'近{window}天出库'] / min(window, history_days)
+        turnover = (demand * 365 / stock).where(stock > 0)
+        assert np.allclose(table.loc[stock.index, f'周转次数({window}天)'], turnover.round(2), equal_nan=True)
+    # 365天窗口即整段历史，年化周转与按历史天数年化的总出库一致
+    total = outbound[outbound['SKU'].isin(stock.index)]['数量'].sum()
+    assert np.isclose(results['summary']['turnover'][365], total / history_days * 365 / stock[stock > 0].sum())
+
+    # 历史不足90天时主窗口的可供天数同样按历史天数折算
+    short = outbound[outbound['日期'] >= outbound['日期'].max() - pd.Timedelta(days=44)]
+    table = TurnoverAnalyzer({}).analyze(snapshot, SNAPSHOT_COLUMNS, short, OUTBOUND_COLUMNS)['sku_table'].set_index('SKU')
+    demand = table.loc[stock.index, '近90天出库'] / ((short['日期'].max() - short['日期'].min()).days + 1)
+    has_demand = demand > 0
+    assert np.allclose(table.loc[stock.index, '可供天数'][has_demand], (stock / demand)[has_demand].round(1))
+
+def test_engine_turnover(run_engine):
+    """测试分析引擎以当前工作表为快照、从另一张工作表加载出库历史"""
+    snapshot, outbound = make_data()
+    engine = AnalysisEngine(snapshot)
+    config = {
+        '库存周转分析_sku_column': 'SKU', '库存周转分析_stock_column': '库存', '库存周转分析_category_column': '无数据',
+        '库存周转分析_sheet': '出库', '库存周转分析_sheet_date_column': '日期',
+        '库存周转分析_sheet_sku_column': 'SKU', '库存周转分析_sheet_quantity_column': '数量'
+    }
+    results = run_engine(engine, "库存周转分析", config, ['core.inventory_turnover'],
+                         sheets={'出库': outbound}, current_sheet='库存')
+    assert len(results['sku_table']) == 200
+
+if __name__ == "__main__":
+    test_windows_match_groupby()
+    test_coverage_classes_and_categories()
+    test_history_shorter_than_window()
+    test_engine_turnover(run_dimension)
+    print("🎉 库存周转测试通过")
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+订单聚类测试
+验证一次订单编码得到的订单特征与groupby一致、小批量k-means能分开明显分离的订单群，以及每日聚类构成与分组统计一致
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.abc_analysis import ABCAnalyzer
+from core.order_clustering import OrderClusterAnalyzer
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+def make_orders(n_orders=6000, seed=47):
+    """生成订单明细：单行小件订单、多行订单、大件订单三种画像（含空订单号和空SKU）"""
+    rng = np.random.default_rng(seed)
+    kind = rng.choice(3, n_orders, p=[0.6, 0.3, 0.1])
+    lines = np.where(kind == 1, rng.integers(6, 12, n_orders), 1)
+    codes = np.repeat(np.arange(n_orders), lines)
+    line_kind = kind[codes]
+    n = codes.size
+    df = pd.DataFrame({
+        '订单号': [f'O{code:05d}' for code in codes],
+        'SKU': [f'S{sku:03d}' for sku in rng.integers(0, 400, n)],
+        '件数': np.where(line_kind == 2, rng.integers(20, 40, n), rng.integers(1, 3, n)),
+        '长': np.where(line_kind == 2, rng.uniform(40, 60, n), rng.uniform(5, 10, n)).round(1),
+        '宽': 10.0,
+        '高': 5.0,
+        '重量': np.where(line_kind == 2, 8.0, 0.2),
+        '日期': pd.Timestamp('2024-05-01') + pd.to_timedelta(codes % 10, unit='D')
+    })
+    df.loc[7, '订单号'] = np.nan
+    df.loc[9, 'SKU'] = np.nan
+    return df, kind
+
+def test_order_features_match_groupby():
+    """测试订单特征与按订单groupby汇总一致"""
+    df, _ = make_orders()
+    orders, features = OrderClusterAnalyzer.order_features(df, '订单号', 'SKU', '件数', ['长', '宽', '高'], '重量',
+                                                           'cm', 'kg', 70, 20)
+    valid = df.dropna(subset=['订单号', 'SKU'])
+    grouped = valid.groupby('订单号', sort=False)
+    features.index = orders.keys
+    features = features.loc[grouped.size().index]
+    assert np.array_equal(features['行数'], grouped.size())
+    assert np.allclose(features['件数'], grouped['件数'].sum())
+    volume = valid['长'] * valid['宽'] * valid['高'] * 1000 * valid['件数'] / 1e6
+    assert np.allclose(features['体积(L)'], volume.groupby(valid['订单号'], sort=False).sum())
+    assert np.allclose(features['重量(kg)'], (valid['重量'] * valid['件数']).groupby(valid['订单号'], sort=False).sum())
+
+    # ABC构成：SKU按出库件数合计分类
+    sku_units = df.groupby('SKU', sort=False)['件数'].sum()
+    sku_classes = pd.Series(np.array(['A', 'B', 'C'])[ABCAnalyzer.classify(sku_units, 70, 20)], index=sku_units.index)
+    classes = valid['SKU'].map(sku_classes)
+    a_share = (classes == 'A').groupby(valid['订单号'], sort=False).mean()
+    assert np.allclose(features['A类行占比'], a_share)
+    assert np.allclose(features[['A类行占比', 'B类行占比', 'C类行占比']].sum(axis=1), 1)
+
+def test_mini_batch_kmeans_separates_blobs():
+    """测试小批量k-means分开明显分离的点群，且结果可复现"""
+    rng = np.random.default_rng(3)
+    truth = rng.integers(0, 4, 50000)
+    centers = np.array([[0, 0, 0], [8, 0, 0], [0, 8, 0], [0, 0, 8]], dtype=float)
+    points = centers[truth] + rng.normal(0, 1, (truth.size, 3))
+    result = OrderClusterAnalyzer.mini_batch_kmeans(points, 4, seed=1)
+    contingency = pd.crosstab(truth, result['labels'])
+    assert (contingency.max(axis=1) / contingency.sum(axis=1)).min() > 0.98
+    assert result['inertia'] < truth.size * 3 * 1.1
+    again = OrderClusterAnalyzer.mini_batch_kmeans(points, 4, seed=1)
+    assert np.array_equal(result['labels'], again['labels'])
+
+    # 分块分配与一次性分配一致
+    labels, distances = OrderClusterAnalyzer.assign(points, result['centers'], chunk_size=777)
+    full = ((points[:, None, :] - result['centers'][None]) ** 2).sum(axis=2)
+    assert np.array_equal(labels, full.argmin(axis=1))
+    assert np.allclose(distances, full.min(axis=1))
+
+def test_analyze_profiles_and_daily_mix():
+    """测试每个聚类只包含一种订单画像，每日构成与按日分组统计一致"""
+    df, kind = make_orders()
+    with patch('core.order_clustering.st'):
+        results = OrderClusterAnalyzer({}).analyze(df, '订单号', 'SKU', '件数', '日期', ['长', '宽', '高'], '重量',
+                                                   n_clusters=6)
+    profile = results['profile_table']
+    assert list(profile['聚类']) == [f'类{code}' for code in range(1, 7)]
+    assert profile['订单数'].is_monotonic_decreasing
+    assert profile['订单数'].sum() == results['summary']['order_count']
+    assert np.isclose(profile['行数占比(%)'].sum(), 100)
+
+    order_table = results['order_table']
+    order_kind = pd.Series(kind, index=[f'O{code:05d}' for code in range(kind.size)]).loc[order_table['订单号']]
+    contingency = pd.crosstab(order_kind.to_numpy(), order_table['聚类'].to_numpy())
+    # 单行订单还会按ABC构成细分，但不同画像的订单不会混在同一类
+    assert (contingency.max(axis=0) / contingency.sum(axis=0)).min() > 0.95
+
+    daily = results['daily_table'].set_index('日期')
+    expected = pd.crosstab(order_table['日期'], order_table['聚类'], normalize='index') * 100
+    assert np.allclose(daily[[f'{name}占比(%)' for name in expected.columns]], expected)
+    assert daily['订单数'].sum() == len(order_table)
+
+def test_engine_order_cluster(run_engine):
+    """测试分析引擎执行订单聚类（不选择尺寸和重量列时只用行数、件数和ABC构成）"""
+    df, _ = make_orders()
+    engine = AnalysisEngine(df)
+    config = {
+        '订单聚类分析_order_column': '订单号', '订单聚类分析_sku_column': 'SKU', '订单聚类分析_quantity_column': '件数',
+        '订单聚类分析_date_column': '日期', '订单聚类分析_length_column': '长', '订单聚类分析_width_column': '无数据',
+        '订单聚类分析_height_column': '高', '订单聚类分析_weight_column': '无数据', '订单聚类分析_data_unit': 'cm',
+        '订单聚类分析_weight_unit': 'kg', '订单聚类分析_n_clusters': 4, '订单聚类分析_a_percentage': 70,
+        '订单聚类分析_b_percentage': 20
+    }
+    results = run_engine(engine, "订单聚类分析", config, ['core.order_clustering'])
+    assert results['summary']['features'] == ['行数', '件数', 'A类行占比', 'B类行占比', 'C类行占比']
+    assert results['summary']['cluster_count'] == 4
+
+if __name__ == "__main__":
+    test_order_features_match_groupby()
+    test_mini_batch_kmeans_separates_blobs()
+    test_analyze_profiles_and_daily_mix()
+    test_engine_order_cluster(run_dimension)
+    print("🎉 订单聚类测试通过")
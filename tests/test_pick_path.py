@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+拣选路径测试
+验证按(批次, 巷道)归约的S型、最大间隙距离与逐批次路线规划一致，以及分批、重排方案和储位匹配
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.pick_path import PickPathEstimator
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+from config import SLOTTING_CONFIG
+
+GRID = {**SLOTTING_CONFIG['grid'], 'aisles': 6, 'bays': 12, 'levels': 2, 'bay_width': 1.0, 'aisle_pitch': 3.0}
+
+def reference_route(aisles, bays, grid):
+    """逐批次规划路线的参考实现"""
+    length = grid['bays'] * grid['bay_width']
+    positions = {}
+    for aisle, bay in zip(aisles, bays):
+        positions.setdefault(aisle, []).append((bay + 0.5) * grid['bay_width'])
+    visited = sorted(positions)
+    horizontal = 2 * visited[-1] * grid['aisle_pitch']
+    if len(visited) % 2 == 0:
+        s_shape = len(visited) * length
+    else:
+        s_shape = (len(visited) - 1) * length + 2 * max(positions[visited[-1]])
+    if len(visited) == 1:
+        gap = 2 * max(positions[visited[0]])
+    else:
+        gap = 2 * length
+        for aisle in visited[1:-1]:
+            points = sorted(positions[aisle])
+            gaps = [points[0]] + [b - a for a, b in zip(points, points[1:])] + [length - points[-1]]
+            gap += 2 * (length - max(gaps))
+    return horizontal + s_shape, horizontal + gap
+
+def test_route_distances_match_reference():
+    """测试S型和最大间隙距离与逐批次路线一致（含空批次）"""
+    rng = np.random.default_rng(71)
+    n_lines = 3000
+    batch = rng.integers(0, 400, n_lines)
+    aisle = rng.integers(0, GRID['aisles'], n_lines)
+    bay = rng.integers(0, GRID['bays'], n_lines)
+    distances = PickPathEstimator.route_distances(batch, 410, aisle, bay, GRID)
+
+    for code in range(410):
+        mask = batch == code
+        if not mask.any():
+            assert distances['s_shape'][code] == 0 and distances['aisles_visited'][code] == 0
+            continue
+        s_shape, gap = reference_route(aisle[mask], bay[mask], GRID)
+        assert np.isclose(distances['s_shape'][code], s_shape)
+        assert np.isclose(distances['largest_gap'][code], gap)
+        assert distances['aisles_visited'][code] == len(set(aisle[mask]))
+
+def make_data(n_orders=2000, n_skus=300, seed=73):
+    """生成订单明细和储位表（部分SKU无储位或储位编码无效）"""
+    rng = np.random.default_rng(seed)
+    lines = rng.integers(1, 5, n_orders)
+    weights = rng.pareto(1.0, n_skus) + 0.01
+    orders = pd.DataFrame({
+        '订单号': np.repeat([f'O{i:05d}' for i in range(n_orders)], lines),
+        'SKU': rng.choice([f'S{i:03d}' for i in range(n_skus)], lines.sum(), p=weights / weights.sum())
+    })
+    locations = pd.DataFrame({
+        'SKU': [f'S{i:03d}' for i in range(n_skus - 5)],
+        '储位': [f'{a:02d}-{b:03d}-{c}' for a, b, c in zip(rng.integers(1, 7, n_skus - 5),
+                                                            rng.integers(1, 13, n_skus - 5),
+                                                            rng.integers(1, 3, n_skus - 5))]
+    })
+    locations.loc[0, '储位'] = '99-001-1'
+    return orders, locations
+
+def test_analyze_scenarios():
+    """测试分批与重排方案：批次越大每单距离越小，按频次重排不劣于随机的当前储位"""
+    orders, locations = make_data()
+    results = PickPathEstimator({}).analyze(orders, '订单号', 'SKU', locations, 'SKU', '储位', [10, 1, 5], GRID)
+    summary = results['summary']
+    table = results['scenario_table']
+
+    unlocated = set(orders['SKU']) - set(locations['SKU'][1:])
+    assert summary['unlocated_lines'] == orders['SKU'].isin(unlocated).sum()
+    assert summary['line_count'] == len(orders) - summary['unlocated_lines']
+    assert list(table['储位方案'].unique()) == ['当前储位', '按频次重排']
+
+    for _, group in table.groupby('储位方案'):
+        assert list(group['每批订单数']) == [1, 5, 10]
+        assert group['S型每单距离(m)'].is_monotonic_decreasing
+    current = table[table['储位方案'] == '当前储位'].set_index('每批订单数')
+    reslotted = table[table['储位方案'] == '按频次重排'].set_index('每批订单数')
+    assert (reslotted['S型每单距离(m)'] < current['S型每单距离(m)']).all()
+
+    # 按单拣选的批次明细与逐单路线一致
+    batch_table = results['batch_table']
+    assert len(batch_table) == summary['order_count']
+    first_order = batch_table.iloc[0]
+    lines = orders[(orders['订单号'] == first_order['订单号']) & ~orders['SKU'].isin(unlocated)]
+    codes = locations.set_index('SKU').loc[lines['SKU'], '储位'].str.split('-', expand=True).astype(int) - 1
+    s_shape, _ = reference_route(codes[0].to_numpy(), codes[1].to_numpy(), GRID)
+    assert np.isclose(first_order['S型距离(m)'], round(s_shape, 1))
+
+def test_engine_pick_path(run_engine):
+    """测试分析引擎以当前工作表为订单明细、从另一张工作表加载储位表"""
+    orders, locations = make_data()
+    engine = AnalysisEngine(orders)
+    config = {
+        '拣选路径分析_order_column': '订单号', '拣选路径分析_sku_column': 'SKU', '拣选路径分析_sheet': '储位',
+        '拣选路径分析_sheet_sku_column': 'SKU', '拣选路径分析_sheet_location_column': '储位',
+        '拣选路径分析_aisles': 6, '拣选路径分析_bays': 12, '拣选路径分析_levels': 2,
+        '拣选路径分析_bay_width': 1.0, '拣选路径分析_aisle_pitch': 3.0, '拣选路径分析_batch_sizes': [1, 20]
+    }
+    results = run_engine(engine, "拣选路径分析", config, ['core.pick_path'],
+                         sheets={'储位': locations}, current_sheet='订单')
+    assert len(results['scenario_table']) == 4
+
+if __name__ == "__main__":
+    test_route_distances_match_reference()
+    test_analyze_scenarios()
+    test_engine_pick_path(run_dimension)
+    print("🎉 拣选路径测试通过")
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+补货频次测试
+验证向量化最大装箱数与逐个SKU的装箱分析一致，以及按(SKU, 日)汇总的补货次数、峰值日分布和所需拣选位数与分组合并参考实现一致
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.packing_analysis import PackingAnalyzer
+from core.replenishment import ReplenishmentAnalyzer
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+CONTAINER = {'length': 600, 'width': 400, 'height': 300, 'weight_limit': 30}
+SKU_COLUMNS = {'sku': 'SKU', 'length': '长', 'width': '宽', 'height': '高', 'weight': '重量', 'capacity': None}
+
+def make_data(n_skus=200, n_lines=30000, n_days=60, seed=91):
+    """生成SKU主数据（含重复SKU、无效尺寸、装不下的SKU）与出库明细（含主数据中没有的SKU）"""
+    rng = np.random.default_rng(seed)
+    skus = [f'S{i:03d}' for i in range(n_skus)]
+    sku_df = pd.DataFrame({
+        'SKU': skus + skus[:5],
+        '长': rng.uniform(5, 40, n_skus + 5).round(1),
+        '宽': rng.uniform(5, 30, n_skus + 5).round(1),
+        '高': rng.uniform(2, 20, n_skus + 5).round(1),
+        '重量': rng.uniform(0.05, 3, n_skus + 5).round(2),
+        '储位容量': np.where(rng.random(n_skus + 5) < 0.2, rng.integers(5, 50, n_skus + 5), np.nan)
+    })
+    sku_df.loc[3, '高'] = np.nan
+    sku_df.loc[4, '长'] = 90  # 超过容器长度
+    weights = rng.pareto(1.0, n_skus) + 0.01
+    outbound = pd.DataFrame({
+        '日期': pd.Timestamp('2024-03-01') + pd.to_timedelta(rng.integers(0, n_days, n_lines), unit='D'),
+        'SKU': rng.choice(skus + ['X1'], n_lines, p=np.append(weights / weights.sum() * 0.99, 0.01)),
+        '件数': rng.integers(1, 30, n_lines)
+    })
+    return sku_df, outbound
+
+def test_max_per_box_batch_matches_single():
+    """测试向量化最大装箱数与逐个SKU计算一致（含重量限制和无效尺寸）"""
+    rng = np.random.default_rng(5)
+    n = 500
+    length, width, height = (rng.uniform(-5, 700, n) for _ in range(3))
+    weight = np.where(rng.random(n) < 0.5, rng.uniform(0.01, 40, n), np.nan)
+    length[:5] = [np.nan, 0, 20000, 50, 601]
+    analyzer = PackingAnalyzer(CONTAINER)
+    batch = analyzer.max_per_box_batch(length, width, height, weight_kg=weight)
+    for index in range(n):
+        single = analyzer.analyze_single_sku(length[index], width[index], height[index], 1, index,
+                                             None if np.isnan(weight[index]) else weight[index])
+        assert batch[index] == (single['max_per_box'] if single else 0)
+    assert (batch > 0).sum() > 50
+
+def reference(sku_df, outbound, refills_per_face, peak_percentile):
+    """按(SKU, 日期)分组合并容量的参考实现"""
+    capacity = ReplenishmentAnalyzer.sku_capacity(sku_df, {**SKU_COLUMNS, 'capacity': '储位容量'}, 'cm', CONTAINER)
+    cells = outbound.groupby(['SKU', '日期'], as_index=False)['件数'].sum().merge(capacity, on='SKU')
+    cells = cells[cells['容量'] > 0]
+    cells['补货次数'] = np.ceil(cells['件数'] / cells['容量'])
+    daily = cells.groupby('日期').agg(件数=('件数', 'sum'), 补货次数=('补货次数', 'sum'))
+    peak_days = daily.index[daily['件数'] >= np.percentile(daily['件数'], peak_percentile)]
+    per_sku = cells.groupby('SKU').agg(总次数=('补货次数', 'sum'), 最大件数=('件数', 'max'), 容量=('容量', 'first'))
+    per_sku['拣选位数'] = np.ceil(per_sku['最大件数'] / (per_sku['容量'] * refills_per_face))
+    return cells, daily, peak_days, per_sku
+
+def test_analyze_matches_reference():
+    """测试补货次数、每日汇总、峰值日分布和所需拣选位数与参考实现一致"""
+    sku_df, outbound = make_data()
+    columns = {**SKU_COLUMNS, 'capacity': '储位容量'}
+    results = ReplenishmentAnalyzer({}).analyze(sku_df, columns, 'cm', CONTAINER, outbound, '日期', 'SKU', '件数',
+                                                refills_per_face=2, peak_percentile=90)
+    cells, daily, peak_days, per_sku = reference(sku_df, outbound, 2, 90)
+    summary = results['summary']
+
+    daily_table = results['daily_table'].set_index('日期')
+    assert np.array_equal(daily_table['补货次数'], daily['补货次数'])
+    assert np.allclose(daily_table['出库件数'], daily['件数'])
+    assert list(daily_table.index[daily_table['峰值日']]) == list(peak_days)
+    assert summary['max_daily_trips'] == daily['补货次数'].max()
+
+    sku_table = results['sku_table'].set_index('SKU')
+    expected = per_sku.loc[sku_table.index]
+    assert np.allclose(sku_table['日均补货次数'] * summary['operating_days'], expected['总次数'])
+    assert np.array_equal(sku_table['所需拣选位数'], expected['拣选位数'])
+    assert summary['multi_face_skus'] == (per_sku['拣选位数'] > 1).sum()
+    assert results['sku_table']['日均补货次数'].is_monotonic_decreasing
+
+    peak_trips = cells.loc[cells['日期'].isin(peak_days), '补货次数'].clip(upper=10)
+    assert list(results['peak_distribution']['SKU日数']) == [int((peak_trips == n).sum()) for n in range(1, 11)]
+
+    # 主数据中没有的SKU和装不下的SKU不计入
+    assert summary['unknown_skus'] == 1
+    assert summary['unfit_skus'] >= 1
+    matched = outbound['SKU'].isin(per_sku.index)
+    assert summary['excluded_lines'] == (~matched).sum()
+
+def test_capacity_override():
+    """测试储位容量列优先于按容器计算的最大装箱数"""
+    sku_df, _ = make_data()
+    base = ReplenishmentAnalyzer.sku_capacity(sku_df, SKU_COLUMNS, 'cm', CONTAINER)
+    override = ReplenishmentAnalyzer.sku_capacity(sku_df, {**SKU_COLUMNS, 'capacity': '储位容量'}, 'cm', CONTAINER)
+    first = sku_df.drop_duplicates('SKU').reset_index(drop=True)
+    has_override = first['储位容量'].notna()
+    assert len(base) == len(first)
+    assert np.array_equal(override['容量'][has_override], first['储位容量'][has_override])
+    assert np.array_equal(override['容量'][~has_override], base['容量'][~has_override])
+    assert set(override['容量来源'][has_override]) == {'储位容量'}
+
+def test_engine_replenishment(run_engine):
+    """测试分析引擎以当前工作表为SKU主数据、从另一张工作表加载出库明细"""
+    sku_df, outbound = make_data()
+    engine = AnalysisEngine(sku_df)
+    config = {
+        '补货频次分析_sku_column': 'SKU', '补货频次分析_length_column': '长', '补货频次分析_width_column': '宽',
+        '补货频次分析_height_column': '高', '补货频次分析_weight_column': '无数据', '补货频次分析_capacity_column': '无数据',
+        '补货频次分析_data_unit': 'cm', '补货频次分析_sheet': '出库', '补货频次分析_sheet_date_column': '日期',
+        '补货频次分析_sheet_sku_column': 'SKU', '补货频次分析_sheet_quantity_column': '无数据',
+        '补货频次分析_refills_per_face': 1, '补货频次分析_peak_percentile': 95
+    }
+    results = run_engine(engine, "补货频次分析", config, ['core.replenishment'],
+                         sheets={'出库': outbound}, current_sheet='SKU')
+    # 未选择件数列时每个出库行计1件
+    assert results['daily_table']['出库件数'].sum() + results['summary']['excluded_lines'] == len(outbound)
+
+if __name__ == "__main__":
+    test_max_per_box_batch_matches_single()
+    test_analyze_matches_reference()
+    test_capacity_override()
+    test_engine_replenishment(run_dimension)
+    print("🎉 补货频次测试通过")
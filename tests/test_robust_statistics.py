@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+稳健统计内核测试
+验证一次性矩阵计算与原逐列计算（IQR均值、低值过滤、最值日期）结果一致
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.robust_statistics import RobustStatistics
+from core.time_series_kernel import TimeSeriesKernel
+from core.outbound_analysis import OutboundAnalyzer
+
+def make_daily(n_days, seed):
+    """生成含异常低值、离群高值和重复最值的日聚合数据"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-01', periods=n_days, freq='D')
+    orders = rng.integers(100, 500, n_days)
+    orders[::7] = rng.integers(0, 5, len(orders[::7]))
+    pieces = rng.normal(30, 10, n_days).round(2)
+    pieces[3 % n_days] = 400.0
+    lines = rng.integers(0, 3, n_days)
+    return pd.DataFrame({'日期': dates, '订单数': orders, '件数': pieces, '行数': lines})
+
+def reference_summary(analyzer, daily_data, date_column):
+    """原逐列实现"""
+    result = {}
+    for col in daily_data.columns:
+        if col == date_column:
+            continue
+        filtered = analyzer.filter_outliers_98_percentile(daily_data[col])
+        filtered_max, filtered_min = filtered.max(), filtered.min()
+        result[col] = {
+            'total': daily_data[col].sum(),
+            'daily_avg': daily_data[col].mean(),
+            'daily_avg_no_outliers': analyzer.calculate_average_without_outliers(daily_data[col]),
+            'daily_max': filtered_max,
+            'daily_min': filtered_min,
+            'max_date': daily_data.loc[daily_data[col] == filtered_max, date_column].iloc[0],
+            'min_date': daily_data.loc[daily_data[col] == filtered_min, date_column].iloc[0],
+            'trend': 'increasing' if daily_data[col].iloc[-1] > daily_data[col].iloc[0] else 'decreasing'
+        }
+    return result
+
+def test_matches_per_column_logic():
+    """测试与原逐列计算结果一致（覆盖少于4天、少于10天和常规长度）"""
+    analyzer = OutboundAnalyzer({})
+    for n_days, seed in [(3, 1), (8, 2), (30, 3), (365, 4)]:
+        daily = make_daily(n_days, seed)
+        expected = reference_summary(analyzer, daily, '日期')
+        actual = RobustStatistics.summarize_frame(daily, '日期')
+        assert set(actual) == set(expected)
+        for col, stats in expected.items():
+            for key, value in stats.items():
+                if isinstance(value, str) or isinstance(value, pd.Timestamp):
+                    assert actual[col][key] == value, (n_days, col, key)
+                else:
+                    assert np.isclose(actual[col][key], value), (n_days, col, key, actual[col][key], value)
+        assert isinstance(actual['订单数']['total'], int)
+
+def test_generate_summary_uses_kernel():
+    """测试分析器摘要保留日期范围并包含分位数"""
+    daily = make_daily(60, 5)
+    summary = OutboundAnalyzer({}).generate_summary_statistics(daily, '日期')
+    assert summary['date_range']['total_days'] == 60
+    assert np.isclose(summary['件数']['median'], daily['件数'].median())
+    assert np.isclose(summary['订单数']['q75'], daily['订单数'].quantile(0.75))
+
+def test_per_sku_summaries():
+    """测试多SKU日矩阵（只统计有记录的日期）与逐SKU计算一致"""
+    rng = np.random.default_rng(6)
+    n_rows = 20000
+    # 每隔5天停发一天，验证无记录的日期不参与统计
+    offsets = rng.integers(0, 90, n_rows)
+    offsets = offsets[offsets % 5 != 4]
+    df = pd.DataFrame({
+        '日期': pd.Timestamp('2024-03-01') + pd.to_timedelta(offsets, unit='D'),
+        'SKU': rng.choice([f'S{i:04d}' for i in range(500)], offsets.size),
+        '件数': rng.integers(1, 20, offsets.size)
+    })
+
+    matrix = TimeSeriesKernel.day_key_matrix(df, '日期', 'SKU', '件数')
+    expected = df.groupby([df['日期'].dt.normalize(), 'SKU'])['件数'].sum().unstack(fill_value=0)
+    active = matrix['active_days']
+    assert active.sum() == len(expected) and len(active) == 89
+    assert matrix['dates'][active].equals(pd.DatetimeIndex(expected.index))
+    columns = matrix['keys'].get_indexer(expected.columns)
+    assert np.allclose(matrix['values'][active][:, columns], expected.to_numpy())
+
+    table = RobustStatistics.summarize_series(matrix['values'], matrix['dates'], matrix['keys'], active)
+    assert len(table) == 500
+    analyzer = OutboundAnalyzer({})
+    for sku in ['S0000', 'S0123', 'S0499']:
+        row = table.loc[table['SKU'] == sku].iloc[0]
+        series = expected[sku]
+        assert np.isclose(row['总量'], series.sum())
+        assert np.isclose(row['中位数'], series.median())
+        assert np.isclose(row['日均(剔除离群值)'], round(analyzer.calculate_average_without_outliers(series), 2))
+        assert row['最高'] == analyzer.filter_outliers_98_percentile(series).max()
+
+if __name__ == "__main__":
+    test_matches_per_column_logic()
+    test_generate_summary_uses_kernel()
+    test_per_sku_summaries()
+    print("🎉 稳健统计内核测试通过")
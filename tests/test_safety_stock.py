@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+安全库存测试
+验证分块累加的需求均值/标准差与补零透视表一致，以及安全库存、再订货点公式和投入曲线
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+from statistics import NormalDist
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.safety_stock import SafetyStockCalculator
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+def make_outbound(n_skus=120, n_rows=15000, n_days=100, seed=41):
+    """生成出库明细（部分SKU只在少数天出库）"""
+    rng = np.random.default_rng(seed)
+    skus = [f'S{i:03d}' for i in range(n_skus)]
+    weights = rng.pareto(1.2, n_skus) + 0.01
+    return pd.DataFrame({
+        '日期': pd.Timestamp('2024-03-01') + pd.to_timedelta(rng.integers(0, n_days, n_rows), unit='D'),
+        'SKU': rng.choice(skus, n_rows, p=weights / weights.sum()),
+        '数量': rng.integers(1, 8, n_rows),
+        '单价': rng.uniform(1, 50, n_rows).round(2)
+    })
+
+def reference_moments(df, period_days):
+    """补零透视表 + 样本标准差的参考实现（丢弃末尾不完整周期）"""
+    day = (df['日期'] - df['日期'].min()).dt.days
+    n_periods = (day.max() + 1) // period_days
+    period = day // period_days
+    kept = df[period < n_periods].assign(周期=period[period < n_periods])
+    table = kept.pivot_table(index='SKU', columns='周期', values='数量', aggfunc='sum', fill_value=0)
+    table = table.reindex(columns=range(n_periods), fill_value=0)
+    return table.mean(axis=1), table.std(axis=1, ddof=1), n_periods
+
+def test_moments_match_pivot():
+    """测试日/周需求均值和标准差与补零透视表一致（含多块计算）"""
+    df = make_outbound()
+    for period_days in [1, 7]:
+        for block_size in [1 << 24, 50]:
+            with patch.dict('core.safety_stock.SAFETY_STOCK_CONFIG', {'cell_block_size': block_size}):
+                moments = SafetyStockCalculator.demand_moments(df, '日期', 'SKU', '数量', period_days)
+            mean, std, n_periods = reference_moments(df, period_days)
+            order = moments['skus'].get_indexer(mean.index)
+            assert moments['n_periods'] == n_periods
+            assert np.allclose(moments['mean'][order], mean)
+            assert np.allclose(moments['std'][order], std)
+
+def test_formula_and_levels():
+    """测试安全库存、再订货点公式（含提前期波动）和多服务水平广播"""
+    df = make_outbound()
+    levels = [0.9, 0.95, 0.99]
+    results = SafetyStockCalculator({}).analyze(df, '日期', 'SKU', '数量', None, levels, 7, 2, 1)
+    table = results['sku_table'].set_index('SKU')
+    mean, std, _ = reference_moments(df, 1)
+
+    sigma = np.sqrt(7 * std ** 2 + (mean * 2) ** 2)
+    for level in levels:
+        z = NormalDist().inv_cdf(level)
+        label = f'{level * 100:g}%'
+        assert np.allclose(table.loc[mean.index, f'安全库存@{label}'], np.ceil(z * sigma))
+        assert np.allclose(table.loc[mean.index, f'再订货点@{label}'], np.ceil(mean * 7 + z * sigma))
+
+    level_table = results['level_table']
+    assert list(level_table['服务水平(%)']) == [90, 95, 99]
+    assert level_table['安全库存总量'].is_monotonic_increasing
+    # 按安全库存降序排列
+    assert table['安全库存@99%'].is_monotonic_decreasing
+
+def test_investment_curve():
+    """测试投入曲线随服务水平单调上升，金额按单价加权"""
+    df = make_outbound()
+    results = SafetyStockCalculator({}).analyze(df, '日期', 'SKU', '数量', '单价', [0.95], 5, 0, 7)
+    curve = results['curve']
+    assert curve['安全库存金额'].is_monotonic_increasing
+    assert 95.0 in curve['服务水平(%)'].values
+
+    # 金额 = z × Σ(σ × 单价)，单价取每个SKU第一条
+    moments = SafetyStockCalculator.demand_moments(df, '日期', 'SKU', '数量', 7)
+    cost = df.drop_duplicates('SKU').set_index('SKU')['单价'].reindex(moments['skus']).to_numpy()
+    sigma = moments['std'] * np.sqrt(5 / 7)
+    z = NormalDist().inv_cdf(0.95)
+    amount = curve.loc[curve['服务水平(%)'] == 95.0, '安全库存金额'].iloc[0]
+    assert np.isclose(amount, z * (sigma * cost).sum())
+    assert results['summary']['period_label'] == '7天'
+
+def test_insufficient_history():
+    """测试统计周期不足两个时返回空结果"""
+    df = make_outbound(n_days=10)
+    assert SafetyStockCalculator({}).analyze(df, '日期', 'SKU', '数量', None, [0.95], 7, 0, 7) == {}
+
+def test_engine_safety_stock(run_engine):
+    """测试分析引擎执行安全库存分析"""
+    df = make_outbound()
+    engine = AnalysisEngine(df)
+    config = {
+        '安全库存分析_date_column': '日期', '安全库存分析_sku_column': 'SKU', '安全库存分析_quantity_column': '数量',
+        '安全库存分析_cost_column': '无数据', '安全库存分析_period': '周', '安全库存分析_lead_time': 14,
+        '安全库存分析_lead_time_std': 0.0, '安全库存分析_service_levels': [0.95, 0.9]
+    }
+    results = run_engine(engine, "安全库存分析", config, ['core.safety_stock'])
+    assert results['summary']['period_label'] == '7天'
+    assert list(results['level_table']['服务水平(%)']) == [90, 95]
+
+if __name__ == "__main__":
+    test_moments_match_pivot()
+    test_formula_and_levels()
+    test_investment_curve()
+    test_insufficient_history()
+    test_engine_safety_stock(run_dimension)
+    print("🎉 安全库存测试通过")
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+季节性分解测试
+验证批量移动平均/季节指数与逐序列pandas计算一致，以及周、年季节性和趋势识别
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.seasonality import SeasonalDecomposer
+from core.time_series_kernel import TimeSeriesKernel
+from core.outbound_analysis import OutboundAnalyzer
+
+WEEKLY_PATTERN = np.array([10, 10, 10, 10, 16, 20, 4], dtype=np.float64)
+
+def make_series(n_days=800, n_series=50, seed=8):
+    """生成周季节 + 年季节 + 噪声的序列矩阵"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2022-01-01', periods=n_days, freq='D')
+    weekly = WEEKLY_PATTERN[np.asarray(dates.dayofweek)]
+    yearly = 5 * np.sin(2 * np.pi * (np.asarray(dates.dayofyear) - 100) / 365)
+    values = 30 + weekly[:, None] + yearly[:, None] + rng.normal(0, 1, (n_days, n_series))
+    return values, dates
+
+def test_moving_average_matches_pandas():
+    """测试居中移动平均与pandas rolling一致（奇数和偶数窗口）"""
+    values, _ = make_series(n_days=60, n_series=5)
+    ma7 = SeasonalDecomposer.centered_moving_average(values, 7)
+    expected7 = pd.DataFrame(values).rolling(7, center=True).mean().to_numpy()
+    assert np.allclose(ma7, expected7, equal_nan=True)
+
+    ma12 = SeasonalDecomposer.centered_moving_average(values, 12)
+    expected12 = pd.DataFrame(values).rolling(12).mean().rolling(2).mean().shift(-6).to_numpy()
+    assert np.allclose(ma12, expected12, equal_nan=True)
+
+def test_weekly_index_matches_groupby():
+    """测试周季节指数与按星期groupby的去趋势均值一致"""
+    values, dates = make_series(n_days=120, n_series=3)
+    result = SeasonalDecomposer.decompose(values, dates)
+    detrended = pd.DataFrame(values - result['trend'])
+    expected = detrended.groupby(np.asarray(dates.dayofweek)).mean()
+    expected = expected - expected.mean()
+    assert np.allclose(result['weekly_index'], expected.to_numpy())
+    assert np.allclose(result['weekly_index'].sum(axis=0), 0)
+
+def test_detects_weekly_and_yearly_seasonality():
+    """测试识别周、年季节性的峰谷"""
+    values, dates = make_series()
+    results = SeasonalDecomposer.analyze(values, dates, [f'C{i}' for i in range(50)], '品类')
+    summary = results['summary']
+
+    assert (summary['周季节强度'] > 0.5).all()
+    assert (summary['峰值星期'] == '周六').all()
+    assert (summary['低谷星期'] == '周日').all()
+    assert (summary['年季节强度'] > 0.5).all()
+    assert summary['旺季月份'].isin(['6月', '7月']).all()
+    assert results['monthly_index'].shape == (12, 50)
+
+    # 数据不足两年时不做年季节性分解
+    short = SeasonalDecomposer.analyze(values[:200], dates[:200], [f'C{i}' for i in range(50)])
+    assert short['monthly_index'] is None and '年季节强度' not in short['summary'].columns
+    assert SeasonalDecomposer.analyze(values[:10], dates[:10], ['C0'] * 50) == {}
+
+def test_trend_and_suggestions():
+    """测试趋势识别并并入出库优化建议"""
+    dates = pd.date_range('2024-01-01', periods=120, freq='D')
+    growth = np.linspace(100, 200, 120)
+    daily = pd.DataFrame({'日期': dates, '订单数/天': growth + WEEKLY_PATTERN[np.asarray(dates.dayofweek)] * 5})
+    # 删除部分日期，验证补齐为日历连续序列
+    daily = daily.drop(index=[10, 11, 50]).reset_index(drop=True)
+
+    matrix = SeasonalDecomposer.frame_to_matrix(daily, '日期', ['订单数/天'])
+    assert matrix['values'].shape == (120, 1)
+    assert matrix['values'][10, 0] == 0
+
+    results = SeasonalDecomposer.analyze(matrix['values'], matrix['dates'], ['订单数/天'], '指标')
+    assert results['summary'].loc[0, '趋势变化(%/30天)'] > 5
+
+    analyzer = OutboundAnalyzer({})
+    summary = analyzer.generate_summary_statistics(daily, '日期')
+    suggestions = analyzer.generate_optimization_suggestions(daily, summary, results['summary'])
+    assert any(s.startswith('📈 订单数/天去除季节性后趋势上升') for s in suggestions)
+    assert any(s.startswith('🗓️ 订单数/天存在明显周季节性') for s in suggestions)
+
+def test_day_key_matrix():
+    """测试(天, 键)矩阵与无键汇总序列"""
+    df = pd.DataFrame({
+        '日期': ['2024-01-01', '2024-01-01', '2024-01-03', None],
+        '品类': ['A', 'B', 'A', 'A'],
+        '件数': [2, 3, 4, 5]
+    })
+    matrix = TimeSeriesKernel.day_key_matrix(df, '日期', '品类', '件数')
+    assert matrix['values'].tolist() == [[2, 3], [0, 0], [4, 0]]
+    assert list(matrix['keys']) == ['A', 'B']
+
+    total = TimeSeriesKernel.day_key_matrix(df, '日期', None)
+    assert total['values'][:, 0].tolist() == [2, 0, 1]
+
+if __name__ == "__main__":
+    test_moving_average_matches_pandas()
+    test_weekly_index_matches_groupby()
+    test_detects_weekly_and_yearly_seasonality()
+    test_trend_and_suggestions()
+    test_day_key_matrix()
+    print("🎉 季节性分解测试通过")
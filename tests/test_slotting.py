@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+储位优化测试
+验证储位距离表、按前缀和的连续储位分配与逐储位计算一致，以及COI排序、当前储位解析和行走节省
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.slotting import SlottingOptimizer
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+from config import SLOTTING_CONFIG
+
+GRID = {'aisles': 4, 'bays': 10, 'levels': 3}
+SKU_COLUMNS = {'sku': 'SKU', 'length': '长', 'width': '宽', 'height': '高', 'inventory': '库存', 'location': '储位'}
+
+def make_data(n_skus=150, n_lines=20000, seed=61):
+    """生成SKU尺寸/库存表（含重复SKU和无效尺寸）与出库明细"""
+    rng = np.random.default_rng(seed)
+    skus = [f'S{i:03d}' for i in range(n_skus)]
+    sku_df = pd.DataFrame({
+        'SKU': skus + skus[:10],
+        '长': rng.uniform(10, 60, n_skus + 10).round(1),
+        '宽': rng.uniform(10, 40, n_skus + 10).round(1),
+        '高': rng.uniform(5, 30, n_skus + 10).round(1),
+        '库存': rng.integers(0, 20, n_skus + 10),
+        '储位': [f'{a:02d}-{b:03d}-{c}' for a, b, c in zip(rng.integers(1, 5, n_skus + 10),
+                                                            rng.integers(1, 11, n_skus + 10),
+                                                            rng.integers(1, 4, n_skus + 10))]
+    })
+    sku_df.loc[3, '高'] = np.nan
+    weights = rng.pareto(1.0, n_skus) + 0.01
+    outbound = pd.DataFrame({'SKU': rng.choice(skus + ['X1'], n_lines, p=np.append(weights / weights.sum() * 0.99, 0.01))})
+    return sku_df, outbound
+
+def test_grid_and_assignment():
+    """测试距离表按距离升序，前缀和分配与逐储位平均一致"""
+    grid = {**SLOTTING_CONFIG['grid'], **GRID}
+    locations = SlottingOptimizer.location_grid(grid)
+    assert locations['distance'].size == 4 * SLOTTING_CONFIG['sides'] * 10 * 3
+    assert np.all(np.diff(locations['distance']) >= 0)
+    recomputed = SlottingOptimizer.travel_distance(grid, locations['aisle'], locations['bay'], locations['level'])
+    assert np.allclose(recomputed, locations['distance'])
+
+    slots = np.array([1, 3, 2, 50, 200, 1])
+    placement = SlottingOptimizer.assign(slots, locations['distance'])
+    cursor = 0
+    for index, count in enumerate(slots):
+        if cursor + count <= locations['distance'].size:
+            assert placement['assigned'][index]
+            assert np.isclose(placement['distance'][index], locations['distance'][cursor:cursor + count].mean())
+        else:
+            assert not placement['assigned'][index]
+        cursor += count
+
+def test_coi_order_and_savings():
+    """测试SKU按体积/拣选频次排序，COI分配的行走距离低于随机分配和当前储位"""
+    sku_df, outbound = make_data()
+    results = SlottingOptimizer({}).analyze(sku_df, SKU_COLUMNS, 'cm', outbound, 'SKU', GRID)
+    summary = results['summary']
+    table = results['sku_table']
+
+    stock = sku_df.groupby('SKU')['库存'].sum()
+    first = sku_df.drop_duplicates('SKU').set_index('SKU')
+    volume = first['长'] * first['宽'] * first['高'] * 1000 * np.maximum(stock, 1)
+    picks = outbound['SKU'].value_counts().reindex(volume.index, fill_value=0)
+    coi = (volume / picks).replace(np.inf, np.nan).dropna().drop('S003', errors='ignore')
+    ranked = table[np.isfinite(table['COI(m³/次)'])]['SKU']
+    assert list(ranked) == list(coi.sort_values(kind='stable').index)
+
+    assert summary['invalid_dimension_skus'] == 1
+    assert summary['unknown_outbound_lines'] == (outbound['SKU'] == 'X1').sum()
+    assert summary['coi_travel'] < summary['random_travel']
+    assert summary['current_compared_skus'] > 0 and summary['current_travel'] > summary['current_compared_coi_travel']
+
+    # 储位表与SKU表一致
+    location_table = results['location_table']
+    assert (location_table['SKU'] != '').sum() == summary['used_locations']
+    assert np.isclose(results['band_table']['拣选频次占比(%)'].sum(), 100)
+
+def test_equal_volume_is_optimal():
+    """测试体积相同的单储位SKU：COI即按拣选频次降序，行走距离等于重排不等式下的最优值"""
+    rng = np.random.default_rng(5)
+    sku_df = pd.DataFrame({'SKU': [f'S{i}' for i in range(60)], '长': 10, '宽': 10, '高': 10})
+    outbound = pd.DataFrame({'SKU': rng.choice(sku_df['SKU'], 5000, p=rng.dirichlet(np.ones(60)))})
+    columns = {'sku': 'SKU', 'length': '长', 'width': '宽', 'height': '高'}
+    results = SlottingOptimizer({}).analyze(sku_df, columns, 'cm', outbound, 'SKU', GRID)
+
+    grid = {**SLOTTING_CONFIG['grid'], **GRID}
+    distance = SlottingOptimizer.location_grid(grid)['distance'][:60]
+    picks = np.sort(outbound['SKU'].value_counts().reindex(sku_df['SKU'], fill_value=0).to_numpy())[::-1]
+    assert np.isclose(results['summary']['coi_travel'], (picks * distance).sum())
+    assert results['sku_table']['拣选频次'].is_monotonic_decreasing
+
+def test_grid_smaller_than_distance_bands():
+    """测试储位数少于距离分段数的小网格（1巷道×2列×1层）仍能完成分析"""
+    sku_df = pd.DataFrame({'SKU': ['A', 'B', 'C'], '长': 10, '宽': 10, '高': 10})
+    outbound = pd.DataFrame({'SKU': ['A'] * 5 + ['B'] * 3 + ['C']})
+    columns = {'sku': 'SKU', 'length': '长', 'width': '宽', 'height': '高'}
+    grid = {'aisles': 1, 'bays': 2, 'levels': 1}
+    n_locations = SLOTTING_CONFIG['sides'] * 2
+    assert n_locations < SLOTTING_CONFIG['distance_bands']
+    with patch('core.slotting.st') as mock_st:
+        results = SlottingOptimizer({}).analyze(sku_df, columns, 'cm', outbound, 'SKU', grid)
+        mock_st.error.assert_not_called()
+    band_table = results['band_table']
+    assert len(band_table) == n_locations
+    assert band_table['储位数'].sum() == n_locations
+    assert np.isclose(band_table['拣选频次占比(%)'].sum(), 100)
+
+def test_parse_locations():
+    """测试储位编码解析（编号从1开始，超出网格无效）"""
+    grid = {**SLOTTING_CONFIG['grid'], **GRID}
+    parsed = SlottingOptimizer.parse_locations(pd.Series(['01-001-1', 'A04-R10-L3', '05-001-1', 'X', None]), grid)
+    assert list(parsed['valid']) == [True, True, False, False, False]
+    assert (parsed['aisle'][1], parsed['bay'][1], parsed['level'][1]) == (3, 9, 2)
+
+def test_engine_slotting(run_engine):
+    """测试分析引擎以当前工作表为SKU表、从另一张工作表加载出库历史"""
+    sku_df, outbound = make_data()
+    engine = AnalysisEngine(sku_df)
+    config = {
+        '储位优化分析_sku_column': 'SKU', '储位优化分析_length_column': '长', '储位优化分析_width_column': '宽',
+        '储位优化分析_height_column': '高', '储位优化分析_inventory_column': '无数据', '储位优化分析_data_unit': 'cm',
+        '储位优化分析_location_column': '无数据', '储位优化分析_sheet': '出库', '储位优化分析_sheet_sku_column': 'SKU',
+        '储位优化分析_aisles': 4, '储位优化分析_bays': 10, '储位优化分析_levels': 3
+    }
+    results = run_engine(engine, "储位优化分析", config, ['core.slotting'],
+                         sheets={'出库': outbound}, current_sheet='SKU')
+    assert results['summary']['location_count'] == 240 and 'current_travel' not in results['summary']
+
+if __name__ == "__main__":
+    test_grid_and_assignment()
+    test_coi_order_and_savings()
+    test_equal_volume_is_optimal()
+    test_grid_smaller_than_distance_bands()
+    test_parse_locations()
+    test_engine_slotting(run_dimension)
+    print("🎉 储位优化测试通过")
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+出入库对账测试
+验证区间推算的在库量、缺货天数、积压天数与逐SKU稠密逐日计算一致，期初库存（快照或按首次入库前缺口推定），以及跨工作表执行
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.stock_reconciliation import StockReconciler
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+COLUMNS = {'date': '日期', 'sku': 'SKU', 'quantity': '数量'}
+
+def make_flows(n_skus=40, n_days=90, seed=11):
+    """生成入库、出库明细（包含仅入库和仅出库的SKU、无效日期）"""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2024-01-01')
+    inbound = pd.DataFrame({
+        '日期': start + pd.to_timedelta(rng.integers(0, n_days, 600), unit='D'),
+        'SKU': rng.choice([f'S{i:02d}' for i in range(n_skus - 1)], 600),
+        '数量': rng.integers(5, 30, 600)
+    })
+    outbound = pd.DataFrame({
+        '日期': start + pd.to_timedelta(rng.integers(0, n_days, 2000), unit='D'),
+        'SKU': rng.choice([f'S{i:02d}' for i in range(1, n_skus)], 2000),
+        '数量': rng.integers(1, 10, 2000)
+    })
+    outbound.loc[5, '日期'] = None
+    return inbound, outbound
+
+def dense_reference(inbound, outbound, excess_cover_days, opening=None):
+    """逐SKU稠密逐日计算（参考实现）；opening为空时期初库存取首次入库日（含当天）及之前累计净流量的最大缺口"""
+    dates = pd.date_range(min(inbound['日期'].min(), outbound['日期'].min()),
+                          max(inbound['日期'].max(), outbound['日期'].max()), freq='D')
+    flows = pd.concat([
+        inbound.assign(净=inbound['数量']),
+        outbound.dropna(subset=['日期']).assign(净=-outbound['数量'])
+    ])
+    net = flows.pivot_table(index='日期', columns='SKU', values='净', aggfunc='sum', fill_value=0)
+    stock = net.reindex(dates, fill_value=0).cumsum()
+    if opening is None:
+        first_inbound = inbound.groupby('SKU')['日期'].min().reindex(stock.columns)
+        before = pd.DataFrame({sku: stock.index <= day if pd.notna(day) else np.ones(len(stock), dtype=bool)
+                               for sku, day in first_inbound.items()}, index=stock.index)
+        opening = -stock.where(before).min().fillna(0).clip(upper=0)
+    stock = stock + opening.reindex(stock.columns, fill_value=0)
+    daily_out = outbound.groupby('SKU')['数量'].sum().reindex(stock.columns, fill_value=0) / len(dates)
+    excess = (stock > 0) & (stock > excess_cover_days * daily_out)
+    return stock, excess
+
+def test_matches_dense_reference():
+    """测试区间推算结果与稠密逐日计算一致"""
+    inbound, outbound = make_flows()
+    results = StockReconciler({'excess_cover_days': 10}).analyze(inbound, COLUMNS, outbound, COLUMNS)
+    stock, excess = dense_reference(inbound, outbound, 10)
+
+    table = results['sku_table'].set_index('SKU').loc[stock.columns]
+    assert np.allclose(table['期末库存'], stock.iloc[-1])
+    assert (table['缺货天数'].to_numpy() == (stock < 0).sum().to_numpy()).all()
+    assert (table['积压天数'].to_numpy() == excess.sum().to_numpy()).all()
+
+    daily = results['daily_table']
+    assert len(daily) == len(stock)
+    assert np.allclose(daily['推算库存'], stock.sum(axis=1))
+    assert (daily['缺货SKU数'].to_numpy() == (stock < 0).sum(axis=1).to_numpy()).all()
+    assert (daily['积压SKU数'].to_numpy() == excess.sum(axis=1).to_numpy()).all()
+
+    # 首次缺货日期
+    first = (stock < 0).idxmax().where((stock < 0).any())
+    assert (table['首次缺货日期'].fillna(pd.Timestamp(0)) == first.fillna(pd.Timestamp(0))).all()
+
+def test_opening_snapshot_and_mid_life_extract():
+    """测试库存快照作为期初库存，以及无快照时首次入库前的出库不计为缺货"""
+    inbound, outbound = make_flows()
+    snapshot = pd.DataFrame({'SKU': ['S01', 'S01', 'S02', 'X9'], '库存': [30, 20, 'bad', 99]})
+    results = StockReconciler({}).analyze(inbound, COLUMNS, outbound, COLUMNS, snapshot, {'sku': 'SKU', 'quantity': '库存'})
+    opening = pd.Series({'S01': 50.0})
+    stock, _ = dense_reference(inbound, outbound, 30, opening)
+    table = results['sku_table'].set_index('SKU').loc[stock.columns]
+    assert np.allclose(table['期末库存'], stock.iloc[-1])
+    assert (table['缺货天数'].to_numpy() == (stock < 0).sum().to_numpy()).all()
+    assert table.loc['S01', '期初库存'] == 50 and table.loc['S02', '期初库存'] == 0
+    assert results['summary']['opening_source'] == 'snapshot'
+    assert np.isclose(results['daily_table']['推算库存'].iloc[-1], stock.iloc[-1].sum())
+
+    # 中段截取：先出库10、再入库5，推定期初库存10，之后在库量为5，不缺货
+    inbound = pd.DataFrame({'日期': pd.to_datetime(['2024-01-05']), 'SKU': ['A'], '数量': [5]})
+    outbound = pd.DataFrame({'日期': pd.to_datetime(['2024-01-01', '2024-01-03']), 'SKU': ['A', 'A'], '数量': [4, 6]})
+    results = StockReconciler({}).analyze(inbound, COLUMNS, outbound, COLUMNS)
+    row = results['sku_table'].iloc[0]
+    assert (row['期初库存'], row['最低库存'], row['期末库存'], row['缺货天数']) == (10, 0, 5, 0)
+    assert results['summary']['stockout_skus'] == 0
+    assert results['summary']['opening_source'] == 'implied'
+
+    # 首次入库当天同时出库且出库多于入库：当天的缺口同样由推定的期初库存覆盖
+    inbound = pd.DataFrame({'日期': pd.to_datetime(['2024-01-02', '2024-01-04']), 'SKU': ['A', 'A'], '数量': [5, 4]})
+    outbound = pd.DataFrame({'日期': pd.to_datetime(['2024-01-02', '2024-01-04']), 'SKU': ['A', 'A'], '数量': [8, 6]})
+    row = StockReconciler({}).analyze(inbound, COLUMNS, outbound, COLUMNS)['sku_table'].iloc[0]
+    assert (row['期初库存'], row['最低库存'], row['期末库存'], row['缺货天数']) == (3, -2, -2, 1)
+
+def test_summary_and_status():
+    """测试仅入库/仅出库SKU识别与按行计数"""
+    inbound, outbound = make_flows()
+    results = StockReconciler({}).analyze(inbound, COLUMNS, outbound, COLUMNS)
+    table = results['sku_table'].set_index('SKU')
+    assert table.loc['S00', '状态'] == '仅入库'
+    assert table.loc['S39', '状态'] == '仅出库'
+    assert results['summary']['inbound_only_skus'] == 1
+    assert results['summary']['outbound_only_skus'] == 1
+
+    rows = StockReconciler({}).analyze(inbound, {'date': '日期', 'sku': 'SKU'}, outbound, {'date': '日期', 'sku': 'SKU'})
+    assert rows['summary']['inbound_total'] == len(inbound)
+    assert rows['summary']['outbound_total'] == len(outbound) - 1
+    assert StockReconciler({}).analyze(inbound.iloc[:0], COLUMNS, outbound.iloc[:0], COLUMNS) == {}
+
+def test_engine_loads_second_sheet(run_engine):
+    """测试分析引擎从同一文件的另一张工作表加载入库数据和期初库存快照"""
+    inbound, outbound = make_flows()
+    engine = AnalysisEngine(outbound)
+    config = {
+        '出入库对账分析_current_role': '出库',
+        '出入库对账分析_date_column': '日期', '出入库对账分析_sku_column': 'SKU', '出入库对账分析_quantity_column': '数量',
+        '出入库对账分析_sheet': '入库',
+        '出入库对账分析_sheet_date_column': '日期', '出入库对账分析_sheet_sku_column': 'SKU',
+        '出入库对账分析_sheet_quantity_column': '无数据'
+    }
+    sheets = {'入库': inbound, '期初': pd.DataFrame({'物料': ['S01', 'S02'], '库存': [100, 50]})}
+    summary = run_engine(engine, "出入库对账分析", config, ['core.stock_reconciliation'],
+                         sheets=sheets, current_sheet='出库')['summary']
+    assert summary['inbound_total'] == len(inbound)
+    assert summary['outbound_total'] == outbound['数量'].drop(index=5).sum()
+    assert summary['opening_source'] == 'implied'
+
+    # 另选一张期初库存快照工作表
+    config.update({'出入库对账分析_use_opening': True, '出入库对账分析_opening_sheet': '期初',
+                   '出入库对账分析_opening_sku_column': '物料', '出入库对账分析_opening_quantity_column': '库存'})
+    summary = run_engine(engine, "出入库对账分析", config, ['core.stock_reconciliation'],
+                         sheets=sheets, current_sheet='出库')['summary']
+    assert summary['opening_source'] == 'snapshot'
+    assert summary['opening_total'] == 150
+
+if __name__ == "__main__":
+    test_matches_dense_reference()
+    test_opening_snapshot_and_mid_life_extract()
+    test_summary_and_status()
+    test_engine_loads_second_sheet(run_dimension)
+    print("🎉 出入库对账测试通过")
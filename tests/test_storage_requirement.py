@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+存储需求测试
+验证SKU对齐索引、数组ABC分类与ABC分析一致，以及各存储策略按ABC类别汇总的容器数与逐个SKU装箱结果一致
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.key_index import KeyIndex
+from core.abc_analysis import ABCAnalyzer
+from core.packing_analysis import PackingAnalyzer
+from core.storage_requirement import StorageRequirementAnalyzer
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+CONTAINER = {'length': 600, 'width': 400, 'height': 300, 'weight_limit': 30}
+LOCATION = {'length': 1200, 'width': 1000, 'height': 700}
+COLUMNS = {'length': '长', 'width': '宽', 'height': '高', 'inventory': '库存', 'weight': None}
+
+def make_data(n_skus=300, seed=46):
+    """生成库存数据（含同一SKU多批次、零库存、缺失尺寸和装不下的SKU）"""
+    rng = np.random.default_rng(seed)
+    skus = [f'S{i:03d}' for i in range(n_skus)]
+    rows = rng.choice(skus, n_skus * 2)
+    rows[:n_skus] = skus
+    n = len(rows)
+    df = pd.DataFrame({
+        'SKU': rows,
+        '出库量': (rng.pareto(1.0, n) * 100).round(),
+        '长': rng.uniform(5, 40, n).round(1),
+        '宽': rng.uniform(5, 30, n).round(1),
+        '高': rng.uniform(2, 20, n).round(1),
+        '库存': rng.integers(0, 200, n),
+        '重量': rng.uniform(0.05, 3, n).round(2)
+    })
+    df.loc[df['SKU'] == 'S001', '库存'] = 0
+    df.loc[2, '高'] = np.nan
+    df.loc[3, '长'] = 90  # 超过容器长度
+    return df
+
+def test_key_index_matches_groupby():
+    """测试键列索引的求和与首行取值与groupby一致"""
+    df = make_data()
+    df.loc[5, 'SKU'] = np.nan
+    index = KeyIndex.for_frame(df, 'SKU')
+    assert KeyIndex.for_frame(df, 'SKU') is index
+    grouped = df.groupby('SKU', sort=False)
+    assert list(index.keys) == list(grouped.size().index)
+    assert np.allclose(index.sum(df['库存']), grouped['库存'].sum())
+    assert np.allclose(index.first_numeric(df['长']), grouped['长'].first(), equal_nan=True)
+
+def test_classify_matches_abc_analysis():
+    """测试数组ABC分类与calculate_abc_classification的分类一致"""
+    df = make_data()
+    index = KeyIndex.for_frame(df, 'SKU')
+    classes = ABCAnalyzer.classify(index.sum(df['出库量']), 70, 20)
+    expected = ABCAnalyzer({'a_percentage': 70, 'b_percentage': 20}).calculate_abc_classification(df, 'SKU', '出库量')
+    labels = pd.Series(np.array(['A', 'B', 'C'])[classes], index=index.keys)
+    assert (labels.loc[expected['SKU']].to_numpy() == expected['ABC分类'].to_numpy()).all()
+    assert set(labels.index.difference(expected['SKU'])) <= set(labels[labels == 'C'].index)
+
+def test_dedicated_matches_single_sku():
+    """测试专用容器数与逐个SKU装箱结果按类别汇总一致，共享容器不多于专用容器"""
+    df = make_data()
+    results = StorageRequirementAnalyzer({}).analyze(df, 'SKU', '出库量', COLUMNS, 'cm', CONTAINER, LOCATION,
+                                                     divider_counts=[4])
+    sku_table = results['sku_table']
+    analyzer = PackingAnalyzer(CONTAINER)
+    expected = {'A': 0, 'B': 0, 'C': 0}
+    first = df.drop_duplicates('SKU').set_index('SKU')
+    inventory = df.groupby('SKU', sort=False)['库存'].sum()
+    for row_index, sku in enumerate(first.index):
+        single = analyzer.analyze_single_sku(first.loc[sku, '长'] * 10, first.loc[sku, '宽'] * 10,
+                                             first.loc[sku, '高'] * 10, inventory[sku], row_index)
+        if single and np.isfinite(single['boxes_needed']) and inventory[sku] > 0:
+            expected[sku_table.loc[row_index, 'ABC分类']] += single['boxes_needed']
+
+    table = results['class_table'].set_index(['存储策略', 'ABC分类'])
+    for label, boxes in expected.items():
+        assert table.loc[('专用容器', label), '容器数'] == boxes
+        assert table.loc[('共享容器', label), '容器数'] <= boxes
+    assert table.loc[('专用容器', '合计'), '容器数'] == sku_table['专用容器数'].sum()
+    assert table.loc[('4隔口专用', '合计'), '容器数'] > 0
+    assert results['summary']['unfit_skus'] >= 1
+    assert results['summary']['no_stock_skus'] >= 1
+
+def test_policies_and_locations():
+    """测试隔口策略、共享容器的体积下限和每储位容器数"""
+    classes = np.array([0, 0, 1, 2])
+    dedicated = np.array([1, 2, 1, 3])
+    volume = np.array([0.1, 0.5, 0.2, 1.0]) * 600 * 400 * 300
+    compartments = np.array([1, 3, 2, 5])
+    divided = StorageRequirementAnalyzer.policy_containers('divided', classes, volume, None, dedicated, CONTAINER,
+                                                           compartments, 4)
+    assert list(divided) == [1, 1, 2]
+    shared = StorageRequirementAnalyzer.policy_containers('shared', classes, volume, None, dedicated, CONTAINER)
+    assert list(shared) == [1, 1, 2]
+    heavy = StorageRequirementAnalyzer.policy_containers('shared', classes, volume, np.array([10, 50, 1, 1.0]),
+                                                         dedicated, CONTAINER)
+    assert list(heavy) == [2, 1, 2]
+    assert StorageRequirementAnalyzer.divided_container(CONTAINER, 4)['length'] == 150
+
+    df = make_data()
+    results = StorageRequirementAnalyzer({}).analyze(df, 'SKU', '出库量', COLUMNS, 'cm', CONTAINER, LOCATION)
+    assert results['summary']['containers_per_location'] == 3 * 3 * 1  # 容器旋转为400×300×600
+    table = results['class_table']
+    classes = table[table['ABC分类'] != '合计']
+    totals = table[table['ABC分类'] == '合计'].set_index('存储策略')
+    assert np.array_equal(classes['储位数'], np.ceil(classes['容器数'] / 9))
+    assert np.array_equal(classes.groupby('存储策略', sort=False)['储位数'].sum(), totals['储位数'])
+
+def test_engine_storage_requirement(run_engine):
+    """测试分析引擎执行存储需求分析"""
+    df = make_data()
+    engine = AnalysisEngine(df)
+    config = {
+        '存储需求分析_sku_column': 'SKU', '存储需求分析_quantity_column': '出库量', '存储需求分析_length_column': '长',
+        '存储需求分析_width_column': '宽', '存储需求分析_height_column': '高', '存储需求分析_inventory_column': '库存',
+        '存储需求分析_weight_column': '重量', '存储需求分析_data_unit': 'cm', '存储需求分析_weight_unit': 'kg',
+        '存储需求分析_a_percentage': 70, '存储需求分析_b_percentage': 20, '存储需求分析_divider_counts': [2, 4],
+        '存储需求分析_container_length': 600, '存储需求分析_container_width': 400,
+        '存储需求分析_container_height': 300, '存储需求分析_container_weight_limit': 30
+    }
+    results = run_engine(engine, "存储需求分析", config, ['core.storage_requirement'])
+    assert results['summary']['policies'] == ['专用容器', '共享容器', '2隔口专用', '4隔口专用']
+
+if __name__ == "__main__":
+    test_key_index_matches_groupby()
+    test_classify_matches_abc_analysis()
+    test_dedicated_matches_single_sku()
+    test_policies_and_locations()
+    test_engine_storage_requirement(run_dimension)
+    print("🎉 存储需求测试通过")
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+供应商表现测试
+验证按供应商编码一次汇总的交货次数、交期统计、分位数和准时交货率与groupby参考实现一致，以及日期范围过滤和综合排名
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+from datetime import date
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.supplier_performance import SupplierPerformanceAnalyzer
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+def make_receipts(n=20000, n_suppliers=60, seed=48):
+    """生成入库明细（含空供应商、缺失下单日期、无效入库日期和入库单号）"""
+    rng = np.random.default_rng(seed)
+    supplier = rng.integers(0, n_suppliers, n)
+    receipt = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 500, n), unit='D')
+    lead = rng.poisson(2 + supplier % 10)
+    df = pd.DataFrame({
+        '供应商': [f'V{code:02d}' for code in supplier],
+        '入库日期': (receipt + pd.to_timedelta(rng.integers(0, 20, n), unit='h')).astype(object),
+        '下单日期': (receipt - pd.to_timedelta(lead, unit='D')).astype(object),
+        '入库单号': [f'R{code}' for code in rng.integers(0, 3, n)],
+        '件数': rng.integers(1, 100, n),
+        '箱数': rng.integers(1, 6, n)
+    })
+    df.loc[:9, '供应商'] = None
+    df.loc[10:49, '下单日期'] = None
+    df.loc[50:59, '入库日期'] = 'bad'
+    return df
+
+def reference(df, on_time_days, delivery_column=None):
+    """按供应商、交货分组的参考实现"""
+    data = df.assign(入库日期=pd.to_datetime(df['入库日期'], errors='coerce')).dropna(subset=['供应商', '入库日期'])
+    data['入库日'] = data['入库日期'].dt.normalize()
+    data['交期'] = (data['入库日'] - pd.to_datetime(data['下单日期']).dt.normalize()).dt.days
+    keys = ['供应商', '入库日'] + ([delivery_column] if delivery_column else [])
+    delivery = data.groupby(keys).agg(最大交期=('交期', 'max'), 有交期=('交期', 'count')).reset_index()
+    measured = delivery[delivery['有交期'] > 0]
+    grouped = data.groupby('供应商')
+    table = pd.DataFrame({
+        '交货次数': delivery.groupby('供应商').size(),
+        '行数': grouped.size(),
+        '件数': grouped['件数'].sum(),
+        '箱数': grouped['箱数'].sum(),
+        '平均交期(天)': grouped['交期'].mean(),
+        '交期标准差(天)': grouped['交期'].std(ddof=0),
+        '交期P90(天)': grouped['交期'].quantile(0.9, interpolation='lower'),
+        '准时交货率(%)': (measured['最大交期'] <= on_time_days).groupby(measured['供应商']).mean() * 100
+    })
+    return table
+
+def test_analyze_matches_groupby():
+    """测试各项供应商指标与groupby参考实现一致"""
+    df = make_receipts()
+    with patch('core.supplier_performance.st'):
+        results = SupplierPerformanceAnalyzer({}).analyze(df, '供应商', '入库日期', '下单日期', '件数', '箱数',
+                                                          on_time_days=5)
+    table = results['supplier_table'].set_index('供应商')
+    expected = reference(df, 5).loc[table.index]
+    for column in expected.columns:
+        assert np.allclose(table[column], expected[column]), column
+    summary = results['summary']
+    assert summary['supplier_count'] == 60
+    assert summary['line_count'] == expected['行数'].sum()
+    assert summary['lead_lines'] == summary['line_count'] - 40
+    assert table['每次交货件数'].equals(table['件数'] / table['交货次数'])
+
+def test_delivery_column_and_date_range():
+    """测试按入库单号区分交货，以及按入库日期范围过滤"""
+    df = make_receipts()
+    with patch('core.supplier_performance.st'):
+        results = SupplierPerformanceAnalyzer({}).analyze(df, '供应商', '入库日期', '下单日期', delivery_column='入库单号',
+                                                          start_date=date(2023, 3, 1), end_date=date(2023, 5, 31))
+    receipt = pd.to_datetime(df['入库日期'], errors='coerce')
+    in_range = df[(receipt >= '2023-03-01') & (receipt < '2023-06-01')]
+    expected = reference(in_range, 7, '入库单号')
+    table = results['supplier_table'].set_index('供应商').loc[expected.index]
+    assert np.array_equal(table['交货次数'], expected['交货次数'])
+    assert np.allclose(table['准时交货率(%)'], expected['准时交货率(%)'])
+    assert np.array_equal(table['件数'], table['行数'])  # 未选择件数列时每行计1件
+    assert table['最近入库日期'].max() <= pd.Timestamp('2023-05-31')
+
+def test_group_percentiles_and_ranking():
+    """测试分组分位数与排名规则"""
+    rng = np.random.default_rng(1)
+    codes = rng.integers(0, 5, 1000)
+    values = rng.integers(-3, 30, 1000).astype(float)
+    result = SupplierPerformanceAnalyzer.group_percentiles(codes, values, 6, [0, 50, 90, 100])
+    for code in range(5):
+        expected = np.percentile(values[codes == code], [0, 50, 90, 100], method='lower')
+        assert np.array_equal(result[code], expected)
+    assert np.isnan(result[5]).all()
+
+    df = make_receipts()
+    with patch('core.supplier_performance.st'):
+        results = SupplierPerformanceAnalyzer({}).analyze(df, '供应商', '入库日期', '下单日期')
+    table = results['supplier_table']
+    assert table['排名'].iloc[0] == 1
+    assert table['综合得分'].dropna().is_monotonic_decreasing
+    # 交期最短、最稳定的供应商（编号个位为0）排在前面
+    top = table.head(6)['供应商'].str[-1]
+    assert (top == '0').sum() >= 4
+
+def test_engine_supplier_performance(run_engine):
+    """测试分析引擎在入库分析中输出供应商表现（未选择供应商列时跳过）"""
+    df = make_receipts()
+    engine = AnalysisEngine(df)
+    config = {'入库分析_date_column': '入库日期', '入库分析_quantity_column': '件数',
+              '入库分析_supplier_column': '供应商', '入库分析_reference_date_column': '下单日期',
+              '入库分析_delivery_column': '无数据', '入库分析_box_column': '箱数', '入库分析_on_time_days': 5}
+    results = run_engine(engine, "入库分析", config, ['core.inbound_analysis', 'core.supplier_performance'])["supplier_performance"]
+    assert engine._render_supplier_performance({'入库分析_supplier_column': '无数据'}, '入库日期', '件数') == {}
+    assert results['summary']['ranked_suppliers'] == 60
+    assert results['summary']['on_time_days'] == 5
+
+if __name__ == "__main__":
+    test_analyze_matches_groupby()
+    test_delivery_column_and_date_range()
+    test_group_percentiles_and_ranking()
+    test_engine_supplier_performance(run_dimension)
+    print("🎉 供应商表现测试通过")
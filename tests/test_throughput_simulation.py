@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+吞吐仿真测试
+验证逐日所需工作站数与逐个工作站数枚举一致、进程池结果与单进程一致，以及仿真相对均值测算的差异
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.throughput_simulation import ThroughputSimulator
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+def make_outbound(n_rows=30000, n_days=60, seed=53):
+    """生成带时分的出库明细（日量波动大，作业集中在8-21点）"""
+    rng = np.random.default_rng(seed)
+    day_weight = rng.gamma(2.0, 1.0, n_days)
+    days = rng.choice(n_days, n_rows, p=day_weight / day_weight.sum())
+    hours = rng.choice(np.arange(8, 22), n_rows)
+    return pd.DataFrame({
+        '出库时间': pd.Timestamp('2024-05-01') + pd.to_timedelta(days, unit='D') + pd.to_timedelta(hours, unit='h')
+                    + pd.to_timedelta(rng.integers(0, 3600, n_rows), unit='s'),
+        '件数': rng.integers(1, 6, n_rows)
+    })
+
+def brute_force_stations(load, capacity, backlog_hours):
+    """逐个工作站数模拟积压的参考实现"""
+    result = []
+    for day in load:
+        stations = 1
+        while True:
+            backlog, served = 0.0, True
+            for value in day:
+                backlog = max(backlog + value - stations * capacity, 0)
+                served &= backlog <= backlog_hours * stations * capacity
+            if served:
+                break
+            stations += 1
+        result.append(stations)
+    return np.array(result)
+
+def test_required_stations_match_brute_force():
+    """测试二分查找的所需工作站数与枚举一致"""
+    rng = np.random.default_rng(7)
+    load = rng.poisson(rng.uniform(0, 400, (300, 24))).astype(float)
+    for backlog_hours in [0.0, 0.5, 2.0]:
+        expected = brute_force_stations(load, 60.0, backlog_hours)
+        assert np.array_equal(ThroughputSimulator.required_stations(load, 60.0, backlog_hours), expected)
+    assert np.array_equal(ThroughputSimulator.required_stations(load, 60.0), np.maximum(np.ceil(load.max(axis=1) / 60), 1))
+
+def test_pool_matches_serial():
+    """测试进程池结果与单进程一致（每块随机流由SeedSequence派生，与进程数无关）"""
+    rng = np.random.default_rng(11)
+    matrix = rng.poisson(rng.uniform(0, 200, (40, 24)))
+    matrix[5] = 0  # 非作业日不参与抽样
+    profiles = ThroughputSimulator.workload_profiles(matrix)
+    assert profiles['daily_totals'].size == 39
+    assert np.allclose(profiles['hourly_shares'].sum(axis=1), 1)
+
+    with patch.dict('core.throughput_simulation.THROUGHPUT_SIMULATION_CONFIG',
+                    {'chunk_replications': 30, 'days_per_replication': 50}):
+        serial = ThroughputSimulator.simulate(profiles, 50.0, 0.95, 100, 1.0, seed=3, max_workers=1)
+        pooled = ThroughputSimulator.simulate(profiles, 50.0, 0.95, 100, 1.0, seed=3, max_workers=2)
+        other = ThroughputSimulator.simulate(profiles, 50.0, 0.95, 100, 1.0, seed=4, max_workers=1)
+
+    assert serial['stations'].size == 100
+    assert serial['daily_histogram'].sum() == 100 * 50
+    assert np.array_equal(serial['stations'], pooled['stations'])
+    assert np.array_equal(serial['daily_histogram'], pooled['daily_histogram'])
+    assert not np.array_equal(serial['daily_histogram'], other['daily_histogram'])
+
+def test_analyze_exceeds_average_sizing():
+    """测试波动较大时仿真推荐的工作站数不低于均值测算，服务水平曲线单调"""
+    df = make_outbound()
+    with patch.dict('core.throughput_simulation.THROUGHPUT_SIMULATION_CONFIG', {'days_per_replication': 60}):
+        results = ThroughputSimulator({'max_workers': 1}).analyze(df, '出库时间', '件数', '件数', 40, 1.5, 0.95, 500)
+    summary = results['summary']
+    assert summary['capacity'] == 60
+    assert summary['operating_days'] == 60
+    assert summary['recommended_stations'] >= summary['median_stations'] > summary['average_stations']
+    assert results['service_curve']['满足天数占比(%)'].is_monotonic_increasing
+    assert np.isclose(results['service_curve']['满足天数占比(%)'].iloc[-1], 100)
+    assert results['station_table']['重复次数'].sum() == 500
+
+    # 缺少件数列时无法按件数测算
+    assert ThroughputSimulator({}).analyze(df, '出库时间', None, '件数', 40, 1.0, 0.95, 10) == {}
+
+def test_engine_throughput_simulation(run_engine):
+    """测试分析引擎执行吞吐仿真"""
+    df = make_outbound()
+    engine = AnalysisEngine(df)
+    config = {
+        '吞吐仿真分析_datetime_column': '出库时间', '吞吐仿真分析_quantity_column': '无数据',
+        '吞吐仿真分析_workload': '行数', '吞吐仿真分析_picks_per_hour': 50, '吞吐仿真分析_hit_rate': 1.0,
+        '吞吐仿真分析_backlog_hours': 0.5, '吞吐仿真分析_service_level': 0.9, '吞吐仿真分析_replications': 200,
+        'max_workers': 1
+    }
+    results = run_engine(engine, "吞吐仿真分析", config, ['core.throughput_simulation'])
+    assert results['summary']['replications'] == 200
+
+if __name__ == "__main__":
+    test_required_stations_match_brute_force()
+    test_pool_matches_serial()
+    test_analyze_exceeds_average_sizing()
+    test_engine_throughput_simulation(run_dimension)
+    print("🎉 吞吐仿真测试通过")
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+时间序列聚合内核测试
+验证共享内核与原pandas按日groupby结果一致
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.time_series_kernel import TimeSeriesKernel, MISSING_DAY_CODE
+from core.outbound_analysis import OutboundAnalyzer
+from core.inbound_analysis import InboundAnalyzer
+
+def make_outbound_lines(n_rows=5000, seed=7):
+    """生成带时分秒的出库明细数据"""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2024-01-01T00:00')
+    minutes = rng.integers(0, 60 * 24 * 40, n_rows)
+    return pd.DataFrame({
+        '出库时间': pd.to_datetime(start + minutes.astype('timedelta64[m]')),
+        '订单号': [f'SO{i:05d}' for i in rng.integers(0, 1500, n_rows)],
+        'SKU': [f'SKU{i:04d}' for i in rng.integers(0, 300, n_rows)],
+        '件数': rng.integers(1, 20, n_rows)
+    })
+
+def reference_daily(df, date_column, metrics):
+    """原实现：按.dt.date分组聚合"""
+    grouped = df.assign(**{date_column: pd.to_datetime(df[date_column]).dt.date}).groupby(date_column)
+    result = pd.DataFrame({name: grouped[col].agg(func) for name, (col, func) in metrics.items()})
+    result.index = pd.to_datetime(result.index)
+    return result.sort_index()
+
+def test_day_codes():
+    """测试日期编码"""
+    codes = TimeSeriesKernel.to_day_codes(pd.Series([pd.Timestamp('1970-01-02 23:59'), pd.Timestamp('2024-01-01'), None]))
+    assert codes.dtype == np.int32
+    assert codes[0] == 1
+    assert codes[1] == 19723
+    assert codes[2] == MISSING_DAY_CODE
+    assert TimeSeriesKernel.day_codes_to_datetime(codes[:2])[1] == pd.Timestamp('2024-01-01')
+
+def test_count_distinct_by_group():
+    """测试排序去重计数"""
+    group_idx = np.array([0, 0, 0, 1, 1, 2])
+    key_codes = np.array([3, 3, 1, 1, -1, 2])
+    counts = TimeSeriesKernel.count_distinct_by_group(group_idx, key_codes, 4, 4)
+    assert counts.tolist() == [2, 1, 1, 0]
+
+def test_aggregate_daily_matches_groupby():
+    """测试聚合结果与pandas groupby一致"""
+    df = make_outbound_lines()
+    metrics = {
+        '订单数/天': ('订单号', 'nunique'),
+        'SKU数/天': ('SKU', 'nunique'),
+        '件数/天': ('件数', 'sum')
+    }
+    daily = TimeSeriesKernel.aggregate_daily(df, '出库时间', metrics)
+    expected = reference_daily(df, '出库时间', metrics)
+
+    assert list(daily.columns) == ['出库时间', '订单数/天', 'SKU数/天', '件数/天']
+    assert len(daily) == len(expected)
+    assert (daily['出库时间'].to_numpy() == expected.index.to_numpy()).all()
+    for name in metrics:
+        assert daily[name].dtype == np.int64
+        assert (daily[name].to_numpy() == expected[name].to_numpy()).all()
+
+    print(f"✅ 聚合内核与groupby一致：{len(daily)} 天")
+
+def test_analyzers_share_kernel():
+    """测试出入库分析器的增强聚合结果"""
+    df = make_outbound_lines(n_rows=800)
+    df.loc[5, 'SKU'] = None
+
+    outbound_daily = OutboundAnalyzer({}).aggregate_daily_data_enhanced(
+        df, '出库时间', order_id_column='订单号', sku_column='SKU', item_column='件数'
+    )
+    inbound_daily = InboundAnalyzer({}).aggregate_daily_data_enhanced(
+        df, '出库时间', sku_column='SKU', quantity_column='件数'
+    )
+
+    assert (outbound_daily['SKU数/天'].to_numpy() == inbound_daily['SKU数/天'].to_numpy()).all()
+    assert outbound_daily['件数/天'].sum() == df['件数'].sum()
+    assert outbound_daily['SKU数/天'].sum() == df.dropna(subset=['SKU']).assign(
+        d=df['出库时间'].dt.date).groupby('d')['SKU'].nunique().sum()
+
+if __name__ == "__main__":
+    test_day_codes()
+    test_count_distinct_by_group()
+    test_aggregate_daily_matches_groupby()
+    test_analyzers_share_kernel()
+    print("🎉 时间序列聚合内核测试通过")
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+分区拆单测试
+验证稀疏矩阵得到的订单涉及分区数与按订单分组去重计数一致，以及ABC/均分/字段分区的划分、矩阵缓存和合流工作量
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.order_sku_matrix import OrderSkuMatrix
+from core.key_index import KeyIndex
+from core.zone_split import ZoneSplitAnalyzer
+from core.analysis_engine import AnalysisEngine
+from tests.helpers import run_dimension
+
+def make_orders(n_orders=3000, n_skus=400, seed=83):
+    """生成订单明细（含同单重复SKU、缺失SKU和部分SKU缺失温区）"""
+    rng = np.random.default_rng(seed)
+    lines = rng.geometric(0.4, n_orders)
+    weights = rng.pareto(1.0, n_skus) + 0.01
+    sku_ids = rng.choice(n_skus, lines.sum(), p=weights / weights.sum())
+    temperature = np.array(['常温', '冷藏', '冷冻'])[np.arange(n_skus) % 3]
+    df = pd.DataFrame({
+        '订单号': np.repeat([f'O{i:05d}' for i in range(n_orders)], lines),
+        'SKU': [f'S{i:03d}' for i in sku_ids],
+        '温区': temperature[sku_ids]
+    })
+    df.loc[df['SKU'] == 'S005', '温区'] = None
+    df.loc[7, 'SKU'] = None
+    return df
+
+def reference_zones_per_order(df, zone_of_sku):
+    """按订单分组统计不同分区数的参考实现"""
+    lines = df.dropna(subset=['订单号', 'SKU'])
+    return lines.assign(分区=lines['SKU'].map(zone_of_sku)).groupby('订单号')['分区'].nunique()
+
+def test_zones_per_order_match_groupby():
+    """测试订单×分区关联矩阵每行非零元个数与分组去重计数一致"""
+    df = make_orders()
+    matrix = OrderSkuMatrix.for_frame(df, '订单号', 'SKU')
+    assert OrderSkuMatrix.for_frame(df, '订单号', 'SKU') is matrix
+    assert matrix.skus is KeyIndex.for_frame(df, 'SKU').keys  # 订单、SKU编码复用键列索引
+    assert matrix.line_count == df['SKU'].notna().sum()
+    assert matrix.matrix.sum() == matrix.line_count
+    assert np.array_equal(matrix.sku_lines, df['SKU'].value_counts().reindex(matrix.skus).to_numpy())
+
+    rng = np.random.default_rng(3)
+    sku_zones = rng.integers(0, 7, matrix.n_skus)
+    profile = ZoneSplitAnalyzer.split_profile(matrix, sku_zones, 7)
+    expected = reference_zones_per_order(df, dict(zip(matrix.skus, sku_zones)))
+    actual = pd.Series(profile['zones_per_order'], index=matrix.orders)
+    actual = actual[actual > 0].sort_index()
+    expected = expected.sort_index()
+    assert actual.index.equals(expected.index) and np.array_equal(actual, expected)
+    assert actual.max() > 2
+    assert profile['zone_lines'].sum() == matrix.line_count
+
+    # 各分区订单数、跨区订单数
+    zone_frame = df.dropna(subset=['SKU']).assign(分区=lambda x: x['SKU'].map(dict(zip(matrix.skus, sku_zones))))
+    zone_frame['跨区'] = zone_frame['订单号'].map(expected) > 1
+    by_zone = zone_frame.drop_duplicates(['订单号', '分区']).groupby('分区')
+    assert np.array_equal(profile['zone_orders'], by_zone.size().reindex(range(7), fill_value=0).to_numpy())
+    assert np.array_equal(profile['zone_split_orders'],
+                          by_zone['跨区'].sum().reindex(range(7), fill_value=0).to_numpy())
+
+def test_zoning_rules():
+    """测试ABC分区与ABC分析规则一致、均分分区拣选行数均衡、字段分区处理空值"""
+    sku_lines = np.array([50, 0, 30, 10, 5, 5])
+    zones, labels = ZoneSplitAnalyzer.abc_zones(sku_lines, 50, 30)
+    assert labels == ['A', 'B', 'C'] and list(zones) == [0, 2, 1, 2, 2, 2]
+
+    rng = np.random.default_rng(9)
+    skus = pd.Index([f'S{i:04d}' for i in rng.permutation(1000)])
+    sku_lines = rng.integers(1, 20, 1000)
+    zones, labels = ZoneSplitAnalyzer.balanced_zones(skus, sku_lines, 4)
+    assert len(labels) == 4
+    order = np.argsort(np.asarray(skus))
+    assert np.all(np.diff(zones[order]) >= 0)
+    shares = np.bincount(zones, weights=sku_lines) / sku_lines.sum()
+    assert np.all(np.abs(shares - 0.25) < 0.02)
+
+    df = make_orders()
+    matrix = OrderSkuMatrix.for_frame(df, '订单号', 'SKU')
+    zones, labels = ZoneSplitAnalyzer.attribute_zones(df, 'SKU', '温区', matrix.skus)
+    assert labels[-1] == '未分区'
+    assert labels[zones[list(matrix.skus).index('S005')]] == '未分区'
+    assert labels[zones[list(matrix.skus).index('S001')]] == '冷藏'
+
+def test_analyze_tables():
+    """测试方案对比表、分布表与合流工作量的一致性"""
+    df = make_orders()
+    results = ZoneSplitAnalyzer({}).analyze(df, '订单号', 'SKU', ['温区'], [1, 4, 2], (70, 20))
+    table = results['zoning_table'].set_index('分区方案')
+    assert list(table.index) == ['ABC分区', '按温区', '均分1区', '均分2区', '均分4区']
+    assert results['summary']['order_count'] == df.dropna(subset=['SKU'])['订单号'].nunique()
+
+    # 只有一个分区时没有拆单
+    assert table.loc['均分1区', '拆单率(%)'] == 0 and table.loc['均分1区', '需合流子订单数'] == 0
+    assert table.loc['均分4区', '拆单率(%)'] > table.loc['均分2区', '拆单率(%)']
+
+    distribution = results['distribution_table']
+    for name, group in distribution.groupby('分区方案'):
+        assert np.isclose(group['订单占比(%)'].sum(), 100)
+        sub_orders = (group['涉及分区数'] * group['订单数']).sum()
+        assert sub_orders == table.loc[name, '子订单数']
+        single = group.loc[group['涉及分区数'] == 1, '订单数'].sum()
+        assert table.loc[name, '需合流子订单数'] == sub_orders - single
+
+    zone_table = results['zone_table']
+    assert (zone_table.groupby('分区方案')['拣选行数'].sum() == results['summary']['line_count']).all()
+
+def test_engine_zone_split(run_engine):
+    """测试分析引擎执行分区拆单分析"""
+    df = make_orders()
+    engine = AnalysisEngine(df)
+    config = {
+        '分区拆单分析_order_column': '订单号', '分区拆单分析_sku_column': 'SKU',
+        '分区拆单分析_zone_columns': ['温区'], '分区拆单分析_use_abc': False, '分区拆单分析_zone_counts': [2, 3]
+    }
+    results = run_engine(engine, "分区拆单分析", config, ['core.zone_split'])
+    assert len(results['zoning_table']) == 3
+
+if __name__ == "__main__":
+    test_zones_per_order_match_groupby()
+    test_zoning_rules()
+    test_analyze_tables()
+    test_engine_zone_split(run_dimension)
+    print("🎉 分区拆单测试通过")
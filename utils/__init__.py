@@ -4,6 +4,9 @@
 """
 
 from .utils import DataUtils, SessionStateManager, FileUtils, ValidationUtils, ProgressUtils, FormatUtils
+from .cube_cache import CubeCache
+from .chart_downsampling import ChartDownsampler
+from .excel_loader import ExcelStreamLoader
 
 __all__ = [
     'DataUtils',
@@ -11,5 +14,8 @@ __all__ = [
     'FileUtils',
     'ValidationUtils',
     'ProgressUtils',
-    'FormatUtils'
+    'FormatUtils',
+    'CubeCache',
+    'ChartDownsampler',
+    'ExcelStreamLoader'
 ] 
\ No newline at end of file
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+图表降采样模块 - 大数据量折线图的保极值降采样与WebGL渲染
+降采样结果始终包含首尾点、全局最高/最低点和需要标注的日期，避免随机采样丢失峰值
+"""
+
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+from typing import List, Optional, Iterable
+from config import CHART_CONFIG
+
+class ChartDownsampler:
+    """折线图降采样工具"""
+
+    @staticmethod
+    def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+        """
+        最大三角形三桶算法(LTTB)：每个桶选出与前一选中点、下一桶均值构成三角形面积最大的点
+
+        Args:
+            x: 横坐标（数值）
+            y: 纵坐标
+            n_out: 输出点数
+
+        Returns:
+            np.ndarray: 选中点的下标（升序）
+        """
+        n = len(y)
+        if n_out >= n or n_out < 3:
+            return np.arange(n)
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.nan_to_num(np.asarray(y, dtype=np.float64), nan=0.0)
+        # 首尾点之外划分为n_out-2个桶
+        edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+        selected = np.empty(n_out, dtype=np.int64)
+        selected[0], selected[-1] = 0, n - 1
+
+        previous = 0
+        for i in range(n_out - 2):
+            start, end = edges[i], edges[i + 1]
+            next_start = edges[i + 1]
+            next_end = edges[i + 2] if i + 2 < len(edges) else n
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+
+            area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                          - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+            previous = start + int(np.argmax(area))
+            selected[i + 1] = previous
+        return selected
+
+    @staticmethod
+    def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+        """
+        每桶保留最大值和最小值（整段向量化，无逐桶循环）
+
+        Args:
+            y: 纵坐标
+            n_out: 输出点数（约为桶数×2）
+
+        Returns:
+            np.ndarray: 选中点的下标（升序）
+        """
+        n = len(y)
+        if n_out >= n or n == 0:
+            return np.arange(n)
+
+        n_buckets = max(n_out // 2, 1)
+        size = int(np.ceil(n / n_buckets))
+        padded = np.full(n_buckets * size, np.nan)
+        padded[:n] = y
+        blocks = padded.reshape(-1, size)
+
+        has_value = ~np.isnan(blocks).all(axis=1)
+        offsets = np.flatnonzero(has_value) * size
+        filled_max = np.where(np.isnan(blocks[has_value]), -np.inf, blocks[has_value])
+        filled_min = np.where(np.isnan(blocks[has_value]), np.inf, blocks[has_value])
+        return np.unique(np.concatenate([
+            [0, n - 1],
+            offsets + np.argmax(filled_max, axis=1),
+            offsets + np.argmin(filled_min, axis=1)
+        ]))
+
+    @staticmethod
+    def positions_of(x: np.ndarray, dates: Iterable) -> np.ndarray:
+        """
+        查找指定日期在有序日期数组中的位置（不存在的日期忽略）
+
+        Args:
+            x: 升序的datetime64[ns]数组
+            dates: 日期列表（可包含None）
+
+        Returns:
+            np.ndarray: 位置下标
+        """
+        targets = [date for date in dates if date is not None and not pd.isna(date)]
+        if not targets or len(x) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        targets = pd.to_datetime(pd.Series(targets)).to_numpy().astype('datetime64[ns]')
+        positions = np.searchsorted(x, targets)
+        positions = positions[positions < len(x)]
+        return positions[np.isin(x[positions], targets)]
+
+    @staticmethod
+    def select_indices(x: np.ndarray, y: np.ndarray, max_points: Optional[int] = None,
+                       keep: Optional[np.ndarray] = None, method: Optional[str] = None) -> np.ndarray:
+        """
+        选出需要绘制的点：降采样结果 ∪ 全局最高/最低点 ∪ 必须保留的点
+
+        Args:
+            x: 横坐标（datetime64或数值）
+            y: 纵坐标
+            max_points: 最多点数
+            keep: 必须保留的下标（如标注日期）
+            method: lttb 或 minmax
+
+        Returns:
+            np.ndarray: 升序下标
+        """
+        if max_points is None:
+            max_points = CHART_CONFIG['max_points']
+        if method is None:
+            method = CHART_CONFIG['downsample_method']
+
+        n = len(y)
+        if n <= max_points:
+            return np.arange(n)
+
+        y = np.asarray(y, dtype=np.float64)
+        if method == 'minmax':
+            indices = ChartDownsampler.minmax_indices(y, max_points)
+        else:
+            numeric_x = np.asarray(x).astype(np.int64) if np.issubdtype(np.asarray(x).dtype, np.datetime64) else x
+            indices = ChartDownsampler.lttb_indices(numeric_x, y, max_points)
+
+        extra = [indices]
+        if not np.isnan(y).all():
+            extra.append([np.nanargmax(y), np.nanargmin(y)])
+        if keep is not None and len(keep) > 0:
+            extra.append(np.asarray(keep, dtype=np.int64))
+        return np.unique(np.concatenate(extra).astype(np.int64))
+
+    @staticmethod
+    def use_webgl(n_points: int) -> bool:
+        """数据点数超过阈值时使用WebGL渲染"""
+        return n_points > CHART_CONFIG['webgl_threshold']
+
+    @staticmethod
+    def line_trace(n_points: int, **kwargs):
+        """
+        按数据量选择SVG(Scatter)或WebGL(Scattergl)折线
+
+        Args:
+            n_points: 原始数据点数
+            **kwargs: 传给trace的参数
+
+        Returns:
+            go.Scatter 或 go.Scattergl
+        """
+        if ChartDownsampler.use_webgl(n_points):
+            # WebGL折线不支持样条平滑
+            line = dict(kwargs.pop('line', {}) or {})
+            line.pop('shape', None)
+            line.pop('smoothing', None)
+            return go.Scattergl(line=line, **kwargs)
+        return go.Scatter(**kwargs)
+
+    @staticmethod
+    def downsample_series(dates, values, keep_dates: Optional[List] = None):
+        """
+        对单条日期序列降采样，返回可直接绘图的数组
+
+        Args:
+            dates: 日期序列
+            values: 数值序列
+            keep_dates: 必须保留的日期
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (日期数组, 数值数组)
+        """
+        x = pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[ns]')
+        y = np.asarray(values, dtype=np.float64)
+        keep = ChartDownsampler.positions_of(x, keep_dates or [])
+        indices = ChartDownsampler.select_indices(x, y, keep=keep)
+        return x[indices], y[indices]
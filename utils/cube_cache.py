@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+日聚合缓存模块 - 按数据指纹持久化日聚合立方体
+缓存键 = 源数据内容哈希 + 列映射，命中后只需切片和重新汇总，无需重新扫描原始行
+"""
+
+import os
+import json
+import hashlib
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+class CubeCache:
+    """日聚合立方体缓存（内存 + 磁盘npz）"""
+
+    _memory: "OrderedDict[str, Dict[str, np.ndarray]]" = OrderedDict()
+
+    def __init__(self, cache_dir: str = "data/cube_cache", memory_entries: int = 8, disk_entries: int = 64):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录
+            memory_entries: 内存中最多保留的条目数
+            disk_entries: 磁盘上最多保留的缓存文件数
+        """
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+
+    @staticmethod
+    def source_fingerprint(file_bytes: bytes, sheet_name: str) -> str:
+        """
+        计算源文件工作表的内容指纹
+
+        Args:
+            file_bytes: 上传文件的字节内容
+            sheet_name: 工作表名称
+
+        Returns:
+            str: 指纹字符串
+        """
+        digest = hashlib.sha1(file_bytes)
+        digest.update(str(sheet_name).encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def frame_fingerprint(df: pd.DataFrame, columns: List[str]) -> str:
+        """
+        计算数据框指定列的内容指纹（无源文件指纹时使用，如数据经过清洗）
+
+        Args:
+            df: 数据框
+            columns: 参与计算的列
+
+        Returns:
+            str: 指纹字符串
+        """
+        digest = hashlib.sha1()
+        digest.update(str(len(df)).encode('utf-8'))
+        for column in columns:
+            digest.update(str(column).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(df[column], index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(data_fingerprint: str, column_mapping: Dict[str, Any]) -> str:
+        """
+        由数据指纹和列映射生成缓存键
+
+        Args:
+            data_fingerprint: 数据指纹
+            column_mapping: 列映射及影响聚合结果的参数
+
+        Returns:
+            str: 缓存键
+        """
+        mapping = json.dumps(column_mapping, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(f"{data_fingerprint}|{mapping}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """缓存文件路径"""
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[Dict[str, np.ndarray]]: 数组字典，未命中时为None
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+            # 命中时刷新修改时间，磁盘淘汰按最久未使用的顺序进行
+            os.utime(path)
+        except Exception:
+            # 缓存文件损坏时视为未命中
+            return None
+
+        self._remember(key, arrays)
+        return arrays
+
+    def save(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        写入缓存（先写临时文件再重命名，避免读到写了一半的文件）
+
+        Args:
+            key: 缓存键
+            arrays: 数组字典
+        """
+        self._remember(key, arrays)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except OSError:
+            # 磁盘不可写时仅保留内存缓存
+            pass
+
+    def _evict_disk(self) -> None:
+        """磁盘缓存文件数超过上限时，按修改时间删除最久未使用的文件"""
+        paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.npz')]
+        if len(paths) <= self.disk_entries:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _remember(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """写入内存缓存并淘汰最久未使用的条目"""
+        self._memory[key] = arrays
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空内存和磁盘缓存"""
+        self._memory.clear()
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.cache_dir, name))
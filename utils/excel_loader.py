@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Excel流式加载模块 - 以只读流式模式打开一次工作簿，逐块读取行并按列累积构建数据框
+总行数取自工作表的dimension元数据，无需为计数或抽样额外解析整个工作表；读取过程中按真实行数回报进度
+"""
+
+import io
+import numbers
+import pandas as pd
+import numpy as np
+from pandas._libs.parsers import STR_NA_VALUES
+from typing import Callable, List, Optional, Tuple
+from config import EXCEL_LOADER_CONFIG
+
+class ExcelStreamLoader:
+    """Excel流式加载器（openpyxl只读模式，单次解析）"""
+
+    @staticmethod
+    def _open_workbook(source):
+        """以只读流式模式打开工作簿（上传文件对象、路径或字节均可）"""
+        import openpyxl
+
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        elif hasattr(source, 'seek'):
+            source.seek(0)
+        return openpyxl.load_workbook(source, read_only=True, data_only=True)
+
+    @staticmethod
+    def sheet_dimensions(worksheet) -> Tuple[Optional[int], Optional[int]]:
+        """
+        读取工作表dimension元数据中的行数和列数（不解析单元格）
+
+        Args:
+            worksheet: openpyxl只读工作表
+
+        Returns:
+            tuple: (数据行数（不含表头）, 列数)，元数据缺失时为(None, None)
+        """
+        max_row, max_column = worksheet.max_row, worksheet.max_column
+        if not max_row or not max_column:
+            return None, None
+        return max(max_row - 1, 0), max_column
+
+    @staticmethod
+    def _column_names(header: tuple) -> List[str]:
+        """表头转换为列名（与pd.read_excel一致：空表头为"Unnamed: i"，重复列名加".1"、".2"后缀）"""
+        names, seen = [], {}
+        for position, value in enumerate(header):
+            name = f"Unnamed: {position}" if value is None else value
+            if name in seen:
+                seen[name] += 1
+                while f"{name}.{seen[name]}" in seen:
+                    seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            seen.setdefault(name, 0)
+            names.append(name)
+        return names
+
+    @staticmethod
+    def _build_column(values: list, na_values: set) -> pd.Series:
+        """
+        由单元格值列表构建一列（类型推断规则与pd.read_excel一致）：
+        缺失值字符串转为缺失值；整数值的数值单元格还原为整数；全部为数值或数值文本的列转为数值列；全空列为float64
+
+        Args:
+            values: 单元格值列表
+            na_values: 视为缺失值的字符串（已包含pandas默认缺失值集合）
+
+        Returns:
+            pd.Series: 推断类型后的列
+        """
+        series = pd.Series(values, dtype=object)
+        kinds = series.map(type)
+        strings = kinds.eq(str)
+        if strings.any():
+            series = series.mask(strings & series.isin(na_values))
+        present = series.notna()
+        if not present.any():
+            return pd.Series(np.full(len(series), np.nan))
+
+        inferred = series.infer_objects()
+        if inferred.dtype.kind == 'f':
+            # 数值单元格：没有缺失值且全部为整数值时与pd.read_excel一样还原为整数列
+            numeric = inferred.to_numpy()
+            if present.all() and np.array_equal(numeric, np.round(numeric)) and np.abs(numeric).max() < 2 ** 63:
+                return inferred.astype(np.int64)
+            return inferred
+        if strings[present].any():
+            # 以文本存储的数字（如'123'）：非空值全部为数字或可解析为数字的文本时转为数值列
+            cell_kinds = set(kinds[present].unique())
+            if all(kind is str or (issubclass(kind, numbers.Number) and kind is not bool) for kind in cell_kinds):
+                try:
+                    return pd.to_numeric(series)
+                except (ValueError, TypeError):
+                    pass
+        return inferred
+
+    @staticmethod
+    def load(source, sheet_name: str, progress_callback: Optional[Callable[[float, str], None]] = None,
+             chunk_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        单次流式读取工作表为数据框
+
+        Args:
+            source: 上传的文件对象、文件路径或字节内容
+            sheet_name: 工作表名称
+            progress_callback: 进度回调 callback(进度0~1, 说明)，为空时不回报
+            chunk_rows: 每块读取的行数，为空时使用配置
+
+        Returns:
+            pd.DataFrame: 数据框（工作表为空时为空数据框）
+        """
+        chunk_rows = chunk_rows or EXCEL_LOADER_CONFIG['chunk_rows']
+        na_values = set(EXCEL_LOADER_CONFIG['na_values']) | set(STR_NA_VALUES)
+        read_share = EXCEL_LOADER_CONFIG['read_progress_share']
+        report = progress_callback or (lambda fraction, text: None)
+
+        workbook = ExcelStreamLoader._open_workbook(source)
+        try:
+            worksheet = workbook[sheet_name]
+            total_rows, _ = ExcelStreamLoader.sheet_dimensions(worksheet)
+            rows = worksheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame()
+
+            width = len(header)
+            columns: List[list] = [[] for _ in range(width)]
+            row_count = last_data_row = 0
+            chunk = []
+
+            def flush():
+                """把当前块按列追加到各列列表"""
+                nonlocal width, last_data_row
+                longest = max(len(row) for row in chunk)
+                if longest > width:
+                    # 数据行比表头宽：补齐新列之前的行
+                    columns.extend([None] * row_count for _ in range(longest - width))
+                    width = longest
+                if any(len(row) != width for row in chunk):
+                    chunk[:] = [row + (None,) * (width - len(row)) for row in chunk]
+                for values, column in zip(zip(*chunk), columns):
+                    column.extend(values)
+                # 记录最后一个非空行，末尾的空行（只有格式的单元格）不计入
+                for offset in range(len(chunk) - 1, -1, -1):
+                    if any(value is not None for value in chunk[offset]):
+                        last_data_row = row_count + offset + 1
+                        break
+
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= chunk_rows:
+                    flush()
+                    row_count += len(chunk)
+                    chunk = []
+                    if total_rows:
+                        report(min(row_count / total_rows, 1.0) * read_share,
+                               f"已读取 {row_count:,} / {total_rows:,} 行")
+                    else:
+                        report(0.0, f"已读取 {row_count:,} 行")
+            if chunk:
+                flush()
+                row_count += len(chunk)
+            report(read_share, f"已读取 {row_count:,} 行，正在构建数据列...")
+        finally:
+            workbook.close()
+            if hasattr(source, 'seek'):
+                source.seek(0)  # 复位文件指针，便于调用方回退到pd.read_excel
+
+        # 去掉末尾空表头且没有数据的列（与pd.read_excel一致）
+        header = tuple(header) + (None,) * (width - len(header))
+        while width and header[width - 1] is None and all(value is None for value in columns[width - 1][:last_data_row]):
+            width -= 1
+        names = ExcelStreamLoader._column_names(header[:width])
+
+        data = {}
+        for position in range(width):
+            data[names[position]] = ExcelStreamLoader._build_column(columns[position][:last_data_row], na_values)
+            columns[position] = None  # 及时释放单元格列表
+            report(read_share + (1 - read_share) * (position + 1) / max(width, 1),
+                   f"已构建 {position + 1} / {width} 列")
+        return pd.DataFrame(data, index=pd.RangeIndex(last_data_row))
@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 from typing import Dict, List, Any, Tuple, Optional, Union
+from utils.excel_loader import ExcelStreamLoader
 
 class DataUtils:
     """数据处理工具类"""
@@ -32,38 +33,19 @@ class DataUtils:
             if cache_key in st.session_state:
                 return st.session_state[cache_key]
             
-            # 性能优化的Excel读取
+            # 单次流式读取Excel（只解析一次工作簿，按真实行数显示进度）
             with st.spinner(f"📊 正在高速加载数据表：{sheet_name}..."):
-                # 第一步：快速检查文件格式和数据量
+                progress_bar = st.progress(0.0)
                 try:
-                    # 使用openpyxl引擎，性能更好
-                    sample_df = pd.read_excel(
-                        uploaded_file, 
-                        sheet_name=sheet_name, 
-                        nrows=10,
-                        engine='openpyxl'  # 明确指定引擎
-                    )
+                    df = ExcelStreamLoader.load(uploaded_file, sheet_name,
+                                                lambda fraction, text: progress_bar.progress(fraction, text=text))
+                    progress_bar.empty()
                     
-                    if sample_df.empty:
+                    if df.empty:
                         st.warning(f"⚠️ 工作表 {sheet_name} 为空")
                         return pd.DataFrame()
                     
-                except Exception as e:
-                    st.error(f"❌ 文件格式检查失败: {str(e)}")
-                    return pd.DataFrame()
-                
-                # 第二步：优化参数读取完整数据
-                try:
-                    # 使用优化参数加载
-                    df = pd.read_excel(
-                        uploaded_file,
-                        sheet_name=sheet_name,
-                        engine='openpyxl',  # 使用openpyxl引擎，通常比xlrd更快
-                        na_values=['', 'NULL', 'null', 'N/A', 'n/a', '#N/A'],  # 明确指定NA值
-                        keep_default_na=True  # 保持默认NA处理
-                    )
-                    
-                    # 第三步：数据类型优化（减少内存使用）
+                    # 数据类型优化（减少内存使用）
                     df = DataUtils._optimize_dataframe_dtypes(df)
                     
                     # 缓存数据
@@ -76,7 +58,8 @@ class DataUtils:
                     return df
                     
                 except Exception as e:
-                    # 如果优化参数失败，回退到基本参数
+                    # 如果流式读取失败（如.xls格式），回退到基本参数
+                    progress_bar.empty()
                     st.warning(f"⚠️ 使用基本模式加载...")
                     df = pd.read_excel(uploaded_file, sheet_name=sheet_name)
                     st.session_state[cache_key] = df
@@ -230,6 +213,34 @@ class DataUtils:
             st.error(f"❌ 读取Excel工作表名称失败: {str(e)}")
             return {'sheet_names': [], 'sheet_count': 0}
     
+    @staticmethod
+    def get_sheet_columns(uploaded_file, sheet_name: str) -> List[str]:
+        """
+        仅读取工作表表头，获取列名（缓存版）
+        
+        Args:
+            uploaded_file: 上传的文件对象
+            sheet_name: Sheet名称
+            
+        Returns:
+            List[str]: 列名列表，读取失败时为空列表
+        """
+        try:
+            columns_key = f"excel_columns_{uploaded_file.name}_{uploaded_file.size}_{sheet_name}"
+            
+            # 检查缓存
+            if columns_key in st.session_state:
+                return st.session_state[columns_key]
+            
+            header = pd.read_excel(uploaded_file, sheet_name=sheet_name, nrows=0)
+            columns = [str(col) for col in header.columns]
+            st.session_state[columns_key] = columns
+            return columns
+            
+        except Exception as e:
+            st.error(f"❌ 读取工作表 {sheet_name} 表头失败: {str(e)}")
+            return []
+    
     @staticmethod
     def load_data_in_background(uploaded_file, sheet_name: str, progress_placeholder=None):
         """
@@ -258,27 +269,23 @@ class DataUtils:
             if progress_placeholder:
                 progress_placeholder.info(f"🔄 正在读取工作表：{sheet_name}")
             
-            # 先尝试读取少量数据检查文件格式
+            # 单次流式读取完整数据（总行数取自工作表元数据，无需预读计数）
             try:
-                sample_df = pd.read_excel(uploaded_file, sheet_name=sheet_name, nrows=5)
-                if sample_df.empty:
+                def report(fraction, text):
+                    if progress_placeholder:
+                        progress_placeholder.progress(fraction, text=f"📊 {text}")
+                
+                df = ExcelStreamLoader.load(uploaded_file, sheet_name, report)
+                if df.empty:
                     if progress_placeholder:
                         progress_placeholder.warning(f"⚠️ 工作表 {sheet_name} 为空")
                     return pd.DataFrame()
                 
-                total_rows = len(pd.read_excel(uploaded_file, sheet_name=sheet_name))
-                
-                if progress_placeholder:
-                    progress_placeholder.info(f"📊 检测到 {total_rows:,} 行数据，正在加载...")
-                
             except Exception as e:
                 if progress_placeholder:
                     progress_placeholder.error(f"❌ 文件格式检查失败: {str(e)}")
                 return pd.DataFrame()
             
-            # 读取完整数据
-            df = pd.read_excel(uploaded_file, sheet_name=sheet_name)
-            
             # 缓存数据
             st.session_state[cache_key] = df
             
@@ -421,7 +428,8 @@ class SessionStateManager:
                 'analysis_confirmed', 'selected_dimensions', 'analysis_name', 
                 'data_loaded', 'loaded_data', 'need_data_loading', 'data_loading_progress',
                 'selected_sheet', 'uploaded_file', 'dimension_configs',
-                'data_loading_error', 'data_loading_triggered', 'loading_triggered'
+                'data_loading_error', 'data_loading_triggered', 'loading_triggered',
+                'source_fingerprint_cache'
             ]
         
         for key in keys_to_clear:
@@ -442,7 +450,7 @@ class SessionStateManager:
         # 清理分析配置相关的键
         config_keys = [
             key for key in st.session_state.keys() 
-            if any(prefix in str(key) for prefix in ['装箱分析_', 'ABC分析_', '异常数据清洗_', '出库分析_', '入库分析_'])
+            if any(prefix in str(key) for prefix in ['装箱分析_', 'ABC分析_', '异常数据清洗_', '出库分析_', '入库分析_', '时段峰值分析_', '需求预测_', '季节性分析_', '出入库对账分析_', '库龄分析_', '库存周转分析_', '安全库存分析_', '吞吐仿真分析_', '储位优化分析_', '拣选路径分析_', '分区拆单分析_', '补货频次分析_', '存储需求分析_', '订单聚类分析_'])
         ]
         for key in config_keys:
             if key in st.session_state:
@@ -510,7 +518,14 @@ class SessionStateManager:
                 '出库分析_item_column': st.session_state.get("出库分析_item_column"),
                 '出库分析_item_count_column': st.session_state.get("出库分析_item_count_column"),
                 '出库分析_start_date': st.session_state.get("出库分析_start_date"),
-                '出库分析_end_date': st.session_state.get("出库分析_end_date")
+                '出库分析_end_date': st.session_state.get("出库分析_end_date"),
+                '出库分析_distinct_mode': st.session_state.get("出库分析_distinct_mode", "exact"),
+                '出库分析_hll_precision': st.session_state.get("出库分析_hll_precision", 14),
+                '出库分析_customer_column': st.session_state.get("出库分析_customer_column"),
+                '出库分析_customer_mode': st.session_state.get("出库分析_customer_mode", "exact"),
+                '出库分析_customer_top_n': st.session_state.get("出库分析_customer_top_n"),
+                '出库分析_customer_a_percentage': st.session_state.get("出库分析_customer_a_percentage"),
+                '出库分析_customer_b_percentage': st.session_state.get("出库分析_customer_b_percentage")
             }
         
         # 入库分析配置
@@ -524,7 +539,14 @@ class SessionStateManager:
                 '入库分析_quantity_column': st.session_state.get("入库分析_quantity_column"),
                 '入库分析_quantity_count_column': st.session_state.get("入库分析_quantity_count_column"),
                 '入库分析_start_date': st.session_state.get("入库分析_start_date"),
-                '入库分析_end_date': st.session_state.get("入库分析_end_date")
+                '入库分析_end_date': st.session_state.get("入库分析_end_date"),
+                '入库分析_distinct_mode': st.session_state.get("入库分析_distinct_mode", "exact"),
+                '入库分析_hll_precision': st.session_state.get("入库分析_hll_precision", 14),
+                '入库分析_supplier_column': st.session_state.get("入库分析_supplier_column"),
+                '入库分析_reference_date_column': st.session_state.get("入库分析_reference_date_column"),
+                '入库分析_delivery_column': st.session_state.get("入库分析_delivery_column"),
+                '入库分析_box_column': st.session_state.get("入库分析_box_column"),
+                '入库分析_on_time_days': st.session_state.get("入库分析_on_time_days")
             }
         
 
@@ -538,6 +560,216 @@ class SessionStateManager:
                 '订单结构分析_amount_column': st.session_state.get("订单结构分析_amount_column")
             }
         
+        # 时段峰值分析配置
+        elif dimension == "时段峰值分析":
+            config = {
+                '时段峰值分析_datetime_column': st.session_state.get("时段峰值分析_datetime_column"),
+                '时段峰值分析_order_column': st.session_state.get("时段峰值分析_order_column"),
+                '时段峰值分析_quantity_column': st.session_state.get("时段峰值分析_quantity_column"),
+                '时段峰值分析_slot_minutes': st.session_state.get("时段峰值分析_slot_minutes", 60)
+            }
+        
+        # 需求预测配置
+        elif dimension == "需求预测":
+            config = {
+                '需求预测_date_column': st.session_state.get("需求预测_date_column"),
+                '需求预测_sku_column': st.session_state.get("需求预测_sku_column"),
+                '需求预测_quantity_column': st.session_state.get("需求预测_quantity_column"),
+                '需求预测_horizon': st.session_state.get("需求预测_horizon", 14)
+            }
+        
+        # 季节性分析配置
+        elif dimension == "季节性分析":
+            config = {
+                '季节性分析_date_column': st.session_state.get("季节性分析_date_column"),
+                '季节性分析_series_column': st.session_state.get("季节性分析_series_column"),
+                '季节性分析_quantity_column': st.session_state.get("季节性分析_quantity_column")
+            }
+        
+        # 出入库对账分析配置
+        elif dimension == "出入库对账分析":
+            config = {
+                '出入库对账分析_current_role': st.session_state.get("出入库对账分析_current_role"),
+                '出入库对账分析_date_column': st.session_state.get("出入库对账分析_date_column"),
+                '出入库对账分析_sku_column': st.session_state.get("出入库对账分析_sku_column"),
+                '出入库对账分析_quantity_column': st.session_state.get("出入库对账分析_quantity_column"),
+                '出入库对账分析_sheet': st.session_state.get("出入库对账分析_sheet"),
+                '出入库对账分析_sheet_date_column': st.session_state.get("出入库对账分析_sheet_date_column"),
+                '出入库对账分析_sheet_sku_column': st.session_state.get("出入库对账分析_sheet_sku_column"),
+                '出入库对账分析_sheet_quantity_column': st.session_state.get("出入库对账分析_sheet_quantity_column"),
+                '出入库对账分析_use_opening': st.session_state.get("出入库对账分析_use_opening", False),
+                '出入库对账分析_opening_sheet': st.session_state.get("出入库对账分析_opening_sheet"),
+                '出入库对账分析_opening_sku_column': st.session_state.get("出入库对账分析_opening_sku_column"),
+                '出入库对账分析_opening_quantity_column': st.session_state.get("出入库对账分析_opening_quantity_column")
+            }
+        
+        # 库龄分析配置
+        elif dimension == "库龄分析":
+            config = {
+                '库龄分析_current_role': st.session_state.get("库龄分析_current_role"),
+                '库龄分析_date_column': st.session_state.get("库龄分析_date_column"),
+                '库龄分析_sku_column': st.session_state.get("库龄分析_sku_column"),
+                '库龄分析_quantity_column': st.session_state.get("库龄分析_quantity_column"),
+                '库龄分析_sheet': st.session_state.get("库龄分析_sheet"),
+                '库龄分析_sheet_date_column': st.session_state.get("库龄分析_sheet_date_column"),
+                '库龄分析_sheet_sku_column': st.session_state.get("库龄分析_sheet_sku_column"),
+                '库龄分析_sheet_quantity_column': st.session_state.get("库龄分析_sheet_quantity_column")
+            }
+        
+        # 库存周转分析配置
+        elif dimension == "库存周转分析":
+            config = {
+                '库存周转分析_sku_column': st.session_state.get("库存周转分析_sku_column"),
+                '库存周转分析_stock_column': st.session_state.get("库存周转分析_stock_column"),
+                '库存周转分析_category_column': st.session_state.get("库存周转分析_category_column"),
+                '库存周转分析_sheet': st.session_state.get("库存周转分析_sheet"),
+                '库存周转分析_sheet_date_column': st.session_state.get("库存周转分析_sheet_date_column"),
+                '库存周转分析_sheet_sku_column': st.session_state.get("库存周转分析_sheet_sku_column"),
+                '库存周转分析_sheet_quantity_column': st.session_state.get("库存周转分析_sheet_quantity_column")
+            }
+        
+        # 安全库存分析配置
+        elif dimension == "安全库存分析":
+            config = {
+                '安全库存分析_date_column': st.session_state.get("安全库存分析_date_column"),
+                '安全库存分析_sku_column': st.session_state.get("安全库存分析_sku_column"),
+                '安全库存分析_quantity_column': st.session_state.get("安全库存分析_quantity_column"),
+                '安全库存分析_cost_column': st.session_state.get("安全库存分析_cost_column"),
+                '安全库存分析_period': st.session_state.get("安全库存分析_period"),
+                '安全库存分析_lead_time': st.session_state.get("安全库存分析_lead_time"),
+                '安全库存分析_lead_time_std': st.session_state.get("安全库存分析_lead_time_std"),
+                '安全库存分析_service_levels': st.session_state.get("安全库存分析_service_levels")
+            }
+        
+        # 吞吐仿真分析配置
+        elif dimension == "吞吐仿真分析":
+            config = {
+                '吞吐仿真分析_datetime_column': st.session_state.get("吞吐仿真分析_datetime_column"),
+                '吞吐仿真分析_quantity_column': st.session_state.get("吞吐仿真分析_quantity_column"),
+                '吞吐仿真分析_workload': st.session_state.get("吞吐仿真分析_workload"),
+                '吞吐仿真分析_picks_per_hour': st.session_state.get("吞吐仿真分析_picks_per_hour"),
+                '吞吐仿真分析_hit_rate': st.session_state.get("吞吐仿真分析_hit_rate"),
+                '吞吐仿真分析_backlog_hours': st.session_state.get("吞吐仿真分析_backlog_hours"),
+                '吞吐仿真分析_service_level': st.session_state.get("吞吐仿真分析_service_level"),
+                '吞吐仿真分析_replications': st.session_state.get("吞吐仿真分析_replications")
+            }
+        
+        # 储位优化分析配置
+        elif dimension == "储位优化分析":
+            config = {
+                '储位优化分析_sku_column': st.session_state.get("储位优化分析_sku_column"),
+                '储位优化分析_length_column': st.session_state.get("储位优化分析_length_column"),
+                '储位优化分析_width_column': st.session_state.get("储位优化分析_width_column"),
+                '储位优化分析_height_column': st.session_state.get("储位优化分析_height_column"),
+                '储位优化分析_inventory_column': st.session_state.get("储位优化分析_inventory_column"),
+                '储位优化分析_data_unit': st.session_state.get("储位优化分析_data_unit"),
+                '储位优化分析_location_column': st.session_state.get("储位优化分析_location_column"),
+                '储位优化分析_sheet': st.session_state.get("储位优化分析_sheet"),
+                '储位优化分析_sheet_sku_column': st.session_state.get("储位优化分析_sheet_sku_column"),
+                '储位优化分析_aisles': st.session_state.get("储位优化分析_aisles"),
+                '储位优化分析_bays': st.session_state.get("储位优化分析_bays"),
+                '储位优化分析_levels': st.session_state.get("储位优化分析_levels"),
+                '储位优化分析_bay_width': st.session_state.get("储位优化分析_bay_width"),
+                '储位优化分析_aisle_pitch': st.session_state.get("储位优化分析_aisle_pitch"),
+                '储位优化分析_level_penalty': st.session_state.get("储位优化分析_level_penalty"),
+                '储位优化分析_location_length': st.session_state.get("储位优化分析_location_length"),
+                '储位优化分析_location_width': st.session_state.get("储位优化分析_location_width"),
+                '储位优化分析_location_height': st.session_state.get("储位优化分析_location_height")
+            }
+        
+        # 拣选路径分析配置
+        elif dimension == "拣选路径分析":
+            config = {
+                '拣选路径分析_order_column': st.session_state.get("拣选路径分析_order_column"),
+                '拣选路径分析_sku_column': st.session_state.get("拣选路径分析_sku_column"),
+                '拣选路径分析_sheet': st.session_state.get("拣选路径分析_sheet"),
+                '拣选路径分析_sheet_sku_column': st.session_state.get("拣选路径分析_sheet_sku_column"),
+                '拣选路径分析_sheet_location_column': st.session_state.get("拣选路径分析_sheet_location_column"),
+                '拣选路径分析_aisles': st.session_state.get("拣选路径分析_aisles"),
+                '拣选路径分析_bays': st.session_state.get("拣选路径分析_bays"),
+                '拣选路径分析_levels': st.session_state.get("拣选路径分析_levels"),
+                '拣选路径分析_bay_width': st.session_state.get("拣选路径分析_bay_width"),
+                '拣选路径分析_aisle_pitch': st.session_state.get("拣选路径分析_aisle_pitch"),
+                '拣选路径分析_batch_sizes': st.session_state.get("拣选路径分析_batch_sizes")
+            }
+        
+        # 分区拆单分析配置
+        elif dimension == "分区拆单分析":
+            config = {
+                '分区拆单分析_order_column': st.session_state.get("分区拆单分析_order_column"),
+                '分区拆单分析_sku_column': st.session_state.get("分区拆单分析_sku_column"),
+                '分区拆单分析_zone_columns': st.session_state.get("分区拆单分析_zone_columns"),
+                '分区拆单分析_use_abc': st.session_state.get("分区拆单分析_use_abc"),
+                '分区拆单分析_a_percentage': st.session_state.get("分区拆单分析_a_percentage"),
+                '分区拆单分析_b_percentage': st.session_state.get("分区拆单分析_b_percentage"),
+                '分区拆单分析_zone_counts': st.session_state.get("分区拆单分析_zone_counts")
+            }
+        
+        # 补货频次分析配置
+        elif dimension == "补货频次分析":
+            config = {
+                '补货频次分析_sku_column': st.session_state.get("补货频次分析_sku_column"),
+                '补货频次分析_length_column': st.session_state.get("补货频次分析_length_column"),
+                '补货频次分析_width_column': st.session_state.get("补货频次分析_width_column"),
+                '补货频次分析_height_column': st.session_state.get("补货频次分析_height_column"),
+                '补货频次分析_weight_column': st.session_state.get("补货频次分析_weight_column"),
+                '补货频次分析_capacity_column': st.session_state.get("补货频次分析_capacity_column"),
+                '补货频次分析_data_unit': st.session_state.get("补货频次分析_data_unit"),
+                '补货频次分析_weight_unit': st.session_state.get("补货频次分析_weight_unit"),
+                '补货频次分析_sheet': st.session_state.get("补货频次分析_sheet"),
+                '补货频次分析_sheet_date_column': st.session_state.get("补货频次分析_sheet_date_column"),
+                '补货频次分析_sheet_sku_column': st.session_state.get("补货频次分析_sheet_sku_column"),
+                '补货频次分析_sheet_quantity_column': st.session_state.get("补货频次分析_sheet_quantity_column"),
+                '补货频次分析_refills_per_face': st.session_state.get("补货频次分析_refills_per_face"),
+                '补货频次分析_peak_percentile': st.session_state.get("补货频次分析_peak_percentile"),
+                '补货频次分析_container_length': st.session_state.get("container_length", 600),
+                '补货频次分析_container_width': st.session_state.get("container_width", 400),
+                '补货频次分析_container_height': st.session_state.get("container_height", 300),
+                '补货频次分析_container_weight_limit': st.session_state.get("container_weight_limit", 30)
+            }
+        
+        # 存储需求分析配置
+        elif dimension == "存储需求分析":
+            config = {
+                '存储需求分析_sku_column': st.session_state.get("存储需求分析_sku_column"),
+                '存储需求分析_quantity_column': st.session_state.get("存储需求分析_quantity_column"),
+                '存储需求分析_length_column': st.session_state.get("存储需求分析_length_column"),
+                '存储需求分析_width_column': st.session_state.get("存储需求分析_width_column"),
+                '存储需求分析_height_column': st.session_state.get("存储需求分析_height_column"),
+                '存储需求分析_inventory_column': st.session_state.get("存储需求分析_inventory_column"),
+                '存储需求分析_weight_column': st.session_state.get("存储需求分析_weight_column"),
+                '存储需求分析_data_unit': st.session_state.get("存储需求分析_data_unit"),
+                '存储需求分析_weight_unit': st.session_state.get("存储需求分析_weight_unit"),
+                '存储需求分析_a_percentage': st.session_state.get("存储需求分析_a_percentage"),
+                '存储需求分析_b_percentage': st.session_state.get("存储需求分析_b_percentage"),
+                '存储需求分析_divider_counts': st.session_state.get("存储需求分析_divider_counts"),
+                '存储需求分析_location_length': st.session_state.get("存储需求分析_location_length"),
+                '存储需求分析_location_width': st.session_state.get("存储需求分析_location_width"),
+                '存储需求分析_location_height': st.session_state.get("存储需求分析_location_height"),
+                '存储需求分析_container_length': st.session_state.get("container_length", 600),
+                '存储需求分析_container_width': st.session_state.get("container_width", 400),
+                '存储需求分析_container_height': st.session_state.get("container_height", 300),
+                '存储需求分析_container_weight_limit': st.session_state.get("container_weight_limit", 30)
+            }
+        
+        # 订单聚类分析配置
+        elif dimension == "订单聚类分析":
+            config = {
+                '订单聚类分析_order_column': st.session_state.get("订单聚类分析_order_column"),
+                '订单聚类分析_sku_column': st.session_state.get("订单聚类分析_sku_column"),
+                '订单聚类分析_quantity_column': st.session_state.get("订单聚类分析_quantity_column"),
+                '订单聚类分析_date_column': st.session_state.get("订单聚类分析_date_column"),
+                '订单聚类分析_length_column': st.session_state.get("订单聚类分析_length_column"),
+                '订单聚类分析_width_column': st.session_state.get("订单聚类分析_width_column"),
+                '订单聚类分析_height_column': st.session_state.get("订单聚类分析_height_column"),
+                '订单聚类分析_weight_column': st.session_state.get("订单聚类分析_weight_column"),
+                '订单聚类分析_data_unit': st.session_state.get("订单聚类分析_data_unit"),
+                '订单聚类分析_weight_unit': st.session_state.get("订单聚类分析_weight_unit"),
+                '订单聚类分析_n_clusters': st.session_state.get("订单聚类分析_n_clusters"),
+                '订单聚类分析_a_percentage': st.session_state.get("订单聚类分析_a_percentage"),
+                '订单聚类分析_b_percentage': st.session_state.get("订单聚类分析_b_percentage")
+            }
+        
         return config
 
 class FileUtils: